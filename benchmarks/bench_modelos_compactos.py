@@ -0,0 +1,136 @@
+"""
+Benchmark: dicionários x dataclasses (models) x modelos compactos
+
+Gera uma resposta sintética de agendamentos com poucos stakeholders e
+categorias repetidos (como numa exportação real) e mede, para cada
+representação:
+
+- tempo para decodificar o JSON e construir os objetos
+- tempo para somar `value` e ler `due_date` de todos os itens
+- memória retida pelos objetos (tracemalloc, após descartar o texto JSON)
+
+Nenhuma requisição é feita à API.
+
+Uso:
+    python benchmarks/bench_modelos_compactos.py [--linhas 100000] [--stakeholders 500]
+"""
+import argparse
+import gc
+import json
+import sys
+import time
+import tracemalloc
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from nibo_api.common.models import AgendamentoRecebimento
+from nibo_api.common.modelos_compactos import agendamentos_compactos
+
+
+def _resposta_sintetica(linhas: int, stakeholders: int) -> str:
+    pessoas = [
+        {"id": str(uuid.uuid4()), "name": f"Cliente {i}", "isDeleted": False, "type": "Customer",
+         "cpfCnpj": f"{i:014d}"}
+        for i in range(stakeholders)
+    ]
+    categorias = [
+        {"id": str(uuid.uuid4()), "name": f"Categoria {i}", "isDeleted": False, "type": "in"}
+        for i in range(40)
+    ]
+    items = []
+    for i in range(linhas):
+        pessoa = pessoas[i % stakeholders]
+        categoria = categorias[i % len(categorias)]
+        dia = f"2025-{i % 12 + 1:02d}-{i % 28 + 1:02d}T00:00:00Z"
+        items.append({
+            "scheduleId": str(uuid.uuid4()), "type": "Credit",
+            "isEntry": False, "isBill": False, "isDebitNote": False, "isFlagged": False, "isDued": False,
+            "dueDate": dia, "accrualDate": dia, "scheduleDate": dia,
+            "createDate": "2025-01-01T10:00:00Z", "createUser": "financeiro@empresa.com",
+            "updateDate": "2025-01-02T10:00:00Z", "updateUser": "financeiro@empresa.com",
+            "value": 100.0 + i % 1000, "isPaid": False, "costCenterValueType": 0,
+            "paidValue": 0.0, "openValue": 100.0 + i % 1000,
+            "stakeholderId": pessoa["id"], "stakeholder": dict(pessoa),
+            "description": f"Parcela {i}", "reference": "",
+            "category": dict(categoria),
+            "hasInstallment": False, "hasRecurrence": False,
+            "categories": [{
+                "id": str(uuid.uuid4()), "categoryId": categoria["id"], "categoryName": categoria["name"],
+                "value": 100.0 + i % 1000, "description": "", "type": "in",
+                "parent": "Receitas", "parentId": categorias[0]["id"]
+            }],
+            "costCenters": [], "customAttributes": {},
+        })
+    return json.dumps({"items": items, "count": linhas})
+
+
+def _dicionarios(texto):
+    return json.loads(texto)["items"]
+
+
+def _dataclasses(texto):
+    return [AgendamentoRecebimento.from_dict(item) for item in json.loads(texto)["items"]]
+
+
+def _compactos(texto):
+    return agendamentos_compactos(json.loads(texto))
+
+
+def _agregar_dicionarios(items):
+    total = sum(float(item.get("value", 0)) for item in items)
+    datas = [item["dueDate"] for item in items]
+    return total, len(datas)
+
+
+def _agregar_modelos(items):
+    total = sum(item.value for item in items)
+    datas = [item.due_date for item in items]
+    return total, len(datas)
+
+
+CENARIOS = [
+    ("dicionários", _dicionarios, _agregar_dicionarios),
+    ("dataclasses (models)", _dataclasses, _agregar_modelos),
+    ("compactos (lazy)", _compactos, _agregar_modelos),
+]
+
+
+def _medir_memoria(construir, texto) -> int:
+    gc.collect()
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    objetos = construir(texto)
+    gc.collect()
+    retido = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+    del objetos
+    return retido
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--linhas", type=int, default=100000, help="Quantidade de agendamentos")
+    parser.add_argument("--stakeholders", type=int, default=500, help="Stakeholders distintos")
+    args = parser.parse_args()
+
+    texto = _resposta_sintetica(args.linhas, args.stakeholders)
+    print(f"{args.linhas} agendamentos, {args.stakeholders} stakeholders ({len(texto) / 1e6:.1f} MB de JSON)")
+    print("-" * 78)
+    print(f"{'representação':<22} {'construção':>12} {'agregação':>12} {'memória retida':>16}")
+    for nome, construir, agregar in CENARIOS:
+        gc.collect()
+        inicio = time.perf_counter()
+        objetos = construir(texto)
+        construcao = time.perf_counter() - inicio
+        inicio = time.perf_counter()
+        agregar(objetos)
+        agregacao = time.perf_counter() - inicio
+        del objetos
+        memoria = _medir_memoria(construir, texto)
+        print(f"{nome:<22} {construcao:10.3f} s {agregacao:10.3f} s {memoria / 1e6:13.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Benchmark: dicionários x modo tipado (typed=True) por recurso
+
+Gera páginas sintéticas de pagamentos, contas, transferências, tarefas e
+itens do relatório de obrigações e mede, para cada recurso:
+
+- tempo para decodificar o JSON (dicionários) e para decodificar e tipar
+- tempo para ler dois campos de todos os itens (nos modelos, o segundo é
+  convertido para UUID/datetime no primeiro acesso)
+- memória retida pelos itens (tracemalloc, após descartar o texto JSON)
+
+Nenhuma requisição é feita à API.
+
+Uso:
+    python benchmarks/bench_modelos_tipados.py [--linhas 50000]
+"""
+import argparse
+import gc
+import json
+import sys
+import time
+import tracemalloc
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from nibo_api.common.tipagem import MODELOS_EMPRESA, MODELOS_OBRIGACOES, tipar_resposta
+
+
+def _pessoas(quantidade):
+    return [{"id": str(uuid.uuid4()), "name": f"Pessoa {i}", "type": "Customer"} for i in range(quantidade)]
+
+
+def _pagamento(i, pessoas, contas):
+    dia = f"2025-{i % 12 + 1:02d}-{i % 28 + 1:02d}T00:00:00Z"
+    return {
+        "entryId": str(uuid.uuid4()), "scheduleId": str(uuid.uuid4()), "date": dia,
+        "value": 100.0 + i % 1000, "description": f"Pagamento {i}", "reference": "",
+        "isTransfer": False, "isReconciled": i % 3 == 0, "isFlagged": False,
+        "stakeholder": dict(pessoas[i % len(pessoas)]), "account": dict(contas[i % len(contas)]),
+        "createDate": "2025-01-01T10:00:00Z", "createUser": "financeiro@empresa.com",
+    }
+
+
+def _conta(i, pessoas, contas):
+    return {"id": str(uuid.uuid4()), "name": f"Conta {i}", "type": "Checking",
+            "bankId": contas[i % len(contas)]["id"], "agency": "0001", "number": str(i)}
+
+
+def _transferencia(i, pessoas, contas):
+    return {"id": str(uuid.uuid4()), "date": f"2025-{i % 12 + 1:02d}-01T00:00:00Z", "value": 50.0 + i,
+            "description": "", "fromAccountId": contas[i % len(contas)]["id"],
+            "toAccountId": contas[(i + 1) % len(contas)]["id"]}
+
+
+def _tarefa(i, pessoas, contas):
+    return {"id": str(uuid.uuid4()), "name": f"Tarefa {i}", "status": i % 4, "frequency": 1,
+            "deadLine": "2025-06-30T00:00:00", "inChargeUser": dict(pessoas[i % len(pessoas)]),
+            "customer": dict(pessoas[(i * 7) % len(pessoas)])}
+
+
+def _obrigacao(i, pessoas, contas):
+    return {"id": str(i), "number": i, "dueDate": f"2025-{i % 12 + 1:02d}-20T00:00:00",
+            "accrual": 202500 + i % 12 + 1, "status": 4, "value": 10.0 * (i % 50),
+            "obligation": {"id": str(i % 30), "name": f"Obrigação {i % 30}", "type": 1},
+            "customer": dict(pessoas[i % len(pessoas)]), "department": dict(contas[i % len(contas)])}
+
+
+# (nome, tabela, endpoint, gerador de item, campo simples, campo convertido)
+CENARIOS = [
+    ("pagamentos", MODELOS_EMPRESA, "/payments", _pagamento, "value", "date"),
+    ("contas", MODELOS_EMPRESA, "/accounts", _conta, "name", "id"),
+    ("transferências", MODELOS_EMPRESA, "/transfers", _transferencia, "value", "date"),
+    ("tarefas", MODELOS_OBRIGACOES, "/accountingfirms/x/tasks", _tarefa, "name", "dead_line"),
+    ("relatório obrigações", MODELOS_OBRIGACOES,
+     "/accountingfirms/x/reports/obligations/complete", _obrigacao, "value", "due_date"),
+]
+
+# Nome do campo no JSON para os atributos lidos
+CHAVES_JSON = {"dead_line": "deadLine", "due_date": "dueDate"}
+
+
+def _medir_memoria(construir, texto) -> int:
+    gc.collect()
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    objetos = construir(texto)
+    gc.collect()
+    retido = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+    del objetos
+    return retido
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--linhas", type=int, default=50000, help="Itens por recurso")
+    args = parser.parse_args()
+
+    pessoas = _pessoas(300)
+    contas = _pessoas(10)
+    print(f"{args.linhas} itens por recurso")
+    print("-" * 86)
+    print(f"{'recurso':<22} {'modo':<12} {'construção':>12} {'leitura':>12} {'memória retida':>16}")
+    for nome, tabela, endpoint, gerar, simples, convertido in CENARIOS:
+        texto = json.dumps({
+            "items": [gerar(i, pessoas, contas) for i in range(args.linhas)], "count": args.linhas
+        })
+        modelo = tabela.modelo_para(endpoint)
+        chave_simples = CHAVES_JSON.get(simples, simples)
+        chave_convertida = CHAVES_JSON.get(convertido, convertido)
+
+        def dicionarios(texto):
+            return json.loads(texto)["items"]
+
+        def tipados(texto):
+            return tipar_resposta(modelo, json.loads(texto))["items"]
+
+        def ler_dicionarios(items):
+            return [(item.get(chave_simples), item.get(chave_convertida)) for item in items]
+
+        def ler_tipados(items):
+            return [(getattr(item, simples), getattr(item, convertido)) for item in items]
+
+        for modo, construir, ler in (("dicionários", dicionarios, ler_dicionarios),
+                                     ("typed=True", tipados, ler_tipados)):
+            gc.collect()
+            inicio = time.perf_counter()
+            objetos = construir(texto)
+            construcao = time.perf_counter() - inicio
+            inicio = time.perf_counter()
+            ler(objetos)
+            leitura = time.perf_counter() - inicio
+            del objetos
+            memoria = _medir_memoria(construir, texto)
+            print(f"{nome:<22} {modo:<12} {construcao:10.3f} s {leitura:10.3f} s {memoria / 1e6:13.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
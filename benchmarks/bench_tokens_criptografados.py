@@ -0,0 +1,83 @@
+"""
+Benchmark: construção de clientes com tokens em texto plano x criptografados
+
+Mede o tempo para criar um NiboEmpresaClient para cada organização de um
+arquivo de tokens temporário, em três cenários:
+
+- texto plano: tokens sem criptografia
+- criptografado (sem cache): cache limpo antes de cada cliente, equivalente
+  a derivar a chave PBKDF2 a cada token (comportamento anterior)
+- criptografado (com cache): chave derivada uma vez por processo
+
+Nenhuma requisição é feita à API.
+
+Uso:
+    python benchmarks/bench_tokens_criptografados.py [--organizacoes 150]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from nibo_api.settings import NiboSettings, criptografar_token, limpar_cache_criptografia
+from nibo_api.common.transporte import Transporte
+from nibo_api.empresa.client import NiboEmpresaClient
+
+
+def _arquivo_tokens(diretorio: str, nome: str, tokens: dict) -> str:
+    caminho = os.path.join(diretorio, nome)
+    with open(caminho, "w", encoding="utf-8") as f:
+        json.dump({"api_tokens": tokens}, f)
+    os.chmod(caminho, 0o600)
+    return caminho
+
+
+def _construir_clientes(tokens_path: str, organizacoes, limpar_cache: bool) -> float:
+    config = NiboSettings(tokens_path=tokens_path)
+    transporte = Transporte(config)
+    inicio = time.perf_counter()
+    for org in organizacoes:
+        if limpar_cache:
+            limpar_cache_criptografia()
+        NiboEmpresaClient(config, organizacao_id=org, transporte=transporte)
+    return time.perf_counter() - inicio
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--organizacoes", type=int, default=150, help="Quantidade de organizações")
+    args = parser.parse_args()
+
+    os.environ.setdefault("NIBO_ENCRYPTION_KEY", "chave-de-benchmark")
+    os.environ["NIBO_SUPPRESS_SECURITY_WARNINGS"] = "true"
+
+    organizacoes = [f"org_{i:04d}" for i in range(args.organizacoes)]
+    planos = {org: f"TOKEN{i:028d}" for i, org in enumerate(organizacoes)}
+    cifrados = {org: criptografar_token(token) for org, token in planos.items()}
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        arquivo_plano = _arquivo_tokens(diretorio, "plano.json", planos)
+        arquivo_cifrado = _arquivo_tokens(diretorio, "cifrado.json", cifrados)
+
+        resultados = [
+            ("texto plano", _construir_clientes(arquivo_plano, organizacoes, False)),
+            ("criptografado (sem cache)", _construir_clientes(arquivo_cifrado, organizacoes, True)),
+        ]
+        limpar_cache_criptografia()
+        resultados.append(
+            ("criptografado (com cache)", _construir_clientes(arquivo_cifrado, organizacoes, False))
+        )
+
+    print(f"Construção de {len(organizacoes)} clientes NiboEmpresaClient")
+    print("-" * 60)
+    for nome, segundos in resultados:
+        print(f"{nome:<28} {segundos:8.3f} s  ({segundos / len(organizacoes) * 1000:7.2f} ms/cliente)")
+
+
+if __name__ == "__main__":
+    main()
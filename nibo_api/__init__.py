@@ -3,15 +3,23 @@ Nibo API - Cliente Python para integração com a API do Nibo
 """
 
 from nibo_api.settings import NiboSettings
-from nibo_api.empresa.client import NiboEmpresaClient
-from nibo_api.obrigacoes.client import NiboObrigacoesClient
+from nibo_api.empresa.client import NiboEmpresaClient, AsyncNiboEmpresaClient
+from nibo_api.obrigacoes.client import NiboObrigacoesClient, AsyncNiboObrigacoesClient
+from nibo_api.common.retry import RetryPolicy
+from nibo_api.common.rate_limit import RateLimiter
+from nibo_api.common.transporte import Transporte
+from nibo_api.common.cache import ResponseCache
+from nibo_api.common.coalescencia import Coalescedor
+from nibo_api.common.diario import DiarioEscritas, Reconciliador
+from nibo_api.pool import NiboClientPool
 from nibo_api.common.exceptions import (
     NiboAPIError,
     NiboAuthenticationError,
     NiboNotFoundError,
     NiboValidationError,
     NiboServerError,
-    NiboRateLimitError
+    NiboRateLimitError,
+    NiboEscritaIncertaError
 )
 
 __version__ = "0.1.1"
@@ -20,11 +28,22 @@ __all__ = [
     'NiboSettings',
     'NiboEmpresaClient',
     'NiboObrigacoesClient',
+    'AsyncNiboEmpresaClient',
+    'AsyncNiboObrigacoesClient',
+    'RetryPolicy',
+    'RateLimiter',
+    'Transporte',
+    'ResponseCache',
+    'Coalescedor',
+    'DiarioEscritas',
+    'Reconciliador',
+    'NiboClientPool',
     'NiboAPIError',
     'NiboAuthenticationError',
     'NiboNotFoundError',
     'NiboValidationError',
     'NiboServerError',
     'NiboRateLimitError',
+    'NiboEscritaIncertaError',
 ]
 
@@ -0,0 +1,454 @@
+"""
+Suporte a asyncio para os clientes da API Nibo
+
+O AsyncClientMixin substitui apenas a camada de transporte do BaseClient
+(envio da requisição e paginação). Construtores, headers, montagem de URLs,
+tratamento de erros e todas as interfaces são os mesmos dos clientes
+síncronos: os métodos das interfaces passam a retornar corrotinas (use
+`await`) e os iteradores iter_* passam a ser assíncronos (use `async for`).
+"""
+import asyncio
+import json
+import ssl
+import time
+from collections import deque
+from itertools import islice
+from typing import Optional, Dict, Any, List, AsyncIterator, Mapping, Tuple
+
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+from nibo_api.common.client import BaseClient
+from nibo_api.common.retry import IDEMPOTENCY_HEADER
+from nibo_api.common.paginacao import extrair_items, extrair_total
+from nibo_api.common.coalescencia import CoalescedorAsync, chave_requisicao
+from nibo_api.common.streaming import RespostaStreamAsync
+from nibo_api.common.tipagem import tipar_resposta
+
+
+# Requisições simultâneas permitidas por cliente
+MAX_CONCORRENCIA_PADRAO = 100
+
+
+class AsyncClientMixin:
+    """
+    Transporte assíncrono (aiohttp) para clientes derivados de BaseClient
+
+    Deve vir antes do cliente síncrono na lista de bases, por exemplo
+    `class AsyncNiboEmpresaClient(AsyncClientMixin, NiboEmpresaClient)`.
+    Os headers são lidos de `self.headers` e a configuração SSL de
+    `self.session`, que não é usada para I/O.
+    """
+
+    def __init__(
+        self,
+        *args,
+        max_concorrencia: int = MAX_CONCORRENCIA_PADRAO,
+        limite_conexoes: Optional[int] = None,
+        **kwargs
+    ):
+        """
+        Inicializa o cliente assíncrono
+
+        Args:
+            *args: Argumentos do cliente síncrono
+            max_concorrencia: Máximo de requisições em andamento ao mesmo tempo
+            limite_conexoes: Tamanho do pool de conexões (padrão: max_concorrencia)
+            **kwargs: Argumentos nomeados do cliente síncrono
+
+        Raises:
+            ImportError: Se aiohttp não estiver instalado
+            ValueError: Se max_concorrencia não for positivo
+        """
+        if not AIOHTTP_AVAILABLE:
+            raise ImportError(
+                "Biblioteca aiohttp não está instalada. "
+                "Instale com: pip install nibo-api[async]"
+            )
+        if max_concorrencia <= 0:
+            raise ValueError("max_concorrencia deve ser maior que zero")
+        super().__init__(*args, **kwargs)
+        self.max_concorrencia = max_concorrencia
+        self.limite_conexoes = limite_conexoes or max_concorrencia
+        self._sessao_async = None
+        self._semaforo = None
+        self._coalescedor_async = CoalescedorAsync() if self.coalescedor is not None else None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def close(self):
+        """Fecha a sessão aiohttp e libera as conexões do pool"""
+        if self._sessao_async is not None:
+            await self._sessao_async.close()
+            self._sessao_async = None
+            self._semaforo = None
+
+    def _contexto_ssl(self):
+        """Converte session.verify (bool ou caminho de CA bundle) para o formato do aiohttp"""
+        verify = self.session.verify
+        if verify is False:
+            return False
+        if isinstance(verify, str):
+            return ssl.create_default_context(cafile=verify)
+        return None
+
+    def _obter_sessao(self) -> "aiohttp.ClientSession":
+        """Cria sob demanda a sessão aiohttp (precisa de um loop em execução)"""
+        if self._sessao_async is None or self._sessao_async.closed:
+            conector = aiohttp.TCPConnector(
+                limit=self.limite_conexoes,
+                ssl=self._contexto_ssl()
+            )
+            connect_timeout, read_timeout = self.timeout
+            self._sessao_async = aiohttp.ClientSession(
+                connector=conector,
+                headers=dict(self.headers),
+                timeout=aiohttp.ClientTimeout(
+                    total=None,
+                    sock_connect=connect_timeout,
+                    sock_read=read_timeout
+                )
+            )
+            self._semaforo = asyncio.Semaphore(self.max_concorrencia)
+        return self._sessao_async
+
+    async def _request(
+        self,
+        metodo: str,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        **kwargs
+    ) -> Any:
+        """
+        Envia a requisição HTTP de forma assíncrona (ver BaseClient._request)
+
+        Args:
+            metodo: Método HTTP (GET, POST, PUT, DELETE)
+            url: URL completa
+            headers: Headers adicionais da requisição
+            **kwargs: Argumentos repassados a aiohttp.ClientSession.request
+
+        Returns:
+            Dados JSON da resposta
+        """
+        status, _, texto = await self._enviar_async(metodo, url, headers, **kwargs)
+        return self._tratar_resposta_async(status, texto)
+
+    async def post(
+        self,
+        endpoint: str,
+        data: Optional[Dict[str, Any]] = None,
+        json_data: Optional[Dict[str, Any]] = None,
+        idempotency_key: Optional[str] = None
+    ) -> Any:
+        """
+        Realiza requisição POST de forma assíncrona (ver BaseClient.post)
+
+        Com diário de escritas, a diferença para o cliente síncrono é que uma
+        escrita pendente (envio anterior sem desfecho conhecido) não é
+        conferida no servidor: os verificadores do Reconciliador fazem
+        consultas síncronas. Reconcilie o diário com um cliente síncrono
+        (`Reconciliador(client_sincrono, diario).reconciliar()`) antes de
+        reenviá-la.
+
+        Args:
+            endpoint: Endpoint da API
+            data: Dados a enviar (form-data)
+            json_data: Dados JSON a enviar
+            idempotency_key: Chave de idempotência (header Idempotency-Key)
+
+        Returns:
+            Resposta JSON da API (com diário, a resposta gravada se a mesma
+            escrita já foi confirmada)
+
+        Raises:
+            NiboEscritaIncertaError: Com diário, se uma escrita anterior com a
+                mesma chave está pendente
+        """
+        chave = self._chave_diario(endpoint, json_data, idempotency_key)
+        if chave is None:
+            return await super().post(endpoint, data, json_data, idempotency_key)
+        existe, resposta = self._consultar_diario(chave, reconciliar=False)
+        if existe:
+            return resposta
+        self.diario.registrar_intencao(chave, endpoint, json_data)
+        try:
+            resposta = await self._request(
+                "POST", self._build_url(endpoint), headers={IDEMPOTENCY_HEADER: chave},
+                data=data, json=json_data
+            )
+        except BaseException as erro:
+            self._registrar_erro_diario(chave, erro)
+            raise
+        self.diario.confirmar(chave, resposta)
+        return resposta
+
+    async def _tipar(self, modelo: type, resultado) -> Any:
+        """Versão assíncrona de BaseClient._tipar (resultado é uma corrotina)"""
+        return tipar_resposta(modelo, await resultado)
+
+    async def _get_com_cache(self, url: str, consulta) -> Any:
+        """Versão assíncrona de BaseClient._get_com_cache"""
+        if consulta.fresca:
+            return consulta.dados()
+        status, headers, texto = await self._enviar_async(
+            "GET", url, headers=consulta.headers_condicionais()
+        )
+        if status == 304 and consulta.entrada is not None:
+            return consulta.revalidada(headers)
+        dados = self._tratar_resposta_async(status, texto)
+        consulta.armazenar(status, headers, texto)
+        return dados
+
+    async def _get_stream(self, url: str) -> RespostaStreamAsync:
+        """
+        Versão assíncrona de BaseClient._get_stream
+
+        O semáforo de concorrência vale só para a abertura da resposta; as
+        novas tentativas cobrem falhas antes de o corpo começar a ser lido.
+        """
+        headers = self._montar_headers()
+        sessao = self._obter_sessao()
+        politica = self.retry_policy
+        limitador = self.rate_limiter
+        balde = limitador.balde(self._token_autenticacao()) if limitador is not None else None
+        inicio = time.monotonic()
+        tentativa = 0
+
+        while True:
+            tentativa += 1
+            if balde is not None:
+                espera = balde.reservar()
+                if espera > 0:
+                    await asyncio.sleep(espera)
+            try:
+                async with self._semaforo:
+                    response = await sessao.request("GET", url, headers=headers)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as erro:
+                if politica is None:
+                    raise
+                espera = politica.proxima_espera(
+                    "GET", headers, tentativa, time.monotonic() - inicio,
+                    erro=erro, url=url
+                )
+                if espera is None:
+                    raise
+            else:
+                retry_after = response.headers.get("Retry-After")
+                if balde is not None:
+                    balde.registrar_resposta(response.status, retry_after)
+                espera = None
+                if politica is not None:
+                    espera = politica.proxima_espera(
+                        "GET", headers, tentativa, time.monotonic() - inicio,
+                        status=response.status, retry_after=retry_after, url=url
+                    )
+                if espera is None:
+                    if response.status in (200, 201, 202):
+                        return RespostaStreamAsync(response)
+                    try:
+                        self._lancar_erro(response.status, await response.text())
+                    finally:
+                        response.release()
+                response.release()
+
+            await asyncio.sleep(espera)
+
+    async def _enviar_async(
+        self,
+        metodo: str,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        **kwargs
+    ) -> Tuple[int, Mapping[str, str], str]:
+        """
+        Envia a requisição aplicando limitador de taxa, semáforo e novas tentativas
+
+        Returns:
+            Tupla (status, headers da resposta, corpo) da resposta final
+        """
+        if metodo == "GET" and self._coalescedor_async is not None and not kwargs:
+            chave = chave_requisicao(url, self._token_autenticacao(), headers)
+            return await self._coalescedor_async.executar(
+                chave, lambda: self._enviar_com_retry_async(metodo, url, headers)
+            )
+        return await self._enviar_com_retry_async(metodo, url, headers, **kwargs)
+
+    async def _enviar_com_retry_async(
+        self,
+        metodo: str,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        **kwargs
+    ) -> Tuple[int, Mapping[str, str], str]:
+        """Laço de envio assíncrono (ver _enviar_async)"""
+        headers = self._montar_headers(headers)
+        sessao = self._obter_sessao()
+        politica = self.retry_policy
+        limitador = self.rate_limiter
+        balde = limitador.balde(self._token_autenticacao()) if limitador is not None else None
+        inicio = time.monotonic()
+        tentativa = 0
+
+        while True:
+            tentativa += 1
+            if balde is not None:
+                espera = balde.reservar()
+                if espera > 0:
+                    await asyncio.sleep(espera)
+            try:
+                async with self._semaforo:
+                    async with sessao.request(metodo, url, headers=headers, **kwargs) as response:
+                        status = response.status
+                        headers_resposta = response.headers
+                        retry_after = headers_resposta.get("Retry-After")
+                        texto = await response.text()
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as erro:
+                if politica is None:
+                    raise
+                espera = politica.proxima_espera(
+                    metodo, headers, tentativa, time.monotonic() - inicio,
+                    erro=erro, url=url
+                )
+                if espera is None:
+                    raise
+            else:
+                if balde is not None:
+                    balde.registrar_resposta(status, retry_after)
+                espera = None
+                if politica is not None:
+                    espera = politica.proxima_espera(
+                        metodo, headers, tentativa, time.monotonic() - inicio,
+                        status=status, retry_after=retry_after, url=url
+                    )
+                if espera is None:
+                    return status, headers_resposta, texto
+
+            await asyncio.sleep(espera)
+
+    def _tratar_resposta_async(self, status: int, texto: str) -> Any:
+        """Equivalente a BaseClient._handle_response para respostas já lidas"""
+        if status in (200, 201, 202):
+            try:
+                return json.loads(texto)
+            except ValueError:
+                return texto
+        self._lancar_erro(status, texto)
+
+    async def _paginar_sequencial(
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]],
+        odata_filter: Optional[str],
+        odata_orderby: Optional[str],
+        page_size: int,
+        skip: int,
+        limite: Optional[int],
+        stream: bool = False
+    ) -> AsyncIterator[Any]:
+        """Versão assíncrona de BaseClient._paginar_sequencial"""
+        entregues = 0
+
+        while limite is None or entregues < limite:
+            top = page_size if limite is None else min(page_size, limite - entregues)
+            resposta = await self._buscar_pagina(endpoint, params, odata_filter, odata_orderby, top, skip, stream)
+            if stream:
+                quantidade = 0
+                async with resposta:
+                    async for item in resposta:
+                        quantidade += 1
+                        yield item
+                total = extrair_total(resposta.metadados)
+            else:
+                items = extrair_items(resposta)
+                total = extrair_total(resposta)
+                quantidade = len(items)
+
+                for item in items:
+                    yield item
+
+            entregues += quantidade
+            skip += quantidade
+
+            if quantidade < top:
+                return
+            if total is not None and skip >= total:
+                return
+
+    async def _paginar_paralelo(
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]],
+        odata_filter: Optional[str],
+        odata_orderby: Optional[str],
+        page_size: int,
+        skip: int,
+        limite: Optional[int],
+        max_workers: int
+    ) -> AsyncIterator[Any]:
+        """Versão assíncrona de BaseClient._paginar_paralelo (páginas buscadas como tarefas)"""
+        top = page_size if limite is None else min(page_size, limite)
+        if top <= 0:
+            return
+
+        resposta = await self._buscar_pagina(endpoint, params, odata_filter, odata_orderby, top, skip)
+        items = extrair_items(resposta)
+        total = extrair_total(resposta)
+        del resposta
+
+        for item in items:
+            yield item
+
+        if len(items) < top:
+            return
+
+        proximo_skip = skip + len(items)
+        restante = None if limite is None else limite - len(items)
+
+        if total is None:
+            async for item in self._paginar_sequencial(
+                endpoint, params, odata_filter, odata_orderby,
+                page_size, proximo_skip, restante
+            ):
+                yield item
+            return
+
+        fim = total if restante is None else min(total, proximo_skip + restante)
+        offsets = (
+            (offset, min(page_size, fim - offset))
+            for offset in range(proximo_skip, fim, page_size)
+        )
+
+        async def buscar(offset: int, quantidade: int) -> List[Any]:
+            return extrair_items(
+                await self._buscar_pagina(endpoint, params, odata_filter, odata_orderby, quantidade, offset)
+            )
+
+        pendentes = deque()
+        try:
+            for offset, quantidade in islice(offsets, max_workers):
+                pendentes.append(asyncio.ensure_future(buscar(offset, quantidade)))
+
+            while pendentes:
+                pagina = await pendentes.popleft()
+
+                proximo = next(offsets, None)
+                if proximo is not None:
+                    pendentes.append(asyncio.ensure_future(buscar(*proximo)))
+
+                for item in pagina:
+                    yield item
+        finally:
+            for tarefa in pendentes:
+                tarefa.cancel()
+
+
+class AsyncBaseClient(AsyncClientMixin, BaseClient):
+    """Cliente HTTP base assíncrono com autenticação e suporte a OData"""
@@ -0,0 +1,486 @@
+"""
+Cache opcional de respostas GET (TTL por endpoint, revalidação condicional e LRU)
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from fnmatch import fnmatchcase
+from pathlib import Path
+from typing import Optional, Dict, Any, Mapping
+
+
+# TTLs sugeridos (segundos) para dados de referência que raramente mudam
+TTLS_REFERENCIA: Dict[str, float] = {
+    "/schedules/categories": 3600,
+    "/schedules/categories/*": 3600,
+    "/costcenters": 3600,
+    "/costcenters/*": 3600,
+    "/banks": 86400,
+    "/banks/*": 86400,
+    "/nfse/profiles": 3600,
+    "/charges/profiles": 3600,
+    "/accountingfirms/*/cnaes": 86400,
+    "/accountingfirms/*/departments": 3600,
+    "/accountingfirms/*/tags": 3600,
+}
+
+# TTLs usados pela CLI: referência + consultas que todo comando repete
+TTLS_CLI: Dict[str, float] = dict(
+    TTLS_REFERENCIA,
+    **{
+        "/organizations": 3600,
+        "/accountingfirms": 3600,
+    }
+)
+
+# Limite de memória padrão do BackendMemoria (bytes de JSON armazenados)
+MAX_BYTES_MEMORIA_PADRAO = 32 * 1024 * 1024
+
+
+class EntradaCache(dict):
+    """
+    Resposta armazenada no cache
+
+    Chaves: 'texto' (corpo JSON), 'etag', 'last_modified' e 'expira_em'
+    (timestamp epoch, comparável entre processos).
+    """
+
+    @property
+    def tamanho(self) -> int:
+        return len(self.get("texto") or "")
+
+    def expirada(self, agora: Optional[float] = None) -> bool:
+        return (agora if agora is not None else time.time()) >= self.get("expira_em", 0)
+
+
+class BackendMemoria:
+    """Armazenamento em memória com despejo LRU limitado por bytes (thread-safe)"""
+
+    def __init__(self, max_bytes: int = MAX_BYTES_MEMORIA_PADRAO):
+        """
+        Inicializa o backend
+
+        Args:
+            max_bytes: Tamanho máximo somado dos corpos armazenados
+        """
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entradas: "OrderedDict[str, EntradaCache]" = OrderedDict()
+        self._bytes = 0
+
+    def obter(self, chave: str) -> Optional[EntradaCache]:
+        with self._lock:
+            entrada = self._entradas.get(chave)
+            if entrada is not None:
+                self._entradas.move_to_end(chave)
+            return entrada
+
+    def gravar(self, chave: str, entrada: EntradaCache):
+        with self._lock:
+            anterior = self._entradas.pop(chave, None)
+            if anterior is not None:
+                self._bytes -= anterior.tamanho
+            if entrada.tamanho > self.max_bytes:
+                return
+            self._entradas[chave] = entrada
+            self._bytes += entrada.tamanho
+            while self._bytes > self.max_bytes:
+                _, removida = self._entradas.popitem(last=False)
+                self._bytes -= removida.tamanho
+
+    def remover(self, chave: str):
+        with self._lock:
+            anterior = self._entradas.pop(chave, None)
+            if anterior is not None:
+                self._bytes -= anterior.tamanho
+
+    def limpar(self):
+        with self._lock:
+            self._entradas.clear()
+            self._bytes = 0
+
+    def __len__(self):
+        return len(self._entradas)
+
+
+class BackendDisco:
+    """
+    Armazenamento em disco (um arquivo JSON por entrada)
+
+    Permite que processos curtos (ex: comandos da CLI) compartilhem o cache.
+    Gravações são atômicas (arquivo temporário + rename). Quando o diretório
+    passa de `max_bytes`, os arquivos acessados há mais tempo são removidos.
+    """
+
+    def __init__(self, diretorio: str, max_bytes: int = 256 * 1024 * 1024):
+        """
+        Inicializa o backend
+
+        Args:
+            diretorio: Diretório dos arquivos de cache (criado se necessário)
+            max_bytes: Tamanho máximo do diretório
+        """
+        self.diretorio = Path(diretorio)
+        self.diretorio.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+
+    def _caminho(self, chave: str) -> Path:
+        return self.diretorio / f"{chave}.json"
+
+    def obter(self, chave: str) -> Optional[EntradaCache]:
+        caminho = self._caminho(chave)
+        try:
+            with open(caminho, "r", encoding="utf-8") as f:
+                entrada = EntradaCache(json.load(f))
+            os.utime(caminho)  # marca o acesso para o despejo LRU
+            return entrada
+        except (OSError, ValueError):
+            return None
+
+    def gravar(self, chave: str, entrada: EntradaCache):
+        descritor, temporario = tempfile.mkstemp(dir=self.diretorio, suffix=".tmp")
+        try:
+            with os.fdopen(descritor, "w", encoding="utf-8") as f:
+                json.dump(entrada, f)
+            os.replace(temporario, self._caminho(chave))
+        except OSError:
+            try:
+                os.unlink(temporario)
+            except OSError:
+                pass
+            return
+        self._podar()
+
+    def remover(self, chave: str):
+        try:
+            self._caminho(chave).unlink()
+        except OSError:
+            pass
+
+    def limpar(self):
+        for caminho in self.diretorio.glob("*.json"):
+            try:
+                caminho.unlink()
+            except OSError:
+                pass
+
+    def _podar(self):
+        """Remove os arquivos menos usados até caber em max_bytes"""
+        arquivos = []
+        total = 0
+        for caminho in self.diretorio.glob("*.json"):
+            try:
+                info = caminho.stat()
+            except OSError:
+                continue
+            arquivos.append((info.st_mtime, info.st_size, caminho))
+            total += info.st_size
+        if total <= self.max_bytes:
+            return
+        for _, tamanho, caminho in sorted(arquivos, key=lambda a: a[0]):
+            try:
+                caminho.unlink()
+            except OSError:
+                continue
+            total -= tamanho
+            if total <= self.max_bytes:
+                return
+
+
+class BackendSQLite:
+    """
+    Armazenamento persistente em um arquivo SQLite
+
+    Pensado para processos curtos que rodam em sequência (ex: dezenas de
+    comandos da CLI num script): todos leem e gravam o mesmo arquivo. Usa
+    journal WAL para leitores e escritores concorrentes e despeja as
+    entradas acessadas há mais tempo quando o total passa de `max_bytes`.
+    Erros do SQLite (arquivo bloqueado, disco cheio) são tratados como
+    falta no cache e nunca interrompem a requisição.
+    """
+
+    def __init__(self, caminho: str, max_bytes: int = 256 * 1024 * 1024):
+        """
+        Inicializa o backend
+
+        Args:
+            caminho: Arquivo do banco (o diretório é criado se necessário)
+            max_bytes: Tamanho máximo somado dos corpos armazenados
+        """
+        self.caminho = Path(caminho).expanduser()
+        self.caminho.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conexao = sqlite3.connect(str(self.caminho), timeout=5, check_same_thread=False)
+        try:
+            os.chmod(self.caminho, 0o600)  # respostas podem conter dados dos clientes
+        except OSError:
+            pass
+        with self._lock, self._conexao:
+            self._conexao.execute("PRAGMA journal_mode=WAL")
+            self._conexao.execute(
+                "CREATE TABLE IF NOT EXISTS respostas ("
+                " chave TEXT PRIMARY KEY,"
+                " texto TEXT NOT NULL,"
+                " etag TEXT,"
+                " last_modified TEXT,"
+                " expira_em REAL NOT NULL,"
+                " acessado_em REAL NOT NULL,"
+                " tamanho INTEGER NOT NULL)"
+            )
+            self._conexao.execute(
+                "CREATE INDEX IF NOT EXISTS idx_respostas_acesso ON respostas (acessado_em)"
+            )
+
+    def obter(self, chave: str) -> Optional[EntradaCache]:
+        try:
+            with self._lock, self._conexao:
+                linha = self._conexao.execute(
+                    "SELECT texto, etag, last_modified, expira_em FROM respostas WHERE chave = ?",
+                    (chave,)
+                ).fetchone()
+                if linha is None:
+                    return None
+                self._conexao.execute(
+                    "UPDATE respostas SET acessado_em = ? WHERE chave = ?", (time.time(), chave)
+                )
+        except sqlite3.Error:
+            return None
+        return EntradaCache(texto=linha[0], etag=linha[1], last_modified=linha[2], expira_em=linha[3])
+
+    def gravar(self, chave: str, entrada: EntradaCache):
+        if entrada.tamanho > self.max_bytes:
+            return
+        try:
+            with self._lock, self._conexao:
+                self._conexao.execute(
+                    "INSERT OR REPLACE INTO respostas VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (chave, entrada["texto"], entrada.get("etag"), entrada.get("last_modified"),
+                     entrada.get("expira_em", 0), time.time(), entrada.tamanho)
+                )
+                self._podar()
+        except sqlite3.Error:
+            pass
+
+    def _podar(self):
+        """Remove as entradas menos usadas até caber em max_bytes (chamado com o lock)"""
+        total = self._conexao.execute("SELECT COALESCE(SUM(tamanho), 0) FROM respostas").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        linhas = self._conexao.execute(
+            "SELECT chave, tamanho FROM respostas ORDER BY acessado_em"
+        ).fetchall()
+        removidas = []
+        for chave, tamanho in linhas:
+            removidas.append((chave,))
+            total -= tamanho
+            if total <= self.max_bytes:
+                break
+        self._conexao.executemany("DELETE FROM respostas WHERE chave = ?", removidas)
+
+    def remover(self, chave: str):
+        try:
+            with self._lock, self._conexao:
+                self._conexao.execute("DELETE FROM respostas WHERE chave = ?", (chave,))
+        except sqlite3.Error:
+            pass
+
+    def limpar(self):
+        try:
+            with self._lock, self._conexao:
+                self._conexao.execute("DELETE FROM respostas")
+        except sqlite3.Error:
+            pass
+
+    def close(self):
+        """Fecha a conexão com o banco"""
+        with self._lock:
+            self._conexao.close()
+
+    def __len__(self):
+        with self._lock:
+            return self._conexao.execute("SELECT COUNT(*) FROM respostas").fetchone()[0]
+
+
+class ConsultaCache:
+    """Estado de uma consulta ao cache durante um GET (ver ResponseCache.consultar)"""
+
+    def __init__(self, cache: "ResponseCache", chave: str, ttl: float, entrada: Optional[EntradaCache]):
+        self.cache = cache
+        self.chave = chave
+        self.ttl = ttl
+        self.entrada = entrada
+
+    @property
+    def fresca(self) -> bool:
+        """True se há uma entrada válida que pode ser devolvida sem requisição"""
+        return self.entrada is not None and not self.entrada.expirada() and not self.cache.forcar_atualizacao
+
+    def dados(self) -> Any:
+        """Dados da entrada em cache (nova cópia a cada chamada)"""
+        self.cache._contar("acertos")
+        return _decodificar(self.entrada["texto"])
+
+    def headers_condicionais(self) -> Dict[str, str]:
+        """Headers If-None-Match / If-Modified-Since para revalidar a entrada"""
+        if self.entrada is None:
+            return {}
+        headers = {}
+        if self.entrada.get("etag"):
+            headers["If-None-Match"] = self.entrada["etag"]
+        if self.entrada.get("last_modified"):
+            headers["If-Modified-Since"] = self.entrada["last_modified"]
+        return headers
+
+    def revalidada(self, headers: Mapping[str, str]) -> Any:
+        """Trata um 304: renova o prazo da entrada e devolve seus dados"""
+        self.cache._contar("revalidacoes")
+        entrada = EntradaCache(self.entrada)
+        entrada["expira_em"] = time.time() + self.ttl
+        if headers.get("ETag"):
+            entrada["etag"] = headers["ETag"]
+        self.cache.backend.gravar(self.chave, entrada)
+        return _decodificar(entrada["texto"])
+
+    def armazenar(self, status: int, headers: Mapping[str, str], texto: str):
+        """Guarda uma resposta 200 bem-sucedida"""
+        self.cache._contar("faltas")
+        if status != 200:
+            return
+        self.cache.backend.gravar(self.chave, EntradaCache(
+            texto=texto,
+            etag=headers.get("ETag"),
+            last_modified=headers.get("Last-Modified"),
+            expira_em=time.time() + self.ttl
+        ))
+
+
+def _decodificar(texto: str) -> Any:
+    try:
+        return json.loads(texto)
+    except ValueError:
+        return texto
+
+
+class ResponseCache:
+    """
+    Cache de respostas GET com TTL por endpoint
+
+    Só endpoints com TTL (em `ttls`, por padrão glob, ou `ttl_padrao`) são
+    armazenados. Entradas expiradas com ETag/Last-Modified são revalidadas
+    com If-None-Match/If-Modified-Since; um 304 renova a entrada sem baixar
+    o corpo novamente. A chave inclui a URL completa e uma impressão digital
+    do token de autenticação, então organizações diferentes não compartilham
+    entradas.
+    """
+
+    def __init__(
+        self,
+        ttls: Optional[Mapping[str, float]] = None,
+        ttl_padrao: Optional[float] = None,
+        backend: Optional[Any] = None,
+        forcar_atualizacao: bool = False
+    ):
+        """
+        Inicializa o cache
+
+        Args:
+            ttls: TTL em segundos por padrão de endpoint (ex: {"/banks": 86400,
+                  "/costcenters/*": 3600}). Padrão: TTLS_REFERENCIA
+            ttl_padrao: TTL para endpoints sem padrão correspondente (None = não armazenar)
+            backend: BackendMemoria (padrão), BackendDisco ou compatível
+            forcar_atualizacao: Se True, sempre consulta a API e regrava o cache
+        """
+        self.ttls = dict(TTLS_REFERENCIA if ttls is None else ttls)
+        self.ttl_padrao = ttl_padrao
+        self.backend = backend if backend is not None else BackendMemoria()
+        self.forcar_atualizacao = forcar_atualizacao
+        self._lock = threading.Lock()
+        self._contadores = {"acertos": 0, "revalidacoes": 0, "faltas": 0}
+
+    def ttl_para(self, endpoint: str) -> Optional[float]:
+        """
+        Retorna o TTL aplicável a um endpoint
+
+        Args:
+            endpoint: Endpoint da API (sem query string)
+
+        Returns:
+            TTL em segundos, ou None se o endpoint não deve ser armazenado
+        """
+        ttl = self.ttls.get(endpoint)
+        if ttl is not None:
+            return ttl
+        for padrao, ttl in self.ttls.items():
+            if fnmatchcase(endpoint, padrao):
+                return ttl
+        return self.ttl_padrao
+
+    @staticmethod
+    def chave(url: str, token: Optional[str]) -> str:
+        """Chave da entrada: hash da impressão do token e da URL completa"""
+        impressao = hashlib.sha256((token or "").encode("utf-8")).hexdigest()[:16]
+        return hashlib.sha256(f"{impressao}|GET|{url}".encode("utf-8")).hexdigest()
+
+    def consultar(self, endpoint: str, url: str, token: Optional[str]) -> Optional[ConsultaCache]:
+        """
+        Consulta o cache para um GET
+
+        Args:
+            endpoint: Endpoint da API (usado para o TTL)
+            url: URL completa, com query string
+            token: Token de autenticação do cliente
+
+        Returns:
+            ConsultaCache, ou None se o endpoint não é armazenado
+        """
+        ttl = self.ttl_para(endpoint)
+        if not ttl or ttl <= 0:
+            return None
+        chave = self.chave(url, token)
+        return ConsultaCache(self, chave, ttl, self.backend.obter(chave))
+
+    def limpar(self):
+        """Remove todas as entradas"""
+        self.backend.limpar()
+
+    def metricas(self) -> Dict[str, int]:
+        """Contadores de acertos, revalidações (304) e faltas"""
+        with self._lock:
+            return dict(self._contadores)
+
+    def _contar(self, contador: str):
+        with self._lock:
+            self._contadores[contador] += 1
+
+
+def cache_persistente(
+    config: Optional[Any] = None,
+    ttls: Optional[Mapping[str, float]] = None,
+    forcar_atualizacao: bool = False
+) -> ResponseCache:
+    """
+    Cria um ResponseCache gravado em SQLite no diretório de cache configurado
+
+    Args:
+        config: NiboSettings de onde vem cache_dir (padrão: NiboSettings.compartilhado())
+        ttls: TTL por padrão de endpoint (padrão: TTLS_CLI)
+        forcar_atualizacao: Se True, ignora entradas válidas e regrava o cache
+
+    Returns:
+        ResponseCache com BackendSQLite em <cache_dir>/respostas.sqlite3
+    """
+    if config is None:
+        from nibo_api.settings import NiboSettings
+        config = NiboSettings.compartilhado()
+    backend = BackendSQLite(os.path.join(config.cache_dir, "respostas.sqlite3"))
+    return ResponseCache(
+        ttls=TTLS_CLI if ttls is None else ttls,
+        backend=backend,
+        forcar_atualizacao=forcar_atualizacao
+    )
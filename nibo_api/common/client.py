@@ -10,59 +10,140 @@ except Exception:
     # Fallback silencioso para comportamento padrão do requests/certifi.
     pass
 
+import time
 import requests
-from typing import Optional, Dict, Any, List
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Optional, Dict, Any, List, Iterator, Union
 from urllib.parse import urlencode
 
 from nibo_api.settings import NiboSettings
+from nibo_api.common.paginacao import (
+    TAMANHO_PAGINA_PADRAO,
+    extrair_items,
+    extrair_total
+)
+from nibo_api.common.retry import RetryPolicy, IDEMPOTENCY_HEADER
+from nibo_api.common.rate_limit import RateLimiter
+from nibo_api.common.transporte import Transporte
+from nibo_api.common.cache import ResponseCache, ConsultaCache
+from nibo_api.common.coalescencia import Coalescedor, chave_requisicao
+from nibo_api.common.diario import (
+    CONFIRMADO,
+    EXISTENTE,
+    AUSENTE,
+    PENDENTE,
+    DiarioEscritas,
+    Reconciliador,
+    chave_idempotencia,
+    escrita_ambigua,
+)
+from nibo_api.common.streaming import RespostaStream
+from nibo_api.common.tipagem import TabelaModelos, tipar_resposta
 from nibo_api.common.exceptions import (
     NiboAPIError,
     NiboAuthenticationError,
     NiboNotFoundError,
     NiboValidationError,
     NiboServerError,
-    NiboRateLimitError
+    NiboRateLimitError,
+    NiboEscritaIncertaError
 )
 
 
 class BaseClient:
     """Cliente HTTP base com autenticação e suporte a OData"""
     
+    # Modelos do modo tipado por endpoint (definidos pelos clientes de cada API)
+    modelos: Optional[TabelaModelos] = None
+    
     def __init__(
         self, 
         config: Optional[NiboSettings] = None, 
         base_url: str = "",
         organizacao_id: Optional[str] = None,
-        organizacao_codigo: Optional[str] = None
+        organizacao_codigo: Optional[str] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        transporte: Optional[Transporte] = None,
+        response_cache: Optional[ResponseCache] = None,
+        coalescedor: Union[Coalescedor, bool, None] = None,
+        typed: bool = False,
+        diario: Optional[DiarioEscritas] = None
     ):
         """
         Inicializa o cliente base
         
         Args:
-            config: Instância de NiboSettings. Se None, cria uma nova.
+            config: Instância de NiboSettings. Se None, usa NiboSettings.compartilhado().
             base_url: URL base da API
             organizacao_id: ID da organização (ex: "org_123")
             organizacao_codigo: Código simplificado da organização (ex: "empresa_principal")
+            retry_policy: Política de novas tentativas para erros transitórios
+                          (opcional; sem política, erros são lançados na hora)
+            rate_limiter: Limitador de taxa consultado antes de cada envio.
+                          Compartilhe a mesma instância entre clientes para
+                          que usem o mesmo balde por token (opcional)
+            transporte: Transporte (sessão e pool de conexões) compartilhado
+                        com outros clientes. Se None, cria um exclusivo.
+            response_cache: Cache de respostas GET para dados de referência
+                            (opcional; sem cache, todo GET vai à API)
+            coalescedor: Coalescedor de GETs idênticos em andamento. Se None,
+                         cria um exclusivo do cliente; compartilhe a mesma
+                         instância entre clientes ou use False para desativar.
+            typed: Se True, GETs de endpoints com modelo associado (ver
+                   `modelos`) devolvem modelos compactos em vez de dicionários
+            diario: Diário de escritas para POSTs (opcional). Cada POST com
+                    corpo JSON recebe uma chave de idempotência determinística
+                    e só é reenviado depois de confirmado que não foi aplicado
+                    (ver nibo_api.common.diario)
         """
-        self.config = config or NiboSettings()
+        self.config = config or NiboSettings.compartilhado()
         self.base_url = base_url
         self.organizacao_id = organizacao_id
         self.organizacao_codigo = organizacao_codigo
+        self.retry_policy = retry_policy
+        self.rate_limiter = rate_limiter
+        self.response_cache = response_cache
+        self.coalescedor = self._criar_coalescedor(coalescedor)
+        self.typed = typed
+        self.diario = diario
         
-        self.session = requests.Session()
-        self.session.headers.update({
+        # Pool de conexões, keep-alive e SSL vêm de settings.json/variáveis de ambiente.
+        # A sessão pode ser compartilhada: headers do cliente vão em self.headers.
+        self.transporte = transporte or Transporte(self.config)
+        self.session = self.transporte.session
+        self.timeout = self.transporte.timeout
+        self.headers = {
             "accept": "application/json"
-        })
-        self.session.verify = self.config.ssl_verify
+        }
+        
+        self._versao_config = self.config.versao
+        self._atualizar_autenticacao()
+    
+    @staticmethod
+    def _criar_coalescedor(coalescedor):
+        """Resolve o parâmetro coalescedor (None = exclusivo, False = desativado)"""
+        if coalescedor is None or coalescedor is True:
+            return Coalescedor()
+        return coalescedor or None
+    
+    def _atualizar_autenticacao(self):
+        """
+        Aplica em self.headers o token de autenticação da configuração atual
         
+        Chamado na construção e sempre que a configuração é recarregada
+        (ex: token rotacionado no arquivo de tokens). Subclasses como
+        NiboObrigacoesClient sobrescrevem para usar seus próprios headers.
+        """
         # Obtém token baseado na organização apenas se fornecido
-        # (subclasses como NiboObrigacoesClient configuram seus próprios headers)
-        if organizacao_id or organizacao_codigo:
+        if self.organizacao_id or self.organizacao_codigo:
             api_token = self.config.get_api_token(
-                organizacao_id=organizacao_id,
-                organizacao_codigo=organizacao_codigo
+                organizacao_id=self.organizacao_id,
+                organizacao_codigo=self.organizacao_codigo
             )
-            self.session.headers.update({
+            self.headers.update({
                 "ApiToken": api_token
             })
     
@@ -90,31 +171,163 @@ class BaseClient:
             except ValueError:
                 return response.text
         
-        elif response.status_code == 401:
+        self._lancar_erro(response.status_code, response.text)
+    
+    def _lancar_erro(self, status_code: int, texto: str):
+        """
+        Lança a exceção correspondente a um status HTTP de erro
+        
+        Args:
+            status_code: Código HTTP recebido
+            texto: Corpo da resposta
+            
+        Raises:
+            Ver _handle_response
+        """
+        if status_code == 401:
             raise NiboAuthenticationError(
-                f"Erro de autenticação: {response.text}"
+                f"Erro de autenticação: {texto}"
             )
-        elif response.status_code == 404:
+        elif status_code == 404:
             raise NiboNotFoundError(
-                f"Recurso não encontrado: {response.text}"
+                f"Recurso não encontrado: {texto}"
             )
-        elif response.status_code == 400:
+        elif status_code == 400:
             raise NiboValidationError(
-                f"Erro de validação: {response.text}"
+                f"Erro de validação: {texto}"
             )
-        elif response.status_code == 429:
+        elif status_code == 429:
             raise NiboRateLimitError(
-                f"Limite de requisições excedido: {response.text}"
+                f"Limite de requisições excedido: {texto}"
             )
-        elif 500 <= response.status_code < 600:
+        elif 500 <= status_code < 600:
             raise NiboServerError(
-                f"Erro do servidor ({response.status_code}): {response.text}"
+                f"Erro do servidor ({status_code}): {texto}"
             )
         else:
             raise NiboAPIError(
-                f"Erro na requisição ({response.status_code}): {response.text}"
+                f"Erro na requisição ({status_code}): {texto}"
             )
     
+    def _montar_headers(self, headers: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+        """Combina os headers do cliente (autenticação) com os da requisição"""
+        # Reaplica a autenticação se settings/tokens mudaram em disco
+        versao = self.config.verificar_alteracoes()
+        if versao != self._versao_config:
+            self._versao_config = versao
+            self._atualizar_autenticacao()
+        
+        combinados = dict(self.headers)
+        if headers:
+            combinados.update(headers)
+        return combinados
+    
+    def _token_autenticacao(self) -> Optional[str]:
+        """Retorna o token de autenticação usado pelo cliente (ApiToken ou X-API-Key)"""
+        return self.headers.get("ApiToken") or self.headers.get("X-API-Key")
+    
+    def _request(
+        self,
+        metodo: str,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        **kwargs
+    ) -> Any:
+        """
+        Envia a requisição HTTP e trata a resposta (ver _enviar e _handle_response)
+        
+        Args:
+            metodo: Método HTTP (GET, POST, PUT, DELETE)
+            url: URL completa
+            headers: Headers adicionais da requisição
+            **kwargs: Argumentos repassados a requests.Session.request
+            
+        Returns:
+            Dados JSON da resposta (ver _handle_response)
+        """
+        return self._handle_response(self._enviar(metodo, url, headers, **kwargs))
+    
+    def _enviar(
+        self,
+        metodo: str,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        **kwargs
+    ) -> requests.Response:
+        """
+        Envia a requisição HTTP aplicando o limitador de taxa e a política
+        de novas tentativas
+        
+        Args:
+            metodo: Método HTTP (GET, POST, PUT, DELETE)
+            url: URL completa
+            headers: Headers adicionais da requisição
+            **kwargs: Argumentos repassados a requests.Session.request
+            
+        Returns:
+            Resposta HTTP final (após eventuais novas tentativas)
+        """
+        if metodo == "GET" and self.coalescedor is not None and not kwargs:
+            # GETs idênticos em andamento (mesma URL e token) compartilham o envio;
+            # cada chamador decodifica a resposta e recebe seus próprios objetos
+            chave = chave_requisicao(url, self._token_autenticacao(), headers)
+            return self.coalescedor.executar(
+                chave, lambda: self._enviar_com_retry(metodo, url, headers)
+            )
+        return self._enviar_com_retry(metodo, url, headers, **kwargs)
+    
+    def _enviar_com_retry(
+        self,
+        metodo: str,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        **kwargs
+    ) -> requests.Response:
+        """Laço de envio com limitador de taxa e novas tentativas (ver _enviar)"""
+        headers = self._montar_headers(headers)
+        politica = self.retry_policy
+        limitador = self.rate_limiter
+        token = self._token_autenticacao() if limitador is not None else None
+        inicio = time.monotonic()
+        tentativa = 0
+        
+        while True:
+            tentativa += 1
+            if limitador is not None:
+                limitador.adquirir(token)
+            try:
+                response = self.session.request(
+                    metodo, url, headers=headers, timeout=self.timeout, **kwargs
+                )
+            except (requests.ConnectionError, requests.Timeout) as erro:
+                if politica is None:
+                    raise
+                espera = politica.proxima_espera(
+                    metodo, headers, tentativa, time.monotonic() - inicio,
+                    erro=erro, url=url
+                )
+                if espera is None:
+                    raise
+            else:
+                if limitador is not None:
+                    limitador.registrar_resposta(
+                        token, response.status_code, response.headers.get("Retry-After")
+                    )
+                if politica is None:
+                    return response
+                espera = politica.proxima_espera(
+                    metodo, headers, tentativa, time.monotonic() - inicio,
+                    status=response.status_code,
+                    retry_after=response.headers.get("Retry-After"),
+                    url=url
+                )
+                if espera is None:
+                    return response
+                # Com stream=True a conexão só volta ao pool quando a resposta é fechada
+                response.close()
+            
+            time.sleep(espera)
+    
     def _build_url(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> str:
         """
         Constrói URL completa com parâmetros
@@ -141,7 +354,8 @@ class BaseClient:
         odata_filter: Optional[str] = None,
         odata_orderby: Optional[str] = None,
         odata_top: Optional[int] = None,
-        odata_skip: Optional[int] = None
+        odata_skip: Optional[int] = None,
+        stream: bool = False
     ) -> Any:
         """
         Realiza requisição GET
@@ -153,9 +367,13 @@ class BaseClient:
             odata_orderby: Ordenação OData ($orderby)
             odata_top: Limite de registros ($top)
             odata_skip: Registros a pular ($skip)
+            stream: Se True, decodifica o corpo à medida que chega e retorna
+                uma RespostaStream com os itens de 'items' (sem cache nem
+                coalescência)
             
         Returns:
-            Resposta JSON da API
+            Resposta JSON da API (ou RespostaStream, se stream=True). No modo
+            tipado, itens e recursos viram modelos compactos (ver tipagem)
         """
         query_params = params or {}
         
@@ -170,10 +388,281 @@ class BaseClient:
             query_params["$skip"] = odata_skip
         
         url = self._build_url(endpoint, query_params)
-        response = self.session.get(url)
-        return self._handle_response(response)
+        consulta = None
+        if not stream and self.response_cache is not None:
+            consulta = self.response_cache.consultar(endpoint, url, self._token_autenticacao())
+        
+        if stream:
+            resultado = self._get_stream(url)
+        elif consulta is not None:
+            resultado = self._get_com_cache(url, consulta)
+        else:
+            resultado = self._request("GET", url)
+        
+        modelo = self.modelos.modelo_para(endpoint) if self.typed and self.modelos else None
+        if modelo is None:
+            return resultado
+        return self._tipar(modelo, resultado)
+    
+    def _tipar(self, modelo: type, resultado: Any) -> Any:
+        """Converte a resposta de um GET para modelos compactos (modo tipado)"""
+        return tipar_resposta(modelo, resultado)
+    
+    def _get_com_cache(self, url: str, consulta: ConsultaCache) -> Any:
+        """
+        Realiza um GET usando o cache de respostas
+        
+        Devolve a entrada em cache se ainda válida; se expirada, revalida com
+        If-None-Match/If-Modified-Since (304 reaproveita o corpo armazenado).
+        
+        Args:
+            url: URL completa
+            consulta: Resultado de ResponseCache.consultar
+            
+        Returns:
+            Resposta JSON da API ou do cache
+        """
+        if consulta.fresca:
+            return consulta.dados()
+        response = self._enviar("GET", url, headers=consulta.headers_condicionais())
+        if response.status_code == 304 and consulta.entrada is not None:
+            return consulta.revalidada(response.headers)
+        dados = self._handle_response(response)
+        consulta.armazenar(response.status_code, response.headers, response.text)
+        return dados
+    
+    def _get_stream(self, url: str) -> RespostaStream:
+        """
+        Realiza um GET cujo corpo é lido e decodificado em blocos
+        
+        Args:
+            url: URL completa
+            
+        Returns:
+            RespostaStream sobre os itens da resposta
+            
+        Raises:
+            Ver _handle_response (o corpo de erro é lido por inteiro)
+        """
+        response = self._enviar("GET", url, stream=True)
+        if response.status_code not in (200, 201, 202):
+            try:
+                self._lancar_erro(response.status_code, response.text)
+            finally:
+                response.close()
+        return RespostaStream(response)
     
-    def post(self, endpoint: str, data: Optional[Dict[str, Any]] = None, json_data: Optional[Dict[str, Any]] = None) -> Any:
+    def paginar(
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        odata_filter: Optional[str] = None,
+        odata_orderby: Optional[str] = None,
+        page_size: int = TAMANHO_PAGINA_PADRAO,
+        odata_skip: Optional[int] = None,
+        limite: Optional[int] = None,
+        max_workers: int = 1,
+        stream: bool = False
+    ) -> Iterator[Any]:
+        """
+        Itera sobre todos os itens de um endpoint paginado, página a página
+        
+        Busca páginas de `page_size` registros usando $top/$skip e entrega os
+        itens sob demanda. A iteração termina quando a API retorna uma página
+        incompleta, quando o total informado em 'count'/'metadata' é atingido
+        ou quando `limite` itens foram entregues.
+        
+        Com `max_workers` > 1, o total informado pela primeira página é usado
+        para calcular os offsets restantes, que são buscados em paralelo por
+        um pool de threads limitado. Os itens continuam sendo entregues na
+        ordem do servidor e no máximo `max_workers` + 1 páginas ficam em
+        memória: até `max_workers` em andamento ou aguardando a vez, mais a
+        página cujos itens estão sendo entregues.
+        Se a API não informar o total, a paginação segue sequencialmente.
+        
+        Com `stream` ativo, cada página é decodificada à medida que chega
+        (ver get): os itens são entregues antes de a página terminar de ser
+        recebida e a página nunca fica inteira em memória. Nesse modo as
+        páginas são buscadas uma após a outra.
+        
+        Para resultados estáveis entre páginas, informe `odata_orderby`.
+        
+        Args:
+            endpoint: Endpoint da API
+            params: Parâmetros adicionais de query string
+            odata_filter: Filtro OData ($filter)
+            odata_orderby: Ordenação OData ($orderby)
+            page_size: Quantidade de registros por página ($top)
+            odata_skip: Registros a pular antes da primeira página ($skip)
+            limite: Quantidade máxima de itens a entregar (opcional)
+            max_workers: Quantidade de páginas buscadas em paralelo (padrão: 1)
+            stream: Decodifica cada página em blocos (padrão: False)
+            
+        Returns:
+            Iterador sobre os itens de todas as páginas
+            
+        Raises:
+            ValueError: Se page_size ou max_workers não forem positivos, ou
+                se stream for combinado com max_workers > 1
+        """
+        if page_size <= 0:
+            raise ValueError("page_size deve ser maior que zero")
+        if max_workers <= 0:
+            raise ValueError("max_workers deve ser maior que zero")
+        if stream and max_workers > 1:
+            raise ValueError("stream não pode ser combinado com max_workers > 1")
+        
+        if max_workers == 1:
+            return self._paginar_sequencial(
+                endpoint, params, odata_filter, odata_orderby,
+                page_size, odata_skip or 0, limite, stream=stream
+            )
+        return self._paginar_paralelo(
+            endpoint, params, odata_filter, odata_orderby,
+            page_size, odata_skip or 0, limite, max_workers
+        )
+    
+    def _buscar_pagina(
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]],
+        odata_filter: Optional[str],
+        odata_orderby: Optional[str],
+        top: int,
+        skip: int,
+        stream: bool = False
+    ) -> Any:
+        """Busca uma única página ($top/$skip) de um endpoint paginado"""
+        # stream só é repassado quando ativo, preservando sobrescritas de get
+        opcoes = {"stream": True} if stream else {}
+        return self.get(
+            endpoint,
+            params=dict(params) if params else None,
+            odata_filter=odata_filter,
+            odata_orderby=odata_orderby,
+            odata_top=top,
+            odata_skip=skip,
+            **opcoes
+        )
+    
+    def _paginar_sequencial(
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]],
+        odata_filter: Optional[str],
+        odata_orderby: Optional[str],
+        page_size: int,
+        skip: int,
+        limite: Optional[int],
+        stream: bool = False
+    ) -> Iterator[Any]:
+        """Busca as páginas uma após a outra (ver paginar)"""
+        entregues = 0
+        
+        while limite is None or entregues < limite:
+            top = page_size if limite is None else min(page_size, limite - entregues)
+            resposta = self._buscar_pagina(endpoint, params, odata_filter, odata_orderby, top, skip, stream)
+            if stream:
+                quantidade = 0
+                with resposta:
+                    for item in resposta:
+                        quantidade += 1
+                        yield item
+                total = extrair_total(resposta.metadados)
+            else:
+                items = extrair_items(resposta)
+                total = extrair_total(resposta)
+                quantidade = len(items)
+                
+                for item in items:
+                    yield item
+            
+            entregues += quantidade
+            skip += quantidade
+            
+            if quantidade < top:
+                return
+            if total is not None and skip >= total:
+                return
+    
+    def _paginar_paralelo(
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]],
+        odata_filter: Optional[str],
+        odata_orderby: Optional[str],
+        page_size: int,
+        skip: int,
+        limite: Optional[int],
+        max_workers: int
+    ) -> Iterator[Any]:
+        """Busca a primeira página e, a partir do total, as demais em paralelo (ver paginar)"""
+        top = page_size if limite is None else min(page_size, limite)
+        if top <= 0:
+            return
+        
+        resposta = self._buscar_pagina(endpoint, params, odata_filter, odata_orderby, top, skip)
+        items = extrair_items(resposta)
+        total = extrair_total(resposta)
+        del resposta
+        
+        for item in items:
+            yield item
+        
+        if len(items) < top:
+            return
+        
+        proximo_skip = skip + len(items)
+        restante = None if limite is None else limite - len(items)
+        
+        if total is None:
+            # Sem total não há como calcular os offsets: segue sequencialmente
+            yield from self._paginar_sequencial(
+                endpoint, params, odata_filter, odata_orderby,
+                page_size, proximo_skip, restante
+            )
+            return
+        
+        fim = total if restante is None else min(total, proximo_skip + restante)
+        offsets = (
+            (offset, min(page_size, fim - offset))
+            for offset in range(proximo_skip, fim, page_size)
+        )
+        
+        def buscar(offset: int, quantidade: int) -> List[Any]:
+            return extrair_items(
+                self._buscar_pagina(endpoint, params, odata_filter, odata_orderby, quantidade, offset)
+            )
+        
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        pendentes = deque()
+        try:
+            for offset, quantidade in islice(offsets, max_workers):
+                pendentes.append(executor.submit(buscar, offset, quantidade))
+            
+            while pendentes:
+                pagina = pendentes.popleft().result()
+                
+                # Mantém o pool ocupado enquanto a página atual é consumida
+                # (por isso até max_workers + 1 páginas em memória)
+                proximo = next(offsets, None)
+                if proximo is not None:
+                    pendentes.append(executor.submit(buscar, *proximo))
+                
+                for item in pagina:
+                    yield item
+        finally:
+            for futuro in pendentes:
+                futuro.cancel()
+            executor.shutdown(wait=False)
+    
+    def post(
+        self,
+        endpoint: str,
+        data: Optional[Dict[str, Any]] = None,
+        json_data: Optional[Dict[str, Any]] = None,
+        idempotency_key: Optional[str] = None
+    ) -> Any:
         """
         Realiza requisição POST
         
@@ -181,13 +670,103 @@ class BaseClient:
             endpoint: Endpoint da API
             data: Dados a enviar (form-data)
             json_data: Dados JSON a enviar
+            idempotency_key: Chave de idempotência (header Idempotency-Key).
+                             Só POSTs com chave são repetidos pela retry_policy.
+                             Com diário, se None, é derivada do endpoint e do payload.
             
         Returns:
-            Resposta JSON da API
+            Resposta JSON da API (com diário, a resposta gravada se a mesma
+            escrita já foi confirmada)
+            
+        Com diário, uma escrita anterior com a mesma chave e sem desfecho
+        conhecido é conferida no servidor (Reconciliador) antes de um novo
+        envio. Os clientes assíncronos não fazem essa conferência (ver
+        AsyncClientMixin.post).
+            
+        Raises:
+            NiboEscritaIncertaError: Com diário, se uma escrita anterior com a
+                mesma chave ficou sem desfecho e o servidor não permite
+                confirmar se ela foi aplicada
         """
         url = self._build_url(endpoint)
-        response = self.session.post(url, data=data, json=json_data)
-        return self._handle_response(response)
+        chave = self._chave_diario(endpoint, json_data, idempotency_key)
+        if chave is not None:
+            return self._post_com_diario(endpoint, url, data, json_data, chave)
+        headers = {IDEMPOTENCY_HEADER: idempotency_key} if idempotency_key else None
+        return self._request("POST", url, headers=headers, data=data, json=json_data)
+    
+    def _chave_diario(
+        self,
+        endpoint: str,
+        json_data: Optional[Dict[str, Any]],
+        idempotency_key: Optional[str]
+    ) -> Optional[str]:
+        """
+        Chave do POST no diário de escritas
+        
+        Returns:
+            idempotency_key ou a chave derivada do endpoint e do payload, ou
+            None se o POST não passa pelo diário (sem diário, sem corpo JSON
+            ou endpoint fora de diario.endpoints)
+        """
+        if self.diario is None or json_data is None or not self.diario.registra(endpoint):
+            return None
+        escopo = f"{self.base_url}|{self.organizacao_id or self.organizacao_codigo or ''}"
+        return idempotency_key or chave_idempotencia(endpoint, json_data, escopo)
+    
+    def _consultar_diario(self, chave: str, reconciliar: bool):
+        """
+        Consulta o diário antes de um POST
+        
+        Args:
+            chave: Chave da escrita
+            reconciliar: Confere no servidor uma escrita pendente; se False,
+                         ela gera NiboEscritaIncertaError
+        
+        Returns:
+            (True, resposta) se a escrita já existe no servidor, ou
+            (False, None) se ela deve ser enviada
+        """
+        registro = self.diario.obter(chave)
+        if registro is None or registro.get("estado") not in (CONFIRMADO, PENDENTE):
+            return False, None
+        if registro["estado"] == CONFIRMADO:
+            return True, registro.get("resposta")
+        # Escrita anterior sem desfecho: consulta o servidor antes de repetir
+        if reconciliar:
+            resultado = Reconciliador(self, self.diario).verificar(registro)
+            if resultado.situacao == EXISTENTE:
+                return True, resultado.resposta
+            if resultado.situacao == AUSENTE:
+                return False, None
+        raise NiboEscritaIncertaError(
+            f"Escrita {chave} para {registro.get('endpoint')} sem desfecho conhecido; "
+            "reconcilie o diário antes de reenviar"
+        )
+    
+    def _registrar_erro_diario(self, chave: str, erro: BaseException):
+        """Grava a falha definitiva ou mantém a escrita pendente se o erro é ambíguo"""
+        # Interrupções (ex: KeyboardInterrupt, tarefa cancelada) também deixam o desfecho em aberto
+        if not isinstance(erro, Exception) or escrita_ambigua(erro):
+            self.diario.liberar(chave)
+        else:
+            self.diario.registrar_falha(chave, erro)
+    
+    def _post_com_diario(self, endpoint: str, url: str, data, json_data, chave: str) -> Any:
+        """POST registrado no diário (ver post)"""
+        existe, resposta = self._consultar_diario(chave, reconciliar=True)
+        if existe:
+            return resposta
+        self.diario.registrar_intencao(chave, endpoint, json_data)
+        try:
+            resposta = self._request(
+                "POST", url, headers={IDEMPOTENCY_HEADER: chave}, data=data, json=json_data
+            )
+        except BaseException as erro:
+            self._registrar_erro_diario(chave, erro)
+            raise
+        self.diario.confirmar(chave, resposta)
+        return resposta
     
     def put(self, endpoint: str, data: Optional[Dict[str, Any]] = None, json_data: Optional[Dict[str, Any]] = None) -> Any:
         """
@@ -202,8 +781,7 @@ class BaseClient:
             Resposta JSON da API
         """
         url = self._build_url(endpoint)
-        response = self.session.put(url, data=data, json=json_data)
-        return self._handle_response(response)
+        return self._request("PUT", url, data=data, json=json_data)
     
     def delete(self, endpoint: str) -> Any:
         """
@@ -216,6 +794,5 @@ class BaseClient:
             Resposta da API
         """
         url = self._build_url(endpoint)
-        response = self.session.delete(url)
-        return self._handle_response(response)
+        return self._request("DELETE", url)
 
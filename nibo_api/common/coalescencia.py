@@ -0,0 +1,135 @@
+"""
+Coalescência de requisições GET idênticas em andamento (single-flight)
+"""
+import asyncio
+import hashlib
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Mapping, Optional, Tuple
+
+
+def chave_requisicao(url: str, token: Optional[str], headers: Optional[Mapping[str, str]] = None) -> Tuple:
+    """
+    Chave que identifica requisições equivalentes
+
+    Args:
+        url: URL completa, com query string
+        token: Token de autenticação do cliente
+        headers: Headers adicionais da requisição (ex: If-None-Match)
+
+    Returns:
+        Tupla (url, impressão do token, headers adicionais ordenados)
+    """
+    impressao = hashlib.sha256((token or "").encode("utf-8")).hexdigest()[:16]
+    return url, impressao, tuple(sorted((headers or {}).items()))
+
+
+class _Voo:
+    """Requisição em andamento aguardada por uma ou mais threads"""
+
+    __slots__ = ("evento", "resultado", "erro")
+
+    def __init__(self):
+        self.evento = threading.Event()
+        self.resultado = None
+        self.erro: Optional[BaseException] = None
+
+
+class Coalescedor:
+    """
+    Compartilha uma única chamada entre threads que pedem a mesma chave
+
+    A primeira thread a pedir uma chave executa a função; as que chegam
+    enquanto ela está em andamento esperam e recebem o mesmo resultado (ou
+    a mesma exceção). Concluída a chamada, a chave é liberada: pedidos
+    seguintes disparam uma nova execução, então não há cache de resultados.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._em_andamento: Dict[Hashable, _Voo] = {}
+        self._contadores = {"executadas": 0, "coalescidas": 0}
+
+    def executar(self, chave: Hashable, funcao: Callable[[], Any]) -> Any:
+        """
+        Executa `funcao` ou aguarda a execução em andamento para a mesma chave
+
+        Args:
+            chave: Identificador da requisição (ver chave_requisicao)
+            funcao: Função sem argumentos que realiza a requisição
+
+        Returns:
+            Resultado da função (o mesmo objeto para todas as threads)
+        """
+        with self._lock:
+            voo = self._em_andamento.get(chave)
+            lider = voo is None
+            if lider:
+                voo = self._em_andamento[chave] = _Voo()
+                self._contadores["executadas"] += 1
+            else:
+                self._contadores["coalescidas"] += 1
+
+        if not lider:
+            voo.evento.wait()
+            if voo.erro is not None:
+                raise voo.erro
+            return voo.resultado
+
+        try:
+            voo.resultado = funcao()
+            return voo.resultado
+        except BaseException as erro:
+            voo.erro = erro
+            raise
+        finally:
+            with self._lock:
+                del self._em_andamento[chave]
+            voo.evento.set()
+
+    def metricas(self) -> Dict[str, int]:
+        """Contadores de chamadas executadas e de pedidos atendidos por uma chamada em andamento"""
+        with self._lock:
+            return dict(self._contadores)
+
+
+class CoalescedorAsync:
+    """
+    Versão para asyncio do Coalescedor
+
+    Pedidos concorrentes (tarefas do mesmo loop) pela mesma chave aguardam a
+    mesma corrotina. O cancelamento de quem espera não cancela a requisição
+    compartilhada.
+    """
+
+    def __init__(self):
+        self._em_andamento: Dict[Hashable, "asyncio.Future"] = {}
+        self._contadores = {"executadas": 0, "coalescidas": 0}
+
+    async def executar(self, chave: Hashable, fabrica: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Executa a corrotina criada por `fabrica` ou aguarda a que já está em andamento
+
+        Args:
+            chave: Identificador da requisição (ver chave_requisicao)
+            fabrica: Função sem argumentos que cria a corrotina da requisição
+
+        Returns:
+            Resultado da corrotina (o mesmo objeto para todas as tarefas)
+        """
+        tarefa = self._em_andamento.get(chave)
+        if tarefa is None or tarefa.done():
+            self._contadores["executadas"] += 1
+            tarefa = asyncio.ensure_future(fabrica())
+            self._em_andamento[chave] = tarefa
+            tarefa.add_done_callback(lambda concluida: self._liberar(chave, concluida))
+        else:
+            self._contadores["coalescidas"] += 1
+        return await asyncio.shield(tarefa)
+
+    def _liberar(self, chave: Hashable, tarefa: "asyncio.Future"):
+        if self._em_andamento.get(chave) is tarefa:
+            del self._em_andamento[chave]
+
+    def metricas(self) -> Dict[str, int]:
+        """Contadores de chamadas executadas e de pedidos atendidos por uma chamada em andamento"""
+        return dict(self._contadores)
@@ -0,0 +1,340 @@
+"""
+Resultados em colunas (NumPy) para agendamentos, pagamentos e recebimentos
+
+Converte os itens de `/schedules/*`, `/payments` e `/receipts` em colunas:
+valores em float64, datas em datetime64[D] e stakeholders/categorias
+codificados como inteiros (dicionário de IDs). Filtros, totais e
+agrupamentos (stakeholder, categoria, mês) passam a ser operações
+vetorizadas, sem percorrer os dicionários a cada consulta.
+
+Requer NumPy (pip install nibo-api[colunar]).
+
+Exemplo:
+    resultado = ResultadoColunar.de_itens(client.pagamentos.iter_listar(page_size=500))
+    resultado.filtrar(inicio="2025-01-01", fim="2025-03-31").agrupar("mes")
+"""
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+from nibo_api.common.datas import coluna_datetime64, para_date
+from nibo_api.common.modelos_compactos import dados_do_item
+
+# Campos de data tentados, em ordem, quando campo_data não é informado
+CAMPOS_DATA = ("date", "dueDate", "accrualDate", "scheduleDate")
+
+AGRUPAMENTOS = ("stakeholder", "categoria", "mes")
+
+DataLike = Union[str, date, datetime]
+
+
+class Dicionario:
+    """
+    Codificação de identificadores como inteiros
+
+    O código 0 é reservado para itens sem identificador. Os nomes são os
+    vistos na primeira ocorrência de cada identificador.
+    """
+
+    __slots__ = ("ids", "nomes", "_codigos")
+
+    def __init__(self):
+        self.ids: List[Optional[str]] = [None]
+        self.nomes: List[Optional[str]] = [None]
+        self._codigos: Dict[str, int] = {}
+
+    def codificar(self, identificador: Optional[str], nome: Optional[str] = None) -> int:
+        """Retorna o código do identificador (criando se necessário)"""
+        if identificador is None:
+            return 0
+        codigo = self._codigos.get(identificador)
+        if codigo is None:
+            codigo = self._codigos[identificador] = len(self.ids)
+            self.ids.append(identificador)
+            self.nomes.append(nome)
+        return codigo
+
+    def codigo(self, identificador: str) -> int:
+        """Código de um identificador já visto (-1 se desconhecido)"""
+        return self._codigos.get(str(identificador), -1)
+
+    def __len__(self):
+        return len(self.ids)
+
+
+def _referencia(item: Dict[str, Any], chave: str):
+    """Extrai (id, nome) de um objeto aninhado como 'stakeholder' ou 'category'"""
+    aninhado = item.get(chave)
+    if isinstance(aninhado, dict):
+        return aninhado.get("id"), aninhado.get("name")
+    return None, None
+
+
+def _categoria(item: Dict[str, Any]):
+    """Categoria principal: 'category' ou o primeiro elemento de 'categories'"""
+    identificador, nome = _referencia(item, "category")
+    if identificador is None:
+        categorias = item.get("categories")
+        if categorias:
+            primeira = categorias[0]
+            identificador = primeira.get("categoryId")
+            nome = primeira.get("categoryName")
+    return identificador, nome
+
+
+def _data_numpy(valor: Optional[DataLike]) -> "np.datetime64":
+    if valor is None:
+        return np.datetime64("NaT", "D")
+    convertida = para_date(valor)
+    if convertida is None:
+        raise ValueError(f"Data inválida: {valor!r}")
+    return np.datetime64(convertida, "D")
+
+
+class ResultadoColunar:
+    """
+    Conjunto de lançamentos armazenado em colunas NumPy
+
+    Colunas:
+        valor: float64
+        data: datetime64[D] (NaT quando ausente)
+        stakeholder: int32, códigos de `stakeholders` (0 = sem stakeholder)
+        categoria: int32, códigos de `categorias` (0 = sem categoria)
+        indice: int64, posição do item na lista original (para `itens`)
+
+    Resultados filtrados compartilham os dicionários e a lista original.
+    """
+
+    def __init__(
+        self,
+        valor: "np.ndarray",
+        data: "np.ndarray",
+        stakeholder: "np.ndarray",
+        categoria: "np.ndarray",
+        indice: "np.ndarray",
+        stakeholders: Dicionario,
+        categorias: Dicionario,
+        originais: Optional[List[Dict[str, Any]]] = None
+    ):
+        """
+        Inicializa o resultado a partir das colunas (use de_itens)
+
+        Raises:
+            ImportError: Se NumPy não estiver instalado
+        """
+        if not NUMPY_AVAILABLE:
+            raise ImportError(
+                "Biblioteca numpy não está instalada. "
+                "Instale com: pip install nibo-api[colunar]"
+            )
+        self.valor = valor
+        self.data = data
+        self.stakeholder = stakeholder
+        self.categoria = categoria
+        self.indice = indice
+        self.stakeholders = stakeholders
+        self.categorias = categorias
+        self._originais = originais
+
+    @classmethod
+    def de_itens(
+        cls,
+        itens: Union[Dict[str, Any], Iterable[Dict[str, Any]]],
+        campo_data: Optional[str] = None,
+        manter_itens: bool = True
+    ) -> "ResultadoColunar":
+        """
+        Constrói o resultado a partir de uma página ou de um iterável de itens
+
+        Args:
+            itens: Resposta com 'items', lista de itens ou iterador (ex: iter_listar),
+                   com dicionários ou modelos compactos (typed=True)
+            campo_data: Campo usado na coluna de datas (padrão: o primeiro de
+                        CAMPOS_DATA presente no primeiro item)
+            manter_itens: Se True, guarda os dicionários para `itens()`
+
+        Returns:
+            ResultadoColunar
+        """
+        if isinstance(itens, dict):
+            itens = itens.get("items", [])
+        stakeholders = Dicionario()
+        categorias = Dicionario()
+        valores: List[float] = []
+        datas: List[Any] = []
+        codigos_stakeholder: List[int] = []
+        codigos_categoria: List[int] = []
+        originais: Optional[List[Dict[str, Any]]] = [] if manter_itens else None
+
+        for item in map(dados_do_item, itens):
+            if campo_data is None:
+                campo_data = next((c for c in CAMPOS_DATA if c in item), CAMPOS_DATA[0])
+            valores.append(float(item.get("value") or 0))
+            datas.append(item.get(campo_data))
+            codigos_stakeholder.append(stakeholders.codificar(*_referencia(item, "stakeholder")))
+            codigos_categoria.append(categorias.codificar(*_categoria(item)))
+            if originais is not None:
+                originais.append(item)
+
+        if not NUMPY_AVAILABLE:
+            raise ImportError(
+                "Biblioteca numpy não está instalada. "
+                "Instale com: pip install nibo-api[colunar]"
+            )
+        return cls(
+            valor=np.array(valores, dtype=np.float64),
+            data=coluna_datetime64(datas),
+            stakeholder=np.array(codigos_stakeholder, dtype=np.int32),
+            categoria=np.array(codigos_categoria, dtype=np.int32),
+            indice=np.arange(len(valores), dtype=np.int64),
+            stakeholders=stakeholders,
+            categorias=categorias,
+            originais=originais
+        )
+
+    def _subconjunto(self, mascara: "np.ndarray") -> "ResultadoColunar":
+        return ResultadoColunar(
+            self.valor[mascara],
+            self.data[mascara],
+            self.stakeholder[mascara],
+            self.categoria[mascara],
+            self.indice[mascara],
+            self.stakeholders,
+            self.categorias,
+            self._originais
+        )
+
+    def __len__(self):
+        return len(self.valor)
+
+    def filtrar(
+        self,
+        mascara: Optional["np.ndarray"] = None,
+        inicio: Optional[DataLike] = None,
+        fim: Optional[DataLike] = None,
+        stakeholder: Union[str, Iterable[str], None] = None,
+        categoria: Union[str, Iterable[str], None] = None,
+        valor_minimo: Optional[float] = None,
+        valor_maximo: Optional[float] = None
+    ) -> "ResultadoColunar":
+        """
+        Retorna os lançamentos que atendem a todos os critérios informados
+
+        Args:
+            mascara: Máscara booleana adicional (ex: resultado.valor > 1000)
+            inicio: Data inicial, inclusive (ISO, DD/MM/YYYY, date ou datetime)
+            fim: Data final, inclusive
+            stakeholder: ID ou IDs de stakeholder
+            categoria: ID ou IDs de categoria
+            valor_minimo: Valor mínimo, inclusive
+            valor_maximo: Valor máximo, inclusive
+
+        Returns:
+            Novo ResultadoColunar
+        """
+        selecao = np.ones(len(self), dtype=bool)
+        if mascara is not None:
+            selecao &= mascara
+        if inicio is not None:
+            selecao &= self.data >= _data_numpy(inicio)
+        if fim is not None:
+            selecao &= self.data <= _data_numpy(fim)
+        if stakeholder is not None:
+            selecao &= np.isin(self.stakeholder, self._codigos(self.stakeholders, stakeholder))
+        if categoria is not None:
+            selecao &= np.isin(self.categoria, self._codigos(self.categorias, categoria))
+        if valor_minimo is not None:
+            selecao &= self.valor >= valor_minimo
+        if valor_maximo is not None:
+            selecao &= self.valor <= valor_maximo
+        return self._subconjunto(selecao)
+
+    @staticmethod
+    def _codigos(dicionario: Dicionario, identificadores: Union[str, Iterable[str]]) -> List[int]:
+        if isinstance(identificadores, str) or not isinstance(identificadores, Iterable):
+            identificadores = [identificadores]
+        return [dicionario.codigo(i) for i in identificadores]
+
+    def total(self, exato: bool = False) -> Union[float, Decimal]:
+        """
+        Soma dos valores
+
+        Args:
+            exato: Se True, soma em centavos inteiros e retorna Decimal
+
+        Returns:
+            Total como float (ou Decimal com exato=True)
+        """
+        if exato:
+            centavos = np.rint(self.valor * 100).astype(np.int64).sum()
+            return Decimal(int(centavos)) / 100
+        return float(self.valor.sum())
+
+    def agrupar(self, por: str) -> Dict[Any, Dict[str, Any]]:
+        """
+        Totais e quantidades por stakeholder, categoria ou mês
+
+        Args:
+            por: "stakeholder", "categoria" ou "mes"
+
+        Returns:
+            Dicionário {chave: {"nome", "total", "quantidade"}}, com chave =
+            ID (stakeholder/categoria; None para itens sem) ou "AAAA-MM" (mês),
+            ordenado pela chave para meses e pelo total decrescente nos demais
+
+        Raises:
+            ValueError: Se o agrupamento for inválido
+        """
+        if por not in AGRUPAMENTOS:
+            raise ValueError(f"Agrupamento inválido: {por}. Use um de {AGRUPAMENTOS}")
+        if por == "mes":
+            validas = ~np.isnat(self.data)
+            meses, codigos = np.unique(self.data[validas].astype("datetime64[M]"), return_inverse=True)
+            totais = np.bincount(codigos, weights=self.valor[validas], minlength=len(meses))
+            quantidades = np.bincount(codigos, minlength=len(meses))
+            return {
+                str(mes): {"nome": str(mes), "total": float(total), "quantidade": int(quantidade)}
+                for mes, total, quantidade in zip(meses, totais, quantidades)
+            }
+
+        dicionario = self.stakeholders if por == "stakeholder" else self.categorias
+        codigos = self.stakeholder if por == "stakeholder" else self.categoria
+        totais = np.bincount(codigos, weights=self.valor, minlength=len(dicionario))
+        quantidades = np.bincount(codigos, minlength=len(dicionario))
+        presentes = np.flatnonzero(quantidades)
+        ordem = presentes[np.argsort(-totais[presentes], kind="stable")]
+        return {
+            dicionario.ids[c]: {
+                "nome": dicionario.nomes[c],
+                "total": float(totais[c]),
+                "quantidade": int(quantidades[c])
+            }
+            for c in ordem
+        }
+
+    def itens(self) -> List[Dict[str, Any]]:
+        """
+        Dicionários originais dos lançamentos deste resultado
+
+        Raises:
+            ValueError: Se o resultado foi criado com manter_itens=False
+        """
+        if self._originais is None:
+            raise ValueError("Itens originais não foram mantidos (manter_itens=False)")
+        return [self._originais[i] for i in self.indice]
+
+    def resumo(self) -> Dict[str, Any]:
+        """Quantidade, total e período coberto"""
+        validas = self.data[~np.isnat(self.data)]
+        return {
+            "quantidade": len(self),
+            "total": self.total(),
+            "inicio": str(validas.min()) if len(validas) else None,
+            "fim": str(validas.max()) if len(validas) else None,
+        }
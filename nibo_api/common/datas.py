@@ -0,0 +1,208 @@
+"""
+Conversão de datas da API com memoização
+
+As respostas da API repetem poucas datas distintas em muitos itens (datas de
+vencimento, competência, criação). As funções deste módulo guardam a
+conversão de cada texto já visto, então cada data distinta é interpretada
+uma única vez por processo. Usadas pelos modelos, pelos formatadores da CLI
+e pelos filtros locais.
+
+Exemplo:
+    para_datetime("2025-01-20T00:00:00Z")   # datetime com fuso UTC
+    para_date("20/01/2025")                 # date(2025, 1, 20)
+    converter_coluna(item.get("dueDate") for item in items)
+"""
+import re
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+# Textos distintos guardados por função (datas de um ano inteiro cabem folgadamente)
+TAMANHO_MEMO = 65536
+
+# Fração de segundos fora do formato aceito por fromisoformat antes do Python 3.11
+_FRACAO = re.compile(r"\.(\d+)")
+
+# Valores tratados como "sem data" na exibição e nos filtros
+_VAZIOS = ("", "N/A")
+
+# Data digitada no formato brasileiro (dia e mês com um ou dois dígitos)
+_DATA_BR = re.compile(r"(\d{1,2})/(\d{1,2})/(\d{4})")
+
+# Texto ISO aceito pelo caminho vetorizado (data, com ou sem horário e fuso)
+_ISO = re.compile(r"\d{4}-\d{2}-\d{2}(?:[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?(?:Z|[+-]\d{2}:?\d{2})?)?")
+
+
+def _fracao_seis_digitos(correspondencia) -> str:
+    return "." + correspondencia.group(1)[:6].ljust(6, "0")
+
+
+@lru_cache(maxsize=TAMANHO_MEMO)
+def _datetime_de_texto(texto: str) -> datetime:
+    normalizado = texto[:-1] + "+00:00" if texto.endswith("Z") else texto
+    try:
+        return datetime.fromisoformat(normalizado)
+    except ValueError:
+        return datetime.fromisoformat(_FRACAO.sub(_fracao_seis_digitos, normalizado, count=1))
+
+
+def para_datetime(valor: Any) -> datetime:
+    """
+    Converte um timestamp ISO 8601 da API ('Z', offset ou sem fuso) em datetime
+
+    Args:
+        valor: Texto ISO 8601 ou datetime (devolvido sem alteração)
+
+    Returns:
+        datetime (com fuso quando o texto informa 'Z' ou offset)
+
+    Raises:
+        ValueError: Se o texto não for uma data ISO 8601 válida
+    """
+    if isinstance(valor, datetime):
+        return valor
+    return _datetime_de_texto(valor)
+
+
+@lru_cache(maxsize=TAMANHO_MEMO)
+def _date_de_texto(texto: str) -> Optional[date]:
+    texto = texto.strip()
+    if texto in _VAZIOS:
+        return None
+    try:
+        if "/" in texto:
+            correspondencia = _DATA_BR.fullmatch(texto)
+            if correspondencia is None:
+                raise ValueError(texto)
+            dia, mes, ano = map(int, correspondencia.groups())
+            return date(ano, mes, dia)
+        if len(texto) == 10:
+            return date.fromisoformat(texto)
+        if texto[10:11] not in ("T", " "):
+            raise ValueError(texto)
+        return _datetime_de_texto(texto).date()
+    except ValueError:
+        raise ValueError(f"Data inválida: {texto}. Use DD/MM/YYYY ou YYYY-MM-DD.") from None
+
+
+def para_date(valor: Any) -> Optional[date]:
+    """
+    Converte uma data da API ou digitada pelo usuário em date
+
+    Aceita apenas YYYY-MM-DD, timestamp ISO 8601 completo (como em
+    para_datetime) e DD/MM/YYYY (dia e mês com um ou dois dígitos). O horário e o fuso são descartados.
+
+    Args:
+        valor: Texto, date ou datetime
+
+    Returns:
+        date, ou None se o valor estiver vazio ou for "N/A"
+
+    Raises:
+        ValueError: Se o texto não estiver em um dos formatos aceitos
+            (ex: "31/02/2025" ou "2025-01-01xyz")
+    """
+    if isinstance(valor, datetime):
+        return valor.date()
+    if isinstance(valor, date):
+        return valor
+    if valor is None:
+        return None
+    return _date_de_texto(str(valor))
+
+
+def _date_ou_none(valor: Any) -> Optional[date]:
+    """para_date que devolve None em vez de ValueError (exibição e colunas NumPy)"""
+    try:
+        return para_date(valor)
+    except ValueError:
+        return None
+
+
+def converter_coluna(
+    valores: Iterable[Any],
+    conversor: Callable[[Any], Any] = para_date
+) -> List[Any]:
+    """
+    Converte uma coluna inteira de datas (ex: 'dueDate' de todos os itens)
+
+    Cada valor distinto é convertido uma única vez; os repetidos reaproveitam
+    o mesmo objeto. Valores que não são texto passam direto pelo conversor.
+    Erros do conversor (ex: ValueError de para_date) são propagados.
+
+    Args:
+        valores: Iterável de datas (texto, date, datetime ou None)
+        conversor: Função de conversão (padrão: para_date)
+
+    Returns:
+        Lista com as datas convertidas, na mesma ordem
+    """
+    convertidos: Dict[str, Any] = {}
+    resultado = []
+    for valor in valores:
+        if isinstance(valor, str):
+            convertido = convertidos.get(valor)
+            if convertido is None and valor not in convertidos:
+                convertido = convertidos[valor] = conversor(valor)
+            resultado.append(convertido)
+        else:
+            resultado.append(conversor(valor))
+    return resultado
+
+
+def coluna_datetime64(valores: Iterable[Any]) -> "np.ndarray":
+    """
+    Converte uma coluna de datas em um array NumPy datetime64[D]
+
+    Textos ISO são convertidos de uma vez pelo NumPy; se a coluna tiver
+    outros formatos (ex: DD/MM/YYYY), cada valor distinto passa por para_date.
+    Datas ausentes ou inválidas viram NaT.
+
+    Args:
+        valores: Iterável de datas (texto, date, datetime ou None)
+
+    Returns:
+        Array datetime64[D]
+
+    Raises:
+        ImportError: Se NumPy não estiver instalado
+    """
+    if not NUMPY_AVAILABLE:
+        raise ImportError(
+            "Biblioteca numpy não está instalada. "
+            "Instale com: pip install nibo-api[colunar]"
+        )
+    valores = list(valores)
+    try:
+        return np.array([_texto_iso(v) for v in valores], dtype="datetime64[D]")
+    except ValueError:
+        datas = converter_coluna(valores, _date_ou_none)
+        return np.array(
+            [d.isoformat() if d is not None else "NaT" for d in datas],
+            dtype="datetime64[D]"
+        )
+
+
+def _texto_iso(valor: Any) -> str:
+    """Texto YYYY-MM-DD aceito pelo NumPy (o restante do timestamp é descartado)"""
+    if isinstance(valor, str):
+        if valor in _VAZIOS:
+            return "NaT"
+        if not _ISO.fullmatch(valor):
+            raise ValueError(valor)
+        return valor[:10]
+    convertida = _date_ou_none(valor)
+    return convertida.isoformat() if convertida is not None else "NaT"
+
+
+def limpar_memo():
+    """Descarta as conversões memorizadas (ex: após processar um lote muito grande)"""
+    _datetime_de_texto.cache_clear()
+    _date_de_texto.cache_clear()
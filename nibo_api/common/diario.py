@@ -0,0 +1,432 @@
+"""
+Diário de escritas (write-ahead) para POSTs com chaves de idempotência determinísticas
+
+Antes de cada POST o cliente grava a intenção (endpoint, payload e chave) em um
+arquivo JSON Lines; depois, o desfecho. Uma escrita cujo desfecho é
+desconhecido (timeout, erro 5xx, queda do processo) fica 'pendente' e só é
+reenviada depois que o Reconciliador consulta o servidor e confirma que ela
+não foi aplicada, evitando lançamentos financeiros duplicados.
+"""
+import fnmatch
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+import requests
+
+from nibo_api.common.exceptions import NiboEscritaIncertaError, NiboServerError
+from nibo_api.common.modelos_compactos import dados_do_item
+
+
+# Estados de uma escrita no diário
+PENDENTE = "pendente"
+CONFIRMADO = "confirmado"
+FALHOU = "falhou"
+AUSENTE = "ausente"
+
+# Situações devolvidas pela reconciliação
+EXISTENTE = "existente"
+INDETERMINADO = "indeterminado"
+REENVIADO = "reenviado"
+
+# Verificador: (client, registro) -> (situação, resposta). A situação é
+# EXISTENTE (com a resposta equivalente à do POST), AUSENTE ou INDETERMINADO.
+Verificador = Callable[[Any, Dict[str, Any]], Tuple[str, Any]]
+
+
+def chave_idempotencia(endpoint: str, payload: Any, escopo: str = "") -> str:
+    """
+    Chave determinística de uma escrita: hash do escopo, endpoint e payload
+
+    O payload é serializado em JSON canônico (chaves ordenadas), então o
+    mesmo conteúdo gera a mesma chave em qualquer execução. Dois lançamentos
+    legítimos com payload idêntico precisam de chaves explícitas (ex: o
+    número da linha do arquivo de origem).
+
+    Args:
+        endpoint: Endpoint do POST (ex: "/schedules/credit")
+        payload: Corpo JSON do POST
+        escopo: Distingue APIs e organizações (ex: base_url + organização)
+
+    Returns:
+        Chave hexadecimal (sha256)
+    """
+    conteudo = json.dumps([escopo, endpoint, payload], sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(conteudo.encode()).hexdigest()
+
+
+def extrair_id(resposta: Any) -> Optional[str]:
+    """
+    Extrai o ID criado da resposta de um POST
+
+    Args:
+        resposta: Resposta da API (ID como texto ou objeto com 'id'/'scheduleId')
+
+    Returns:
+        ID criado ou None se a resposta não informar
+    """
+    if isinstance(resposta, str):
+        return resposta.strip().strip('"') or None
+    if isinstance(resposta, dict):
+        for campo in ("id", "scheduleId"):
+            if resposta.get(campo):
+                return str(resposta[campo])
+    return None
+
+
+def escrita_ambigua(erro: Exception) -> bool:
+    """True se a escrita pode ter sido aplicada apesar do erro"""
+    return isinstance(erro, (
+        NiboServerError, NiboEscritaIncertaError, requests.RequestException, TimeoutError, ConnectionError
+    ))
+
+
+class DiarioEscritas:
+    """
+    Diário de escritas em arquivo JSON Lines (somente acréscimos)
+
+    Cada POST registrado recebe uma linha 'pendente' antes do envio e outra
+    com o desfecho depois: 'confirmado' (com a resposta), 'falhou' (recusado
+    pela API; pode ser reenviado) ou 'ausente' (a reconciliação confirmou que
+    não foi aplicado). Erros ambíguos não geram desfecho: a escrita continua
+    pendente. Ao reabrir, o último estado de cada chave é restaurado; uma
+    linha truncada por uma queda é ignorada. Seguro entre threads.
+    """
+
+    def __init__(
+        self,
+        caminho: Union[str, "os.PathLike[str]"],
+        endpoints: Optional[Iterable[str]] = None,
+        sincronizar: bool = True
+    ):
+        """
+        Abre (ou cria) o diário
+
+        Args:
+            caminho: Arquivo do diário
+            endpoints: Padrões glob dos endpoints registrados (ex: "/schedules/*").
+                       Se None, todo POST com corpo JSON é registrado.
+            sincronizar: Se True, força a gravação em disco (fsync) da intenção
+                         antes do envio; mais lento, mas sobrevive à queda da máquina
+        """
+        self.caminho = os.fspath(caminho)
+        self.endpoints = list(endpoints) if endpoints is not None else None
+        self.sincronizar = sincronizar
+        self._lock = threading.Lock()
+        self._registros: Dict[str, Dict[str, Any]] = {}
+        self._em_andamento = set()
+        try:
+            with open(self.caminho, "r", encoding="utf-8") as f:
+                for linha in f:
+                    try:
+                        registro = json.loads(linha)
+                    except ValueError:
+                        continue  # última linha truncada por uma queda
+                    if isinstance(registro, dict) and "chave" in registro:
+                        self._mesclar(registro)
+        except FileNotFoundError:
+            pass
+        self._arquivo = open(self.caminho, "a", encoding="utf-8")
+
+    def _mesclar(self, registro: Dict[str, Any]):
+        """Atualiza o estado da chave mantendo endpoint e payload da intenção"""
+        anterior = self._registros.get(registro["chave"], {})
+        self._registros[registro["chave"]] = {**anterior, **registro}
+
+    def _gravar(self, registro: Dict[str, Any], sincronizar: bool = False):
+        """Acrescenta uma linha ao diário (com o lock adquirido)"""
+        registro["instante"] = time.time()
+        self._arquivo.write(json.dumps(registro, ensure_ascii=False, default=str) + "\n")
+        self._arquivo.flush()
+        if sincronizar:
+            os.fsync(self._arquivo.fileno())
+        self._mesclar(registro)
+
+    def registra(self, endpoint: str) -> bool:
+        """
+        Indica se POSTs para o endpoint passam pelo diário
+
+        Args:
+            endpoint: Endpoint do POST
+
+        Returns:
+            True se não há filtro de endpoints ou se algum padrão corresponde
+        """
+        if self.endpoints is None:
+            return True
+        return any(fnmatch.fnmatchcase(endpoint, padrao) for padrao in self.endpoints)
+
+    def obter(self, chave: str) -> Optional[Dict[str, Any]]:
+        """
+        Estado atual de uma escrita
+
+        Args:
+            chave: Chave de idempotência
+
+        Returns:
+            Registro ('estado', 'endpoint', 'payload', 'id', 'resposta', 'erro')
+            ou None se a chave nunca foi registrada
+        """
+        with self._lock:
+            registro = self._registros.get(chave)
+            return dict(registro) if registro is not None else None
+
+    def registrar_intencao(self, chave: str, endpoint: str, payload: Any):
+        """
+        Grava a intenção de escrita antes do envio
+
+        Args:
+            chave: Chave de idempotência
+            endpoint: Endpoint do POST
+            payload: Corpo JSON do POST
+
+        Raises:
+            NiboEscritaIncertaError: Se a mesma chave já está sendo enviada
+                                     por outra thread
+        """
+        with self._lock:
+            if chave in self._em_andamento:
+                raise NiboEscritaIncertaError(f"Escrita {chave} já está em andamento")
+            self._em_andamento.add(chave)
+            registro = {"chave": chave, "estado": PENDENTE, "endpoint": endpoint, "payload": payload}
+            self._gravar(registro, sincronizar=self.sincronizar)
+
+    def confirmar(self, chave: str, resposta: Any):
+        """
+        Grava a confirmação de uma escrita aplicada
+
+        Args:
+            chave: Chave de idempotência
+            resposta: Resposta da API (devolvida a chamadas repetidas)
+        """
+        with self._lock:
+            self._em_andamento.discard(chave)
+            self._gravar({"chave": chave, "estado": CONFIRMADO, "id": extrair_id(resposta), "resposta": resposta})
+
+    def registrar_falha(self, chave: str, erro: Union[Exception, str], estado: str = FALHOU):
+        """
+        Grava que a escrita não foi aplicada
+
+        Args:
+            chave: Chave de idempotência
+            erro: Erro definitivo (ex: validação) ou motivo
+            estado: 'falhou' (recusada pela API) ou 'ausente' (reconciliada)
+        """
+        with self._lock:
+            self._em_andamento.discard(chave)
+            self._gravar({"chave": chave, "estado": estado, "erro": str(erro)})
+
+    def liberar(self, chave: str):
+        """
+        Encerra o envio sem desfecho conhecido (a escrita continua pendente)
+
+        Args:
+            chave: Chave de idempotência
+        """
+        with self._lock:
+            self._em_andamento.discard(chave)
+
+    def pendentes(self) -> List[Dict[str, Any]]:
+        """
+        Escritas sem desfecho conhecido e que não estão em andamento
+
+        Returns:
+            Registros pendentes, na ordem em que foram gravados
+        """
+        with self._lock:
+            return [
+                dict(registro) for chave, registro in self._registros.items()
+                if registro.get("estado") == PENDENTE and chave not in self._em_andamento
+            ]
+
+    def compactar(self):
+        """
+        Reescreve o diário com uma linha por chave (o estado atual)
+
+        A troca do arquivo é atômica (os.replace): uma queda durante a
+        compactação mantém o diário anterior.
+        """
+        with self._lock:
+            diretorio = os.path.dirname(os.path.abspath(self.caminho))
+            descritor, temporario = tempfile.mkstemp(dir=diretorio, suffix=".tmp")
+            try:
+                with os.fdopen(descritor, "w", encoding="utf-8") as f:
+                    for registro in self._registros.values():
+                        f.write(json.dumps(registro, ensure_ascii=False, default=str) + "\n")
+                    f.flush()
+                    os.fsync(f.fileno())
+                self._arquivo.close()
+                os.replace(temporario, self.caminho)
+            except BaseException:
+                if os.path.exists(temporario):
+                    os.unlink(temporario)
+                raise
+            finally:
+                if self._arquivo.closed:
+                    self._arquivo = open(self.caminho, "a", encoding="utf-8")
+
+    def close(self):
+        """Fecha o arquivo do diário"""
+        with self._lock:
+            if not self._arquivo.closed:
+                self._arquivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def verificar_agendamento(client: Any, registro: Dict[str, Any]) -> Tuple[str, Any]:
+    """
+    Procura no servidor um agendamento criado pela escrita, pela referência
+
+    Consulta o mesmo endpoint do POST (/schedules/credit ou /schedules/debit)
+    com `reference eq '...'` e, se o payload informa o contato, exige o mesmo
+    stakeholder. A referência deve identificar o lançamento de forma única.
+
+    Args:
+        client: Cliente que fez o POST
+        registro: Registro da escrita no diário
+
+    Returns:
+        (EXISTENTE, id), (AUSENTE, None) ou (INDETERMINADO, None) se o
+        payload não tem referência
+    """
+    payload = registro.get("payload") or {}
+    referencia = payload.get("reference")
+    if not referencia:
+        return INDETERMINADO, None
+    filtro = "reference eq '{}'".format(str(referencia).replace("'", "''"))
+    resposta = client.get(registro["endpoint"], odata_filter=filtro)
+    itens = resposta.get("items", []) if isinstance(resposta, dict) else resposta or []
+    contato = str(payload.get("stakeholderId") or "").casefold()
+    for item in map(dados_do_item, itens):
+        if item.get("reference") != referencia:
+            continue
+        if contato and str((item.get("stakeholder") or {}).get("id", "")).casefold() != contato:
+            continue
+        return EXISTENTE, extrair_id(item)
+    return AUSENTE, None
+
+
+# Verificadores embutidos por padrão glob de endpoint
+VERIFICADORES_PADRAO: Dict[str, Verificador] = {
+    "/schedules/credit": verificar_agendamento,
+    "/schedules/debit": verificar_agendamento,
+}
+
+
+@dataclass
+class ResultadoReconciliacao:
+    """
+    Resultado da reconciliação de uma escrita pendente
+
+    situacao:
+        'existente'     - encontrada no servidor; confirmada no diário
+        'ausente'       - não aplicada; pode ser reenviada com segurança
+        'reenviado'     - ausente e reenviada agora (reconciliar(reenviar=True))
+        'indeterminado' - sem verificador para o endpoint ou o payload não
+                          permite a busca; continua pendente
+    """
+    chave: str
+    endpoint: str
+    situacao: str
+    id: Optional[str] = None
+    resposta: Any = None
+    erro: Optional[Union[Exception, str]] = None
+
+
+class Reconciliador:
+    """
+    Confere no servidor as escritas pendentes do diário antes de reenviá-las
+
+    Cada endpoint precisa de um verificador que procure o recurso criado pela
+    escrita (ex: agendamentos pela referência). Endpoints sem verificador
+    ficam 'indeterminado' e não são reenviados.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        diario: Optional[DiarioEscritas] = None,
+        verificadores: Optional[Dict[str, Verificador]] = None
+    ):
+        """
+        Inicializa o reconciliador
+
+        Args:
+            client: Cliente síncrono usado nas consultas e reenvios
+            diario: Diário a reconciliar. Se None, usa client.diario.
+            verificadores: Verificadores adicionais por padrão glob de endpoint
+                           (têm prioridade sobre VERIFICADORES_PADRAO)
+        """
+        self.client = client
+        self.diario = diario if diario is not None else client.diario
+        self.verificadores = dict(verificadores or {})
+        for padrao, funcao in VERIFICADORES_PADRAO.items():
+            self.verificadores.setdefault(padrao, funcao)
+
+    def _verificador(self, endpoint: str) -> Optional[Verificador]:
+        """Primeiro verificador cujo padrão corresponde ao endpoint"""
+        for padrao, funcao in self.verificadores.items():
+            if fnmatch.fnmatchcase(endpoint, padrao):
+                return funcao
+        return None
+
+    def verificar(self, registro: Dict[str, Any]) -> ResultadoReconciliacao:
+        """
+        Verifica uma escrita pendente e grava o desfecho encontrado no diário
+
+        Args:
+            registro: Registro da escrita (ver DiarioEscritas.obter)
+
+        Returns:
+            ResultadoReconciliacao ('existente', 'ausente' ou 'indeterminado')
+        """
+        chave, endpoint = registro["chave"], registro.get("endpoint", "")
+        verificador = self._verificador(endpoint)
+        if verificador is None:
+            return ResultadoReconciliacao(chave, endpoint, INDETERMINADO)
+        situacao, resposta = verificador(self.client, registro)
+        if situacao == EXISTENTE:
+            self.diario.confirmar(chave, resposta)
+            return ResultadoReconciliacao(chave, endpoint, EXISTENTE, extrair_id(resposta), resposta)
+        if situacao == AUSENTE:
+            self.diario.registrar_falha(chave, "não encontrada no servidor", estado=AUSENTE)
+        return ResultadoReconciliacao(chave, endpoint, situacao)
+
+    def reconciliar(self, reenviar: bool = False) -> List[ResultadoReconciliacao]:
+        """
+        Reconcilia todas as escritas pendentes do diário
+
+        Args:
+            reenviar: Se True, reenvia (com a mesma chave) as escritas ausentes
+
+        Returns:
+            Um ResultadoReconciliacao por escrita pendente. Erros de uma
+            escrita ficam no seu resultado e não interrompem as demais.
+        """
+        resultados = []
+        for registro in self.diario.pendentes():
+            try:
+                resultado = self.verificar(registro)
+                if reenviar and resultado.situacao == AUSENTE:
+                    resposta = self.client.post(
+                        resultado.endpoint, json_data=registro.get("payload"), idempotency_key=resultado.chave
+                    )
+                    resultado = ResultadoReconciliacao(
+                        resultado.chave, resultado.endpoint, REENVIADO, extrair_id(resposta), resposta
+                    )
+            except Exception as erro:
+                resultado = ResultadoReconciliacao(
+                    registro["chave"], registro.get("endpoint", ""), INDETERMINADO, erro=erro
+                )
+            resultados.append(resultado)
+        return resultados
@@ -32,3 +32,7 @@ class NiboRateLimitError(NiboAPIError):
     """Limite de requisições excedido"""
     pass
 
+
+class NiboEscritaIncertaError(NiboAPIError):
+    """Escrita anterior com a mesma chave de idempotência sem desfecho conhecido"""
+    pass
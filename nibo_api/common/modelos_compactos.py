@@ -0,0 +1,555 @@
+"""
+Modelos compactos (__slots__) com decodificação preguiçosa dos campos
+
+Variantes de `nibo_api.common.models` para grandes volumes (ex: exportação
+de 100 mil agendamentos). Cada objeto guarda os valores brutos da API numa
+tupla e só converte um campo (UUID, datetime, modelos aninhados) no primeiro
+acesso. Com um Internador, stakeholders, categorias e textos repetidos entre
+os itens de uma página passam a ser um único objeto.
+
+Exemplo:
+    pagina = client.agendamentos_receber.listar_abertos()
+    agendamentos = agendamentos_compactos(pagina)
+    total = sum(a.value for a in agendamentos)   # só 'value' é decodificado
+"""
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional
+from uuid import UUID
+
+from nibo_api.common.datas import para_datetime as decodificar_datetime
+
+UUID_ZERO = UUID("00000000-0000-0000-0000-000000000000")
+
+_AUSENTE = object()
+
+
+def decodificar_uuid(valor: Any) -> UUID:
+    """Converte o texto de um UUID (mantém instâncias de UUID)"""
+    return valor if isinstance(valor, UUID) else UUID(valor)
+
+
+class Campo:
+    """
+    Descritor de um campo decodificado sob demanda
+
+    O valor bruto fica na tupla `_valores` do objeto. Campos sem
+    `decodificar` são devolvidos diretamente; os demais são convertidos no
+    primeiro acesso e guardados no dicionário `_cache` do objeto (criado só
+    quando algum campo é decodificado). Valores ausentes ou None resultam
+    em `padrao` (ou na chamada de `padrao` quando ele é callable, para
+    listas e dicionários).
+    """
+
+    __slots__ = ("chave", "decodificar", "padrao", "repetido", "nome", "indice")
+
+    def __init__(
+        self,
+        chave: str,
+        decodificar: Optional[Callable[[Any], Any]] = None,
+        padrao: Any = None,
+        repetido: bool = False
+    ):
+        """
+        Inicializa o campo
+
+        Args:
+            chave: Nome do campo no JSON da API (ex: "dueDate")
+            decodificar: Conversão do valor bruto (ex: decodificar_uuid)
+            padrao: Valor (ou fábrica) usado quando o campo falta ou é None
+            repetido: Se True, textos iguais entre itens viram um só objeto
+                      (ex: datas, usuários, tipos)
+        """
+        self.chave = chave
+        self.decodificar = decodificar
+        self.padrao = padrao
+        self.repetido = repetido
+        self.nome = None
+        self.indice = None
+
+    def __set_name__(self, dono, nome):
+        self.nome = nome
+
+    def __get__(self, obj, tipo=None):
+        if obj is None:
+            return self
+        bruto = obj._valores[self.indice]
+        if self.decodificar is None and bruto is not None:
+            return bruto
+        cache = obj._cache
+        if cache is None:
+            cache = obj._cache = {}
+        else:
+            valor = cache.get(self.indice, _AUSENTE)
+            if valor is not _AUSENTE:
+                return valor
+        valor = cache[self.indice] = self.converter(obj, bruto)
+        return valor
+
+    def preparar(self, bruto: Any, internador: Optional["Internador"]) -> Any:
+        """Ajusta o valor bruto guardado na construção (compartilha textos repetidos)"""
+        if internador is not None and isinstance(bruto, str):
+            return internador.texto(bruto)
+        return bruto
+
+    def converter(self, obj, bruto: Any) -> Any:
+        """Converte o valor bruto (sobrescrito por campos aninhados)"""
+        if bruto is None:
+            return self.padrao() if callable(self.padrao) else self.padrao
+        return self.decodificar(bruto) if self.decodificar is not None else bruto
+
+
+class Aninhado(Campo):
+    """
+    Campo com um modelo compacto aninhado
+
+    Com Internador, dicionários com o mesmo identificador passam a ser um
+    só e a decodificação devolve sempre a mesma instância.
+    """
+
+    __slots__ = ("modelo",)
+
+    def __init__(self, chave: str, modelo: type):
+        super().__init__(chave, decodificar=modelo, repetido=modelo._chave_id is not None)
+        self.modelo = modelo
+
+    def preparar(self, bruto: Any, internador: Optional["Internador"]) -> Any:
+        if internador is None or not isinstance(bruto, dict):
+            return bruto
+        identificador = bruto.get(self.modelo._chave_id)
+        if identificador is None:
+            return bruto
+        return internador.objeto(("dict", self.modelo, identificador), lambda: bruto)
+
+    def converter(self, obj, bruto: Any) -> Any:
+        if bruto is None:
+            return None
+        return self.modelo.de_dict(bruto, obj._internador)
+
+
+class ListaAninhada(Campo):
+    """
+    Campo com uma lista de modelos compactos aninhados
+
+    Os itens já são guardados como modelos compactos na construção (mais
+    leves que os dicionários), e continuam decodificando seus campos sob
+    demanda.
+    """
+
+    __slots__ = ("modelo",)
+
+    def __init__(self, chave: str, modelo: type):
+        super().__init__(chave, repetido=True)
+        self.modelo = modelo
+
+    def __get__(self, obj, tipo=None):
+        if obj is None:
+            return self
+        return list(obj._valores[self.indice] or ())
+
+    def preparar(self, bruto: Any, internador: Optional["Internador"]) -> Any:
+        if not bruto:
+            return None
+        return tuple(self.modelo.de_dict(item, internador) for item in bruto)
+
+
+class _MetaModelo(type):
+    """Numera os Campos declarados e pré-calcula o construtor da classe"""
+
+    def __new__(mcs, nome, bases, namespace):
+        namespace.setdefault("__slots__", ())
+        cls = super().__new__(mcs, nome, bases, namespace)
+        campos = {}
+        for base in reversed(cls.__mro__):
+            for chave, valor in vars(base).items():
+                if isinstance(valor, Campo):
+                    campos[chave] = valor
+        for indice, campo in enumerate(campos.values()):
+            campo.indice = indice
+        cls._campos = campos
+        cls._chaves = tuple(campo.chave for campo in campos.values())
+        cls._conjunto_chaves = frozenset(cls._chaves)
+        cls._preparar = tuple(
+            (campo.indice, campo.preparar) for campo in campos.values() if campo.repetido
+        )
+        return cls
+
+
+class ModeloCompacto(metaclass=_MetaModelo):
+    """
+    Base dos modelos compactos
+
+    Subclasses declaram atributos Campo/Aninhado/ListaAninhada e, se o
+    recurso tiver identificador, `_chave_id` (campo do JSON usado para
+    compartilhar instâncias no Internador). Os valores brutos ficam numa
+    tupla na ordem dos campos; chaves desconhecidas vão para `_extras`.
+    """
+
+    __slots__ = ("_valores", "_cache", "_extras", "_internador")
+    _campos: Dict[str, Campo] = {}
+    _chave_id: Optional[str] = None
+
+    def __init__(self, dados: Dict[str, Any], internador: Optional["Internador"] = None):
+        """
+        Inicializa o modelo (nenhum campo é decodificado aqui)
+
+        Args:
+            dados: Dicionário retornado pela API
+            internador: Internador da página (opcional)
+        """
+        valores = tuple(map(dados.get, self._chaves))
+        if self._preparar:
+            valores = list(valores)
+            for indice, preparar in self._preparar:
+                valores[indice] = preparar(valores[indice], internador)
+            valores = tuple(valores)
+        self._valores = valores
+        self._cache = None
+        extras = dados.keys() - self._conjunto_chaves
+        self._extras = {chave: dados[chave] for chave in extras} if extras else None
+        self._internador = internador
+
+    @classmethod
+    def de_dict(cls, dados: Dict[str, Any], internador: Optional["Internador"] = None) -> "ModeloCompacto":
+        """
+        Cria o modelo, reaproveitando a instância já vista no Internador
+
+        Args:
+            dados: Dicionário retornado pela API
+            internador: Internador da página (opcional)
+
+        Returns:
+            Instância do modelo
+        """
+        if internador is None or cls._chave_id is None:
+            return cls(dados, internador)
+        identificador = dados.get(cls._chave_id)
+        if identificador is None:
+            return cls(dados, internador)
+        return internador.objeto((cls, identificador), lambda: cls(dados, internador))
+
+    @property
+    def dados(self) -> Dict[str, Any]:
+        """Dicionário equivalente ao retornado pela API"""
+        dados = {}
+        for campo, bruto in zip(self._campos.values(), self._valores):
+            if bruto is None:
+                continue
+            if isinstance(campo, ListaAninhada):
+                bruto = [item.dados for item in bruto]
+            dados[campo.chave] = bruto
+        if self._extras:
+            dados.update(self._extras)
+        return dados
+
+    def para_dict(self) -> Dict[str, Any]:
+        """Todos os campos decodificados, pelo nome do atributo"""
+        return {nome: getattr(self, nome) for nome in self._campos}
+
+    def __eq__(self, outro):
+        if type(outro) is not type(self):
+            return NotImplemented
+        return self._valores == outro._valores and self._extras == outro._extras
+
+    __hash__ = None
+
+    def __repr__(self):
+        chave = self._chave_id and self._valores[self._chaves.index(self._chave_id)]
+        return f"{type(self).__name__}({chave!r})" if chave else f"{type(self).__name__}(...)"
+
+
+class Internador:
+    """
+    Compartilha objetos repetidos entre os itens de uma página
+
+    Guarda uma instância por identificador (stakeholders, categorias) e uma
+    cópia de cada texto repetido. Use um Internador por lote de páginas que
+    deve ficar em memória junto; ele mantém referências a tudo que viu.
+    """
+
+    __slots__ = ("_objetos", "_textos")
+
+    def __init__(self):
+        self._objetos: Dict[Hashable, Any] = {}
+        self._textos: Dict[str, str] = {}
+
+    def objeto(self, chave: Hashable, criar: Callable[[], Any]) -> Any:
+        """Retorna a instância já registrada para a chave ou registra uma nova"""
+        objeto = self._objetos.get(chave)
+        if objeto is None:
+            objeto = self._objetos[chave] = criar()
+        return objeto
+
+    def texto(self, valor: str) -> str:
+        """Retorna a cópia canônica de um texto"""
+        return self._textos.setdefault(valor, valor)
+
+    def __len__(self):
+        return len(self._objetos)
+
+
+class StakeholderCompacto(ModeloCompacto):
+    """Versão compacta de models.Stakeholder"""
+    _chave_id = "id"
+
+    id = Campo("id", decodificar_uuid)
+    name = Campo("name")
+    is_deleted = Campo("isDeleted", padrao=False)
+    type = Campo("type", repetido=True)
+    cpf_cnpj = Campo("cpfCnpj")
+
+
+class CategoriaElementoCompacta(ModeloCompacto):
+    """Versão compacta de models.CategoryElement"""
+
+    id = Campo("id", decodificar_uuid)
+    category_id = Campo("categoryId", decodificar_uuid, repetido=True)
+    category_name = Campo("categoryName", repetido=True)
+    value = Campo("value", float, padrao=0.0)
+    description = Campo("description", padrao="")
+    type = Campo("type", repetido=True)
+    parent = Campo("parent", padrao="", repetido=True)
+    parent_id = Campo("parentId", decodificar_uuid, padrao=UUID_ZERO, repetido=True)
+
+
+class RecorrenciaCompacta(ModeloCompacto):
+    """Versão compacta de models.Recurrence"""
+    _chave_id = "id"
+
+    id = Campo("id", decodificar_uuid)
+    interval = Campo("interval")
+    interval_type = Campo("intervalType")
+    interval_type_description = Campo("intervalTypeDescription", repetido=True)
+    end_type = Campo("endType")
+    end_type_description = Campo("endTypeDescription", repetido=True)
+    provision_in_advance = Campo("provisionInAdvance", padrao=0)
+    base_day = Campo("baseDay", padrao=0)
+
+
+class AgendamentoCompacto(ModeloCompacto):
+    """Versão compacta de models.AgendamentoRecebimento (agendamentos a receber e a pagar)"""
+
+    schedule_id = Campo("scheduleId", decodificar_uuid)
+    type = Campo("type", repetido=True)
+    is_entry = Campo("isEntry", padrao=False)
+    is_bill = Campo("isBill", padrao=False)
+    is_debit_note = Campo("isDebitNote", padrao=False)
+    is_flagged = Campo("isFlagged", padrao=False)
+    is_dued = Campo("isDued", padrao=False)
+    due_date = Campo("dueDate", decodificar_datetime, repetido=True)
+    accrual_date = Campo("accrualDate", decodificar_datetime, repetido=True)
+    schedule_date = Campo("scheduleDate", decodificar_datetime, repetido=True)
+    create_date = Campo("createDate", decodificar_datetime, repetido=True)
+    create_user = Campo("createUser", repetido=True)
+    update_date = Campo("updateDate", decodificar_datetime, repetido=True)
+    update_user = Campo("updateUser", repetido=True)
+    value = Campo("value", float, padrao=0.0)
+    is_paid = Campo("isPaid", padrao=False)
+    cost_center_value_type = Campo("costCenterValueType", padrao=0)
+    paid_value = Campo("paidValue", float, padrao=0.0)
+    open_value = Campo("openValue", float, padrao=0.0)
+    stakeholder_id = Campo("stakeholderId", decodificar_uuid, padrao=UUID_ZERO, repetido=True)
+    stakeholder = Aninhado("stakeholder", StakeholderCompacto)
+    description = Campo("description", padrao="")
+    reference = Campo("reference", padrao="")
+    category = Aninhado("category", StakeholderCompacto)
+    has_installment = Campo("hasInstallment", padrao=False)
+    has_recurrence = Campo("hasRecurrence", padrao=False)
+    categories = ListaAninhada("categories", CategoriaElementoCompacta)
+    cost_centers = Campo("costCenters", padrao=list)
+    recurrence = Aninhado("recurrence", RecorrenciaCompacta)
+    has_open_entry_promise = Campo("hasOpenEntryPromise", padrao=False)
+    has_entry_promise = Campo("hasEntryPromise", padrao=False)
+    auto_generate_entry_promise = Campo("autoGenerateEntryPromise", padrao=False)
+    has_invoice = Campo("hasInvoice", padrao=False)
+    has_pending_invoice = Campo("hasPendingInvoice", padrao=False)
+    has_schedule_invoice = Campo("hasScheduleInvoice", padrao=False)
+    custom_attributes = Campo("customAttributes", padrao=dict)
+    auto_generate_nf_se_type = Campo("autoGenerateNFSeType", padrao=0)
+    is_payment_scheduled = Campo("isPaymentScheduled", padrao=False)
+
+
+class ReferenciaCompacta(ModeloCompacto):
+    """Referência a outro recurso ({'id', 'name'}), ex: conta, usuário, departamento"""
+    _chave_id = "id"
+
+    id = Campo("id", decodificar_uuid)
+    name = Campo("name")
+
+
+class LancamentoCompacto(ModeloCompacto):
+    """Pagamento ou recebimento já realizado (/payments, /receipts, extratos)"""
+
+    entry_id = Campo("entryId", decodificar_uuid)
+    schedule_id = Campo("scheduleId", decodificar_uuid)
+    type = Campo("type", repetido=True)
+    date = Campo("date", decodificar_datetime, repetido=True)
+    value = Campo("value", float, padrao=0.0)
+    description = Campo("description", padrao="")
+    reference = Campo("reference", padrao="")
+    identifier = Campo("identifier")
+    is_transfer = Campo("isTransfer", padrao=False)
+    is_reconciled = Campo("isReconciled", padrao=False)
+    is_flagged = Campo("isFlagged", padrao=False)
+    stakeholder = Aninhado("stakeholder", StakeholderCompacto)
+    category = Aninhado("category", StakeholderCompacto)
+    categories = ListaAninhada("categories", CategoriaElementoCompacta)
+    account = Aninhado("account", ReferenciaCompacta)
+    cost_centers = Campo("costCenters", padrao=list)
+    create_date = Campo("createDate", decodificar_datetime, repetido=True)
+    create_user = Campo("createUser", repetido=True)
+    update_date = Campo("updateDate", decodificar_datetime, repetido=True)
+    update_user = Campo("updateUser", repetido=True)
+
+
+class ContaCompacta(ModeloCompacto):
+    """Conta bancária (/accounts)"""
+    _chave_id = "id"
+
+    id = Campo("id", decodificar_uuid)
+    name = Campo("name")
+    type = Campo("type", repetido=True)
+    bank_id = Campo("bankId", decodificar_uuid, repetido=True)
+    agency = Campo("agency")
+    number = Campo("number")
+    is_deleted = Campo("isDeleted", padrao=False)
+    is_archived = Campo("isArchived", padrao=False)
+
+
+class TransferenciaCompacta(ModeloCompacto):
+    """Transferência entre contas (/transfers)"""
+
+    id = Campo("id", decodificar_uuid)
+    date = Campo("date", decodificar_datetime, repetido=True)
+    value = Campo("value", float, padrao=0.0)
+    description = Campo("description", padrao="")
+    from_account_id = Campo("fromAccountId", decodificar_uuid, repetido=True)
+    to_account_id = Campo("toAccountId", decodificar_uuid, repetido=True)
+    from_account = Aninhado("fromAccount", ReferenciaCompacta)
+    to_account = Aninhado("toAccount", ReferenciaCompacta)
+
+
+class CentroCustoCompacto(ModeloCompacto):
+    """Centro de custo (/costcenters)"""
+    _chave_id = "costCenterId"
+
+    cost_center_id = Campo("costCenterId", decodificar_uuid)
+    description = Campo("description", padrao="")
+    is_deleted = Campo("isDeleted", padrao=False)
+
+
+class CategoriaCompacta(ModeloCompacto):
+    """Versão compacta de models.Categoria (/schedules/categories)"""
+    _chave_id = "id"
+
+    id = Campo("id", decodificar_uuid)
+    name = Campo("name")
+    type = Campo("type", repetido=True)
+    is_deleted = Campo("isDeleted", padrao=False)
+    parent_id = Campo("parentId", decodificar_uuid, repetido=True)
+
+
+class ContatoCompacto(ModeloCompacto):
+    """Versão compacta de models.Cliente (clientes, fornecedores, funcionários e sócios)"""
+    _chave_id = "id"
+
+    id = Campo("id", decodificar_uuid)
+    name = Campo("name")
+    is_deleted = Campo("isDeleted", padrao=False)
+    type = Campo("type", repetido=True)
+    document = Campo("document")
+    communication = Campo("communication")
+    address = Campo("address")
+    bank_account_information = Campo("bankAccountInformation")
+    company_information = Campo("companyInformation")
+
+
+class ClienteObrigacoesCompacto(ModeloCompacto):
+    """Cliente de um escritório contábil (Nibo Obrigações)"""
+    _chave_id = "id"
+
+    id = Campo("id", decodificar_uuid)
+    name = Campo("name")
+    code = Campo("code")
+    document_number = Campo("documentNumber")
+    email = Campo("email")
+    is_active = Campo("isActive", padrao=True)
+
+
+class TarefaCompacta(ModeloCompacto):
+    """Tarefa do Nibo Obrigações"""
+    _chave_id = "id"
+
+    id = Campo("id", decodificar_uuid)
+    name = Campo("name")
+    description = Campo("description", padrao="")
+    status = Campo("status", padrao=0)
+    frequency = Campo("frequency", padrao=0)
+    frequency_schedule = Campo("frequencySchedule", padrao=0)
+    skip_holiday = Campo("skipHoliday", padrao=0)
+    dead_line = Campo("deadLine", decodificar_datetime, repetido=True)
+    task_template_id = Campo("taskTemplateId", decodificar_uuid, repetido=True)
+    in_charge_user = Aninhado("inChargeUser", ReferenciaCompacta)
+    customer = Aninhado("customer", ReferenciaCompacta)
+    department = Aninhado("department", ReferenciaCompacta)
+
+
+class ObrigacaoCompacta(ModeloCompacto):
+    """Descrição da obrigação de um item do relatório ({'id', 'name', 'type'})"""
+    _chave_id = "id"
+
+    id = Campo("id")
+    name = Campo("name")
+    type = Campo("type")
+
+
+class ItemRelatorioObrigacoesCompacto(ModeloCompacto):
+    """Item de /reports/obligations/complete (Nibo Obrigações)"""
+
+    id = Campo("id")
+    number = Campo("number")
+    due_date = Campo("dueDate", decodificar_datetime, repetido=True)
+    filed_date = Campo("filedDate", decodificar_datetime, repetido=True)
+    accrual = Campo("accrual", repetido=True)
+    status = Campo("status")
+    status_type = Campo("statusType")
+    destination_type = Campo("destinationType")
+    value = Campo("value", float)
+    obligation = Aninhado("obligation", ObrigacaoCompacta)
+    customer = Aninhado("customer", ReferenciaCompacta)
+    department = Aninhado("department", ReferenciaCompacta)
+
+
+def agendamentos_compactos(
+    pagina: Any,
+    internador: Optional[Internador] = None
+) -> List[AgendamentoCompacto]:
+    """
+    Converte uma página (ou lista de itens) de agendamentos em modelos compactos
+
+    Stakeholders e categorias repetidos passam a apontar para o mesmo
+    dicionário (e, quando decodificados, para o mesmo objeto) e textos
+    repetidos (datas, usuários, tipos) viram uma só cópia, o que libera as
+    duplicatas devolvidas pela API assim que a página é descartada.
+
+    Args:
+        pagina: Resposta com 'items' ou lista/iterável de dicionários
+        internador: Internador a compartilhar entre páginas (padrão: um novo)
+
+    Returns:
+        Lista de AgendamentoCompacto
+    """
+    items: Iterable[Dict[str, Any]] = pagina.get("items", []) if isinstance(pagina, dict) else pagina
+    internador = internador if internador is not None else Internador()
+    return [AgendamentoCompacto(dados, internador) for dados in items]
+
+
+def dados_do_item(item: Any) -> Any:
+    """
+    Dicionário da API de um item de listagem, com ou sem typed=True
+
+    Args:
+        item: Dicionário da API ou modelo compacto
+
+    Returns:
+        `item.dados` para modelos compactos; demais valores sem alteração
+    """
+    return item.dados if isinstance(item, ModeloCompacto) else item
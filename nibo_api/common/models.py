@@ -6,6 +6,8 @@ from typing import Optional, List, Any, Dict
 from uuid import UUID
 from datetime import datetime
 
+from nibo_api.common.datas import para_datetime
+
 
 @dataclass
 class CategoryElement:
@@ -127,12 +129,6 @@ class AgendamentoRecebimento:
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'AgendamentoRecebimento':
         """Cria instância a partir de dicionário"""
-        # Parse de datas
-        def parse_datetime(dt_str: str) -> datetime:
-            if isinstance(dt_str, datetime):
-                return dt_str
-            return datetime.fromisoformat(dt_str.replace('Z', '+00:00'))
-        
         categories = [
             CategoryElement.from_dict(cat) 
             for cat in data.get("categories", [])
@@ -150,12 +146,12 @@ class AgendamentoRecebimento:
             is_debit_note=data.get("isDebitNote", False),
             is_flagged=data.get("isFlagged", False),
             is_dued=data.get("isDued", False),
-            due_date=parse_datetime(data["dueDate"]),
-            accrual_date=parse_datetime(data["accrualDate"]),
-            schedule_date=parse_datetime(data["scheduleDate"]),
-            create_date=parse_datetime(data["createDate"]),
+            due_date=para_datetime(data["dueDate"]),
+            accrual_date=para_datetime(data["accrualDate"]),
+            schedule_date=para_datetime(data["scheduleDate"]),
+            create_date=para_datetime(data["createDate"]),
             create_user=data["createUser"],
-            update_date=parse_datetime(data["updateDate"]),
+            update_date=para_datetime(data["updateDate"]),
             update_user=data["updateUser"],
             value=float(data["value"]),
             is_paid=data.get("isPaid", False),
@@ -0,0 +1,648 @@
+"""
+Avaliação local de expressões OData ($filter, $orderby, $top, $skip)
+
+Interpreta o subconjunto de OData usado pelas interfaces e pela CLI
+(`contains(stakeholder/name, 'X')`, `dueDate ge 2025-01-01T00:00:00Z and
+dueDate le ...`, `isPaid eq false`) para responder consultas sem ir à API:
+
+- como predicado sobre itens em memória (`compilar_predicado`, `aplicar_odata`)
+- como SQL sobre o espelho local (`CompiladorSQL`)
+
+As duas formas usam as mesmas funções auxiliares (registradas no SQLite por
+`registrar_funcoes`), então devolvem os mesmos itens. Como no servidor,
+comparações de texto ignoram maiúsculas e minúsculas e datas com fuso são
+comparadas em UTC.
+
+Suportado: eq, ne, gt, ge, lt, le, in, and, or, not, parênteses; textos entre
+aspas simples, números, true/false/null, datas (2025-01-20 ou
+2025-01-20T10:30:00Z, também datetime'...'), GUIDs; funções contains,
+substringof, startswith, endswith, tolower, toupper, trim, length, year,
+month e day. Campos aninhados usam '/' (ex: stakeholder/name).
+
+Exemplo:
+    aplicar_odata(itens, odata_filter="contains(stakeholder/name, 'silva')",
+                  odata_orderby="dueDate desc", odata_top=10)
+"""
+import operator
+import re
+import sys
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from nibo_api.common.datas import para_datetime
+from nibo_api.common.modelos_compactos import dados_do_item
+
+
+class ErroOData(ValueError):
+    """Expressão OData inválida ou não suportada na avaliação local"""
+    pass
+
+
+_TOKEN = re.compile(r"""\s*(?:
+    (?P<tipado>(?:datetime|datetimeoffset|guid)'(?:[^']|'')*')
+   |(?P<texto>'(?:[^']|'')*')
+   |(?P<guid>[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12})
+   |(?P<datahora>\d{4}-\d{2}-\d{2}(?:T\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?(?:Z|[+-]\d{2}:\d{2})?)?)
+   |(?P<numero>-?\d+(?:\.\d+)?)
+   |(?P<simbolo>[(),])
+   |(?P<nome>[A-Za-z_]\w*(?:/[A-Za-z_]\w*)*)
+)""", re.VERBOSE)
+
+_CAMINHO = re.compile(r"[A-Za-z_]\w*(?:/[A-Za-z_]\w*)*")
+
+_COMPARACOES = {"eq", "ne", "gt", "ge", "lt", "le"}
+
+_OPERADORES = {
+    "eq": operator.eq, "ne": operator.ne,
+    "gt": operator.gt, "ge": operator.ge, "lt": operator.lt, "le": operator.le,
+}
+
+_OPERADORES_SQL = {"eq": "IS", "ne": "IS NOT", "gt": ">", "ge": ">=", "lt": "<", "le": "<="}
+
+# nome -> (quantidade de argumentos, devolve booleano)
+_FUNCOES = {
+    "contains": (2, True), "substringof": (2, True), "startswith": (2, True), "endswith": (2, True),
+    "tolower": (1, False), "toupper": (1, False), "trim": (1, False), "length": (1, False),
+    "year": (1, False), "month": (1, False), "day": (1, False),
+}
+
+
+# Funções auxiliares (usadas no Python e registradas no SQLite)
+
+def _minusculas(valor: Any) -> Any:
+    return valor.casefold() if isinstance(valor, str) else valor
+
+
+def _instante(valor: Any) -> Optional[datetime]:
+    """datetime sem fuso, em UTC quando o valor informa fuso (None se não for data)"""
+    if valor is None or isinstance(valor, (bool, int, float)):
+        return None
+    try:
+        instante = para_datetime(valor)
+    except (TypeError, ValueError):
+        return None
+    if instante.tzinfo is not None:
+        instante = instante.astimezone(timezone.utc).replace(tzinfo=None)
+    return instante
+
+
+def texto_instante(valor: Any) -> Optional[str]:
+    """
+    Data/hora normalizada em texto de largura fixa (UTC, microssegundos)
+
+    Textos nesse formato ordenam como as datas que representam; é assim que
+    o espelho local grava as colunas de data indexadas.
+
+    Args:
+        valor: Texto ISO 8601 ou datetime
+
+    Returns:
+        Texto 'YYYY-MM-DDTHH:MM:SS.ffffff', ou None se o valor não for data
+    """
+    instante = _instante(valor)
+    return instante.isoformat(timespec="microseconds") if instante is not None else None
+
+
+def _parte_data(parte: str, valor: Any) -> Optional[int]:
+    instante = _instante(valor)
+    return getattr(instante, parte) if instante is not None else None
+
+
+def _contem(texto: Any, trecho: Any) -> Optional[bool]:
+    if isinstance(texto, str) and isinstance(trecho, str):
+        return trecho.casefold() in texto.casefold()
+    return None
+
+
+def _comeca(texto: Any, trecho: Any) -> Optional[bool]:
+    if isinstance(texto, str) and isinstance(trecho, str):
+        return texto.casefold().startswith(trecho.casefold())
+    return None
+
+
+def _termina(texto: Any, trecho: Any) -> Optional[bool]:
+    if isinstance(texto, str) and isinstance(trecho, str):
+        return texto.casefold().endswith(trecho.casefold())
+    return None
+
+
+def _aparar(valor: Any) -> Any:
+    return valor.strip(" ") if isinstance(valor, str) else valor
+
+
+def _tamanho(valor: Any) -> Optional[int]:
+    return len(valor) if isinstance(valor, str) else None
+
+
+_FUNCOES_SQL = {
+    "nibo_lower": (1, _minusculas),
+    "nibo_instante": (1, texto_instante),
+    "nibo_parte": (2, _parte_data),
+    "nibo_contem": (2, _contem),
+    "nibo_comeca": (2, _comeca),
+    "nibo_termina": (2, _termina),
+    "nibo_aparar": (1, _aparar),
+    "nibo_tamanho": (1, _tamanho),
+    "nibo_comparar": (4, lambda op, a, b, tipo: _comparar(op, a, b, tipo)),
+}
+
+
+def registrar_funcoes(conexao):
+    """
+    Registra na conexão SQLite as funções usadas pelo SQL do CompiladorSQL
+
+    Args:
+        conexao: sqlite3.Connection
+    """
+    # deterministic (permite usar as funções em índices) só existe a partir do Python 3.8
+    opcoes = {"deterministic": True} if sys.version_info >= (3, 8) else {}
+    for nome, (argumentos, funcao) in _FUNCOES_SQL.items():
+        conexao.create_function(nome, argumentos, funcao, **opcoes)
+
+
+# Análise da expressão
+
+def _tokens(texto: str) -> List[Tuple[str, Any]]:
+    tokens = []
+    posicao = 0
+    texto = texto.rstrip()
+    while posicao < len(texto):
+        correspondencia = _TOKEN.match(texto, posicao)
+        if not correspondencia or correspondencia.end() == posicao:
+            raise ErroOData(f"Expressão OData inválida perto de: {texto[posicao:posicao + 20]!r}")
+        posicao = correspondencia.end()
+        tipo = correspondencia.lastgroup
+        valor = correspondencia.group(tipo)
+        if tipo == "texto":
+            tokens.append(("valor", (valor[1:-1].replace("''", "'"), "texto")))
+        elif tipo == "tipado":
+            prefixo, _, conteudo = valor.partition("'")
+            conteudo = conteudo[:-1].replace("''", "'")
+            if prefixo == "guid":
+                tokens.append(("valor", (conteudo, "texto")))
+            else:
+                tokens.append(("valor", (_literal_data(conteudo), "datahora")))
+        elif tipo == "guid":
+            tokens.append(("valor", (valor, "texto")))
+        elif tipo == "datahora":
+            tokens.append(("valor", (_literal_data(valor), "datahora")))
+        elif tipo == "numero":
+            tokens.append(("valor", (float(valor) if "." in valor else int(valor), "numero")))
+        elif tipo == "simbolo":
+            tokens.append((valor, valor))
+        else:
+            minusculo = valor.lower()
+            if minusculo in ("true", "false"):
+                tokens.append(("valor", (minusculo == "true", "numero")))
+            elif minusculo == "null":
+                tokens.append(("valor", (None, "nulo")))
+            elif minusculo in _COMPARACOES or minusculo in ("and", "or", "not", "in"):
+                tokens.append(("operador", minusculo))
+            else:
+                tokens.append(("nome", valor))
+    return tokens
+
+
+def _literal_data(texto: str) -> datetime:
+    instante = _instante(texto)
+    if instante is None:
+        raise ErroOData(f"Data inválida na expressão OData: {texto}")
+    return instante
+
+
+class _Analisador:
+    """Analisador descendente recursivo; produz uma árvore de tuplas"""
+
+    def __init__(self, texto: str):
+        self.tokens = _tokens(texto)
+        self.posicao = 0
+
+    def _atual(self) -> Tuple[str, Any]:
+        return self.tokens[self.posicao] if self.posicao < len(self.tokens) else ("fim", None)
+
+    def _consumir(self, tipo: str, valor: Any = None) -> Tuple[str, Any]:
+        token = self._atual()
+        if token[0] != tipo or (valor is not None and token[1] != valor):
+            encontrado = token[1] if token[0] != "fim" else "fim da expressão"
+            raise ErroOData(f"Expressão OData inválida: esperado '{valor or tipo}', encontrado '{encontrado}'")
+        self.posicao += 1
+        return token
+
+    def analisar(self):
+        arvore = self._ou()
+        if self._atual()[0] != "fim":
+            raise ErroOData(f"Expressão OData inválida: '{self._atual()[1]}' inesperado")
+        return arvore
+
+    def _ou(self):
+        esquerda = self._e()
+        while self._atual() == ("operador", "or"):
+            self.posicao += 1
+            esquerda = ("ou", esquerda, self._e())
+        return esquerda
+
+    def _e(self):
+        esquerda = self._nao()
+        while self._atual() == ("operador", "and"):
+            self.posicao += 1
+            esquerda = ("e", esquerda, self._nao())
+        return esquerda
+
+    def _nao(self):
+        if self._atual() == ("operador", "not"):
+            self.posicao += 1
+            return ("nao", self._nao())
+        return self._comparacao()
+
+    def _comparacao(self):
+        esquerda = self._primario()
+        tipo, valor = self._atual()
+        if tipo == "operador" and valor in _COMPARACOES:
+            self.posicao += 1
+            return ("cmp", valor, esquerda, self._primario())
+        if (tipo, valor) == ("operador", "in"):
+            # "a in (x, y)" equivale a "a eq x or a eq y"
+            self.posicao += 1
+            self._consumir("(")
+            opcoes = [self._primario()]
+            while self._atual()[0] == ",":
+                self.posicao += 1
+                opcoes.append(self._primario())
+            self._consumir(")")
+            expressao = ("cmp", "eq", esquerda, opcoes[0])
+            for opcao in opcoes[1:]:
+                expressao = ("ou", expressao, ("cmp", "eq", esquerda, opcao))
+            return expressao
+        if esquerda[0] == "func" and _FUNCOES[esquerda[1]][1]:
+            return esquerda
+        if esquerda[0] in ("ou", "e", "nao", "cmp"):
+            return esquerda
+        # Campo ou valor isolado em contexto booleano (ex: "isPaid")
+        return ("cmp", "eq", esquerda, ("valor", True, "numero"))
+
+    def _primario(self):
+        tipo, valor = self._atual()
+        if tipo == "(":
+            self.posicao += 1
+            expressao = self._ou()
+            self._consumir(")")
+            return expressao
+        if tipo == "valor":
+            self.posicao += 1
+            return ("valor",) + valor
+        if tipo == "nome":
+            self.posicao += 1
+            if self._atual()[0] == "(":
+                return self._funcao(valor)
+            return ("campo", valor)
+        encontrado = valor if tipo != "fim" else "fim da expressão"
+        raise ErroOData(f"Expressão OData inválida: '{encontrado}' inesperado")
+
+    def _funcao(self, nome: str):
+        funcao = nome.lower()
+        if funcao not in _FUNCOES:
+            raise ErroOData(f"Função OData não suportada na consulta local: {nome}")
+        self._consumir("(")
+        argumentos = [self._primario()]
+        while self._atual()[0] == ",":
+            self.posicao += 1
+            argumentos.append(self._primario())
+        self._consumir(")")
+        if len(argumentos) != _FUNCOES[funcao][0]:
+            raise ErroOData(f"Função {nome} espera {_FUNCOES[funcao][0]} argumento(s)")
+        if funcao == "substringof":
+            funcao, argumentos = "contains", argumentos[::-1]
+        return ("func", funcao, argumentos)
+
+
+def analisar_filtro(texto: str):
+    """
+    Analisa uma expressão $filter
+
+    Args:
+        texto: Expressão OData (ex: "dueDate ge 2025-01-01T00:00:00Z")
+
+    Returns:
+        Árvore da expressão (tuplas), aceita por compilar_predicado e CompiladorSQL
+
+    Raises:
+        ErroOData: Se a expressão for inválida ou usar algo não suportado
+    """
+    return _Analisador(texto).analisar()
+
+
+def analisar_ordenacao(texto: Optional[str]) -> List[Tuple[str, bool]]:
+    """
+    Analisa uma expressão $orderby
+
+    Args:
+        texto: Ex: "dueDate desc, value"
+
+    Returns:
+        Lista de (caminho do campo, decrescente)
+
+    Raises:
+        ErroOData: Se algum termo for inválido
+    """
+    ordenacao = []
+    for termo in (texto or "").split(","):
+        partes = termo.split()
+        if not partes:
+            continue
+        direcao = partes[1].lower() if len(partes) == 2 else "asc"
+        if len(partes) > 2 or direcao not in ("asc", "desc") or not _CAMINHO.fullmatch(partes[0]):
+            raise ErroOData(f"Ordenação OData inválida: {termo.strip()!r}")
+        ordenacao.append((partes[0], direcao == "desc"))
+    return ordenacao
+
+
+# Avaliação em memória
+
+def _resolver(item: Any, caminho: str) -> Any:
+    """Valor de um campo aninhado ('a/b'); nomes sem diferenciar maiúsculas"""
+    valor = dados_do_item(item)  # modelos de typed=True
+    for parte in caminho.split("/"):
+        if not isinstance(valor, dict):
+            return None
+        if parte in valor:
+            valor = valor[parte]
+            continue
+        minusculo = parte.lower()
+        valor = next((v for k, v in valor.items() if k.lower() == minusculo), None)
+    return valor
+
+
+def _compilar_valor(no) -> Callable[[Any], Any]:
+    tipo = no[0]
+    if tipo == "valor":
+        constante = no[1]
+        return lambda item: constante
+    if tipo == "campo":
+        caminho = no[1]
+        return lambda item: _resolver(item, caminho)
+    if tipo == "func":
+        nome = no[1]
+        argumentos = [_compilar_valor(arg) for arg in no[2]]
+        if nome in ("contains", "startswith", "endswith"):
+            funcao = {"contains": _contem, "startswith": _comeca, "endswith": _termina}[nome]
+            texto, trecho = argumentos
+            return lambda item: funcao(texto(item), trecho(item))
+        argumento = argumentos[0]
+        if nome in ("tolower", "toupper"):
+            metodo = str.lower if nome == "tolower" else str.upper
+            return lambda item: _aplicar_texto(metodo, argumento(item))
+        if nome == "trim":
+            return lambda item: _aparar(argumento(item))
+        if nome == "length":
+            return lambda item: _tamanho(argumento(item))
+        return lambda item: _parte_data(nome, argumento(item))
+    # Expressão booleana usada como valor
+    return compilar_predicado(no)
+
+
+def _aplicar_texto(metodo, valor):
+    return metodo(valor) if isinstance(valor, str) else valor
+
+
+def _tipo_comparacao(esquerda, direita) -> Optional[str]:
+    for no in (direita, esquerda):
+        if no[0] == "valor":
+            return no[2]
+    return None
+
+
+def _comparar(op: str, a: Any, b: Any, tipo: Optional[str]) -> bool:
+    if tipo == "datahora":
+        a, b = _instante(a), _instante(b)
+    elif isinstance(a, str) and isinstance(b, str):
+        a, b = a.casefold(), b.casefold()
+    if a is None or b is None:
+        if op == "eq":
+            return a is None and b is None
+        if op == "ne":
+            return not (a is None and b is None)
+        return False
+    try:
+        return bool(_OPERADORES[op](a, b))
+    except TypeError:
+        return op == "ne"
+
+
+def compilar_predicado(filtro) -> Callable[[Any], bool]:
+    """
+    Converte uma expressão $filter em uma função item -> bool
+
+    Args:
+        filtro: Texto OData ou árvore de analisar_filtro
+
+    Returns:
+        Predicado aplicável a dicionários da API (ou modelos de typed=True)
+
+    Raises:
+        ErroOData: Se a expressão for inválida
+    """
+    no = analisar_filtro(filtro) if isinstance(filtro, str) else filtro
+    tipo = no[0]
+    if tipo in ("e", "ou"):
+        esquerda, direita = compilar_predicado(no[1]), compilar_predicado(no[2])
+        if tipo == "e":
+            return lambda item: esquerda(item) and direita(item)
+        return lambda item: esquerda(item) or direita(item)
+    if tipo == "nao":
+        interno = compilar_predicado(no[1])
+        return lambda item: not interno(item)
+    if tipo == "cmp":
+        op, esquerda, direita = no[1], no[2], no[3]
+        tipo_comparacao = _tipo_comparacao(esquerda, direita)
+        valor_esquerda, valor_direita = _compilar_valor(esquerda), _compilar_valor(direita)
+        return lambda item: _comparar(op, valor_esquerda(item), valor_direita(item), tipo_comparacao)
+    valor = _compilar_valor(no)
+    return lambda item: bool(valor(item))
+
+
+def _chave_ordenacao(valor: Any) -> Tuple:
+    """Ordem entre tipos como no SQLite: nulos, números, textos, demais"""
+    if valor is None:
+        return (0,)
+    if isinstance(valor, (bool, int, float)):
+        return (1, valor)
+    if isinstance(valor, str):
+        return (2, valor)
+    return (3, str(valor))
+
+
+def aplicar_odata(
+    itens: Iterable[Any],
+    odata_filter: Optional[str] = None,
+    odata_orderby: Optional[str] = None,
+    odata_top: Optional[int] = None,
+    odata_skip: Optional[int] = None
+) -> List[Any]:
+    """
+    Aplica $filter, $orderby, $skip e $top a itens em memória
+
+    Args:
+        itens: Itens da API (dicionários ou modelos de typed=True)
+        odata_filter: Filtro OData
+        odata_orderby: Ordenação OData (sem ela, a ordem original é mantida)
+        odata_top: Limite de itens
+        odata_skip: Itens a pular
+
+    Returns:
+        Lista com os itens selecionados
+
+    Raises:
+        ErroOData: Se o filtro ou a ordenação forem inválidos
+    """
+    selecionados = list(itens)
+    if odata_filter:
+        predicado = compilar_predicado(odata_filter)
+        selecionados = [item for item in selecionados if predicado(item)]
+    # Ordenações estáveis, do último critério para o primeiro
+    for caminho, decrescente in reversed(analisar_ordenacao(odata_orderby)):
+        selecionados.sort(key=lambda item: _chave_ordenacao(_resolver(item, caminho)), reverse=decrescente)
+    inicio = odata_skip or 0
+    fim = inicio + odata_top if odata_top is not None else None
+    return selecionados[inicio:fim]
+
+
+# Compilação para SQL
+
+class CompiladorSQL:
+    """
+    Traduz $filter e $orderby para SQL sobre uma tabela com o JSON dos itens
+
+    Campos listados em `colunas` usam colunas próprias (e seus índices);
+    os demais são lidos do JSON com json_extract, cujo caminho diferencia
+    maiúsculas e minúsculas. A conexão precisa das funções de
+    registrar_funcoes.
+
+    Tipos de coluna:
+        "texto": mesmo valor do JSON (comparado sem diferenciar maiúsculas)
+        "numero": mesmo valor do JSON
+        "id": identificador gravado em minúsculas (comparação exata)
+        "datahora": data gravada com texto_instante
+    """
+
+    def __init__(self, colunas: Optional[Dict[str, Tuple[str, str]]] = None, coluna_json: str = "dados"):
+        """
+        Inicializa o compilador
+
+        Args:
+            colunas: Caminho OData -> (coluna SQL, tipo da coluna)
+            coluna_json: Coluna com o item completo em JSON
+        """
+        self.colunas = {caminho.lower(): coluna for caminho, coluna in (colunas or {}).items()}
+        self.coluna_json = coluna_json
+
+    def filtro(self, filtro) -> Tuple[str, List[Any]]:
+        """
+        Compila um $filter para uma condição WHERE
+
+        Args:
+            filtro: Texto OData ou árvore de analisar_filtro
+
+        Returns:
+            Tupla (sql, parâmetros)
+
+        Raises:
+            ErroOData: Se a expressão for inválida
+        """
+        no = analisar_filtro(filtro) if isinstance(filtro, str) else filtro
+        return self._booleano(no)
+
+    def ordem(self, ordenacao: Optional[str]) -> Tuple[str, List[Any]]:
+        """
+        Compila um $orderby para os termos do ORDER BY
+
+        Args:
+            ordenacao: Texto OData (ex: "dueDate desc, value")
+
+        Returns:
+            Tupla (sql, parâmetros); sql vazio se não houver ordenação
+
+        Raises:
+            ErroOData: Se algum termo for inválido
+        """
+        termos, parametros = [], []
+        for caminho, decrescente in analisar_ordenacao(ordenacao):
+            coluna = self.colunas.get(caminho.lower())
+            if coluna and coluna[1] != "id":
+                termos.append(f"{coluna[0]}{' DESC' if decrescente else ''}")
+            else:
+                termos.append(f"json_extract({self.coluna_json}, ?){' DESC' if decrescente else ''}")
+                parametros.append(self._caminho_json(caminho))
+        return ", ".join(termos), parametros
+
+    @staticmethod
+    def _caminho_json(caminho: str) -> str:
+        return "$." + caminho.replace("/", ".")
+
+    def _booleano(self, no) -> Tuple[str, List[Any]]:
+        tipo = no[0]
+        if tipo in ("e", "ou"):
+            esquerda, parametros_esquerda = self._booleano(no[1])
+            direita, parametros_direita = self._booleano(no[2])
+            conector = "AND" if tipo == "e" else "OR"
+            return f"({esquerda} {conector} {direita})", parametros_esquerda + parametros_direita
+        if tipo == "nao":
+            interno, parametros = self._booleano(no[1])
+            return f"(NOT {interno})", parametros
+        if tipo == "cmp":
+            return self._comparacao(no[1], no[2], no[3])
+        sql, parametros = self._valor(no)
+        return f"COALESCE({sql}, 0)", parametros
+
+    def _valor(self, no) -> Tuple[str, List[Any]]:
+        tipo = no[0]
+        if tipo == "valor":
+            return "?", [texto_instante(no[1]) if no[2] == "datahora" else no[1]]
+        if tipo == "campo":
+            coluna = self.colunas.get(no[1].lower())
+            if coluna and coluna[1] in ("texto", "numero"):
+                return coluna[0], []
+            return f"json_extract({self.coluna_json}, ?)", [self._caminho_json(no[1])]
+        if tipo == "func":
+            nome = no[1]
+            argumentos = [self._valor(arg) for arg in no[2]]
+            sqls = [sql for sql, _ in argumentos]
+            parametros = [p for _, ps in argumentos for p in ps]
+            if nome in ("contains", "startswith", "endswith"):
+                funcao = {"contains": "nibo_contem", "startswith": "nibo_comeca", "endswith": "nibo_termina"}[nome]
+                return f"{funcao}({sqls[0]}, {sqls[1]})", parametros
+            if nome in ("tolower", "toupper"):
+                # Comparações de texto já ignoram maiúsculas
+                return f"nibo_lower({sqls[0]})", parametros
+            if nome == "trim":
+                return f"nibo_aparar({sqls[0]})", parametros
+            if nome == "length":
+                return f"nibo_tamanho({sqls[0]})", parametros
+            return f"nibo_parte(?, {sqls[0]})", [nome] + parametros
+        sql, parametros = self._booleano(no)
+        return f"({sql})", parametros
+
+    def _coluna_indexada(self, no, tipo: Optional[str]) -> Optional[str]:
+        """Coluna própria que pode ser comparada diretamente com um valor do tipo dado"""
+        if no[0] != "campo":
+            return None
+        coluna = self.colunas.get(no[1].lower())
+        if coluna and (coluna[1], tipo) in (("datahora", "datahora"), ("id", "texto")):
+            return coluna[0]
+        return None
+
+    def _comparacao(self, op: str, esquerda, direita) -> Tuple[str, List[Any]]:
+        tipo = _tipo_comparacao(esquerda, direita)
+        coluna = self._coluna_indexada(esquerda, tipo)
+        if coluna is not None and direita[0] == "valor":
+            # Comparação direta com a coluna, para o SQLite usar o índice
+            valor = texto_instante(direita[1]) if tipo == "datahora" else direita[1].casefold()
+            sql = f"{coluna} {_OPERADORES_SQL[op]} ?"
+            if op not in ("eq", "ne"):
+                sql = f"COALESCE({sql}, 0)"
+            return f"({sql})", [valor]
+        sql_esquerda, parametros_esquerda = self._valor(esquerda)
+        sql_direita, parametros_direita = self._valor(direita)
+        return (
+            f"nibo_comparar(?, {sql_esquerda}, {sql_direita}, ?)",
+            [op] + parametros_esquerda + parametros_direita + [tipo]
+        )
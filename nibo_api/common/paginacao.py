@@ -0,0 +1,59 @@
+"""
+Utilitários de paginação OData ($top/$skip) para a API Nibo
+"""
+from typing import Any, List, Optional
+
+
+# Tamanho de página padrão usado pelos iteradores iter_*
+TAMANHO_PAGINA_PADRAO = 100
+
+# Chaves em que a API de Obrigações informa o total dentro de 'metadata'
+_CHAVES_TOTAL_METADATA = ("totalCount", "totalItems", "total", "count")
+
+
+def extrair_items(resposta: Any) -> List[Any]:
+    """
+    Extrai a lista de itens de uma página retornada pela API
+
+    A API Empresa retorna {'items': [...], 'count': N}, a API de Obrigações
+    retorna {'items': [...], 'metadata': {...}} e alguns endpoints (ex: CNAEs)
+    retornam a lista diretamente.
+
+    Args:
+        resposta: Resposta JSON de uma página
+
+    Returns:
+        Lista de itens da página (vazia se não houver)
+    """
+    if isinstance(resposta, list):
+        return resposta
+    if isinstance(resposta, dict):
+        return resposta.get("items") or []
+    return []
+
+
+def extrair_total(resposta: Any) -> Optional[int]:
+    """
+    Extrai o total de registros informado pela API, se houver
+
+    Args:
+        resposta: Resposta JSON de uma página
+
+    Returns:
+        Total de registros ('count' ou campo equivalente em 'metadata'),
+        ou None se a API não informar
+    """
+    if not isinstance(resposta, dict):
+        return None
+
+    count = resposta.get("count")
+    if isinstance(count, int):
+        return count
+
+    metadata = resposta.get("metadata")
+    if isinstance(metadata, dict):
+        for chave in _CHAVES_TOTAL_METADATA:
+            valor = metadata.get(chave)
+            if isinstance(valor, int):
+                return valor
+    return None
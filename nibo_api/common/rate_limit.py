@@ -0,0 +1,225 @@
+"""
+Limitação de taxa (token bucket) no lado do cliente para a API Nibo
+"""
+import hashlib
+import threading
+import time
+from typing import Optional, Dict
+
+from nibo_api.common.retry import parse_retry_after
+
+
+class TokenBucket:
+    """
+    Balde de fichas thread-safe
+
+    Acumula fichas a `taxa` por segundo até `capacidade` (rajada). Cada
+    requisição consome uma ficha; sem fichas disponíveis, a thread espera.
+    No modo adaptativo, a taxa é reduzida pela metade a cada 429 recebido e
+    volta a subir gradualmente a cada resposta bem-sucedida (AIMD).
+    """
+
+    def __init__(
+        self,
+        taxa: float,
+        capacidade: float,
+        adaptativo: bool = False,
+        taxa_minima: Optional[float] = None,
+        fator_reducao: float = 0.5,
+        incremento: Optional[float] = None
+    ):
+        """
+        Inicializa o balde
+
+        Args:
+            taxa: Fichas repostas por segundo (requisições por segundo)
+            capacidade: Máximo de fichas acumuladas (tamanho da rajada)
+            adaptativo: Se True, ajusta a taxa conforme os 429 recebidos
+            taxa_minima: Menor taxa aceita no modo adaptativo (padrão: 5% da taxa)
+            fator_reducao: Fator aplicado à taxa a cada 429 no modo adaptativo
+            incremento: Taxa recuperada a cada sucesso no modo adaptativo
+                        (padrão: 2% da taxa configurada)
+
+        Raises:
+            ValueError: Se taxa ou capacidade não forem positivas
+        """
+        if taxa <= 0:
+            raise ValueError("taxa deve ser maior que zero")
+        if capacidade < 1:
+            raise ValueError("capacidade deve ser maior ou igual a 1")
+        self.taxa_maxima = float(taxa)
+        self.capacidade = float(capacidade)
+        self.adaptativo = adaptativo
+        self.taxa_minima = taxa_minima if taxa_minima is not None else self.taxa_maxima * 0.05
+        self.fator_reducao = fator_reducao
+        self.incremento = incremento if incremento is not None else self.taxa_maxima * 0.02
+
+        self._lock = threading.Lock()
+        self._taxa = self.taxa_maxima
+        self._fichas = self.capacidade
+        self._atualizado = time.monotonic()
+        self._bloqueado_ate = 0.0
+
+    @property
+    def taxa(self) -> float:
+        """Taxa atual em requisições por segundo"""
+        with self._lock:
+            return self._taxa
+
+    def _repor(self, agora: float):
+        """Repõe as fichas acumuladas desde a última atualização (com lock)"""
+        decorrido = agora - self._atualizado
+        if decorrido > 0:
+            self._fichas = min(self.capacidade, self._fichas + decorrido * self._taxa)
+            self._atualizado = agora
+
+    def reservar(self) -> float:
+        """
+        Reserva uma ficha sem bloquear
+
+        A ficha é descontada na hora (o saldo pode ficar negativo), o que
+        mantém a ordem de chegada entre threads concorrentes.
+
+        Returns:
+            Segundos que o chamador deve esperar antes de enviar a requisição
+        """
+        with self._lock:
+            agora = time.monotonic()
+            self._repor(agora)
+            self._fichas -= 1
+            espera = 0.0 if self._fichas >= 0 else -self._fichas / self._taxa
+            return max(espera, self._bloqueado_ate - agora)
+
+    def adquirir(self) -> float:
+        """
+        Consome uma ficha, esperando se necessário
+
+        Returns:
+            Segundos efetivamente esperados
+        """
+        espera = self.reservar()
+        if espera > 0:
+            time.sleep(espera)
+        return espera
+
+    def registrar_resposta(self, status: int, retry_after: Optional[str] = None):
+        """
+        Ajusta o balde a partir do status de uma resposta
+
+        Um 429 com Retry-After pausa o balde pelo tempo pedido pelo servidor.
+        No modo adaptativo, 429 reduz a taxa e respostas não-429 a recuperam.
+
+        Args:
+            status: Código HTTP recebido
+            retry_after: Valor do header Retry-After, se houver
+        """
+        with self._lock:
+            agora = time.monotonic()
+            self._repor(agora)
+            if status == 429:
+                espera = parse_retry_after(retry_after)
+                if espera:
+                    self._bloqueado_ate = max(self._bloqueado_ate, agora + espera)
+                if self.adaptativo:
+                    self._taxa = max(self.taxa_minima, self._taxa * self.fator_reducao)
+                    self._fichas = min(self._fichas, 0.0)
+            elif self.adaptativo and self._taxa < self.taxa_maxima:
+                self._taxa = min(self.taxa_maxima, self._taxa + self.incremento)
+
+
+class RateLimiter:
+    """
+    Limitador de taxa com um TokenBucket por token de API
+
+    Clientes que compartilham a mesma instância de RateLimiter e o mesmo
+    token (header ApiToken ou X-API-Key) consomem do mesmo balde, mesmo
+    estando em threads diferentes. Os tokens são identificados por um hash,
+    sem manter o valor original.
+    """
+
+    def __init__(
+        self,
+        requisicoes_por_segundo: float = 5.0,
+        rajada: int = 10,
+        adaptativo: bool = False,
+        taxa_minima: Optional[float] = None
+    ):
+        """
+        Inicializa o limitador
+
+        Args:
+            requisicoes_por_segundo: Taxa sustentada por token
+            rajada: Quantidade de requisições permitidas em sequência sem espera
+            adaptativo: Se True, reduz a taxa ao receber 429 e recupera aos poucos
+            taxa_minima: Menor taxa aceita no modo adaptativo (opcional)
+        """
+        if requisicoes_por_segundo <= 0:
+            raise ValueError("requisicoes_por_segundo deve ser maior que zero")
+        if rajada < 1:
+            raise ValueError("rajada deve ser maior ou igual a 1")
+        self.requisicoes_por_segundo = requisicoes_por_segundo
+        self.rajada = rajada
+        self.adaptativo = adaptativo
+        self.taxa_minima = taxa_minima
+
+        self._lock = threading.Lock()
+        self._baldes: Dict[str, TokenBucket] = {}
+
+    @staticmethod
+    def chave_token(token: Optional[str]) -> str:
+        """
+        Calcula a chave do balde para um token
+
+        Args:
+            token: Valor do header de autenticação (None = anônimo)
+
+        Returns:
+            Impressão digital (hash) do token
+        """
+        return hashlib.sha256((token or "").encode("utf-8")).hexdigest()[:16]
+
+    def balde(self, token: Optional[str]) -> TokenBucket:
+        """
+        Retorna (criando se necessário) o balde associado a um token
+
+        Args:
+            token: Valor do header de autenticação
+
+        Returns:
+            TokenBucket compartilhado pelo token
+        """
+        chave = self.chave_token(token)
+        with self._lock:
+            balde = self._baldes.get(chave)
+            if balde is None:
+                balde = TokenBucket(
+                    self.requisicoes_por_segundo,
+                    self.rajada,
+                    adaptativo=self.adaptativo,
+                    taxa_minima=self.taxa_minima
+                )
+                self._baldes[chave] = balde
+            return balde
+
+    def adquirir(self, token: Optional[str]) -> float:
+        """
+        Aguarda uma ficha no balde do token
+
+        Args:
+            token: Valor do header de autenticação
+
+        Returns:
+            Segundos esperados
+        """
+        return self.balde(token).adquirir()
+
+    def registrar_resposta(self, token: Optional[str], status: int, retry_after: Optional[str] = None):
+        """
+        Informa ao balde do token o status de uma resposta (ver TokenBucket.registrar_resposta)
+
+        Args:
+            token: Valor do header de autenticação
+            status: Código HTTP recebido
+            retry_after: Valor do header Retry-After, se houver
+        """
+        self.balde(token).registrar_resposta(status, retry_after)
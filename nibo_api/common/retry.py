@@ -0,0 +1,194 @@
+"""
+Política de novas tentativas (retry) para requisições à API Nibo
+"""
+import random
+import threading
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional, Dict, Any, Callable, Iterable
+
+
+# Header usado para marcar um POST como seguro para repetição
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+
+
+def parse_retry_after(valor: Optional[str]) -> Optional[float]:
+    """
+    Interpreta o header Retry-After
+
+    Args:
+        valor: Valor do header (segundos ou data HTTP)
+
+    Returns:
+        Segundos de espera, ou None se ausente/inválido
+    """
+    if not valor:
+        return None
+    valor = valor.strip()
+    try:
+        return max(0.0, float(valor))
+    except ValueError:
+        pass
+    try:
+        data = parsedate_to_datetime(valor)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if data is None:
+        return None
+    if data.tzinfo is None:
+        data = data.replace(tzinfo=timezone.utc)
+    return max(0.0, (data - datetime.now(timezone.utc)).total_seconds())
+
+
+class RetryPolicy:
+    """
+    Política de novas tentativas com backoff exponencial e jitter
+
+    Repete requisições que falharam com status transitórios (429 e 5xx) ou
+    erros de conexão, respeitando o header Retry-After e um prazo total.
+    Métodos idempotentes (GET, PUT, DELETE) são sempre repetidos; POST só é
+    repetido quando a requisição carrega o header Idempotency-Key.
+    """
+
+    def __init__(
+        self,
+        max_tentativas: int = 5,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        prazo_total: Optional[float] = 300.0,
+        jitter: bool = True,
+        status_repetiveis: Iterable[int] = (429, 500, 502, 503, 504),
+        metodos_idempotentes: Iterable[str] = ("GET", "HEAD", "OPTIONS", "PUT", "DELETE"),
+        respeitar_retry_after: bool = True,
+        on_retry: Optional[Callable[[Dict[str, Any]], None]] = None
+    ):
+        """
+        Inicializa a política de novas tentativas
+
+        Args:
+            max_tentativas: Número máximo de tentativas (incluindo a primeira)
+            backoff_base: Espera base em segundos (dobra a cada tentativa)
+            backoff_max: Espera máxima entre tentativas, em segundos
+            prazo_total: Tempo máximo total em segundos, incluindo esperas (None = sem prazo)
+            jitter: Se True, sorteia a espera entre 0 e o backoff calculado ("full jitter")
+            status_repetiveis: Códigos HTTP que disparam nova tentativa
+            metodos_idempotentes: Métodos HTTP repetidos sem Idempotency-Key
+            respeitar_retry_after: Se True, usa o header Retry-After quando presente
+            on_retry: Callback de métricas chamado a cada nova tentativa ou desistência
+        """
+        if max_tentativas < 1:
+            raise ValueError("max_tentativas deve ser maior ou igual a 1")
+        self.max_tentativas = max_tentativas
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.prazo_total = prazo_total
+        self.jitter = jitter
+        self.status_repetiveis = frozenset(status_repetiveis)
+        self.metodos_idempotentes = frozenset(m.upper() for m in metodos_idempotentes)
+        self.respeitar_retry_after = respeitar_retry_after
+        self.on_retry = on_retry
+
+        self._lock = threading.Lock()
+        self._contadores = {"repeticoes": 0, "desistencias": 0}
+
+    def metodo_repetivel(self, metodo: str, headers: Optional[Dict[str, str]] = None) -> bool:
+        """
+        Indica se uma requisição pode ser repetida com segurança
+
+        Args:
+            metodo: Método HTTP
+            headers: Headers da requisição
+
+        Returns:
+            True se o método é idempotente ou se o POST tem Idempotency-Key
+        """
+        metodo = metodo.upper()
+        if metodo in self.metodos_idempotentes:
+            return True
+        return metodo == "POST" and bool(headers and headers.get(IDEMPOTENCY_HEADER))
+
+    def calcular_espera(self, tentativa: int, retry_after: Optional[float] = None) -> float:
+        """
+        Calcula a espera antes da próxima tentativa
+
+        Args:
+            tentativa: Número da tentativa que acabou de falhar (1 = primeira)
+            retry_after: Espera pedida pelo servidor via Retry-After (opcional)
+
+        Returns:
+            Espera em segundos
+        """
+        if retry_after is not None and self.respeitar_retry_after:
+            return retry_after
+        teto = min(self.backoff_max, self.backoff_base * (2 ** (tentativa - 1)))
+        return random.uniform(0, teto) if self.jitter else teto
+
+    def proxima_espera(
+        self,
+        metodo: str,
+        headers: Optional[Dict[str, str]],
+        tentativa: int,
+        decorrido: float,
+        status: Optional[int] = None,
+        retry_after: Optional[str] = None,
+        erro: Optional[Exception] = None,
+        url: Optional[str] = None
+    ) -> Optional[float]:
+        """
+        Decide se a requisição deve ser repetida e quanto esperar
+
+        Args:
+            metodo: Método HTTP
+            headers: Headers da requisição
+            tentativa: Número da tentativa que acabou de ser feita (1 = primeira)
+            decorrido: Segundos decorridos desde a primeira tentativa
+            status: Código HTTP recebido (None se houve erro de conexão)
+            retry_after: Valor do header Retry-After da resposta
+            erro: Exceção de conexão/timeout, se houver
+            url: URL da requisição (apenas para métricas)
+
+        Returns:
+            Segundos a esperar antes de repetir, ou None para não repetir
+        """
+        if erro is None and status not in self.status_repetiveis:
+            return None
+        if not self.metodo_repetivel(metodo, headers):
+            return None
+
+        evento = {
+            "metodo": metodo.upper(),
+            "url": url,
+            "tentativa": tentativa,
+            "status": status,
+            "erro": repr(erro) if erro is not None else None,
+        }
+
+        espera = self.calcular_espera(tentativa, parse_retry_after(retry_after))
+        esgotou = tentativa >= self.max_tentativas
+        if not esgotou and self.prazo_total is not None:
+            esgotou = decorrido + espera > self.prazo_total
+
+        if esgotou:
+            self._registrar("desistencias", dict(evento, evento="desistencia", espera=None))
+            return None
+
+        self._registrar("repeticoes", dict(evento, evento="retry", espera=espera))
+        return espera
+
+    def metricas(self) -> Dict[str, int]:
+        """
+        Retorna os contadores acumulados da política
+
+        Returns:
+            Dicionário com 'repeticoes' (novas tentativas feitas) e
+            'desistencias' (requisições que esgotaram tentativas ou prazo)
+        """
+        with self._lock:
+            return dict(self._contadores)
+
+    def _registrar(self, contador: str, evento: Dict[str, Any]):
+        """Atualiza contadores e notifica o callback de métricas"""
+        with self._lock:
+            self._contadores[contador] += 1
+        if self.on_retry is not None:
+            self.on_retry(evento)
@@ -0,0 +1,290 @@
+"""
+Decodificação incremental de respostas JSON grandes
+
+Entrega os elementos da lista `items` (ou de uma lista no topo da resposta)
+à medida que os blocos chegam, sem montar o documento inteiro em memória.
+Os demais campos do topo (ex: 'count', 'metadata') ficam em `metadados`.
+"""
+import codecs
+import json
+import re
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, Union
+
+_ESPACOS = re.compile(r"[ \t\n\r]*")
+_DECODIFICADOR = json.JSONDecoder()
+
+# Tamanho dos blocos lidos da conexão no modo stream
+TAMANHO_BLOCO_PADRAO = 64 * 1024
+
+# Estados do DecodificadorItens
+_INICIO, _CHAVE, _DOIS_PONTOS, _VALOR, _LISTA, _FIM = range(6)
+
+
+class DecodificadorItens:
+    """
+    Analisador incremental de {"items": [...], ...} ou [...]
+
+    Alimente com blocos de texto (ou bytes UTF-8) via `alimentar`, que
+    devolve os itens completos encontrados até ali; chame `finalizar` ao
+    fim do corpo. Cada item é decodificado com json.JSONDecoder.raw_decode,
+    então apenas o item atual e o trecho ainda não consumido ficam no buffer.
+    """
+
+    def __init__(self, chave: str = "items"):
+        """
+        Inicializa o analisador
+
+        Args:
+            chave: Campo do objeto de topo cuja lista será entregue item a item
+        """
+        self.chave = chave
+        self.metadados: Dict[str, Any] = {}
+        self._buffer = ""
+        self._pos = 0
+        self._estado = _INICIO
+        self._chave_atual = None
+        self._lista_no_topo = False
+        self._terminou = False
+        self._bytes = codecs.getincrementaldecoder("utf-8")()
+
+    def alimentar(self, bloco: Union[str, bytes]) -> Iterator[Any]:
+        """
+        Acrescenta um bloco do corpo e devolve os itens já completos
+
+        Args:
+            bloco: Trecho seguinte do corpo (str ou bytes UTF-8)
+
+        Returns:
+            Iterador sobre os itens completos (consuma antes do próximo bloco)
+        """
+        if isinstance(bloco, bytes):
+            bloco = self._bytes.decode(bloco)
+        if self._pos:
+            self._buffer = self._buffer[self._pos:]
+            self._pos = 0
+        self._buffer += bloco
+        return self._processar()
+
+    def finalizar(self) -> Iterator[Any]:
+        """
+        Indica o fim do corpo e devolve os itens restantes
+
+        Raises:
+            ValueError: Se o JSON estiver incompleto ou inválido
+        """
+        self._buffer = self._buffer[self._pos:] + self._bytes.decode(b"", final=True)
+        self._pos = 0
+        self._terminou = True
+        yield from self._processar()
+        self._pular_espacos()
+        if self._estado != _FIM or self._pos < len(self._buffer):
+            raise ValueError("Resposta JSON incompleta ou inválida")
+
+    def _pular_espacos(self):
+        self._pos = _ESPACOS.match(self._buffer, self._pos).end()
+
+    def _proximo(self) -> str:
+        """Próximo caractere significativo ('' se o buffer acabou)"""
+        self._pular_espacos()
+        return self._buffer[self._pos:self._pos + 1]
+
+    def _decodificar_valor(self):
+        """
+        Decodifica o valor JSON na posição atual
+
+        Returns:
+            (True, valor) se completo, ou (False, None) se faltam dados.
+            Números e literais só são aceitos com um caractere depois deles
+            (ou no fim do corpo), pois "12" pode ser o início de "123".
+        """
+        try:
+            valor, fim = _DECODIFICADOR.raw_decode(self._buffer, self._pos)
+        except json.JSONDecodeError:
+            if self._terminou:
+                raise ValueError("Resposta JSON inválida") from None
+            return False, None
+        if fim >= len(self._buffer) and not self._terminou:
+            return False, None
+        self._pos = fim
+        return True, valor
+
+    def _processar(self) -> Iterator[Any]:
+        while True:
+            c = self._proximo()
+            if not c:
+                return
+
+            if self._estado == _INICIO:
+                if c == "{":
+                    self._estado = _CHAVE
+                elif c == "[":
+                    self._estado = _LISTA
+                    self._lista_no_topo = True
+                else:
+                    raise ValueError("Resposta JSON não é um objeto nem uma lista")
+                self._pos += 1
+
+            elif self._estado == _CHAVE:
+                if c == ",":
+                    self._pos += 1
+                elif c == "}":
+                    self._pos += 1
+                    self._estado = _FIM
+                else:
+                    completo, chave = self._decodificar_valor()
+                    if not completo:
+                        return
+                    self._chave_atual = chave
+                    self._estado = _DOIS_PONTOS
+
+            elif self._estado == _DOIS_PONTOS:
+                if c != ":":
+                    raise ValueError("Resposta JSON inválida: ':' esperado")
+                self._pos += 1
+                self._estado = _VALOR
+
+            elif self._estado == _VALOR:
+                if self._chave_atual == self.chave and c == "[":
+                    self._pos += 1
+                    self._estado = _LISTA
+                    continue
+                completo, valor = self._decodificar_valor()
+                if not completo:
+                    return
+                self.metadados[self._chave_atual] = valor
+                self._estado = _CHAVE
+
+            elif self._estado == _LISTA:
+                if c == ",":
+                    self._pos += 1
+                elif c == "]":
+                    self._pos += 1
+                    self._estado = _FIM if self._lista_no_topo else _CHAVE
+                else:
+                    completo, item = self._decodificar_valor()
+                    if not completo:
+                        return
+                    yield item
+
+            else:
+                raise ValueError("Conteúdo após o fim da resposta JSON")
+
+
+def iter_itens_json(blocos: Iterable[Union[str, bytes]], chave: str = "items") -> Iterator[Any]:
+    """
+    Itera sobre os itens de uma resposta JSON recebida em blocos
+
+    Args:
+        blocos: Iterável de trechos do corpo (str ou bytes UTF-8)
+        chave: Campo do objeto de topo com a lista de itens
+
+    Returns:
+        Iterador sobre os itens
+    """
+    decodificador = DecodificadorItens(chave)
+    for bloco in blocos:
+        yield from decodificador.alimentar(bloco)
+    yield from decodificador.finalizar()
+
+
+class RespostaStream:
+    """
+    Itens de uma resposta GET entregues à medida que são recebidos
+
+    Itere para obter os itens; os campos de topo restantes (ex: 'count')
+    ficam em `metadados` conforme aparecem no corpo (campos depois da lista
+    só ficam disponíveis ao fim da iteração). A conexão é liberada ao fim da
+    iteração ou em `close()`; use como gerenciador de contexto se puder
+    interromper a iteração no meio.
+    """
+
+    def __init__(self, response, chave: str = "items", tamanho_bloco: int = TAMANHO_BLOCO_PADRAO):
+        """
+        Inicializa a resposta
+
+        Args:
+            response: requests.Response obtida com stream=True
+            chave: Campo do objeto de topo com a lista de itens
+            tamanho_bloco: Bytes lidos por vez da conexão
+        """
+        self.response = response
+        self.tamanho_bloco = tamanho_bloco
+        # Conversão aplicada a cada item (ex: modelos do modo tipado)
+        self.converter = None
+        self._decodificador = DecodificadorItens(chave)
+
+    @property
+    def metadados(self) -> Dict[str, Any]:
+        """Campos de topo diferentes da lista de itens"""
+        return self._decodificador.metadados
+
+    def __iter__(self) -> Iterator[Any]:
+        try:
+            for bloco in self.response.iter_content(self.tamanho_bloco):
+                yield from self._converter(self._decodificador.alimentar(bloco))
+            yield from self._converter(self._decodificador.finalizar())
+        finally:
+            self.close()
+
+    def _converter(self, itens: Iterator[Any]) -> Iterator[Any]:
+        return itens if self.converter is None else map(self.converter, itens)
+
+    def close(self):
+        """Libera a conexão"""
+        self.response.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class RespostaStreamAsync:
+    """
+    Versão assíncrona de RespostaStream (aiohttp)
+
+    Itere com `async for`; a conexão volta ao pool ao fim da iteração ou em
+    `close()` (também disponível como `async with`).
+    """
+
+    def __init__(self, response, chave: str = "items", tamanho_bloco: int = TAMANHO_BLOCO_PADRAO):
+        """
+        Inicializa a resposta
+
+        Args:
+            response: aiohttp.ClientResponse ainda não lida
+            chave: Campo do objeto de topo com a lista de itens
+            tamanho_bloco: Bytes lidos por vez da conexão
+        """
+        self.response = response
+        self.tamanho_bloco = tamanho_bloco
+        # Conversão aplicada a cada item (ex: modelos do modo tipado)
+        self.converter = None
+        self._decodificador = DecodificadorItens(chave)
+
+    @property
+    def metadados(self) -> Dict[str, Any]:
+        """Campos de topo diferentes da lista de itens"""
+        return self._decodificador.metadados
+
+    async def __aiter__(self) -> AsyncIterator[Any]:
+        converter = self.converter or (lambda item: item)
+        try:
+            async for bloco in self.response.content.iter_chunked(self.tamanho_bloco):
+                for item in self._decodificador.alimentar(bloco):
+                    yield converter(item)
+            for item in self._decodificador.finalizar():
+                yield converter(item)
+        finally:
+            self.close()
+
+    def close(self):
+        """Devolve a conexão ao pool"""
+        self.response.release()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.close()
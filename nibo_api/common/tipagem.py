@@ -0,0 +1,129 @@
+"""
+Modo tipado dos clientes (typed=True)
+
+Associa endpoints a modelos compactos (nibo_api.common.modelos_compactos) e
+converte as respostas GET: os itens de 'items' (ou a lista devolvida
+diretamente) viram modelos, e um recurso único vira um modelo. Os demais
+campos da resposta ('count', 'metadata') e endpoints sem modelo associado
+continuam como vieram da API.
+"""
+import re
+from functools import partial
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from nibo_api.common.modelos_compactos import (
+    Internador,
+    AgendamentoCompacto,
+    CategoriaCompacta,
+    CentroCustoCompacto,
+    ClienteObrigacoesCompacto,
+    ContaCompacta,
+    ContatoCompacto,
+    ItemRelatorioObrigacoesCompacto,
+    LancamentoCompacto,
+    TarefaCompacta,
+    TransferenciaCompacta,
+)
+from nibo_api.common.streaming import RespostaStream, RespostaStreamAsync
+
+# Segmento de identificador em um endpoint (ex: /customers/{id})
+_ID = r"[^/]+"
+
+
+class TabelaModelos:
+    """
+    Associação entre padrões de endpoint e modelos compactos
+
+    Os padrões são expressões regulares compiladas uma única vez e testadas
+    na ordem de declaração contra o endpoint inteiro (sem query string).
+    """
+
+    def __init__(self, padroes: Iterable[Tuple[str, type]]):
+        """
+        Inicializa a tabela
+
+        Args:
+            padroes: Pares (expressão regular do endpoint, classe do modelo)
+        """
+        self._padroes = tuple((re.compile(padrao), modelo) for padrao, modelo in padroes)
+        self._memo: Dict[str, Optional[type]] = {}
+
+    def modelo_para(self, endpoint: str) -> Optional[type]:
+        """
+        Retorna o modelo associado ao endpoint
+
+        Args:
+            endpoint: Endpoint da API (ex: "/payments")
+
+        Returns:
+            Classe do modelo, ou None se o endpoint não tiver modelo
+        """
+        try:
+            return self._memo[endpoint]
+        except KeyError:
+            pass
+        modelo = next(
+            (modelo for padrao, modelo in self._padroes if padrao.fullmatch(endpoint)), None
+        )
+        if len(self._memo) < 4096:
+            self._memo[endpoint] = modelo
+        return modelo
+
+
+MODELOS_EMPRESA = TabelaModelos([
+    (r"/schedules/(credit|debit)(/opened|/dued)?", AgendamentoCompacto),
+    (rf"/schedules/(credit|debit)/{_ID}", AgendamentoCompacto),
+    (rf"/(customers|suppliers|employees|partners)/{_ID}/schedules", AgendamentoCompacto),
+    (rf"/installments/{_ID}/schedules", AgendamentoCompacto),
+    (r"/schedules/categories", CategoriaCompacta),
+    (rf"/(payments|receipts)(/{_ID})?", LancamentoCompacto),
+    (rf"/accounts/{_ID}/statement", LancamentoCompacto),
+    (rf"/accounts(/{_ID})?", ContaCompacta),
+    (rf"/transfers(/{_ID})?", TransferenciaCompacta),
+    (rf"/costcenters(/{_ID})?", CentroCustoCompacto),
+    (rf"/(customers|suppliers|employees|partners)(/{_ID})?", ContatoCompacto),
+])
+
+MODELOS_OBRIGACOES = TabelaModelos([
+    (rf"/accountingfirms/{_ID}/tasks(/{_ID})?", TarefaCompacta),
+    (rf"/accountingfirms/{_ID}/reports/obligations/complete", ItemRelatorioObrigacoesCompacto),
+    (rf"/accountingfirms/{_ID}/customers(/{_ID})?", ClienteObrigacoesCompacto),
+])
+
+
+def tipar_resposta(modelo: type, resposta: Any) -> Any:
+    """
+    Converte uma resposta GET para modelos compactos
+
+    Um Internador por resposta faz com que stakeholders, categorias e textos
+    repetidos entre os itens sejam compartilhados.
+
+    Args:
+        modelo: Classe do modelo (ver TabelaModelos)
+        resposta: Resposta já decodificada, ou RespostaStream(Async)
+
+    Returns:
+        Resposta com os itens convertidos (o dicionário de topo é copiado)
+    """
+    internador = Internador()
+    if isinstance(resposta, (RespostaStream, RespostaStreamAsync)):
+        resposta.converter = partial(_converter, modelo.de_dict, internador)
+        return resposta
+    if isinstance(resposta, list):
+        return _converter_lista(modelo.de_dict, internador, resposta)
+    if isinstance(resposta, dict):
+        items = resposta.get("items")
+        if isinstance(items, list):
+            tipada = dict(resposta)
+            tipada["items"] = _converter_lista(modelo.de_dict, internador, items)
+            return tipada
+        return modelo(resposta, internador)
+    return resposta
+
+
+def _converter(de_dict, internador: Internador, item: Any) -> Any:
+    return de_dict(item, internador) if isinstance(item, dict) else item
+
+
+def _converter_lista(de_dict, internador: Internador, items: List[Any]) -> List[Any]:
+    return [de_dict(item, internador) if isinstance(item, dict) else item for item in items]
@@ -0,0 +1,127 @@
+"""
+Sessão HTTP configurável (pool de conexões, timeouts e TCP keep-alive)
+"""
+import socket
+from typing import Optional, Tuple, List
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+
+from nibo_api.settings import NiboSettings
+
+
+def opcoes_keepalive(idle: int) -> List[Tuple[int, int, int]]:
+    """
+    Monta as opções de socket para TCP keep-alive
+
+    Opções específicas de cada SO (TCP_KEEPIDLE, TCP_KEEPINTVL, TCP_KEEPCNT,
+    TCP_KEEPALIVE no macOS) só são aplicadas quando disponíveis.
+
+    Args:
+        idle: Segundos de inatividade antes do primeiro pacote de keep-alive
+
+    Returns:
+        Lista de tuplas (nível, opção, valor) para socket.setsockopt
+    """
+    opcoes = [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+    if hasattr(socket, "TCP_KEEPIDLE"):
+        opcoes.append((socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, idle))
+    elif hasattr(socket, "TCP_KEEPALIVE"):
+        opcoes.append((socket.IPPROTO_TCP, socket.TCP_KEEPALIVE, idle))
+    if hasattr(socket, "TCP_KEEPINTVL"):
+        opcoes.append((socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, max(1, idle // 4)))
+    if hasattr(socket, "TCP_KEEPCNT"):
+        opcoes.append((socket.IPPROTO_TCP, socket.TCP_KEEPCNT, 4))
+    return opcoes
+
+
+class KeepAliveHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter que aplica opções de socket extras (ex: TCP keep-alive) às conexões do pool"""
+
+    def __init__(self, socket_options: Optional[List[Tuple[int, int, int]]] = None, **kwargs):
+        """
+        Inicializa o adapter
+
+        Args:
+            socket_options: Opções de socket somadas às padrão do urllib3
+            **kwargs: Argumentos de HTTPAdapter (pool_connections, pool_maxsize, ...)
+        """
+        self.socket_options = list(HTTPConnection.default_socket_options) + list(socket_options or [])
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs["socket_options"] = self.socket_options
+        super().init_poolmanager(*args, **kwargs)
+
+    def proxy_manager_for(self, *args, **kwargs):
+        kwargs["socket_options"] = self.socket_options
+        return super().proxy_manager_for(*args, **kwargs)
+
+
+def timeout_requisicao(config: NiboSettings) -> Tuple[Optional[float], Optional[float]]:
+    """
+    Retorna o timeout (conexão, leitura) configurado
+
+    Args:
+        config: Instância de NiboSettings
+
+    Returns:
+        Tupla (connect_timeout, read_timeout) no formato aceito pelo requests
+    """
+    return (config.connect_timeout, config.read_timeout)
+
+
+def criar_sessao(config: NiboSettings) -> requests.Session:
+    """
+    Cria uma requests.Session com pool e keep-alive configurados via NiboSettings
+
+    Args:
+        config: Instância de NiboSettings
+
+    Returns:
+        Sessão com adapters HTTP/HTTPS configurados e verificação SSL aplicada
+    """
+    socket_options = opcoes_keepalive(config.tcp_keepalive_idle) if config.tcp_keepalive else None
+
+    session = requests.Session()
+    for prefixo in ("https://", "http://"):
+        session.mount(prefixo, KeepAliveHTTPAdapter(
+            socket_options=socket_options,
+            pool_connections=config.pool_connections,
+            pool_maxsize=config.pool_maxsize
+        ))
+    session.verify = config.ssl_verify
+    return session
+
+
+class Transporte:
+    """
+    Sessão HTTP compartilhável entre vários clientes
+
+    Concentra o pool de conexões, o contexto TLS e os timeouts. Os headers
+    de autenticação ficam em cada cliente e são enviados por requisição, de
+    modo que clientes de organizações diferentes podem reaproveitar as
+    mesmas conexões já abertas com a API.
+    """
+
+    def __init__(self, config: Optional[NiboSettings] = None):
+        """
+        Inicializa o transporte
+
+        Args:
+            config: Instância de NiboSettings. Se None, usa NiboSettings.compartilhado().
+        """
+        self.config = config or NiboSettings.compartilhado()
+        self.session = criar_sessao(self.config)
+        self.timeout = timeout_requisicao(self.config)
+
+    def close(self):
+        """Fecha as conexões abertas do pool"""
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
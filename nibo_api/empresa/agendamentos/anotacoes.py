@@ -1,10 +1,11 @@
 """
 Interface para anotações de agendamentos no Nibo Empresa
 """
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterator
 from uuid import UUID
 
 from nibo_api.common.client import BaseClient
+from nibo_api.common.paginacao import TAMANHO_PAGINA_PADRAO
 
 
 class AnotacoesAgendamentoInterface:
@@ -48,6 +49,35 @@ class AnotacoesAgendamentoInterface:
             odata_skip=odata_skip
         )
     
+    def iter_listar(
+        self,
+        schedule_id: UUID,
+        odata_filter: Optional[str] = None,
+        odata_orderby: Optional[str] = None,
+        page_size: int = TAMANHO_PAGINA_PADRAO,
+        **opcoes
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Itera sobre todos os registros de listar(), buscando página a página
+        
+        Args:
+            schedule_id: UUID do agendamento
+            odata_filter: Filtro OData
+            odata_orderby: Campo para ordenação
+            page_size: Registros por página ($top)
+            **opcoes: Opções de paginação repassadas a BaseClient.paginar
+            
+        Returns:
+            Iterador sobre os itens de todas as páginas
+        """
+        return self.client.paginar(
+            f"/schedules/{schedule_id}/notes",
+            odata_filter=odata_filter,
+            odata_orderby=odata_orderby,
+            page_size=page_size,
+            **opcoes
+        )
+    
     def criar(
         self,
         schedule_id: UUID,
@@ -1,11 +1,13 @@
 """
 Interface para pagamentos (contas pagas) no Nibo Empresa
 """
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterator
 from uuid import UUID
-from datetime import datetime
 
 from nibo_api.common.client import BaseClient
+from nibo_api.common.datas import para_date
+from nibo_api.common.paginacao import TAMANHO_PAGINA_PADRAO
+from nibo_api.empresa.espelho import espelho_do_cliente, fonte_local
 
 
 class PagamentosInterface:
@@ -25,7 +27,8 @@ class PagamentosInterface:
         odata_filter: Optional[str] = None,
         odata_orderby: Optional[str] = None,
         odata_top: Optional[int] = None,
-        odata_skip: Optional[int] = None
+        odata_skip: Optional[int] = None,
+        source: str = "api"
     ) -> Dict[str, Any]:
         """
         Lista pagamentos (contas pagas)
@@ -35,10 +38,15 @@ class PagamentosInterface:
             odata_orderby: Campo para ordenação
             odata_top: Limite de registros
             odata_skip: Registros a pular
+            source: "api" (padrão) ou "local" para responder pelo espelho local (client.espelho)
             
         Returns:
             Dicionário com 'items' (lista de pagamentos) e 'count' (total)
         """
+        if fonte_local(source):
+            return espelho_do_cliente(self.client).listar(
+                "pagamentos", None, odata_filter, odata_orderby, odata_top, odata_skip
+            )
         return self.client.get(
             "/payments",
             odata_filter=odata_filter,
@@ -46,6 +54,39 @@ class PagamentosInterface:
             odata_top=odata_top,
             odata_skip=odata_skip
         )
+    
+    def iter_listar(
+        self,
+        odata_filter: Optional[str] = None,
+        odata_orderby: Optional[str] = None,
+        page_size: int = TAMANHO_PAGINA_PADRAO,
+        source: str = "api",
+        **opcoes
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Itera sobre todos os registros de listar(), buscando página a página
+        
+        Args:
+            odata_filter: Filtro OData
+            odata_orderby: Campo para ordenação
+            page_size: Registros por página ($top)
+            source: "api" (padrão) ou "local" para responder pelo espelho local (client.espelho)
+            **opcoes: Opções de paginação repassadas a BaseClient.paginar
+            
+        Returns:
+            Iterador sobre os itens de todas as páginas
+        """
+        if fonte_local(source):
+            return espelho_do_cliente(self.client).iterar(
+                "pagamentos", None, odata_filter, odata_orderby, **opcoes
+            )
+        return self.client.paginar(
+            "/payments",
+            odata_filter=odata_filter,
+            odata_orderby=odata_orderby,
+            page_size=page_size,
+            **opcoes
+        )
 
     def listar_por_periodo(
         self,
@@ -53,13 +94,46 @@ class PagamentosInterface:
         data_fim: str,
         odata_orderby: str = "date desc",
         odata_top: Optional[int] = None,
-        odata_skip: Optional[int] = None
+        odata_skip: Optional[int] = None,
+        source: str = "api"
     ) -> Dict[str, Any]:
         """
         Lista pagamentos realizados no período informado.
 
         Aceita data em DD/MM/YYYY ou YYYY-MM-DD.
         """
+        return self.listar(
+            odata_filter=self._montar_filtro_periodo(data_inicio, data_fim),
+            odata_orderby=odata_orderby,
+            odata_top=odata_top,
+            odata_skip=odata_skip,
+            source=source
+        )
+
+    def iter_listar_por_periodo(
+        self,
+        data_inicio: str,
+        data_fim: str,
+        odata_orderby: str = "date desc",
+        page_size: int = TAMANHO_PAGINA_PADRAO,
+        source: str = "api",
+        **opcoes
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Itera sobre todos os pagamentos realizados no período, página a página.
+
+        Aceita data em DD/MM/YYYY ou YYYY-MM-DD.
+        """
+        return self.iter_listar(
+            odata_filter=self._montar_filtro_periodo(data_inicio, data_fim),
+            odata_orderby=odata_orderby,
+            page_size=page_size,
+            source=source,
+            **opcoes
+        )
+
+    def _montar_filtro_periodo(self, data_inicio: str, data_fim: str) -> str:
+        """Monta filtro OData para o campo date no intervalo informado."""
         inicio = self._parse_data(data_inicio)
         fim = self._parse_data(data_fim)
         if not inicio or not fim:
@@ -67,28 +141,14 @@ class PagamentosInterface:
         if inicio > fim:
             raise ValueError("Data inicial não pode ser maior que data final.")
 
-        filtro = (
+        return (
             f"date ge {inicio.strftime('%Y-%m-%dT00:00:00Z')} "
             f"and date le {fim.strftime('%Y-%m-%dT23:59:59Z')}"
         )
-        return self.listar(
-            odata_filter=filtro,
-            odata_orderby=odata_orderby,
-            odata_top=odata_top,
-            odata_skip=odata_skip
-        )
 
     @staticmethod
     def _parse_data(data_str: str):
-        if not data_str:
-            return None
-        valor = data_str.strip()
-        for fmt in ("%d/%m/%Y", "%Y-%m-%d"):
-            try:
-                return datetime.strptime(valor, fmt)
-            except ValueError:
-                continue
-        return None
+        return para_date(data_str)
     
     def criar(
         self,
@@ -1,10 +1,13 @@
 """
 Interface para agendamentos de pagamento no Nibo Empresa
 """
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterable, Iterator
 from uuid import UUID
 
 from nibo_api.common.client import BaseClient
+from nibo_api.common.paginacao import TAMANHO_PAGINA_PADRAO
+from nibo_api.empresa.espelho import espelho_do_cliente, fonte_local
+from nibo_api.empresa.lote import MAX_WORKERS_LOTE_PADRAO, ResultadoItemLote, executar_lote
 
 
 class AgendamentosPagarInterface:
@@ -24,7 +27,8 @@ class AgendamentosPagarInterface:
         odata_filter: Optional[str] = None,
         odata_orderby: Optional[str] = None,
         odata_top: Optional[int] = None,
-        odata_skip: Optional[int] = None
+        odata_skip: Optional[int] = None,
+        source: str = "api"
     ) -> Dict[str, Any]:
         """
         Lista pagamentos agendados em aberto (contas a pagar)
@@ -34,10 +38,15 @@ class AgendamentosPagarInterface:
             odata_orderby: Campo para ordenação
             odata_top: Limite de registros
             odata_skip: Registros a pular
+            source: "api" (padrão) ou "local" para responder pelo espelho local (client.espelho)
             
         Returns:
             Dicionário com 'items' (lista de agendamentos) e 'count' (total)
         """
+        if fonte_local(source):
+            return espelho_do_cliente(self.client).listar(
+                "agendamentos_pagar", "abertos", odata_filter, odata_orderby, odata_top, odata_skip
+            )
         return self.client.get(
             "/schedules/debit/opened",
             odata_filter=odata_filter,
@@ -46,12 +55,46 @@ class AgendamentosPagarInterface:
             odata_skip=odata_skip
         )
     
+    def iter_listar_abertos(
+        self,
+        odata_filter: Optional[str] = None,
+        odata_orderby: Optional[str] = None,
+        page_size: int = TAMANHO_PAGINA_PADRAO,
+        source: str = "api",
+        **opcoes
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Itera sobre todos os registros de listar_abertos(), buscando página a página
+        
+        Args:
+            odata_filter: Filtro OData
+            odata_orderby: Campo para ordenação
+            page_size: Registros por página ($top)
+            source: "api" (padrão) ou "local" para responder pelo espelho local (client.espelho)
+            **opcoes: Opções de paginação repassadas a BaseClient.paginar
+            
+        Returns:
+            Iterador sobre os itens de todas as páginas
+        """
+        if fonte_local(source):
+            return espelho_do_cliente(self.client).iterar(
+                "agendamentos_pagar", "abertos", odata_filter, odata_orderby, **opcoes
+            )
+        return self.client.paginar(
+            "/schedules/debit/opened",
+            odata_filter=odata_filter,
+            odata_orderby=odata_orderby,
+            page_size=page_size,
+            **opcoes
+        )
+    
     def listar_vencidos(
         self,
         odata_filter: Optional[str] = None,
         odata_orderby: Optional[str] = None,
         odata_top: Optional[int] = None,
-        odata_skip: Optional[int] = None
+        odata_skip: Optional[int] = None,
+        source: str = "api"
     ) -> Dict[str, Any]:
         """
         Lista pagamentos agendados vencidos
@@ -61,10 +104,15 @@ class AgendamentosPagarInterface:
             odata_orderby: Campo para ordenação
             odata_top: Limite de registros
             odata_skip: Registros a pular
+            source: "api" (padrão) ou "local" para responder pelo espelho local (client.espelho)
             
         Returns:
             Dicionário com 'items' (lista de agendamentos) e 'count' (total)
         """
+        if fonte_local(source):
+            return espelho_do_cliente(self.client).listar(
+                "agendamentos_pagar", "vencidos", odata_filter, odata_orderby, odata_top, odata_skip
+            )
         return self.client.get(
             "/schedules/debit/dued",
             odata_filter=odata_filter,
@@ -73,6 +121,105 @@ class AgendamentosPagarInterface:
             odata_skip=odata_skip
         )
     
+    def iter_listar_vencidos(
+        self,
+        odata_filter: Optional[str] = None,
+        odata_orderby: Optional[str] = None,
+        page_size: int = TAMANHO_PAGINA_PADRAO,
+        source: str = "api",
+        **opcoes
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Itera sobre todos os registros de listar_vencidos(), buscando página a página
+        
+        Args:
+            odata_filter: Filtro OData
+            odata_orderby: Campo para ordenação
+            page_size: Registros por página ($top)
+            source: "api" (padrão) ou "local" para responder pelo espelho local (client.espelho)
+            **opcoes: Opções de paginação repassadas a BaseClient.paginar
+            
+        Returns:
+            Iterador sobre os itens de todas as páginas
+        """
+        if fonte_local(source):
+            return espelho_do_cliente(self.client).iterar(
+                "agendamentos_pagar", "vencidos", odata_filter, odata_orderby, **opcoes
+            )
+        return self.client.paginar(
+            "/schedules/debit/dued",
+            odata_filter=odata_filter,
+            odata_orderby=odata_orderby,
+            page_size=page_size,
+            **opcoes
+        )
+
+    def listar_todos(
+        self,
+        odata_filter: Optional[str] = None,
+        odata_orderby: Optional[str] = None,
+        odata_top: Optional[int] = None,
+        odata_skip: Optional[int] = None,
+        source: str = "api"
+    ) -> Dict[str, Any]:
+        """
+        Lista todos os pagamentos agendados
+
+        Args:
+            odata_filter: Filtro OData
+            odata_orderby: Campo para ordenação
+            odata_top: Limite de registros
+            odata_skip: Registros a pular
+            source: "api" (padrão) ou "local" para responder pelo espelho local (client.espelho)
+
+        Returns:
+            Dicionário com 'items' (lista de agendamentos) e 'count' (total)
+        """
+        if fonte_local(source):
+            return espelho_do_cliente(self.client).listar(
+                "agendamentos_pagar", None, odata_filter, odata_orderby, odata_top, odata_skip
+            )
+        return self.client.get(
+            "/schedules/debit",
+            odata_filter=odata_filter,
+            odata_orderby=odata_orderby,
+            odata_top=odata_top,
+            odata_skip=odata_skip
+        )
+
+    def iter_listar_todos(
+        self,
+        odata_filter: Optional[str] = None,
+        odata_orderby: Optional[str] = None,
+        page_size: int = TAMANHO_PAGINA_PADRAO,
+        source: str = "api",
+        **opcoes
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Itera sobre todos os registros de listar_todos(), buscando página a página
+
+        Args:
+            odata_filter: Filtro OData
+            odata_orderby: Campo para ordenação
+            page_size: Registros por página ($top)
+            source: "api" (padrão) ou "local" para responder pelo espelho local (client.espelho)
+            **opcoes: Opções de paginação repassadas a BaseClient.paginar
+
+        Returns:
+            Iterador sobre os itens de todas as páginas
+        """
+        if fonte_local(source):
+            return espelho_do_cliente(self.client).iterar(
+                "agendamentos_pagar", None, odata_filter, odata_orderby, **opcoes
+            )
+        return self.client.paginar(
+            "/schedules/debit",
+            odata_filter=odata_filter,
+            odata_orderby=odata_orderby,
+            page_size=page_size,
+            **opcoes
+        )
+
     def agendar(
         self,
         categories: list,
@@ -125,6 +272,35 @@ class AgendamentosPagarInterface:
         """
         return self.client.post("/schedules/debit", json_data=payload)
     
+    def agendar_lote(
+        self,
+        payloads: Iterable[Dict[str, Any]],
+        max_workers: int = MAX_WORKERS_LOTE_PADRAO,
+        checkpoint: Optional[str] = None,
+        **opcoes
+    ) -> Iterator[ResultadoItemLote]:
+        """
+        Agenda vários pagamentos, com até max_workers envios simultâneos
+        
+        Os payloads (mesmo formato de agendar_json) são lidos sob demanda e
+        os resultados entregues na ordem de entrada, um por payload, com o
+        ID criado ou o erro. Com checkpoint, um lote interrompido pode ser
+        executado de novo sem recriar os agendamentos já feitos (ver
+        nibo_api.empresa.lote.executar_lote).
+        
+        Args:
+            payloads: Payloads dos agendamentos
+            max_workers: Envios simultâneos (o rate_limiter do cliente continua valendo)
+            checkpoint: Arquivo de checkpoint para retomada (opcional)
+            **opcoes: Opções repassadas a executar_lote (ex: converter, reenviar_incertos)
+            
+        Returns:
+            Iterador de ResultadoItemLote
+        """
+        return executar_lote(
+            self.agendar_json, payloads, max_workers=max_workers, checkpoint=checkpoint, **opcoes
+        )
+    
     def pagar_lancamento_agendado(
         self,
         schedule_id: UUID,
@@ -1,11 +1,14 @@
 """
 Interface para agendamentos de recebimento no Nibo Empresa
 """
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, Iterable, List, Iterator
 from uuid import UUID
 from datetime import datetime
 
 from nibo_api.common.client import BaseClient
+from nibo_api.common.paginacao import TAMANHO_PAGINA_PADRAO
+from nibo_api.empresa.espelho import espelho_do_cliente, fonte_local
+from nibo_api.empresa.lote import MAX_WORKERS_LOTE_PADRAO, ResultadoItemLote, executar_lote
 from nibo_api.common.models import AgendamentoRecebimento, AgendamentoList
 
 
@@ -26,7 +29,8 @@ class AgendamentosReceberInterface:
         odata_filter: Optional[str] = None,
         odata_orderby: Optional[str] = None,
         odata_top: Optional[int] = None,
-        odata_skip: Optional[int] = None
+        odata_skip: Optional[int] = None,
+        source: str = "api"
     ) -> Dict[str, Any]:
         """
         Lista recebimentos agendados em aberto (contas a receber)
@@ -36,10 +40,15 @@ class AgendamentosReceberInterface:
             odata_orderby: Campo para ordenação
             odata_top: Limite de registros
             odata_skip: Registros a pular
+            source: "api" (padrão) ou "local" para responder pelo espelho local (client.espelho)
             
         Returns:
             Dicionário com 'items' (lista de agendamentos) e 'count' (total)
         """
+        if fonte_local(source):
+            return espelho_do_cliente(self.client).listar(
+                "agendamentos_receber", "abertos", odata_filter, odata_orderby, odata_top, odata_skip
+            )
         return self.client.get(
             "/schedules/credit/opened",
             odata_filter=odata_filter,
@@ -48,12 +57,46 @@ class AgendamentosReceberInterface:
             odata_skip=odata_skip
         )
     
+    def iter_listar_abertos(
+        self,
+        odata_filter: Optional[str] = None,
+        odata_orderby: Optional[str] = None,
+        page_size: int = TAMANHO_PAGINA_PADRAO,
+        source: str = "api",
+        **opcoes
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Itera sobre todos os registros de listar_abertos(), buscando página a página
+        
+        Args:
+            odata_filter: Filtro OData (ex: "stakeholder/cpfCnpj eq '11497110000127'")
+            odata_orderby: Campo para ordenação
+            page_size: Registros por página ($top)
+            source: "api" (padrão) ou "local" para responder pelo espelho local (client.espelho)
+            **opcoes: Opções de paginação repassadas a BaseClient.paginar
+            
+        Returns:
+            Iterador sobre os itens de todas as páginas
+        """
+        if fonte_local(source):
+            return espelho_do_cliente(self.client).iterar(
+                "agendamentos_receber", "abertos", odata_filter, odata_orderby, **opcoes
+            )
+        return self.client.paginar(
+            "/schedules/credit/opened",
+            odata_filter=odata_filter,
+            odata_orderby=odata_orderby,
+            page_size=page_size,
+            **opcoes
+        )
+    
     def listar_vencidos(
         self,
         odata_filter: Optional[str] = None,
         odata_orderby: Optional[str] = None,
         odata_top: Optional[int] = None,
-        odata_skip: Optional[int] = None
+        odata_skip: Optional[int] = None,
+        source: str = "api"
     ) -> Dict[str, Any]:
         """
         Lista recebimentos agendados vencidos
@@ -63,10 +106,15 @@ class AgendamentosReceberInterface:
             odata_orderby: Campo para ordenação
             odata_top: Limite de registros
             odata_skip: Registros a pular
+            source: "api" (padrão) ou "local" para responder pelo espelho local (client.espelho)
             
         Returns:
             Dicionário com 'items' (lista de agendamentos) e 'count' (total)
         """
+        if fonte_local(source):
+            return espelho_do_cliente(self.client).listar(
+                "agendamentos_receber", "vencidos", odata_filter, odata_orderby, odata_top, odata_skip
+            )
         return self.client.get(
             "/schedules/credit/dued",
             odata_filter=odata_filter,
@@ -75,12 +123,46 @@ class AgendamentosReceberInterface:
             odata_skip=odata_skip
         )
     
+    def iter_listar_vencidos(
+        self,
+        odata_filter: Optional[str] = None,
+        odata_orderby: Optional[str] = None,
+        page_size: int = TAMANHO_PAGINA_PADRAO,
+        source: str = "api",
+        **opcoes
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Itera sobre todos os registros de listar_vencidos(), buscando página a página
+        
+        Args:
+            odata_filter: Filtro OData
+            odata_orderby: Campo para ordenação
+            page_size: Registros por página ($top)
+            source: "api" (padrão) ou "local" para responder pelo espelho local (client.espelho)
+            **opcoes: Opções de paginação repassadas a BaseClient.paginar
+            
+        Returns:
+            Iterador sobre os itens de todas as páginas
+        """
+        if fonte_local(source):
+            return espelho_do_cliente(self.client).iterar(
+                "agendamentos_receber", "vencidos", odata_filter, odata_orderby, **opcoes
+            )
+        return self.client.paginar(
+            "/schedules/credit/dued",
+            odata_filter=odata_filter,
+            odata_orderby=odata_orderby,
+            page_size=page_size,
+            **opcoes
+        )
+    
     def listar_todos(
         self,
         odata_filter: Optional[str] = None,
         odata_orderby: Optional[str] = None,
         odata_top: Optional[int] = None,
-        odata_skip: Optional[int] = None
+        odata_skip: Optional[int] = None,
+        source: str = "api"
     ) -> Dict[str, Any]:
         """
         Lista todos os recebimentos agendados
@@ -90,10 +172,15 @@ class AgendamentosReceberInterface:
             odata_orderby: Campo para ordenação
             odata_top: Limite de registros
             odata_skip: Registros a pular
+            source: "api" (padrão) ou "local" para responder pelo espelho local (client.espelho)
             
         Returns:
             Dicionário com 'items' (lista de agendamentos) e 'count' (total)
         """
+        if fonte_local(source):
+            return espelho_do_cliente(self.client).listar(
+                "agendamentos_receber", None, odata_filter, odata_orderby, odata_top, odata_skip
+            )
         return self.client.get(
             "/schedules/credit",
             odata_filter=odata_filter,
@@ -102,6 +189,39 @@ class AgendamentosReceberInterface:
             odata_skip=odata_skip
         )
     
+    def iter_listar_todos(
+        self,
+        odata_filter: Optional[str] = None,
+        odata_orderby: Optional[str] = None,
+        page_size: int = TAMANHO_PAGINA_PADRAO,
+        source: str = "api",
+        **opcoes
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Itera sobre todos os registros de listar_todos(), buscando página a página
+        
+        Args:
+            odata_filter: Filtro OData
+            odata_orderby: Campo para ordenação
+            page_size: Registros por página ($top)
+            source: "api" (padrão) ou "local" para responder pelo espelho local (client.espelho)
+            **opcoes: Opções de paginação repassadas a BaseClient.paginar
+            
+        Returns:
+            Iterador sobre os itens de todas as páginas
+        """
+        if fonte_local(source):
+            return espelho_do_cliente(self.client).iterar(
+                "agendamentos_receber", None, odata_filter, odata_orderby, **opcoes
+            )
+        return self.client.paginar(
+            "/schedules/credit",
+            odata_filter=odata_filter,
+            odata_orderby=odata_orderby,
+            page_size=page_size,
+            **opcoes
+        )
+    
     def buscar_por_agendamento(self, schedule_id: UUID) -> Dict[str, Any]:
         """
         Busca um recebimento por ID do agendamento
@@ -166,6 +286,35 @@ class AgendamentosReceberInterface:
         """
         return self.client.post("/schedules/credit", json_data=payload)
     
+    def agendar_lote(
+        self,
+        payloads: Iterable[Dict[str, Any]],
+        max_workers: int = MAX_WORKERS_LOTE_PADRAO,
+        checkpoint: Optional[str] = None,
+        **opcoes
+    ) -> Iterator[ResultadoItemLote]:
+        """
+        Agenda vários recebimentos, com até max_workers envios simultâneos
+        
+        Os payloads (mesmo formato de agendar_json) são lidos sob demanda e
+        os resultados entregues na ordem de entrada, um por payload, com o
+        ID criado ou o erro. Com checkpoint, um lote interrompido pode ser
+        executado de novo sem recriar os agendamentos já feitos (ver
+        nibo_api.empresa.lote.executar_lote).
+        
+        Args:
+            payloads: Payloads dos agendamentos
+            max_workers: Envios simultâneos (o rate_limiter do cliente continua valendo)
+            checkpoint: Arquivo de checkpoint para retomada (opcional)
+            **opcoes: Opções repassadas a executar_lote (ex: converter, reenviar_incertos)
+            
+        Returns:
+            Iterador de ResultadoItemLote
+        """
+        return executar_lote(
+            self.agendar_json, payloads, max_workers=max_workers, checkpoint=checkpoint, **opcoes
+        )
+    
     def receber_lancamento_agendado(
         self,
         schedule_id: UUID,
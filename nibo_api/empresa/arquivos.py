@@ -47,7 +47,10 @@ class ArquivosInterface:
                 data['description'] = description
             
             url = f"{self.client.base_url}/files"
-            # Reaproveita a sessão do cliente (headers + config SSL/CA bundle)
-            response = self.client.session.post(url, files=files, data=data)
+            # Reaproveita a sessão do cliente (pool + config SSL/CA bundle) e seus headers
+            response = self.client.session.post(
+                url, files=files, data=data,
+                headers=self.client.headers, timeout=self.client.timeout
+            )
             return self.client._handle_response(response)
 
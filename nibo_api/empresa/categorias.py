@@ -1,10 +1,11 @@
 """
 Interface para gerenciamento de categorias no Nibo Empresa
 """
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterator
 from uuid import UUID
 
 from nibo_api.common.client import BaseClient
+from nibo_api.common.paginacao import TAMANHO_PAGINA_PADRAO
 
 
 class CategoriasInterface:
@@ -46,6 +47,33 @@ class CategoriasInterface:
             odata_skip=odata_skip
         )
     
+    def iter_listar(
+        self,
+        odata_filter: Optional[str] = None,
+        odata_orderby: Optional[str] = None,
+        page_size: int = TAMANHO_PAGINA_PADRAO,
+        **opcoes
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Itera sobre todos os registros de listar(), buscando página a página
+        
+        Args:
+            odata_filter: Filtro OData (ex: "type eq 'in'")
+            odata_orderby: Campo para ordenação
+            page_size: Registros por página ($top)
+            **opcoes: Opções de paginação repassadas a BaseClient.paginar
+            
+        Returns:
+            Iterador sobre os itens de todas as páginas
+        """
+        return self.client.paginar(
+            "/schedules/categories",
+            odata_filter=odata_filter,
+            odata_orderby=odata_orderby,
+            page_size=page_size,
+            **opcoes
+        )
+    
     def listar_grupos(self) -> Dict[str, Any]:
         """
         Lista grupos de categorias
@@ -4,6 +4,8 @@ Cliente principal para a API Nibo Empresa
 from typing import Optional
 from nibo_api.settings import NiboSettings
 from nibo_api.common.client import BaseClient
+from nibo_api.common.tipagem import MODELOS_EMPRESA
+from nibo_api.common.async_client import AsyncClientMixin
 from nibo_api.empresa.contatos.clientes import ClientesInterface
 from nibo_api.empresa.contatos.fornecedores import FornecedoresInterface
 from nibo_api.empresa.contatos.funcionarios import FuncionariosInterface
@@ -28,21 +30,25 @@ from nibo_api.empresa.cobrancas import CobrancasInterface
 
 class NiboEmpresaClient(BaseClient):
     """Cliente principal para interagir com a API Nibo Empresa"""
-    
+
+    modelos = MODELOS_EMPRESA
+
     def __init__(
-        self, 
+        self,
         config: Optional[NiboSettings] = None,
         organizacao_id: Optional[str] = None,
-        organizacao_codigo: Optional[str] = None
+        organizacao_codigo: Optional[str] = None,
+        **opcoes,
     ):
         """
         Inicializa o cliente Nibo Empresa
-        
+
         Args:
-            config: Instância de NiboSettings. Se None, cria uma nova.
+            config: Instância de NiboSettings. Se None, usa NiboSettings.compartilhado().
             organizacao_id: ID da organização (ex: "org_123")
             organizacao_codigo: Código simplificado da organização (ex: "empresa_principal")
-            
+            **opcoes: Opções repassadas ao BaseClient (ex: retry_policy, rate_limiter, typed)
+
         Raises:
             ValueError: Se nenhum identificador de organização for fornecido
         """
@@ -52,16 +58,20 @@ class NiboEmpresaClient(BaseClient):
                 "Exemplo: NiboEmpresaClient(config, organizacao_id='org_123') ou "
                 "NiboEmpresaClient(config, organizacao_codigo='empresa_principal')"
             )
-        
+
         if config is None:
-            config = NiboSettings()
+            config = NiboSettings.compartilhado()
         super().__init__(
-            config, 
+            config,
             base_url=config.empresa_base_url,
             organizacao_id=organizacao_id,
-            organizacao_codigo=organizacao_codigo
+            organizacao_codigo=organizacao_codigo,
+            **opcoes,
         )
-        
+
+        # Espelho local usado pelas interfaces com source="local" (ver nibo_api.empresa.espelho)
+        self.espelho = None
+
         # Inicializa interfaces
         self.clientes = ClientesInterface(self)
         self.fornecedores = FornecedoresInterface(self)
@@ -84,3 +94,35 @@ class NiboEmpresaClient(BaseClient):
         self.relatorios = RelatoriosInterface(self)
         self.cobrancas = CobrancasInterface(self)
 
+    @staticmethod
+    def executar_em_organizacoes(organizacoes, operacao, *args, **kwargs):
+        """
+        Executa a mesma operação em várias organizações, em paralelo
+
+        Atalho para nibo_api.empresa.fanout.executar_em_organizacoes.
+
+        Exemplo:
+            resultados = NiboEmpresaClient.executar_em_organizacoes(
+                ["empresa_a", "empresa_b"], "agendamentos_receber.listar_abertos",
+                max_workers=16
+            )
+            for organizacao, agendamento in resultados.itens():
+                ...
+        """
+        from nibo_api.empresa.fanout import executar_em_organizacoes
+
+        return executar_em_organizacoes(organizacoes, operacao, *args, **kwargs)
+
+
+class AsyncNiboEmpresaClient(AsyncClientMixin, NiboEmpresaClient):
+    """
+    Versão assíncrona (asyncio/aiohttp) do NiboEmpresaClient
+
+    Aceita os mesmos argumentos do NiboEmpresaClient, além de max_concorrencia e
+    limite_conexoes. As interfaces são as mesmas: seus métodos retornam
+    corrotinas e os iteradores iter_* devem ser consumidos com `async for`.
+
+    Exemplo:
+        async with AsyncNiboEmpresaClient(config, organizacao_codigo='empresa_principal') as client:
+            resultado = await client.clientes.listar(odata_top=10)
+    """
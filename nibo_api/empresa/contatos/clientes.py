@@ -1,10 +1,11 @@
 """
 Interface para gerenciamento de clientes no Nibo Empresa
 """
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Iterator
 from uuid import UUID
 
 from nibo_api.common.client import BaseClient
+from nibo_api.common.paginacao import TAMANHO_PAGINA_PADRAO
 from nibo_api.common.models import Cliente
 
 
@@ -47,6 +48,33 @@ class ClientesInterface:
             odata_skip=odata_skip
         )
     
+    def iter_listar(
+        self,
+        odata_filter: Optional[str] = None,
+        odata_orderby: Optional[str] = None,
+        page_size: int = TAMANHO_PAGINA_PADRAO,
+        **opcoes
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Itera sobre todos os registros de listar(), buscando página a página
+        
+        Args:
+            odata_filter: Filtro OData (ex: "document/number eq '11497110000127'")
+            odata_orderby: Campo para ordenação
+            page_size: Registros por página ($top)
+            **opcoes: Opções de paginação repassadas a BaseClient.paginar
+            
+        Returns:
+            Iterador sobre os itens de todas as páginas
+        """
+        return self.client.paginar(
+            "/customers",
+            odata_filter=odata_filter,
+            odata_orderby=odata_orderby,
+            page_size=page_size,
+            **opcoes
+        )
+    
     def buscar_por_id(self, cliente_id: UUID) -> Dict[str, Any]:
         """
         Busca um cliente por ID
@@ -88,6 +116,35 @@ class ClientesInterface:
             odata_skip=odata_skip
         )
     
+    def iter_buscar_agendamentos_por_cliente(
+        self,
+        cliente_id: UUID,
+        odata_filter: Optional[str] = None,
+        odata_orderby: Optional[str] = None,
+        page_size: int = TAMANHO_PAGINA_PADRAO,
+        **opcoes
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Itera sobre todos os registros de buscar_agendamentos_por_cliente(), buscando página a página
+        
+        Args:
+            cliente_id: UUID do cliente
+            odata_filter: Filtro OData
+            odata_orderby: Campo para ordenação
+            page_size: Registros por página ($top)
+            **opcoes: Opções de paginação repassadas a BaseClient.paginar
+            
+        Returns:
+            Iterador sobre os itens de todas as páginas
+        """
+        return self.client.paginar(
+            f"/customers/{cliente_id}/schedules",
+            odata_filter=odata_filter,
+            odata_orderby=odata_orderby,
+            page_size=page_size,
+            **opcoes
+        )
+    
     def criar(
         self,
         name: str,
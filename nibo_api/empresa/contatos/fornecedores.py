@@ -1,10 +1,11 @@
 """
 Interface para gerenciamento de fornecedores no Nibo Empresa
 """
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterator
 from uuid import UUID
 
 from nibo_api.common.client import BaseClient
+from nibo_api.common.paginacao import TAMANHO_PAGINA_PADRAO
 
 
 class FornecedoresInterface:
@@ -46,6 +47,33 @@ class FornecedoresInterface:
             odata_skip=odata_skip
         )
     
+    def iter_listar(
+        self,
+        odata_filter: Optional[str] = None,
+        odata_orderby: Optional[str] = None,
+        page_size: int = TAMANHO_PAGINA_PADRAO,
+        **opcoes
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Itera sobre todos os registros de listar(), buscando página a página
+        
+        Args:
+            odata_filter: Filtro OData
+            odata_orderby: Campo para ordenação
+            page_size: Registros por página ($top)
+            **opcoes: Opções de paginação repassadas a BaseClient.paginar
+            
+        Returns:
+            Iterador sobre os itens de todas as páginas
+        """
+        return self.client.paginar(
+            "/suppliers",
+            odata_filter=odata_filter,
+            odata_orderby=odata_orderby,
+            page_size=page_size,
+            **opcoes
+        )
+    
     def buscar_agendamentos_por_fornecedor(
         self,
         fornecedor_id: UUID,
@@ -75,6 +103,35 @@ class FornecedoresInterface:
             odata_skip=odata_skip
         )
     
+    def iter_buscar_agendamentos_por_fornecedor(
+        self,
+        fornecedor_id: UUID,
+        odata_filter: Optional[str] = None,
+        odata_orderby: Optional[str] = None,
+        page_size: int = TAMANHO_PAGINA_PADRAO,
+        **opcoes
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Itera sobre todos os registros de buscar_agendamentos_por_fornecedor(), buscando página a página
+        
+        Args:
+            fornecedor_id: UUID do fornecedor
+            odata_filter: Filtro OData
+            odata_orderby: Campo para ordenação
+            page_size: Registros por página ($top)
+            **opcoes: Opções de paginação repassadas a BaseClient.paginar
+            
+        Returns:
+            Iterador sobre os itens de todas as páginas
+        """
+        return self.client.paginar(
+            f"/suppliers/{fornecedor_id}/schedules",
+            odata_filter=odata_filter,
+            odata_orderby=odata_orderby,
+            page_size=page_size,
+            **opcoes
+        )
+    
     def buscar_por_id(self, fornecedor_id: UUID) -> Dict[str, Any]:
         """
         Busca um fornecedor por ID
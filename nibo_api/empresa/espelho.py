@@ -0,0 +1,672 @@
+"""
+Espelho local em SQLite dos agendamentos e lançamentos de uma organização
+
+Mantém uma cópia dos agendamentos a receber e a pagar, dos recebimentos e
+dos pagamentos de uma organização do Nibo Empresa em um arquivo SQLite,
+com índices por vencimento, stakeholder, categoria e status. Consultas
+repetidas (relatórios, filtros da CLI, conferências) passam a ler o
+arquivo local em vez de paginar a API inteira a cada execução.
+
+A primeira sincronização de cada recurso carrega tudo; as seguintes pedem
+à API apenas os itens com `updateDate` maior ou igual à última alteração
+já recebida. Exclusões não aparecem nessas consultas incrementais: são
+detectadas por uma carga completa periódica (ver `intervalo_completa`),
+que remove do espelho os itens que a API deixou de listar, ou informadas
+diretamente com `remover()` quando a exclusão parte deste processo.
+
+Exemplo:
+    client = NiboEmpresaClient(organizacao_codigo="empresa_principal")
+    with EspelhoLocal(client) as espelho:
+        espelho.sincronizar()
+        vencidos = espelho.consultar("agendamentos_receber", status="vencido")
+
+    # As interfaces respondem pelo espelho com source="local"
+    client.espelho = espelho
+    client.agendamentos_receber.listar_abertos(
+        odata_filter="contains(stakeholder/name, 'silva')", source="local"
+    )
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from nibo_api.common.client import BaseClient
+from nibo_api.common.datas import para_date, para_datetime
+from nibo_api.common.modelos_compactos import dados_do_item
+from nibo_api.common.odata import CompiladorSQL, registrar_funcoes, texto_instante
+from nibo_api.common.tipagem import tipar_resposta
+
+
+# Itens gravados por transação durante a sincronização
+TAMANHO_LOTE = 500
+
+# Registros pedidos por página à API durante a sincronização
+TAMANHO_PAGINA_ESPELHO = 500
+
+# Intervalo padrão entre cargas completas (detecção de exclusões), em segundos
+INTERVALO_COMPLETA_PADRAO = 24 * 60 * 60
+
+
+def _status_agendamento(item: Dict[str, Any]) -> str:
+    if item.get("isPaid"):
+        return "pago"
+    if item.get("isDued"):
+        return "vencido"
+    return "aberto"
+
+
+def _status_lancamento(item: Dict[str, Any]) -> str:
+    return "conciliado" if item.get("isReconciled") else "pendente"
+
+
+@dataclass(frozen=True)
+class RecursoEspelhado:
+    """Recurso da API mantido no espelho"""
+    nome: str
+    interface: str
+    metodo: str
+    endpoint: str
+    chave_id: str
+    campo_data: str
+    status: Callable[[Dict[str, Any]], str]
+    campo_atualizacao: str = "updateDate"
+
+
+RECURSOS: Dict[str, RecursoEspelhado] = {
+    recurso.nome: recurso for recurso in (
+        RecursoEspelhado("agendamentos_receber", "agendamentos_receber", "iter_listar_todos", "/schedules/credit",
+                         "scheduleId", "dueDate", _status_agendamento),
+        RecursoEspelhado("agendamentos_pagar", "agendamentos_pagar", "iter_listar_todos", "/schedules/debit",
+                         "scheduleId", "dueDate", _status_agendamento),
+        RecursoEspelhado("recebimentos", "recebimentos", "iter_listar", "/receipts",
+                         "entryId", "date", _status_lancamento),
+        RecursoEspelhado("pagamentos", "pagamentos", "iter_listar", "/payments",
+                         "entryId", "date", _status_lancamento),
+    )
+}
+
+# Fontes aceitas pelo parâmetro `source` das interfaces
+FONTES = ("api", "local")
+
+# Recortes dos agendamentos equivalentes aos endpoints /opened e /dued
+ESCOPOS = ("abertos", "vencidos")
+
+_ESQUEMA = (
+    "CREATE TABLE IF NOT EXISTS itens ("
+    " recurso TEXT NOT NULL,"
+    " id TEXT NOT NULL,"
+    " vencimento TEXT,"
+    " stakeholder_id TEXT,"
+    " stakeholder_nome TEXT,"
+    " categoria_id TEXT,"
+    " status TEXT,"
+    " valor REAL,"
+    " atualizado_em TEXT,"
+    " geracao INTEGER NOT NULL,"
+    " dados TEXT NOT NULL,"
+    " PRIMARY KEY (recurso, id))",
+    "CREATE INDEX IF NOT EXISTS idx_itens_vencimento ON itens (recurso, vencimento)",
+    "CREATE INDEX IF NOT EXISTS idx_itens_stakeholder ON itens (recurso, stakeholder_id)",
+    "CREATE INDEX IF NOT EXISTS idx_itens_categoria ON itens (recurso, categoria_id)",
+    "CREATE INDEX IF NOT EXISTS idx_itens_status ON itens (recurso, status, vencimento)",
+    "CREATE TABLE IF NOT EXISTS sincronizacoes ("
+    " recurso TEXT PRIMARY KEY,"
+    " marca_atualizacao TEXT,"
+    " geracao INTEGER NOT NULL DEFAULT 0,"
+    " ultima_completa REAL,"
+    " ultima_execucao REAL)",
+)
+
+
+@dataclass
+class ResultadoSincronizacao:
+    """Resumo da sincronização de um recurso"""
+    recurso: str
+    completa: bool
+    gravados: int = 0
+    removidos: int = 0
+    duracao: float = 0.0
+
+
+def _instante(texto: str) -> datetime:
+    """datetime sem fuso (em UTC quando o texto informa fuso), para comparar marcas"""
+    valor = para_datetime(texto)
+    if valor.tzinfo is not None:
+        valor = valor.astimezone(timezone.utc).replace(tzinfo=None)
+    return valor
+
+
+def _literal_odata(texto: str) -> str:
+    """Marca de atualização no formato aceito pelos filtros OData da API"""
+    valor = para_datetime(texto)
+    if valor.tzinfo is None:
+        return valor.strftime("%Y-%m-%dT%H:%M:%S")
+    return valor.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _categoria_id(item: Dict[str, Any]) -> Optional[str]:
+    categoria = item.get("category")
+    if isinstance(categoria, dict) and categoria.get("id"):
+        return str(categoria["id"]).casefold()
+    categorias = item.get("categories") or []
+    if categorias and isinstance(categorias[0], dict):
+        primeira = categorias[0].get("categoryId") or categorias[0].get("id")
+        return str(primeira).casefold() if primeira else None
+    return None
+
+
+def fonte_local(source: str) -> bool:
+    """
+    Valida o parâmetro `source` das interfaces
+
+    Args:
+        source: "api" (padrão) ou "local"
+
+    Returns:
+        True se a consulta deve ser respondida pelo espelho local
+
+    Raises:
+        ValueError: Se a fonte não for reconhecida
+    """
+    if source not in FONTES:
+        raise ValueError(f"source deve ser um de: {', '.join(FONTES)}")
+    return source == "local"
+
+
+def espelho_do_cliente(client: BaseClient) -> "EspelhoLocal":
+    """
+    Espelho associado ao cliente (client.espelho)
+
+    Raises:
+        ValueError: Se nenhum espelho tiver sido associado
+    """
+    espelho = getattr(client, "espelho", None)
+    if espelho is None:
+        raise ValueError(
+            "Nenhum espelho local associado ao cliente. "
+            "Use: client.espelho = EspelhoLocal(client); client.espelho.sincronizar()"
+        )
+    return espelho
+
+
+def caminho_padrao(client: BaseClient) -> str:
+    """
+    Arquivo padrão do espelho de uma organização
+
+    Args:
+        client: Cliente da organização
+
+    Returns:
+        <cache_dir>/espelho-<organização>.sqlite3
+    """
+    organizacao = client.organizacao_codigo or client.organizacao_id or "padrao"
+    nome = "".join(c if c.isalnum() or c in "-_" else "_" for c in str(organizacao))
+    return os.path.join(client.config.cache_dir, f"espelho-{nome}.sqlite3")
+
+
+class EspelhoLocal:
+    """
+    Cópia local, em SQLite, de agendamentos e lançamentos de uma organização
+
+    A conexão é compartilhada entre threads e protegida por um lock, como no
+    cache persistente de respostas. Diferente do cache, erros do SQLite são
+    propagados: o espelho é a fonte das consultas locais e não pode ficar
+    silenciosamente incompleto.
+    """
+
+    def __init__(
+        self,
+        client: BaseClient,
+        caminho: Optional[str] = None,
+        intervalo_completa: float = INTERVALO_COMPLETA_PADRAO,
+        page_size: int = TAMANHO_PAGINA_ESPELHO
+    ):
+        """
+        Inicializa o espelho, criando o arquivo e as tabelas se necessário
+
+        Args:
+            client: NiboEmpresaClient da organização espelhada
+            caminho: Arquivo do banco (padrão: <cache_dir>/espelho-<organização>.sqlite3)
+            intervalo_completa: Segundos entre cargas completas, que detectam
+                exclusões (0 faz toda sincronização ser completa)
+            page_size: Registros por página pedidos à API
+        """
+        self.client = client
+        self.caminho = Path(caminho or caminho_padrao(client)).expanduser()
+        self.caminho.parent.mkdir(parents=True, exist_ok=True)
+        self.intervalo_completa = intervalo_completa
+        self.page_size = page_size
+        self._lock = threading.Lock()
+        self._conexao = sqlite3.connect(str(self.caminho), timeout=5, check_same_thread=False)
+        try:
+            os.chmod(self.caminho, 0o600)  # contém dados financeiros da organização
+        except OSError:
+            pass
+        registrar_funcoes(self._conexao)
+        with self._lock, self._conexao:
+            self._conexao.execute("PRAGMA journal_mode=WAL")
+            for comando in _ESQUEMA:
+                self._conexao.execute(comando)
+
+    # Sincronização
+
+    def sincronizar(
+        self,
+        recursos: Optional[Iterable[str]] = None,
+        completa: Optional[bool] = None
+    ) -> List[ResultadoSincronizacao]:
+        """
+        Atualiza o espelho a partir da API
+
+        Args:
+            recursos: Nomes dos recursos (padrão: todos de RECURSOS)
+            completa: True força carga completa, False força incremental
+                (quando já houver marca) e None decide pelo intervalo_completa
+
+        Returns:
+            Lista de ResultadoSincronizacao, na ordem dos recursos
+
+        Raises:
+            ValueError: Se algum recurso não for espelhado
+        """
+        nomes = list(recursos) if recursos is not None else list(RECURSOS)
+        for nome in nomes:
+            self._recurso(nome)
+        return [self._sincronizar_recurso(RECURSOS[nome], completa) for nome in nomes]
+
+    def _sincronizar_recurso(
+        self,
+        recurso: RecursoEspelhado,
+        completa: Optional[bool]
+    ) -> ResultadoSincronizacao:
+        inicio = time.monotonic()
+        marca, geracao, ultima_completa = self._estado(recurso.nome)
+        if marca is None:
+            completa = True
+        elif completa is None:
+            completa = ultima_completa is None or time.time() - ultima_completa >= self.intervalo_completa
+
+        # A carga completa marca os itens recebidos com uma nova geração; os que
+        # ficarem com geração antiga ao final foram excluídos na API
+        if completa:
+            geracao += 1
+            filtro = None
+        else:
+            filtro = f"{recurso.campo_atualizacao} ge {_literal_odata(marca)}"
+
+        listar = getattr(getattr(self.client, recurso.interface), recurso.metodo)
+        itens = listar(
+            odata_filter=filtro,
+            odata_orderby=recurso.campo_atualizacao,
+            page_size=self.page_size
+        )
+        resultado = ResultadoSincronizacao(recurso.nome, completa)
+        nova_marca = marca
+        lote: List[Tuple] = []
+        for item in itens:
+            item = dados_do_item(item)  # clientes com typed=True
+            linha = self._linha(recurso, item, geracao)
+            if linha is None:
+                continue
+            lote.append(linha)
+            atualizado = item.get(recurso.campo_atualizacao)
+            if atualizado and (nova_marca is None or _instante(atualizado) > _instante(nova_marca)):
+                nova_marca = atualizado
+            if len(lote) >= TAMANHO_LOTE:
+                resultado.gravados += self._gravar(lote)
+                lote = []
+        resultado.gravados += self._gravar(lote)
+
+        agora = time.time()
+        with self._lock, self._conexao:
+            if completa:
+                resultado.removidos = self._conexao.execute(
+                    "DELETE FROM itens WHERE recurso = ? AND geracao < ?", (recurso.nome, geracao)
+                ).rowcount
+            self._conexao.execute(
+                "INSERT OR REPLACE INTO sincronizacoes VALUES (?, ?, ?, ?, ?)",
+                (recurso.nome, nova_marca, geracao,
+                 agora if completa else ultima_completa, agora)
+            )
+        resultado.duracao = time.monotonic() - inicio
+        return resultado
+
+    def _linha(self, recurso: RecursoEspelhado, item: Dict[str, Any], geracao: int) -> Optional[Tuple]:
+        """Colunas indexadas de um item (None se o item não tiver identificador)"""
+        identificador = item.get(recurso.chave_id)
+        if not identificador:
+            return None
+        stakeholder = item.get("stakeholder") or {}
+        valor = item.get("value")
+        return (
+            recurso.nome,
+            str(identificador),
+            texto_instante(item.get(recurso.campo_data)),
+            str(stakeholder["id"]).casefold() if stakeholder.get("id") else None,
+            stakeholder.get("name"),
+            _categoria_id(item),
+            recurso.status(item),
+            float(valor) if valor is not None else None,
+            texto_instante(item.get(recurso.campo_atualizacao)),
+            geracao,
+            json.dumps(item, ensure_ascii=False),
+        )
+
+    def _gravar(self, linhas: Sequence[Tuple]) -> int:
+        if not linhas:
+            return 0
+        with self._lock, self._conexao:
+            self._conexao.executemany(
+                "INSERT OR REPLACE INTO itens VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", linhas
+            )
+        return len(linhas)
+
+    def _estado(self, nome: str) -> Tuple[Optional[str], int, Optional[float]]:
+        with self._lock:
+            linha = self._conexao.execute(
+                "SELECT marca_atualizacao, geracao, ultima_completa FROM sincronizacoes WHERE recurso = ?",
+                (nome,)
+            ).fetchone()
+        return linha if linha is not None else (None, 0, None)
+
+    @staticmethod
+    def _recurso(nome: str) -> RecursoEspelhado:
+        try:
+            return RECURSOS[nome]
+        except KeyError:
+            raise ValueError(
+                f"Recurso '{nome}' não é espelhado. Use um de: {', '.join(RECURSOS)}"
+            ) from None
+
+    # Consultas
+
+    def consultar(
+        self,
+        recurso: str,
+        vencimento_inicio: Optional[Any] = None,
+        vencimento_fim: Optional[Any] = None,
+        stakeholder_id: Optional[Any] = None,
+        categoria_id: Optional[Any] = None,
+        status: Optional[str] = None,
+        limite: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Consulta itens do espelho usando os índices locais
+
+        Args:
+            recurso: Nome do recurso (ex: "agendamentos_receber")
+            vencimento_inicio: Data mínima (dueDate nos agendamentos, date nos
+                lançamentos), em DD/MM/YYYY, ISO ou date
+            vencimento_fim: Data máxima, inclusive
+            stakeholder_id: ID do cliente/fornecedor
+            categoria_id: ID da categoria
+            status: "aberto", "vencido" ou "pago" (agendamentos);
+                "pendente" ou "conciliado" (lançamentos)
+            limite: Quantidade máxima de itens
+
+        Returns:
+            Itens como retornados pela API, ordenados por data
+
+        Raises:
+            ValueError: Se o recurso não for espelhado ou alguma data for inválida
+        """
+        self._recurso(recurso)
+        condicoes = ["recurso = ?"]
+        parametros: List[Any] = [recurso]
+        # vencimento guarda data e hora (texto_instante): o fim vai até o dia seguinte, exclusive
+        for operador, valor, dias in ((">=", vencimento_inicio, 0), ("<", vencimento_fim, 1)):
+            if valor is not None:
+                data = para_date(valor)
+                if data is None:
+                    raise ValueError(f"Data inválida: {valor}. Use DD/MM/YYYY ou YYYY-MM-DD.")
+                condicoes.append(f"vencimento {operador} ?")
+                parametros.append((data + timedelta(days=dias)).isoformat())
+        for coluna, valor in (("stakeholder_id", stakeholder_id),
+                              ("categoria_id", categoria_id),
+                              ("status", status)):
+            if valor is not None:
+                condicoes.append(f"{coluna} = ?")
+                parametros.append(str(valor).casefold())
+        sql = f"SELECT dados FROM itens WHERE {' AND '.join(condicoes)} ORDER BY vencimento, id"
+        if limite is not None:
+            sql += " LIMIT ?"
+            parametros.append(int(limite))
+        with self._lock:
+            linhas = self._conexao.execute(sql, parametros).fetchall()
+        return [json.loads(linha[0]) for linha in linhas]
+
+    def listar(
+        self,
+        recurso: str,
+        escopo: Optional[str] = None,
+        odata_filter: Optional[str] = None,
+        odata_orderby: Optional[str] = None,
+        odata_top: Optional[int] = None,
+        odata_skip: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Responde uma listagem da API a partir do espelho, com os mesmos parâmetros OData
+
+        O filtro e a ordenação são compilados para SQL (ver
+        nibo_api.common.odata); vencimento, updateDate, stakeholder/id,
+        stakeholder/name e value usam as colunas indexadas.
+
+        Args:
+            recurso: Nome do recurso (ex: "agendamentos_receber")
+            escopo: "abertos" ou "vencidos" (agendamentos), como /opened e /dued
+            odata_filter: Filtro OData
+            odata_orderby: Ordenação OData (padrão: data do item)
+            odata_top: Limite de registros
+            odata_skip: Registros a pular
+
+        Returns:
+            Dicionário com 'items' e 'count' (total que atende ao filtro), como a
+            API; com typed=True no cliente, os itens são modelos compactos
+
+        Raises:
+            ValueError: Se o recurso ou o escopo forem inválidos
+            ErroOData: Se o filtro ou a ordenação não forem suportados
+        """
+        definicao, onde, parametros, sql, parametros_sql = self._montar_consulta(
+            recurso, escopo, odata_filter, odata_orderby, odata_top, odata_skip
+        )
+        with self._lock:
+            total = self._conexao.execute(f"SELECT COUNT(*) FROM itens WHERE {onde}", parametros).fetchone()[0]
+            linhas = self._conexao.execute(sql, parametros_sql).fetchall()
+        resultado = {"items": [json.loads(linha[0]) for linha in linhas], "count": total}
+        modelo = self._modelo(definicao)
+        return tipar_resposta(modelo, resultado) if modelo is not None else resultado
+
+    def _montar_consulta(self, recurso, escopo, odata_filter, odata_orderby, odata_top, odata_skip):
+        """
+        Monta o SQL de uma listagem (ver listar)
+
+        Returns:
+            (definição do recurso, condição WHERE, parâmetros da condição,
+            SELECT completo, parâmetros do SELECT)
+        """
+        definicao = self._recurso(recurso)
+        condicoes = ["recurso = ?"]
+        parametros: List[Any] = [recurso]
+        if escopo is not None:
+            if escopo not in ESCOPOS or definicao.campo_data != "dueDate":
+                raise ValueError(f"Escopo '{escopo}' não se aplica a {recurso}")
+            condicoes.append("status != 'pago'")
+            if escopo == "vencidos":
+                condicoes.append("vencimento < ?")
+                parametros.append(date.today().isoformat())
+        compilador = CompiladorSQL(self._colunas(definicao))
+        if odata_filter:
+            filtro, parametros_filtro = compilador.filtro(odata_filter)
+            condicoes.append(filtro)
+            parametros.extend(parametros_filtro)
+        ordem, parametros_ordem = compilador.ordem(odata_orderby)
+        onde = " AND ".join(condicoes)
+        sql = f"SELECT dados FROM itens WHERE {onde} ORDER BY {ordem + ', ' if ordem else ''}vencimento, id"
+        parametros_pagina: List[Any] = []
+        if odata_top is not None or odata_skip:
+            sql += " LIMIT ? OFFSET ?"
+            parametros_pagina = [odata_top if odata_top is not None else -1, odata_skip or 0]
+        return definicao, onde, parametros, sql, parametros + parametros_ordem + parametros_pagina
+
+    def _modelo(self, definicao: RecursoEspelhado) -> Optional[type]:
+        """Modelo compacto do recurso quando o cliente está no modo tipado"""
+        modelos = getattr(self.client, "modelos", None)
+        if getattr(self.client, "typed", False) and modelos:
+            return modelos.modelo_para(definicao.endpoint)
+        return None
+
+    def iterar(
+        self,
+        recurso: str,
+        escopo: Optional[str] = None,
+        odata_filter: Optional[str] = None,
+        odata_orderby: Optional[str] = None,
+        odata_skip: Optional[int] = None,
+        limite: Optional[int] = None,
+        **opcoes
+    ) -> Iterator[Any]:
+        """
+        Equivalente local dos métodos iter_* das interfaces
+
+        As linhas são lidas do cursor em lotes de TAMANHO_LOTE, então só um
+        lote fica decodificado em memória por vez.
+
+        Args:
+            recurso: Nome do recurso
+            escopo: "abertos" ou "vencidos" (agendamentos)
+            odata_filter: Filtro OData
+            odata_orderby: Ordenação OData
+            odata_skip: Registros a pular
+            limite: Quantidade máxima de itens
+            **opcoes: Opções de paginação da API (page_size, max_workers,
+                stream), sem efeito na consulta local
+
+        Returns:
+            Iterador sobre os itens
+
+        Raises:
+            ValueError: Se o recurso ou o escopo forem inválidos
+            ErroOData: Se o filtro ou a ordenação não forem suportados
+        """
+        definicao, _, _, sql, parametros_sql = self._montar_consulta(
+            recurso, escopo, odata_filter, odata_orderby, limite, odata_skip
+        )
+        return self._iterar_cursor(self._modelo(definicao), sql, parametros_sql)
+
+    def _iterar_cursor(self, modelo: Optional[type], sql: str, parametros: List[Any]) -> Iterator[Any]:
+        """Percorre o resultado do SELECT em lotes, sem manter o lock entre eles"""
+        with self._lock:
+            cursor = self._conexao.execute(sql, parametros)
+        try:
+            while True:
+                with self._lock:
+                    linhas = cursor.fetchmany(TAMANHO_LOTE)
+                if not linhas:
+                    return
+                itens = [json.loads(linha[0]) for linha in linhas]
+                yield from (tipar_resposta(modelo, itens) if modelo is not None else itens)
+        finally:
+            with self._lock:
+                cursor.close()
+
+    @staticmethod
+    def _colunas(recurso: RecursoEspelhado) -> Dict[str, Tuple[str, str]]:
+        """Campos OData atendidos pelas colunas indexadas"""
+        return {
+            recurso.campo_data: ("vencimento", "datahora"),
+            recurso.campo_atualizacao: ("atualizado_em", "datahora"),
+            "stakeholder/id": ("stakeholder_id", "id"),
+            "stakeholder/name": ("stakeholder_nome", "texto"),
+            "value": ("valor", "numero"),
+        }
+
+    def obter(self, recurso: str, identificador: Any) -> Optional[Dict[str, Any]]:
+        """
+        Busca um item do espelho pelo identificador (scheduleId ou entryId)
+
+        Args:
+            recurso: Nome do recurso
+            identificador: ID do item
+
+        Returns:
+            Item como retornado pela API, ou None se não estiver no espelho
+        """
+        self._recurso(recurso)
+        with self._lock:
+            linha = self._conexao.execute(
+                "SELECT dados FROM itens WHERE recurso = ? AND id = ?", (recurso, str(identificador))
+            ).fetchone()
+        return json.loads(linha[0]) if linha else None
+
+    def remover(self, recurso: str, identificador: Any) -> bool:
+        """
+        Remove um item do espelho (ex: logo após excluí-lo pela API)
+
+        Args:
+            recurso: Nome do recurso
+            identificador: ID do item
+
+        Returns:
+            True se o item estava no espelho
+        """
+        self._recurso(recurso)
+        with self._lock, self._conexao:
+            return self._conexao.execute(
+                "DELETE FROM itens WHERE recurso = ? AND id = ?", (recurso, str(identificador))
+            ).rowcount > 0
+
+    def contar(self, recurso: str) -> int:
+        """Quantidade de itens do recurso no espelho"""
+        self._recurso(recurso)
+        with self._lock:
+            return self._conexao.execute(
+                "SELECT COUNT(*) FROM itens WHERE recurso = ?", (recurso,)
+            ).fetchone()[0]
+
+    def estado(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Estado da sincronização de cada recurso já sincronizado
+
+        Returns:
+            Dicionário recurso -> {'marca_atualizacao', 'ultima_completa',
+            'ultima_execucao', 'itens'}
+        """
+        with self._lock:
+            linhas = self._conexao.execute(
+                "SELECT s.recurso, s.marca_atualizacao, s.ultima_completa, s.ultima_execucao,"
+                " (SELECT COUNT(*) FROM itens i WHERE i.recurso = s.recurso)"
+                " FROM sincronizacoes s"
+            ).fetchall()
+        return {
+            recurso: {
+                "marca_atualizacao": marca,
+                "ultima_completa": completa,
+                "ultima_execucao": execucao,
+                "itens": itens,
+            }
+            for recurso, marca, completa, execucao, itens in linhas
+        }
+
+    def limpar(self):
+        """Descarta todos os itens e o estado de sincronização"""
+        with self._lock, self._conexao:
+            self._conexao.execute("DELETE FROM itens")
+            self._conexao.execute("DELETE FROM sincronizacoes")
+
+    def close(self):
+        """Fecha a conexão com o banco"""
+        with self._lock:
+            self._conexao.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
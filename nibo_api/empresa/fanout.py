@@ -0,0 +1,147 @@
+"""
+Execução de uma mesma consulta em várias organizações do Nibo Empresa
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from operator import attrgetter
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from nibo_api.common.paginacao import extrair_items
+from nibo_api.pool import NiboClientPool, pool_padrao
+
+
+# Organizações consultadas ao mesmo tempo por padrão
+MAX_WORKERS_PADRAO = 8
+
+Operacao = Union[str, Callable[..., Any]]
+
+
+@dataclass
+class ResultadoOrganizacao:
+    """Resultado da operação em uma organização"""
+    organizacao: str
+    resultado: Any = None
+    erro: Optional[Exception] = None
+    duracao: float = 0.0
+
+    @property
+    def sucesso(self) -> bool:
+        """True se a operação terminou sem erro"""
+        return self.erro is None
+
+
+class ResultadoFanOut(list):
+    """Lista de ResultadoOrganizacao, na ordem das organizações informadas"""
+
+    def sucessos(self) -> List[ResultadoOrganizacao]:
+        """Resultados das organizações que terminaram sem erro"""
+        return [r for r in self if r.sucesso]
+
+    def erros(self) -> Dict[str, Exception]:
+        """Erros por organização"""
+        return {r.organizacao: r.erro for r in self if not r.sucesso}
+
+    def por_organizacao(self) -> Dict[str, Any]:
+        """Resultados bem-sucedidos indexados pela organização"""
+        return {r.organizacao: r.resultado for r in self if r.sucesso}
+
+    def itens(self) -> Iterator[Tuple[str, Any]]:
+        """
+        Visão consolidada dos itens retornados por todas as organizações
+
+        Returns:
+            Iterador de tuplas (organizacao, item), extraindo 'items' de
+            respostas paginadas ou percorrendo listas
+        """
+        for r in self.sucessos():
+            resultado = r.resultado
+            items = resultado if isinstance(resultado, list) else extrair_items(resultado)
+            for item in items:
+                yield r.organizacao, item
+
+
+def _resolver_operacao(operacao: Operacao) -> Callable[..., Any]:
+    """Converte 'interface.metodo' em uma função que recebe o cliente"""
+    if callable(operacao):
+        return operacao
+    if isinstance(operacao, str) and operacao:
+        metodo = attrgetter(operacao)
+        return lambda client, *args, **kwargs: metodo(client)(*args, **kwargs)
+    raise ValueError("operacao deve ser um callable ou 'interface.metodo' (ex: 'agendamentos_receber.listar_abertos')")
+
+
+def executar_em_organizacoes(
+    organizacoes: Optional[Iterable[str]],
+    operacao: Operacao,
+    *args,
+    max_workers: int = MAX_WORKERS_PADRAO,
+    pool: Optional[NiboClientPool] = None,
+    **kwargs
+) -> ResultadoFanOut:
+    """
+    Executa a mesma operação em várias organizações, em paralelo
+
+    Cada organização é atendida por um cliente do pool (conexões e
+    transporte compartilhados). No máximo `max_workers` organizações são
+    consultadas ao mesmo tempo. Erros de uma organização ficam registrados
+    no seu ResultadoOrganizacao e não interrompem as demais.
+
+    Args:
+        organizacoes: IDs ou códigos de organização (resolvidos como em
+                      NiboSettings.get_api_token(organizacao_codigo=...)).
+                      Se None, usa todas as organizações de api_tokens.
+        operacao: Callable que recebe o cliente (e *args/**kwargs) ou caminho
+                  de um método de interface, ex: 'agendamentos_receber.listar_abertos'
+        *args: Argumentos posicionais repassados à operação
+        max_workers: Quantidade máxima de organizações em paralelo
+        pool: NiboClientPool a usar (padrão: pool_padrao())
+        **kwargs: Argumentos nomeados repassados à operação
+
+    Returns:
+        ResultadoFanOut com um resultado por organização, na ordem informada.
+        Iteradores (ex: métodos iter_*) são consumidos dentro da thread da
+        organização e entregues como lista.
+
+    Raises:
+        ValueError: Se max_workers não for positivo ou a operação for inválida
+    """
+    if max_workers <= 0:
+        raise ValueError("max_workers deve ser maior que zero")
+    funcao = _resolver_operacao(operacao)
+    pool = pool or pool_padrao()
+    if organizacoes is None:
+        organizacoes = organizacoes_configuradas(pool)
+    organizacoes = list(organizacoes)
+
+    def executar(organizacao: str) -> ResultadoOrganizacao:
+        inicio = time.monotonic()
+        try:
+            client = pool.empresa(organizacao_codigo=organizacao)
+            resultado = funcao(client, *args, **kwargs)
+            if isinstance(resultado, Iterator):
+                resultado = list(resultado)
+        except Exception as erro:
+            return ResultadoOrganizacao(organizacao, erro=erro, duracao=time.monotonic() - inicio)
+        return ResultadoOrganizacao(organizacao, resultado=resultado, duracao=time.monotonic() - inicio)
+
+    resultados = ResultadoFanOut()
+    if not organizacoes:
+        return resultados
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(organizacoes))) as executor:
+        resultados.extend(executor.map(executar, organizacoes))
+    return resultados
+
+
+def organizacoes_configuradas(pool: Optional[NiboClientPool] = None) -> List[str]:
+    """
+    Lista as organizações com token configurado (chaves de api_tokens)
+
+    Args:
+        pool: NiboClientPool cuja configuração será usada (padrão: pool_padrao())
+
+    Returns:
+        Lista de IDs/códigos de organização
+    """
+    pool = pool or pool_padrao()
+    return list(pool.config._get_api_tokens_dict().keys())
@@ -0,0 +1,243 @@
+"""
+Criação de agendamentos em lote, com concorrência limitada e retomada por checkpoint
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, Optional, Union
+
+from nibo_api.common.diario import escrita_ambigua, extrair_id
+
+
+# Envios simultâneos por padrão (o rate_limiter do cliente continua valendo)
+MAX_WORKERS_LOTE_PADRAO = 8
+
+# Situações de um item do lote
+CRIADO = "criado"
+RETOMADO = "retomado"
+ERRO = "erro"
+INCERTO = "incerto"
+ENVIANDO = "enviando"
+
+
+@dataclass
+class ResultadoItemLote:
+    """
+    Resultado do envio de um item do lote
+
+    situacao:
+        'criado'   - enviado agora e aceito pela API
+        'retomado' - já criado numa execução anterior (lido do checkpoint)
+        'erro'     - recusado ou inválido; nada foi criado e o item é reenviado ao retomar
+        'incerto'  - a requisição pode ter sido aplicada (erro 5xx, timeout ou
+                     queda durante o envio); não é reenviado ao retomar, para
+                     não duplicar, salvo com reenviar_incertos=True
+    """
+    indice: int
+    chave: str
+    situacao: str
+    id: Optional[str] = None
+    resposta: Any = None
+    erro: Optional[Union[Exception, str]] = None
+    duracao: float = 0.0
+
+    @property
+    def sucesso(self) -> bool:
+        """True se o item existe na API (criado agora ou antes)"""
+        return self.situacao in (CRIADO, RETOMADO)
+
+
+class CheckpointLote:
+    """
+    Checkpoint de um lote em arquivo JSON Lines (somente acréscimos)
+
+    Cada item recebe um registro 'enviando' antes do POST e outro com o
+    desfecho ('criado' com o id, 'erro' ou 'incerto') depois. Ao reabrir, o
+    último registro de cada chave indica o que já foi feito; um 'enviando'
+    sem desfecho (processo interrompido durante o envio) vira 'incerto'.
+    Cada linha é gravada com flush, então sobrevive à queda do processo.
+    """
+
+    def __init__(self, caminho: Union[str, "os.PathLike[str]"]):
+        """
+        Abre (ou cria) o checkpoint
+
+        Args:
+            caminho: Arquivo do checkpoint
+        """
+        self.caminho = os.fspath(caminho)
+        self._lock = threading.Lock()
+        self._estado: Dict[str, Dict[str, Any]] = {}
+        try:
+            with open(self.caminho, "r", encoding="utf-8") as f:
+                for linha in f:
+                    try:
+                        registro = json.loads(linha)
+                    except ValueError:
+                        continue  # última linha truncada por uma queda
+                    if isinstance(registro, dict) and "chave" in registro:
+                        self._estado[registro["chave"]] = registro
+        except FileNotFoundError:
+            pass
+        self._arquivo = open(self.caminho, "a", encoding="utf-8")
+
+    def situacao(self, chave: str) -> Optional[Dict[str, Any]]:
+        """
+        Último registro de uma chave
+
+        Args:
+            chave: Chave do item
+
+        Returns:
+            Registro ('situacao', 'id', 'erro') ou None se o item nunca foi enviado
+        """
+        with self._lock:
+            registro = self._estado.get(chave)
+        if registro is not None and registro.get("situacao") == ENVIANDO:
+            return dict(registro, situacao=INCERTO)
+        return registro
+
+    def registrar(self, chave: str, situacao: str, id: Optional[str] = None, erro: Optional[str] = None):
+        """
+        Acrescenta um registro ao checkpoint
+
+        Args:
+            chave: Chave do item
+            situacao: 'enviando', 'criado', 'erro' ou 'incerto'
+            id: ID criado (situação 'criado')
+            erro: Mensagem de erro
+        """
+        registro = {"chave": chave, "situacao": situacao}
+        if id is not None:
+            registro["id"] = id
+        if erro is not None:
+            registro["erro"] = erro
+        linha = json.dumps(registro, ensure_ascii=False) + "\n"
+        with self._lock:
+            self._estado[chave] = registro
+            self._arquivo.write(linha)
+            self._arquivo.flush()
+
+    def close(self):
+        """Fecha o arquivo do checkpoint"""
+        with self._lock:
+            if not self._arquivo.closed:
+                self._arquivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def chave_padrao(indice: int, item: Any) -> str:
+    """
+    Chave de checkpoint de um item: posição no lote + hash do conteúdo
+
+    Args:
+        indice: Posição do item no lote (a partir de 0)
+        item: Item original (payload ou linha de arquivo)
+
+    Returns:
+        Chave estável entre execuções para a mesma entrada
+    """
+    conteudo = json.dumps(item, sort_keys=True, ensure_ascii=False, default=str)
+    return f"{indice}:{hashlib.sha256(conteudo.encode()).hexdigest()[:16]}"
+
+
+def executar_lote(
+    enviar: Callable[[Dict[str, Any]], Any],
+    itens: Iterable[Any],
+    max_workers: int = MAX_WORKERS_LOTE_PADRAO,
+    checkpoint: Optional[Union[str, "os.PathLike[str]", CheckpointLote]] = None,
+    converter: Optional[Callable[[Any], Dict[str, Any]]] = None,
+    chave: Callable[[int, Any], str] = chave_padrao,
+    reenviar_incertos: bool = False
+) -> Iterator[ResultadoItemLote]:
+    """
+    Envia os itens com concorrência limitada, entregando um resultado por item
+
+    Os itens são lidos sob demanda: no máximo 2 * max_workers ficam em
+    andamento ou aguardando entrega, então entradas grandes (ex: um CSV com
+    dezenas de milhares de linhas) não são carregadas em memória. Os
+    resultados saem na ordem dos itens. Erros de um item ficam no seu
+    resultado e não interrompem os demais.
+
+    Args:
+        enviar: Função que cria um item (ex: agendar_json)
+        itens: Payloads (ou itens a converter com `converter`)
+        max_workers: Envios simultâneos
+        checkpoint: Caminho ou CheckpointLote para retomar um lote interrompido
+        converter: Converte cada item em payload; falhas viram resultado 'erro'
+        chave: Função (indice, item) -> chave do item no checkpoint
+        reenviar_incertos: Reenvia itens 'incerto' do checkpoint (pode duplicar)
+
+    Returns:
+        Iterador de ResultadoItemLote, na ordem dos itens
+
+    Raises:
+        ValueError: Se max_workers não for positivo
+    """
+    if max_workers <= 0:
+        raise ValueError("max_workers deve ser maior que zero")
+    return _executar_lote(enviar, itens, max_workers, checkpoint, converter, chave, reenviar_incertos)
+
+
+def _executar_lote(enviar, itens, max_workers, checkpoint, converter, chave, reenviar_incertos):
+    registro = CheckpointLote(checkpoint) if isinstance(checkpoint, (str, os.PathLike)) else checkpoint
+
+    def processar(indice: int, chave_item: str, item: Any) -> ResultadoItemLote:
+        inicio = time.monotonic()
+        try:
+            payload = converter(item) if converter else item
+        except Exception as erro:
+            if registro is not None:
+                registro.registrar(chave_item, ERRO, erro=str(erro))
+            return ResultadoItemLote(indice, chave_item, ERRO, erro=erro, duracao=time.monotonic() - inicio)
+        if registro is not None:
+            registro.registrar(chave_item, ENVIANDO)
+        try:
+            resposta = enviar(payload)
+        except Exception as erro:
+            situacao = INCERTO if escrita_ambigua(erro) else ERRO
+            if registro is not None:
+                registro.registrar(chave_item, situacao, erro=str(erro))
+            return ResultadoItemLote(indice, chave_item, situacao, erro=erro, duracao=time.monotonic() - inicio)
+        criado = extrair_id(resposta)
+        if registro is not None:
+            registro.registrar(chave_item, CRIADO, id=criado)
+        return ResultadoItemLote(
+            indice, chave_item, CRIADO, id=criado, resposta=resposta, duracao=time.monotonic() - inicio
+        )
+
+    pendentes: Deque[Union[Future, ResultadoItemLote]] = deque()
+
+    def proximo() -> ResultadoItemLote:
+        pendente = pendentes.popleft()
+        return pendente.result() if isinstance(pendente, Future) else pendente
+
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for indice, item in enumerate(itens):
+                chave_item = chave(indice, item)
+                anterior = registro.situacao(chave_item) if registro is not None else None
+                situacao = anterior.get("situacao") if anterior else None
+                if situacao == CRIADO:
+                    pendentes.append(ResultadoItemLote(indice, chave_item, RETOMADO, id=anterior.get("id")))
+                elif situacao == INCERTO and not reenviar_incertos:
+                    pendentes.append(ResultadoItemLote(indice, chave_item, INCERTO, erro=anterior.get("erro")))
+                else:
+                    pendentes.append(executor.submit(processar, indice, chave_item, item))
+                while len(pendentes) > 2 * max_workers:
+                    yield proximo()
+            while pendentes:
+                yield proximo()
+    finally:
+        if registro is not None and registro is not checkpoint:
+            registro.close()
@@ -2,6 +2,9 @@
 Comandos CLI principais para Nibo Empresa
 """
 import argparse
+
+from nibo_api.pool import configurar_cache_cli
+from .utils import adicionar_opcoes_cache
 from .commands import (
     organizacoes,
     clientes,
@@ -59,6 +62,9 @@ Exemplos de uso:
   # Criar agendamento de pagamento
   python manage.py empresa criar-agendamento-pagar --fornecedor "uuid" --categoria "uuid" --valor 500.00 --data-agendamento "01/01/2025" --data-vencimento "31/01/2025" --descricao "Pagamento" --org org_123
 
+  # Importar agendamentos de um CSV (retoma do checkpoint se interrompido)
+  python manage.py empresa importar-agendamentos --arquivo agendamentos.csv --tipo receber --org org_123
+
   # Listar categorias
   python manage.py empresa categorias --org org_123
 
@@ -67,6 +73,10 @@ Exemplos de uso:
 
   # Usar formato JSON
   python manage.py empresa clientes --json --org org_123
+
+  # Ignorar ou renovar o cache local de consultas
+  python manage.py empresa categorias --org org_123 --no-cache
+  python manage.py empresa categorias --org org_123 --refresh
         """
     )
     
@@ -78,6 +88,8 @@ Exemplos de uso:
     agendamentos.add_agendamentos_parser(subparsers)
     categorias.add_categorias_parser(subparsers)
     fornecedores.add_fornecedores_parser(subparsers)
+    for subparser in {id(p): p for p in subparsers.choices.values()}.values():
+        adicionar_opcoes_cache(subparser)
     
     # Se chamado via manage.py, remove o primeiro argumento ("empresa")
     import sys
@@ -91,6 +103,7 @@ Exemplos de uso:
         parser.print_help()
         return 0
     
+    configurar_cache_cli(sem_cache=args.no_cache, atualizar=args.refresh)
     try:
         return args.func(args)
     except Exception as e:
@@ -2,12 +2,16 @@
 Comandos CLI para agendamentos
 """
 import argparse
-from typing import Optional, Dict, Any
+import csv
+import json
+from typing import Optional, Dict, Any, Iterator
 from uuid import UUID
-from datetime import datetime
 
-from nibo_api.settings import NiboSettings
+from nibo_api.pool import pool_padrao
+from nibo_api.common.diario import DiarioEscritas
 from nibo_api.empresa.client import NiboEmpresaClient
+from nibo_api.common.datas import para_date
+from nibo_api.empresa.lote import MAX_WORKERS_LOTE_PADRAO, ResultadoItemLote
 from ..utils import exibir_resultado_json, exibir_agendamentos
 
 
@@ -31,9 +35,7 @@ def listar_agendamentos_receber(
     Returns:
         Dicionário com 'items' (lista de agendamentos) e 'count'
     """
-    config = NiboSettings()
-    client = NiboEmpresaClient(
-        config,
+    client = pool_padrao().empresa(
         organizacao_id=organizacao_id,
         organizacao_codigo=organizacao_codigo
     )
@@ -79,9 +81,7 @@ def listar_agendamentos_pagar(
     Returns:
         Dicionário com 'items' (lista de agendamentos) e 'count'
     """
-    config = NiboSettings()
-    client = NiboEmpresaClient(
-        config,
+    client = pool_padrao().empresa(
         organizacao_id=organizacao_id,
         organizacao_codigo=organizacao_codigo
     )
@@ -136,9 +136,7 @@ def criar_agendamento_receber(
     Returns:
         Dados do agendamento criado
     """
-    config = NiboSettings()
-    client = NiboEmpresaClient(
-        config,
+    client = pool_padrao().empresa(
         organizacao_id=organizacao_id,
         organizacao_codigo=organizacao_codigo
     )
@@ -187,9 +185,7 @@ def criar_agendamento_pagar(
     Returns:
         Dados do agendamento criado
     """
-    config = NiboSettings()
-    client = NiboEmpresaClient(
-        config,
+    client = pool_padrao().empresa(
         organizacao_id=organizacao_id,
         organizacao_codigo=organizacao_codigo
     )
@@ -210,18 +206,149 @@ def criar_agendamento_pagar(
     )
 
 
-def _parse_data_periodo(data_str: str):
-    """Converte data de entrada (DD/MM/YYYY ou YYYY-MM-DD) para datetime."""
-    if not data_str:
-        return None
+# Colunas do CSV de importar-agendamentos
+COLUNAS_IMPORTACAO = ("contato", "categoria", "valor", "data_agendamento", "data_vencimento", "descricao", "referencia")
+
+
+def _ler_csv_agendamentos(caminho: str) -> Iterator[Dict[str, str]]:
+    """Lê as linhas do CSV sob demanda (separador ',' ou ';', detectado pelo cabeçalho)"""
+    with open(caminho, "r", encoding="utf-8-sig", newline="") as f:
+        cabecalho = f.readline()
+        f.seek(0)
+        delimitador = ";" if cabecalho.count(";") > cabecalho.count(",") else ","
+        for linha in csv.DictReader(f, delimiter=delimitador):
+            yield {(chave or "").strip().lower(): (valor or "").strip() for chave, valor in linha.items()}
+
+
+def _converter_valor(texto: str) -> float:
+    """Converte '1234.56', '1234,56' ou '1.234,56' em float"""
+    if "," in texto:
+        texto = texto.replace(".", "").replace(",", ".")
+    return float(texto)
 
-    data_limpa = data_str.strip()
-    for fmt in ("%d/%m/%Y", "%Y-%m-%d"):
+
+def payload_linha_agendamento(linha: Dict[str, str]) -> Dict[str, Any]:
+    """
+    Converte uma linha do CSV de importação no payload de agendar_json
+    
+    Colunas: contato (UUID do cliente ou fornecedor; aceita também 'cliente'
+    ou 'fornecedor'), categoria, valor, data_agendamento, data_vencimento
+    (DD/MM/YYYY ou YYYY-MM-DD), descricao e referencia (opcional).
+    
+    Args:
+        linha: Linha do CSV (colunas em minúsculas)
+        
+    Returns:
+        Payload do agendamento
+        
+    Raises:
+        ValueError: Se uma coluna obrigatória faltar ou for inválida
+    """
+    contato = linha.get("contato") or linha.get("cliente") or linha.get("fornecedor")
+    faltando = [
+        coluna for coluna, valor in (
+            ("contato", contato),
+            ("categoria", linha.get("categoria")),
+            ("valor", linha.get("valor")),
+            ("data_agendamento", linha.get("data_agendamento")),
+            ("data_vencimento", linha.get("data_vencimento")),
+            ("descricao", linha.get("descricao")),
+        ) if not valor
+    ]
+    if faltando:
+        raise ValueError(f"Colunas obrigatórias vazias: {', '.join(faltando)}")
+    
+    datas = {}
+    for coluna in ("data_agendamento", "data_vencimento"):
         try:
-            return datetime.strptime(data_limpa, fmt)
+            data = para_date(linha[coluna])
         except ValueError:
-            continue
-    return None
+            data = None
+        if data is None:
+            raise ValueError(f"Data inválida em {coluna}: {linha[coluna]}")
+        datas[coluna] = data.strftime("%d/%m/%Y")
+    
+    payload = {
+        "categories": [{
+            "categoryId": str(UUID(linha["categoria"])),
+            "value": _converter_valor(linha["valor"]),
+            "description": linha["descricao"]
+        }],
+        "stakeholderId": str(UUID(contato)),
+        "scheduleDate": datas["data_agendamento"],
+        "dueDate": datas["data_vencimento"],
+        "description": linha["descricao"]
+    }
+    if linha.get("referencia"):
+        payload["reference"] = linha["referencia"]
+    return payload
+
+
+def importar_agendamentos(
+    caminho_arquivo: str,
+    tipo: str = "receber",
+    checkpoint: Optional[str] = None,
+    max_workers: int = MAX_WORKERS_LOTE_PADRAO,
+    reenviar_incertos: bool = False,
+    organizacao_id: Optional[str] = None,
+    organizacao_codigo: Optional[str] = None,
+    diario: Optional[str] = None
+) -> Iterator[ResultadoItemLote]:
+    """
+    Cria agendamentos a partir de um CSV, em paralelo e com checkpoint
+    
+    Args:
+        caminho_arquivo: CSV com as colunas de payload_linha_agendamento
+        tipo: 'receber' ou 'pagar'
+        checkpoint: Arquivo de checkpoint (padrão: <arquivo>.checkpoint.jsonl)
+        max_workers: Envios simultâneos
+        reenviar_incertos: Reenvia linhas cujo envio anterior ficou sem confirmação
+        organizacao_id: ID da organização (ex: "org_123")
+        organizacao_codigo: Código simplificado da organização (ex: "empresa_principal")
+        diario: Arquivo do diário de escritas (opcional). Com diário, linhas
+                reenviadas só são criadas depois de conferido, pela referência,
+                que o envio anterior não foi aplicado.
+        
+    Returns:
+        Iterador de ResultadoItemLote, um por linha (indice 0 = primeira linha de dados)
+    """
+    pool = pool_padrao()
+    if diario:
+        diario_escritas = DiarioEscritas(diario)
+        client = NiboEmpresaClient(
+            pool.config,
+            organizacao_id=organizacao_id,
+            organizacao_codigo=organizacao_codigo,
+            transporte=pool.transporte,
+            diario=diario_escritas,
+            **pool.opcoes
+        )
+    else:
+        diario_escritas = None
+        client = pool.empresa(
+            organizacao_id=organizacao_id,
+            organizacao_codigo=organizacao_codigo
+        )
+    interface = client.agendamentos_receber if tipo == "receber" else client.agendamentos_pagar
+    resultados = interface.agendar_lote(
+        _ler_csv_agendamentos(caminho_arquivo),
+        max_workers=max_workers,
+        checkpoint=checkpoint or f"{caminho_arquivo}.checkpoint.jsonl",
+        converter=payload_linha_agendamento,
+        reenviar_incertos=reenviar_incertos
+    )
+    return _fechar_ao_final(resultados, diario_escritas) if diario_escritas else resultados
+
+
+def _fechar_ao_final(resultados: Iterator[ResultadoItemLote], diario: DiarioEscritas) -> Iterator[ResultadoItemLote]:
+    """Repassa os resultados e fecha o diário ao terminar o lote"""
+    with diario:
+        yield from resultados
+
+
+def _parse_data_periodo(data_str: str):
+    """Converte data de entrada (DD/MM/YYYY ou YYYY-MM-DD) para date."""
+    return para_date(data_str)
 
 
 def _montar_filtro_periodo(data_inicio: str, data_fim: str) -> str:
@@ -272,9 +399,7 @@ def listar_pagamentos_recebimentos_periodo(
     """
     Lista pagamentos e recebimentos realizados em um período.
     """
-    config = NiboSettings()
-    client = NiboEmpresaClient(
-        config,
+    client = pool_padrao().empresa(
         organizacao_id=organizacao_id,
         organizacao_codigo=organizacao_codigo
     )
@@ -326,9 +451,7 @@ def listar_pagamentos_periodo(
     odata_orderby: str = "date desc"
 ) -> Dict[str, Any]:
     """Lista apenas pagamentos realizados em um período."""
-    config = NiboSettings()
-    client = NiboEmpresaClient(
-        config,
+    client = pool_padrao().empresa(
         organizacao_id=organizacao_id,
         organizacao_codigo=organizacao_codigo
     )
@@ -364,9 +487,7 @@ def listar_recebimentos_periodo(
     odata_orderby: str = "date desc"
 ) -> Dict[str, Any]:
     """Lista apenas recebimentos realizados em um período."""
-    config = NiboSettings()
-    client = NiboEmpresaClient(
-        config,
+    client = pool_padrao().empresa(
         organizacao_id=organizacao_id,
         organizacao_codigo=organizacao_codigo
     )
@@ -400,9 +521,7 @@ def listar_agendamentos_pagar_receber_periodo(
     organizacao_codigo: Optional[str] = None
 ) -> Dict[str, Any]:
     """Lista agendamentos a pagar e a receber juntos no período (dueDate)."""
-    config = NiboSettings()
-    client = NiboEmpresaClient(
-        config,
+    client = pool_padrao().empresa(
         organizacao_id=organizacao_id,
         organizacao_codigo=organizacao_codigo
     )
@@ -765,6 +884,59 @@ def handle_agendamentos_pagar_receber_periodo(args):
     return 0
 
 
+def handle_importar_agendamentos(args):
+    """Handler para comando importar-agendamentos"""
+    organizacao_id = None
+    organizacao_codigo = None
+    if hasattr(args, "organizacao") and args.organizacao:
+        if args.organizacao.startswith("org_") or "-" in args.organizacao:
+            organizacao_id = args.organizacao
+        else:
+            organizacao_codigo = args.organizacao
+
+    if not organizacao_id and not organizacao_codigo:
+        print("ERRO: É necessário fornecer --org (ou --organizacao) para este comando.")
+        return 1
+
+    contagem = {}
+    try:
+        resultados = importar_agendamentos(
+            caminho_arquivo=args.arquivo,
+            tipo=args.tipo,
+            checkpoint=args.checkpoint,
+            max_workers=args.max_workers,
+            reenviar_incertos=args.reenviar_incertos,
+            organizacao_id=organizacao_id,
+            organizacao_codigo=organizacao_codigo,
+            diario=args.diario
+        )
+        for resultado in resultados:
+            contagem[resultado.situacao] = contagem.get(resultado.situacao, 0) + 1
+            # Linha 1 do arquivo é o cabeçalho
+            linha = resultado.indice + 2
+            erro = str(resultado.erro) if resultado.erro is not None else None
+            if args.json:
+                print(json.dumps({"linha": linha, "situacao": resultado.situacao, "id": resultado.id, "erro": erro},
+                                 ensure_ascii=False), flush=True)
+            elif resultado.sucesso:
+                print(f"Linha {linha}: {resultado.situacao} {resultado.id or ''}".rstrip(), flush=True)
+            else:
+                print(f"Linha {linha}: {resultado.situacao} - {erro}", flush=True)
+    except Exception as e:
+        print(f"ERRO ao importar agendamentos: {e}")
+        return 1
+
+    if not args.json:
+        print("=" * 60)
+        print("  ".join(f"{situacao}: {total}" for situacao, total in sorted(contagem.items())) or "Nenhuma linha")
+        if contagem.get("incerto"):
+            if args.diario:
+                print("Linhas 'incerto' podem ter sido criadas; --reenviar-incertos confere a referência antes de reenviar.")
+            else:
+                print("Linhas 'incerto' podem ter sido criadas; confira na API antes de usar --reenviar-incertos.")
+    return 0 if not (contagem.get("erro") or contagem.get("incerto")) else 1
+
+
 def add_agendamentos_parser(subparsers):
     """Adiciona parsers para comandos de agendamentos"""
     # Comando: agendamentos-receber
@@ -984,4 +1156,55 @@ def add_agendamentos_parser(subparsers):
     )
     parser_agr_periodo.set_defaults(func=handle_agendamentos_pagar_receber_periodo)
 
-
+    # Comando: importar-agendamentos
+    parser_importar = subparsers.add_parser(
+        "importar-agendamentos",
+        help="Cria agendamentos a partir de um CSV (em paralelo, com checkpoint para retomada)"
+    )
+    parser_importar.add_argument(
+        "--arquivo",
+        type=str,
+        required=True,
+        help="CSV com as colunas: " + ", ".join(COLUNAS_IMPORTACAO)
+    )
+    parser_importar.add_argument(
+        "--tipo",
+        type=str,
+        choices=["receber", "pagar"],
+        default="receber",
+        help="Tipo de agendamento (padrão: receber)"
+    )
+    parser_importar.add_argument(
+        "--checkpoint",
+        type=str,
+        help="Arquivo de checkpoint (padrão: <arquivo>.checkpoint.jsonl)"
+    )
+    parser_importar.add_argument(
+        "--max-workers",
+        type=int,
+        default=MAX_WORKERS_LOTE_PADRAO,
+        help=f"Envios simultâneos (padrão: {MAX_WORKERS_LOTE_PADRAO})"
+    )
+    parser_importar.add_argument(
+        "--reenviar-incertos",
+        action="store_true",
+        help="Reenvia linhas cujo envio anterior ficou sem confirmação (sem --diario, pode duplicar)"
+    )
+    parser_importar.add_argument(
+        "--diario",
+        type=str,
+        help="Diário de escritas: antes de reenviar, confere pela referência se a linha já foi criada"
+    )
+    parser_importar.add_argument(
+        "--json",
+        action="store_true",
+        help="Exibe um resultado JSON por linha"
+    )
+    parser_importar.add_argument(
+        "--org",
+        "--organizacao",
+        type=str,
+        dest="organizacao",
+        help="ID ou código da organização (ex: 'org_123' ou 'empresa_principal')"
+    )
+    parser_importar.set_defaults(func=handle_importar_agendamentos)
@@ -4,8 +4,7 @@ Comandos CLI para categorias
 import argparse
 from typing import Optional, Dict, Any
 
-from nibo_api.settings import NiboSettings
-from nibo_api.empresa.client import NiboEmpresaClient
+from nibo_api.pool import pool_padrao
 from ..utils import exibir_resultado_json
 
 
@@ -23,9 +22,7 @@ def listar_categorias(
     Returns:
         Dicionário com 'items' (lista de categorias) e 'count'
     """
-    config = NiboSettings()
-    client = NiboEmpresaClient(
-        config,
+    client = pool_padrao().empresa(
         organizacao_id=organizacao_id,
         organizacao_codigo=organizacao_codigo
     )
@@ -4,8 +4,7 @@ Comandos CLI para clientes
 import argparse
 from typing import Optional, Dict, Any
 
-from nibo_api.settings import NiboSettings
-from nibo_api.empresa.client import NiboEmpresaClient
+from nibo_api.pool import pool_padrao
 from ..utils import exibir_resultado_json, exibir_lista_simples
 
 
@@ -25,9 +24,7 @@ def listar_clientes(
     Returns:
         Dicionário com 'items' (lista de clientes) e 'count'
     """
-    config = NiboSettings()
-    client = NiboEmpresaClient(
-        config,
+    client = pool_padrao().empresa(
         organizacao_id=organizacao_id,
         organizacao_codigo=organizacao_codigo
     )
@@ -64,9 +61,7 @@ def criar_cliente(
     Returns:
         Dados do cliente criado
     """
-    config = NiboSettings()
-    client = NiboEmpresaClient(
-        config,
+    client = pool_padrao().empresa(
         organizacao_id=organizacao_id,
         organizacao_codigo=organizacao_codigo
     )
@@ -4,8 +4,7 @@ Comandos CLI para organizações
 import argparse
 from typing import Optional, Dict, Any
 
-from nibo_api.settings import NiboSettings
-from nibo_api.empresa.client import NiboEmpresaClient
+from nibo_api.pool import pool_padrao
 from ..utils import exibir_resultado_json
 
 
@@ -23,18 +22,17 @@ def listar_organizacoes(
     Returns:
         Dicionário com lista de organizações
     """
-    config = NiboSettings()
+    pool = pool_padrao()
     # Para listar organizações, precisa de um token inicial
     # Se não fornecido, tenta usar o primeiro token disponível
     if not organizacao_id and not organizacao_codigo:
-        api_tokens = config._get_api_tokens_dict()
+        api_tokens = pool.config._get_api_tokens_dict()
         if api_tokens:
             # Usa o primeiro token disponível
             primeiro_id = list(api_tokens.keys())[0]
             organizacao_id = primeiro_id
     
-    client = NiboEmpresaClient(
-        config,
+    client = pool.empresa(
         organizacao_id=organizacao_id,
         organizacao_codigo=organizacao_codigo
     )
@@ -1,10 +1,11 @@
 """
 Interface para parcelamentos no Nibo Empresa
 """
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterator
 from uuid import UUID
 
 from nibo_api.common.client import BaseClient
+from nibo_api.common.paginacao import TAMANHO_PAGINA_PADRAO
 
 
 class ParcelamentosInterface:
@@ -48,6 +49,35 @@ class ParcelamentosInterface:
             odata_skip=odata_skip
         )
     
+    def iter_listar_agendamentos_parcelamento(
+        self,
+        parcelamento_id: UUID,
+        odata_filter: Optional[str] = None,
+        odata_orderby: Optional[str] = None,
+        page_size: int = TAMANHO_PAGINA_PADRAO,
+        **opcoes
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Itera sobre todos os registros de listar_agendamentos_parcelamento(), buscando página a página
+        
+        Args:
+            parcelamento_id: UUID do parcelamento
+            odata_filter: Filtro OData
+            odata_orderby: Campo para ordenação
+            page_size: Registros por página ($top)
+            **opcoes: Opções de paginação repassadas a BaseClient.paginar
+            
+        Returns:
+            Iterador sobre os itens de todas as páginas
+        """
+        return self.client.paginar(
+            f"/installments/{parcelamento_id}/schedules",
+            odata_filter=odata_filter,
+            odata_orderby=odata_orderby,
+            page_size=page_size,
+            **opcoes
+        )
+    
     def buscar_por_id(self, parcelamento_id: UUID) -> Dict[str, Any]:
         """
         Busca um parcelamento por ID
@@ -22,7 +22,7 @@ class ArquivosInterface:
     
     def criar_arquivo_upload(
         self,
-        accounting_firm_id: UUID,
+        accounting_firm_id: Optional[UUID],
         name: str,
         **kwargs
     ) -> Dict[str, Any]:
@@ -37,13 +37,14 @@ class ArquivosInterface:
         O upload deve ser concluído dentro desse período.
         
         Args:
-            accounting_firm_id: UUID do escritório contábil
+            accounting_firm_id: UUID do escritório contábil (None usa o escritório padrão)
             name: Nome do arquivo
             **kwargs: Outros campos opcionais
             
         Returns:
             Dicionário com dados do arquivo criado, incluindo sharedAccessSignature
         """
+        accounting_firm_id = self.client.resolver_escritorio(accounting_firm_id)
         payload = {
             "name": name
         }
@@ -86,7 +87,8 @@ class ArquivosInterface:
             shared_access_signature,
             data=file_content,
             headers=headers,
-            verify=self.client.session.verify
+            verify=self.client.session.verify,
+            timeout=self.client.timeout
         )
         response.raise_for_status()
         return response
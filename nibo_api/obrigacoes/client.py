@@ -1,9 +1,20 @@
 """
 Cliente principal para a API Nibo Obrigações
 """
-from typing import Optional
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Optional, Dict, Any
+from uuid import UUID
+
 from nibo_api.settings import NiboSettings
 from nibo_api.common.client import BaseClient
+from nibo_api.common.paginacao import extrair_items
+from nibo_api.common.tipagem import MODELOS_OBRIGACOES
+from nibo_api.common.async_client import AsyncClientMixin
 from nibo_api.obrigacoes.escritorios import EscritoriosInterface
 from nibo_api.obrigacoes.usuarios import UsuariosInterface
 from nibo_api.obrigacoes.arquivos import ArquivosInterface
@@ -19,32 +30,45 @@ from nibo_api.obrigacoes.responsabilidades import ResponsabilidadesInterface
 from nibo_api.obrigacoes.relatorios import RelatoriosInterface
 
 
+# Arquivo (em cache_dir) com o escritório padrão de cada credencial, compartilhado entre processos
+ARQUIVO_ESCRITORIOS_PADRAO = "escritorios-padrao.json"
+
+# Escritório padrão já resolvido no processo, por impressão de (URL base, token, usuário)
+_escritorios_lock = threading.Lock()
+_escritorios_padrao: Dict[str, UUID] = {}
+
+
+def limpar_cache_escritorios():
+    """Descarta os escritórios padrão resolvidos no processo (o arquivo em cache_dir é mantido)"""
+    with _escritorios_lock:
+        _escritorios_padrao.clear()
+
+
 class NiboObrigacoesClient(BaseClient):
     """Cliente principal para interagir com a API Nibo Obrigações"""
     
-    def __init__(self, config: Optional[NiboSettings] = None):
+    modelos = MODELOS_OBRIGACOES
+    
+    def __init__(
+        self,
+        config: Optional[NiboSettings] = None,
+        cache_escritorios: Optional[bool] = None,
+        **opcoes
+    ):
         """
         Inicializa o cliente Nibo Obrigações
         
         Args:
-            config: Instância de NiboSettings. Se None, cria uma nova.
+            config: Instância de NiboSettings. Se None, usa NiboSettings.compartilhado().
+            cache_escritorios: Lê e grava o escritório padrão em cache_dir. Se None,
+                               segue cache_habilitado da configuração (a CLI usa
+                               False com --no-cache).
+            **opcoes: Opções repassadas ao BaseClient (ex: retry_policy, rate_limiter, typed)
         """
         if config is None:
-            config = NiboSettings()
-        super().__init__(config, base_url=config.obrigacoes_base_url)
-        
-        # Remove o header ApiToken padrão e adiciona os headers corretos para Obrigações
-        self.session.headers.pop("ApiToken", None)
-        self.session.headers.update({
-            "X-API-Key": config.obrigacoes_api_token
-        })
-        
-        # Adiciona X-User-Id se fornecido (necessário se token não estiver vinculado a usuário)
-        user_id = config.obrigacoes_user_id
-        if user_id:
-            self.session.headers.update({
-                "X-User-Id": user_id
-            })
+            config = NiboSettings.compartilhado()
+        super().__init__(config, base_url=config.obrigacoes_base_url, **opcoes)
+        self.cache_escritorios = cache_escritorios
         
         # Inicializa interfaces
         self.escritorios = EscritoriosInterface(self)
@@ -60,4 +84,213 @@ class NiboObrigacoesClient(BaseClient):
         self.templates_tarefas = TemplatesTarefasInterface(self)
         self.responsabilidades = ResponsabilidadesInterface(self)
         self.relatorios = RelatoriosInterface(self)
+    
+    def _impressao_credencial(self) -> str:
+        """Hash que identifica a credencial (o token nunca é gravado em disco)"""
+        partes = (self.base_url, self._token_autenticacao() or "", self.config.obrigacoes_user_id or "")
+        return hashlib.sha256("|".join(partes).encode()).hexdigest()
+    
+    def _arquivo_escritorios(self) -> Optional[Path]:
+        habilitado = self.config.cache_habilitado if self.cache_escritorios is None else self.cache_escritorios
+        if not habilitado:
+            return None
+        return Path(self.config.cache_dir) / ARQUIVO_ESCRITORIOS_PADRAO
+    
+    def _ler_escritorios(self) -> Dict[str, Any]:
+        caminho = self._arquivo_escritorios()
+        if caminho is None:
+            return {}
+        try:
+            with open(caminho, "r", encoding="utf-8") as f:
+                dados = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return dados if isinstance(dados, dict) else {}
+    
+    def _gravar_escritorio(self, impressao: str, escritorio_id: UUID):
+        caminho = self._arquivo_escritorios()
+        if caminho is None:
+            return
+        dados = self._ler_escritorios()
+        dados[impressao] = str(escritorio_id)
+        temporario = None
+        try:
+            caminho.parent.mkdir(parents=True, exist_ok=True)
+            descritor, temporario = tempfile.mkstemp(dir=caminho.parent, suffix=".tmp")
+            with os.fdopen(descritor, "w", encoding="utf-8") as f:
+                json.dump(dados, f)
+            os.replace(temporario, caminho)
+        except OSError:
+            if temporario is not None:
+                try:
+                    os.unlink(temporario)
+                except OSError:
+                    pass
+    
+    def escritorio_padrao(self, atualizar: bool = False) -> UUID:
+        """
+        Retorna o escritório contábil usado quando uma operação não informa accounting_firm_id
+        
+        Ordem de resolução: obrigacoes_accounting_firm_id (settings.json ou
+        NIBO_OBRIGACOES_ACCOUNTING_FIRM_ID), escritório já resolvido no
+        processo, arquivo escritorios-padrao.json em cache_dir e, por fim, o
+        primeiro escritório retornado pela API. O resultado da API é guardado
+        no processo e no arquivo, de modo que a consulta acontece uma única
+        vez por credencial.
+        
+        Args:
+            atualizar: Ignora os caches e consulta a API novamente
+            
+        Returns:
+            UUID do escritório padrão
+            
+        Raises:
+            ValueError: Se nenhum escritório for encontrado
+        """
+        escritorio = self._escritorio_conhecido(atualizar)
+        if escritorio is not None:
+            return escritorio
+        resposta = self._request("GET", self._build_url("/accountingfirms", {"$top": 1}))
+        return self._guardar_escritorio(resposta)
+    
+    def _escritorio_conhecido(self, atualizar: bool = False) -> Optional[UUID]:
+        """
+        Escritório padrão configurado, já resolvido no processo ou gravado em cache_dir
+        
+        Args:
+            atualizar: Ignora os caches (a configuração continua valendo)
+            
+        Returns:
+            UUID do escritório, ou None se for preciso consultar a API
+        """
+        configurado = self.config.obrigacoes_accounting_firm_id
+        if configurado:
+            return UUID(str(configurado))
+        if atualizar:
+            return None
+        impressao = self._impressao_credencial()
+        with _escritorios_lock:
+            escritorio = _escritorios_padrao.get(impressao)
+        if escritorio is not None:
+            return escritorio
+        try:
+            escritorio = UUID(str(self._ler_escritorios()[impressao]))
+        except (KeyError, ValueError):
+            return None
+        with _escritorios_lock:
+            _escritorios_padrao[impressao] = escritorio
+        return escritorio
+    
+    def _guardar_escritorio(self, resposta: Any) -> UUID:
+        """
+        Guarda no processo e em cache_dir o primeiro escritório de /accountingfirms
+        
+        Raises:
+            ValueError: Se a resposta não tiver escritórios
+        """
+        itens = extrair_items(resposta)
+        if not itens:
+            raise ValueError("Nenhum escritório encontrado")
+        escritorio = UUID(str(itens[0]["id"]))
+        impressao = self._impressao_credencial()
+        with _escritorios_lock:
+            _escritorios_padrao[impressao] = escritorio
+        self._gravar_escritorio(impressao, escritorio)
+        return escritorio
+    
+    def resolver_escritorio(self, accounting_firm_id: Optional[UUID] = None) -> UUID:
+        """
+        Retorna accounting_firm_id, ou o escritório padrão quando None
+        
+        Args:
+            accounting_firm_id: UUID do escritório contábil (opcional)
+            
+        Returns:
+            UUID do escritório a usar
+        """
+        if accounting_firm_id is None:
+            return self.escritorio_padrao()
+        return accounting_firm_id
+    
+    def _atualizar_autenticacao(self):
+        """Aplica os headers de autenticação da API de Obrigações (ver BaseClient)"""
+        # Remove o header ApiToken padrão e adiciona os headers corretos para Obrigações
+        self.headers.pop("ApiToken", None)
+        self.headers.update({
+            "X-API-Key": self.config.obrigacoes_api_token
+        })
+        
+        # Adiciona X-User-Id se fornecido (necessário se token não estiver vinculado a usuário)
+        user_id = self.config.obrigacoes_user_id
+        if user_id:
+            self.headers.update({
+                "X-User-Id": user_id
+            })
+        else:
+            self.headers.pop("X-User-Id", None)
 
+
+class AsyncNiboObrigacoesClient(AsyncClientMixin, NiboObrigacoesClient):
+    """
+    Versão assíncrona (asyncio/aiohttp) do NiboObrigacoesClient
+
+    Aceita os mesmos argumentos do NiboObrigacoesClient, além de max_concorrencia e
+    limite_conexoes. As interfaces são as mesmas: seus métodos retornam
+    corrotinas e os iteradores iter_* devem ser consumidos com `async for`.
+
+    As interfaces montam a URL antes de a corrotina ser aguardada, então,
+    para omitir accounting_firm_id, o escritório padrão precisa estar
+    configurado, em cache ou ter sido resolvido com
+    `await client.escritorio_padrao()`.
+
+    Exemplo:
+        async with AsyncNiboObrigacoesClient(config) as client:
+            escritorios = await client.escritorios.listar()
+            await client.escritorio_padrao()
+            departamentos = await client.departamentos.listar()
+    """
+
+    async def escritorio_padrao(self, atualizar: bool = False) -> UUID:
+        """
+        Versão assíncrona de NiboObrigacoesClient.escritorio_padrao
+        
+        A consulta à API usa a sessão aiohttp, com o semáforo, o limitador
+        de taxa e a política de novas tentativas do cliente.
+        
+        Args:
+            atualizar: Ignora os caches e consulta a API novamente
+            
+        Returns:
+            UUID do escritório padrão
+            
+        Raises:
+            ValueError: Se nenhum escritório for encontrado
+        """
+        escritorio = self._escritorio_conhecido(atualizar)
+        if escritorio is not None:
+            return escritorio
+        resposta = await self._request("GET", self._build_url("/accountingfirms", {"$top": 1}))
+        return self._guardar_escritorio(resposta)
+
+    def resolver_escritorio(self, accounting_firm_id: Optional[UUID] = None) -> UUID:
+        """
+        Retorna accounting_firm_id, ou o escritório padrão já conhecido quando None
+        
+        Args:
+            accounting_firm_id: UUID do escritório contábil (opcional)
+            
+        Returns:
+            UUID do escritório a usar
+            
+        Raises:
+            ValueError: Se o escritório padrão ainda não foi resolvido
+        """
+        if accounting_firm_id is not None:
+            return accounting_firm_id
+        escritorio = self._escritorio_conhecido()
+        if escritorio is None:
+            raise ValueError(
+                "Escritório padrão ainda não resolvido: use 'await client.escritorio_padrao()' "
+                "ou informe accounting_firm_id"
+            )
+        return escritorio
@@ -1,10 +1,274 @@
 """
 Interface para clientes no Nibo Obrigações
 """
-from typing import Optional, Dict, Any
+import inspect
+import re
+import threading
+import time
+import unicodedata
+from typing import Optional, Dict, Any, Iterator, List
 from uuid import UUID
 
+from nibo_api.common.async_client import AsyncClientMixin
 from nibo_api.common.client import BaseClient
+from nibo_api.common.modelos_compactos import dados_do_item
+from nibo_api.common.paginacao import TAMANHO_PAGINA_PADRAO
+
+
+# Tempo (segundos) que o diretório de clientes é usado antes de ser atualizado
+TTL_DIRETORIO_PADRAO = 300
+
+# Intervalo mínimo (segundos) entre atualizações disparadas por buscas sem resultado
+INTERVALO_RECARGA_MINIMO = 30
+
+
+def normalizar_nome(nome: Any) -> str:
+    """
+    Normaliza um nome para comparação: sem acentos, minúsculo e com espaços simples
+
+    Args:
+        nome: Nome do cliente
+
+    Returns:
+        Nome normalizado ("" se vazio)
+    """
+    if not nome:
+        return ""
+    decomposto = unicodedata.normalize("NFKD", str(nome))
+    sem_acentos = "".join(c for c in decomposto if not unicodedata.combining(c))
+    return " ".join(sem_acentos.casefold().split())
+
+
+def normalizar_documento(documento: Any) -> str:
+    """
+    Normaliza um CPF/CNPJ mantendo apenas os dígitos
+
+    Args:
+        documento: Documento com ou sem máscara (ex: "12.345.678/0001-90")
+
+    Returns:
+        Somente os dígitos ("" se vazio)
+    """
+    return re.sub(r"\D", "", str(documento)) if documento else ""
+
+
+class DiretorioClientes:
+    """
+    Diretório em memória dos clientes de um escritório
+
+    Carrega a lista completa de clientes uma vez (paginando, sem limite de
+    registros) e mantém índices por id, nome normalizado e documento, de
+    modo que cada busca é uma consulta a dicionário. Depois de `ttl`
+    segundos a lista é buscada de novo e os índices são ajustados apenas
+    para os clientes incluídos, alterados ou removidos. Buscas sem
+    resultado também disparam essa atualização, no máximo uma vez a cada
+    INTERVALO_RECARGA_MINIMO segundos.
+
+    A API não informa data de alteração dos clientes, por isso a
+    atualização relê a lista inteira em vez de pedir só as mudanças.
+
+    Os clientes são guardados e devolvidos como dicionários da API, também
+    em clientes criados com typed=True.
+    """
+
+    def __init__(
+        self,
+        interface: "ClientesInterface",
+        accounting_firm_id: UUID,
+        ttl: float = TTL_DIRETORIO_PADRAO,
+        page_size: int = TAMANHO_PAGINA_PADRAO
+    ):
+        """
+        Inicializa o diretório (a carga acontece na primeira busca)
+
+        Args:
+            interface: Interface de clientes usada para listar
+            accounting_firm_id: UUID do escritório contábil
+            ttl: Segundos até a próxima atualização da lista
+            page_size: Registros por página na carga
+        """
+        self.interface = interface
+        self.accounting_firm_id = accounting_firm_id
+        self.ttl = ttl
+        self.page_size = page_size
+        self._lock = threading.RLock()
+        self._por_id: Dict[str, Dict[str, Any]] = {}
+        self._por_nome: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._por_documento: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._carregado_em: Optional[float] = None
+
+    @staticmethod
+    def _chave(cliente_id: Any) -> str:
+        return str(cliente_id).strip().casefold()
+
+    def _indexar(self, cliente: Dict[str, Any]) -> None:
+        chave = self._chave(cliente["id"])
+        self._remover_indices(chave)
+        self._por_id[chave] = cliente
+        nome = normalizar_nome(cliente.get("name"))
+        if nome:
+            self._por_nome.setdefault(nome, {})[chave] = cliente
+        documento = normalizar_documento(cliente.get("documentNumber"))
+        if documento:
+            self._por_documento.setdefault(documento, {})[chave] = cliente
+
+    def _remover_indices(self, chave: str) -> None:
+        anterior = self._por_id.pop(chave, None)
+        if anterior is None:
+            return
+        for indice, valor in (
+            (self._por_nome, normalizar_nome(anterior.get("name"))),
+            (self._por_documento, normalizar_documento(anterior.get("documentNumber"))),
+        ):
+            grupo = indice.get(valor)
+            if grupo is not None:
+                grupo.pop(chave, None)
+                if not grupo:
+                    del indice[valor]
+
+    def atualizar(self) -> None:
+        """
+        Busca a lista de clientes e aplica as diferenças aos índices
+        """
+        clientes = {
+            self._chave(cliente["id"]): cliente
+            for cliente in map(dados_do_item, self.interface.iter_listar(
+                self.accounting_firm_id, page_size=self.page_size
+            ))
+            if isinstance(cliente, dict) and cliente.get("id")
+        }
+        with self._lock:
+            for chave in [chave for chave in self._por_id if chave not in clientes]:
+                self._remover_indices(chave)
+            for chave, cliente in clientes.items():
+                if self._por_id.get(chave) != cliente:
+                    self._indexar(cliente)
+            self._carregado_em = time.monotonic()
+
+    def _garantir_carga(self) -> None:
+        with self._lock:
+            carregado_em = self._carregado_em
+        if carregado_em is None or time.monotonic() - carregado_em >= self.ttl:
+            self.atualizar()
+
+    def _recarregar_apos_falha(self) -> bool:
+        """Atualiza após uma busca sem resultado; False se a carga ainda é recente"""
+        with self._lock:
+            carregado_em = self._carregado_em
+        if carregado_em is not None and time.monotonic() - carregado_em < INTERVALO_RECARGA_MINIMO:
+            return False
+        self.atualizar()
+        return True
+
+    def _buscar(self, busca) -> Any:
+        self._garantir_carga()
+        with self._lock:
+            resultado = busca()
+        if not resultado and self._recarregar_apos_falha():
+            with self._lock:
+                resultado = busca()
+        return resultado
+
+    def invalidar(self) -> None:
+        """Força a atualização da lista na próxima busca"""
+        with self._lock:
+            self._carregado_em = None
+
+    def registrar(self, cliente: Dict[str, Any]) -> None:
+        """
+        Inclui ou atualiza um cliente nos índices sem consultar a API
+
+        Args:
+            cliente: Dados do cliente ou modelo compacto (deve conter 'id')
+        """
+        cliente = dados_do_item(cliente)
+        if isinstance(cliente, dict) and cliente.get("id"):
+            with self._lock:
+                self._indexar(cliente)
+
+    def obter(self, cliente_id: Any) -> Optional[Dict[str, Any]]:
+        """
+        Busca um cliente pelo UUID
+
+        Args:
+            cliente_id: UUID do cliente
+
+        Returns:
+            Dados do cliente ou None se não encontrado
+        """
+        chave = self._chave(cliente_id)
+        return self._buscar(lambda: self._por_id.get(chave))
+
+    def por_nome(self, nome: str) -> List[Dict[str, Any]]:
+        """
+        Busca clientes pelo nome exato (sem diferenciar maiúsculas e acentos)
+
+        Args:
+            nome: Nome do cliente
+
+        Returns:
+            Lista de clientes com esse nome
+        """
+        chave = normalizar_nome(nome)
+        return self._buscar(lambda: list(self._por_nome.get(chave, {}).values()))
+
+    def por_documento(self, documento: str) -> List[Dict[str, Any]]:
+        """
+        Busca clientes pelo CPF/CNPJ (com ou sem máscara)
+
+        Args:
+            documento: Número do documento
+
+        Returns:
+            Lista de clientes com esse documento
+        """
+        chave = normalizar_documento(documento)
+        return self._buscar(lambda: list(self._por_documento.get(chave, {}).values()))
+
+    def buscar(self, texto: str) -> List[Dict[str, Any]]:
+        """
+        Busca clientes cujo nome contém o texto (sem diferenciar maiúsculas e acentos)
+
+        Args:
+            texto: Trecho do nome
+
+        Returns:
+            Lista de clientes encontrados
+        """
+        trecho = normalizar_nome(texto)
+        return self._buscar(lambda: [
+            cliente for nome, grupo in self._por_nome.items() if trecho in nome for cliente in grupo.values()
+        ])
+
+    def resolver(self, identificador: str) -> List[Dict[str, Any]]:
+        """
+        Identifica clientes por UUID, CPF/CNPJ, nome exato ou trecho do nome
+
+        Args:
+            identificador: UUID, documento ou nome do cliente
+
+        Returns:
+            Lista de clientes encontrados (vazia se nenhum)
+        """
+        try:
+            cliente = self.obter(UUID(str(identificador)))
+            return [cliente] if cliente else []
+        except ValueError:
+            pass
+        documento = normalizar_documento(identificador)
+        if len(documento) in (11, 14) and not re.search(r"[^\d\s./-]", identificador):
+            return self.por_documento(documento)
+        return self.por_nome(identificador) or self.buscar(identificador)
+
+    def __len__(self) -> int:
+        self._garantir_carga()
+        with self._lock:
+            return len(self._por_id)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        self._garantir_carga()
+        with self._lock:
+            return iter(list(self._por_id.values()))
 
 
 class ClientesInterface:
@@ -18,10 +282,58 @@ class ClientesInterface:
             client: Instância do cliente HTTP base
         """
         self.client = client
+        self._diretorios: Dict[str, DiretorioClientes] = {}
+        self._lock_diretorios = threading.Lock()
+    
+    def diretorio(self, accounting_firm_id: Optional[UUID] = None, ttl: Optional[float] = None) -> DiretorioClientes:
+        """
+        Retorna o diretório em memória dos clientes de um escritório
+
+        O mesmo diretório é reaproveitado enquanto esta interface existir;
+        criar() e atualizar() mantêm seus índices em dia. Disponível apenas
+        no cliente síncrono (NiboObrigacoesClient).
+
+        Args:
+            accounting_firm_id: UUID do escritório contábil (None usa o escritório padrão)
+            ttl: Segundos até a próxima atualização da lista (padrão: TTL_DIRETORIO_PADRAO)
+
+        Returns:
+            Diretório com buscas por id, nome e documento
+
+        Raises:
+            TypeError: Se o cliente for assíncrono
+        """
+        if isinstance(self.client, AsyncClientMixin):
+            raise TypeError(
+                "O diretório de clientes é síncrono; use NiboObrigacoesClient "
+                "em vez de AsyncNiboObrigacoesClient."
+            )
+        accounting_firm_id = self.client.resolver_escritorio(accounting_firm_id)
+        chave = str(accounting_firm_id).casefold()
+        with self._lock_diretorios:
+            diretorio = self._diretorios.get(chave)
+            if diretorio is None:
+                diretorio = DiretorioClientes(self, accounting_firm_id)
+                self._diretorios[chave] = diretorio
+        if ttl is not None:
+            diretorio.ttl = ttl
+        return diretorio
+    
+    def _registrar_no_diretorio(self, accounting_firm_id: UUID, cliente: Any) -> None:
+        if inspect.isawaitable(cliente):
+            return  # cliente assíncrono: não há diretório (ver diretorio())
+        diretorio = self._diretorios.get(str(accounting_firm_id).casefold())
+        if diretorio is None:
+            return
+        cliente = dados_do_item(cliente)
+        if isinstance(cliente, dict) and cliente.get("id"):
+            diretorio.registrar(cliente)
+        else:
+            diretorio.invalidar()
     
     def listar(
         self,
-        accounting_firm_id: UUID,
+        accounting_firm_id: Optional[UUID] = None,
         odata_filter: Optional[str] = None,
         odata_orderby: Optional[str] = None,
         odata_top: Optional[int] = None,
@@ -31,7 +343,7 @@ class ClientesInterface:
         Lista todos os clientes de um escritório
         
         Args:
-            accounting_firm_id: UUID do escritório contábil
+            accounting_firm_id: UUID do escritório contábil (None usa o escritório padrão)
             odata_filter: Filtro OData
             odata_orderby: Campo para ordenação
             odata_top: Limite de registros
@@ -40,6 +352,7 @@ class ClientesInterface:
         Returns:
             Dicionário com 'items' (lista de clientes) e 'metadata'
         """
+        accounting_firm_id = self.client.resolver_escritorio(accounting_firm_id)
         return self.client.get(
             f"/accountingfirms/{accounting_firm_id}/customers",
             odata_filter=odata_filter,
@@ -48,9 +361,39 @@ class ClientesInterface:
             odata_skip=odata_skip
         )
     
+    def iter_listar(
+        self,
+        accounting_firm_id: Optional[UUID] = None,
+        odata_filter: Optional[str] = None,
+        odata_orderby: Optional[str] = None,
+        page_size: int = TAMANHO_PAGINA_PADRAO,
+        **opcoes
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Itera sobre todos os registros de listar(), buscando página a página
+        
+        Args:
+            accounting_firm_id: UUID do escritório contábil (None usa o escritório padrão)
+            odata_filter: Filtro OData
+            odata_orderby: Campo para ordenação
+            page_size: Registros por página ($top)
+            **opcoes: Opções de paginação repassadas a BaseClient.paginar
+            
+        Returns:
+            Iterador sobre os itens de todas as páginas
+        """
+        accounting_firm_id = self.client.resolver_escritorio(accounting_firm_id)
+        return self.client.paginar(
+            f"/accountingfirms/{accounting_firm_id}/customers",
+            odata_filter=odata_filter,
+            odata_orderby=odata_orderby,
+            page_size=page_size,
+            **opcoes
+        )
+    
     def criar(
         self,
-        accounting_firm_id: UUID,
+        accounting_firm_id: Optional[UUID],
         name: str,
         **kwargs
     ) -> Dict[str, Any]:
@@ -58,26 +401,29 @@ class ClientesInterface:
         Cria um novo cliente em um escritório
         
         Args:
-            accounting_firm_id: UUID do escritório contábil
+            accounting_firm_id: UUID do escritório contábil (None usa o escritório padrão)
             name: Nome do cliente
             **kwargs: Outros campos opcionais
             
         Returns:
             Dados do cliente criado
         """
+        accounting_firm_id = self.client.resolver_escritorio(accounting_firm_id)
         payload = {
             "name": name
         }
         payload.update(kwargs)
         
-        return self.client.post(
+        resultado = self.client.post(
             f"/accountingfirms/{accounting_firm_id}/customers",
             json_data=payload
         )
+        self._registrar_no_diretorio(accounting_firm_id, resultado)
+        return resultado
     
     def adicionar_grupo_clientes(
         self,
-        accounting_firm_id: UUID,
+        accounting_firm_id: Optional[UUID],
         cliente_id: UUID,
         group_id: UUID,
         **kwargs
@@ -86,7 +432,7 @@ class ClientesInterface:
         Adiciona cliente ao grupo de clientes
         
         Args:
-            accounting_firm_id: UUID do escritório contábil
+            accounting_firm_id: UUID do escritório contábil (None usa o escritório padrão)
             cliente_id: UUID do cliente
             group_id: UUID do grupo
             **kwargs: Outros campos opcionais
@@ -94,6 +440,7 @@ class ClientesInterface:
         Returns:
             Resposta da API
         """
+        accounting_firm_id = self.client.resolver_escritorio(accounting_firm_id)
         payload = {
             "groupId": str(group_id)
         }
@@ -106,7 +453,7 @@ class ClientesInterface:
     
     def atualizar(
         self,
-        accounting_firm_id: UUID,
+        accounting_firm_id: Optional[UUID],
         cliente_id: UUID,
         **kwargs
     ) -> Dict[str, Any]:
@@ -114,15 +461,18 @@ class ClientesInterface:
         Atualiza um cliente existente
         
         Args:
-            accounting_firm_id: UUID do escritório contábil
+            accounting_firm_id: UUID do escritório contábil (None usa o escritório padrão)
             cliente_id: UUID do cliente
             **kwargs: Campos a atualizar
             
         Returns:
             Dados do cliente atualizado
         """
-        return self.client.put(
+        accounting_firm_id = self.client.resolver_escritorio(accounting_firm_id)
+        resultado = self.client.put(
             f"/accountingfirms/{accounting_firm_id}/customers/{cliente_id}",
             json_data=kwargs
         )
+        self._registrar_no_diretorio(accounting_firm_id, resultado)
+        return resultado
 
@@ -1,10 +1,11 @@
 """
 Interface para CNAEs no Nibo Obrigações
 """
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterator
 from uuid import UUID
 
 from nibo_api.common.client import BaseClient
+from nibo_api.common.paginacao import TAMANHO_PAGINA_PADRAO
 
 
 class CNAEsInterface:
@@ -21,7 +22,7 @@ class CNAEsInterface:
     
     def listar(
         self,
-        accounting_firm_id: UUID,
+        accounting_firm_id: Optional[UUID] = None,
         odata_filter: Optional[str] = None,
         odata_orderby: Optional[str] = None,
         odata_top: Optional[int] = None,
@@ -31,7 +32,7 @@ class CNAEsInterface:
         Lista todos os CNAEs de um escritório
         
         Args:
-            accounting_firm_id: UUID do escritório contábil
+            accounting_firm_id: UUID do escritório contábil (None usa o escritório padrão)
             odata_filter: Filtro OData
             odata_orderby: Campo para ordenação
             odata_top: Limite de registros
@@ -40,6 +41,7 @@ class CNAEsInterface:
         Returns:
             Lista de CNAEs (retorna lista direta, não objeto com items)
         """
+        accounting_firm_id = self.client.resolver_escritorio(accounting_firm_id)
         return self.client.get(
             f"/accountingfirms/{accounting_firm_id}/cnaes",
             odata_filter=odata_filter,
@@ -47,4 +49,34 @@ class CNAEsInterface:
             odata_top=odata_top,
             odata_skip=odata_skip
         )
+    
+    def iter_listar(
+        self,
+        accounting_firm_id: Optional[UUID] = None,
+        odata_filter: Optional[str] = None,
+        odata_orderby: Optional[str] = None,
+        page_size: int = TAMANHO_PAGINA_PADRAO,
+        **opcoes
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Itera sobre todos os registros de listar(), buscando página a página
+        
+        Args:
+            accounting_firm_id: UUID do escritório contábil (None usa o escritório padrão)
+            odata_filter: Filtro OData
+            odata_orderby: Campo para ordenação
+            page_size: Registros por página ($top)
+            **opcoes: Opções de paginação repassadas a BaseClient.paginar
+            
+        Returns:
+            Iterador sobre os itens de todas as páginas
+        """
+        accounting_firm_id = self.client.resolver_escritorio(accounting_firm_id)
+        return self.client.paginar(
+            f"/accountingfirms/{accounting_firm_id}/cnaes",
+            odata_filter=odata_filter,
+            odata_orderby=odata_orderby,
+            page_size=page_size,
+            **opcoes
+        )
 
@@ -21,7 +21,7 @@ class ConferenciaInterface:
     
     def enviar_tela_conferencia(
         self,
-        accounting_firm_id: UUID,
+        accounting_firm_id: Optional[UUID],
         task_id: UUID,
         **kwargs
     ) -> Dict[str, Any]:
@@ -29,13 +29,14 @@ class ConferenciaInterface:
         Envia para tela de conferência
         
         Args:
-            accounting_firm_id: UUID do escritório contábil
+            accounting_firm_id: UUID do escritório contábil (None usa o escritório padrão)
             task_id: UUID da tarefa
             **kwargs: Outros campos opcionais
             
         Returns:
             Resposta da API
         """
+        accounting_firm_id = self.client.resolver_escritorio(accounting_firm_id)
         payload = {
             "taskId": str(task_id)
         }
@@ -48,7 +49,7 @@ class ConferenciaInterface:
     
     def enviar_arquivo_conferencia(
         self,
-        accounting_firm_id: UUID,
+        accounting_firm_id: Optional[UUID],
         file_id: UUID,
         **kwargs
     ) -> Dict[str, Any]:
@@ -61,13 +62,14 @@ class ConferenciaInterface:
         3. Então enviar para conferência usando este método
         
         Args:
-            accounting_firm_id: UUID do escritório contábil
+            accounting_firm_id: UUID do escritório contábil (None usa o escritório padrão)
             file_id: UUID do arquivo (retornado após criar e fazer upload)
             **kwargs: Outros campos opcionais
             
         Returns:
             Resposta da API
         """
+        accounting_firm_id = self.client.resolver_escritorio(accounting_firm_id)
         payload = {
             "fileId": str(file_id)
         }
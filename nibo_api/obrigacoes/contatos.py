@@ -1,10 +1,11 @@
 """
 Interface para contatos no Nibo Obrigações
 """
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterator
 from uuid import UUID
 
 from nibo_api.common.client import BaseClient
+from nibo_api.common.paginacao import TAMANHO_PAGINA_PADRAO
 
 
 class ContatosInterface:
@@ -21,7 +22,7 @@ class ContatosInterface:
     
     def listar(
         self,
-        accounting_firm_id: UUID,
+        accounting_firm_id: Optional[UUID] = None,
         odata_filter: Optional[str] = None,
         odata_orderby: Optional[str] = None,
         odata_top: Optional[int] = None,
@@ -31,7 +32,7 @@ class ContatosInterface:
         Lista todos os contatos de um escritório
         
         Args:
-            accounting_firm_id: UUID do escritório contábil
+            accounting_firm_id: UUID do escritório contábil (None usa o escritório padrão)
             odata_filter: Filtro OData
             odata_orderby: Campo para ordenação
             odata_top: Limite de registros
@@ -40,6 +41,7 @@ class ContatosInterface:
         Returns:
             Dicionário com 'items' (lista de contatos) e 'metadata'
         """
+        accounting_firm_id = self.client.resolver_escritorio(accounting_firm_id)
         return self.client.get(
             f"/accountingfirms/{accounting_firm_id}/contacts",
             odata_filter=odata_filter,
@@ -48,28 +50,59 @@ class ContatosInterface:
             odata_skip=odata_skip
         )
     
+    def iter_listar(
+        self,
+        accounting_firm_id: Optional[UUID] = None,
+        odata_filter: Optional[str] = None,
+        odata_orderby: Optional[str] = None,
+        page_size: int = TAMANHO_PAGINA_PADRAO,
+        **opcoes
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Itera sobre todos os registros de listar(), buscando página a página
+        
+        Args:
+            accounting_firm_id: UUID do escritório contábil (None usa o escritório padrão)
+            odata_filter: Filtro OData
+            odata_orderby: Campo para ordenação
+            page_size: Registros por página ($top)
+            **opcoes: Opções de paginação repassadas a BaseClient.paginar
+            
+        Returns:
+            Iterador sobre os itens de todas as páginas
+        """
+        accounting_firm_id = self.client.resolver_escritorio(accounting_firm_id)
+        return self.client.paginar(
+            f"/accountingfirms/{accounting_firm_id}/contacts",
+            odata_filter=odata_filter,
+            odata_orderby=odata_orderby,
+            page_size=page_size,
+            **opcoes
+        )
+    
     def buscar_por_id(
         self,
-        accounting_firm_id: UUID,
+        accounting_firm_id: Optional[UUID],
         contato_id: UUID
     ) -> Dict[str, Any]:
         """
         Busca um contato específico
         
         Args:
-            accounting_firm_id: UUID do escritório contábil
+            accounting_firm_id: UUID do escritório contábil (None usa o escritório padrão)
             contato_id: UUID do contato
             
         Returns:
             Dados do contato
         """
+        accounting_firm_id = self.client.resolver_escritorio(accounting_firm_id)
         return self.client.get(
             f"/accountingfirms/{accounting_firm_id}/contacts/{contato_id}"
         )
     
     def listar_departamentos(
         self,
-        accounting_firm_id: UUID,
+        accounting_firm_id: Optional[UUID],
         contato_id: UUID,
         odata_filter: Optional[str] = None,
         odata_orderby: Optional[str] = None,
@@ -80,7 +113,7 @@ class ContatosInterface:
         Lista os departamentos de um contato
         
         Args:
-            accounting_firm_id: UUID do escritório contábil
+            accounting_firm_id: UUID do escritório contábil (None usa o escritório padrão)
             contato_id: UUID do contato
             odata_filter: Filtro OData
             odata_orderby: Campo para ordenação
@@ -90,6 +123,7 @@ class ContatosInterface:
         Returns:
             Dicionário com 'items' (lista de departamentos) e 'metadata'
         """
+        accounting_firm_id = self.client.resolver_escritorio(accounting_firm_id)
         return self.client.get(
             f"/accountingfirms/{accounting_firm_id}/contacts/{contato_id}/departments",
             odata_filter=odata_filter,
@@ -98,9 +132,41 @@ class ContatosInterface:
             odata_skip=odata_skip
         )
     
+    def iter_listar_departamentos(
+        self,
+        accounting_firm_id: Optional[UUID],
+        contato_id: UUID,
+        odata_filter: Optional[str] = None,
+        odata_orderby: Optional[str] = None,
+        page_size: int = TAMANHO_PAGINA_PADRAO,
+        **opcoes
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Itera sobre todos os registros de listar_departamentos(), buscando página a página
+        
+        Args:
+            accounting_firm_id: UUID do escritório contábil (None usa o escritório padrão)
+            contato_id: UUID do contato
+            odata_filter: Filtro OData
+            odata_orderby: Campo para ordenação
+            page_size: Registros por página ($top)
+            **opcoes: Opções de paginação repassadas a BaseClient.paginar
+            
+        Returns:
+            Iterador sobre os itens de todas as páginas
+        """
+        accounting_firm_id = self.client.resolver_escritorio(accounting_firm_id)
+        return self.client.paginar(
+            f"/accountingfirms/{accounting_firm_id}/contacts/{contato_id}/departments",
+            odata_filter=odata_filter,
+            odata_orderby=odata_orderby,
+            page_size=page_size,
+            **opcoes
+        )
+    
     def criar(
         self,
-        accounting_firm_id: UUID,
+        accounting_firm_id: Optional[UUID],
         name: str,
         **kwargs
     ) -> Dict[str, Any]:
@@ -108,13 +174,14 @@ class ContatosInterface:
         Cria um novo contato
         
         Args:
-            accounting_firm_id: UUID do escritório contábil
+            accounting_firm_id: UUID do escritório contábil (None usa o escritório padrão)
             name: Nome do contato
             **kwargs: Outros campos opcionais
             
         Returns:
             Dados do contato criado
         """
+        accounting_firm_id = self.client.resolver_escritorio(accounting_firm_id)
         payload = {
             "name": name
         }
@@ -127,7 +194,7 @@ class ContatosInterface:
     
     def adicionar_departamentos(
         self,
-        accounting_firm_id: UUID,
+        accounting_firm_id: Optional[UUID],
         contato_id: UUID,
         department_ids: list,
         **kwargs
@@ -136,7 +203,7 @@ class ContatosInterface:
         Adiciona departamentos a um contato
         
         Args:
-            accounting_firm_id: UUID do escritório contábil
+            accounting_firm_id: UUID do escritório contábil (None usa o escritório padrão)
             contato_id: UUID do contato
             department_ids: Lista de UUIDs dos departamentos
             **kwargs: Outros campos opcionais
@@ -144,6 +211,7 @@ class ContatosInterface:
         Returns:
             Resposta da API
         """
+        accounting_firm_id = self.client.resolver_escritorio(accounting_firm_id)
         payload = {
             "departmentIds": [str(dep_id) for dep_id in department_ids]
         }
@@ -156,7 +224,7 @@ class ContatosInterface:
     
     def remover_departamento(
         self,
-        accounting_firm_id: UUID,
+        accounting_firm_id: Optional[UUID],
         contato_id: UUID,
         department_id: UUID
     ) -> Dict[str, Any]:
@@ -164,13 +232,14 @@ class ContatosInterface:
         Remove departamento de um contato
         
         Args:
-            accounting_firm_id: UUID do escritório contábil
+            accounting_firm_id: UUID do escritório contábil (None usa o escritório padrão)
             contato_id: UUID do contato
             department_id: UUID do departamento
             
         Returns:
             Resposta da API
         """
+        accounting_firm_id = self.client.resolver_escritorio(accounting_firm_id)
         return self.client.delete(
             f"/accountingfirms/{accounting_firm_id}/contacts/{contato_id}/departments/{department_id}"
         )
@@ -10,8 +10,7 @@ from pathlib import Path
 from typing import Optional, List, Dict, Any
 from uuid import UUID
 
-from nibo_api.settings import NiboSettings
-from nibo_api.obrigacoes.client import NiboObrigacoesClient
+from nibo_api.pool import pool_padrao, configurar_cache_cli
 from nibo_api.obrigacoes.tarefas import (
     interpretar_status,
     interpretar_skip_holiday,
@@ -23,7 +22,8 @@ from .utils import (
     format_date,
     exibir_resultado_json,
     exibir_lista_simples,
-    exibir_obrigacoes
+    exibir_obrigacoes,
+    adicionar_opcoes_cache
 )
 
 
@@ -32,21 +32,13 @@ from .utils import (
 
 def listar_escritorios() -> Dict[str, Any]:
     """Lista todos os escritórios contábeis"""
-    config = NiboSettings()
-    client = NiboObrigacoesClient(config)
+    client = pool_padrao().obrigacoes()
     return client.escritorios.listar()
 
 
 def listar_clientes(accounting_firm_id: Optional[UUID] = None, nome_cliente: Optional[str] = None) -> Dict[str, Any]:
     """Lista clientes de um escritório contábil"""
-    config = NiboSettings()
-    client = NiboObrigacoesClient(config)
-    
-    if accounting_firm_id is None:
-        escritorios = client.escritorios.listar()
-        if not escritorios.get("items"):
-            raise ValueError("Nenhum escritório encontrado")
-        accounting_firm_id = UUID(escritorios["items"][0]["id"])
+    client = pool_padrao().obrigacoes()
     
     if nome_cliente:
         nome_escape = nome_cliente.replace("'", "''")
@@ -60,14 +52,7 @@ def listar_clientes(accounting_firm_id: Optional[UUID] = None, nome_cliente: Opt
 
 def listar_contatos(accounting_firm_id: Optional[UUID] = None) -> Dict[str, Any]:
     """Lista contatos de um escritório contábil"""
-    config = NiboSettings()
-    client = NiboObrigacoesClient(config)
-    
-    if accounting_firm_id is None:
-        escritorios = client.escritorios.listar()
-        if not escritorios.get("items"):
-            raise ValueError("Nenhum escritório encontrado")
-        accounting_firm_id = UUID(escritorios["items"][0]["id"])
+    client = pool_padrao().obrigacoes()
     
     return client.contatos.listar(accounting_firm_id=accounting_firm_id)
 
@@ -79,65 +64,12 @@ def listar_obrigacoes_cliente(
     accounting_firm_id: Optional[UUID] = None
 ) -> Dict[str, Any]:
     """Lista obrigações de um cliente específico"""
-    config = NiboSettings()
-    client = NiboObrigacoesClient(config)
-    
-    if accounting_firm_id is None:
-        escritorios = client.escritorios.listar()
-        if not escritorios.get("items"):
-            raise ValueError("Nenhum escritório encontrado")
-        accounting_firm_id = UUID(escritorios["items"][0]["id"])
-    
-    clientes_encontrados = []
-    
-    try:
-        cliente_id = UUID(cliente_identificador)
-        cliente_encontrado = None
-        skip = 0
-        page_size = 100
-        
-        while cliente_encontrado is None:
-            clientes = client.clientes.listar(
-                accounting_firm_id=accounting_firm_id,
-                odata_top=page_size,
-                odata_skip=skip
-            )
-            
-            items = clientes.get("items", [])
-            if not items:
-                break
-            
-            for cliente in items:
-                if str(cliente.get("id")) == str(cliente_id):
-                    cliente_encontrado = cliente
-                    break
-            
-            if cliente_encontrado:
-                break
-            
-            skip += len(items)
-            if skip >= 1000:
-                break
-        
-        if cliente_encontrado is None:
-            raise ValueError(f"Cliente com ID '{cliente_identificador}' não encontrado")
-        
-        clientes_encontrados = [cliente_encontrado]
-    except ValueError:
-        nome_cliente = cliente_identificador
-        nome_escape = nome_cliente.replace("'", "''")
-        clientes = client.clientes.listar(
-            accounting_firm_id=accounting_firm_id,
-            odata_filter=f"contains(name, '{nome_escape}')"
-        )
-        
-        if not clientes.get("items") or len(clientes["items"]) == 0:
-            raise ValueError(f"Cliente '{nome_cliente}' não encontrado")
-        
-        clientes_encontrados = clientes["items"]
+    client = pool_padrao().obrigacoes()
     
+    # UUID, CPF/CNPJ ou nome, resolvidos pelo diretório em memória do escritório
+    clientes_encontrados = client.clientes.diretorio(accounting_firm_id).resolver(cliente_identificador)
     if not clientes_encontrados:
-        raise ValueError(f"Erro ao identificar o cliente: '{cliente_identificador}'")
+        raise ValueError(f"Cliente '{cliente_identificador}' não encontrado")
     
     if data_inicio is None:
         data_inicio = date.today()
@@ -145,52 +77,23 @@ def listar_obrigacoes_cliente(
         ano_atual = date.today().year
         data_fim = date(ano_atual, 12, 31)
     
-    cliente_ids = [UUID(cliente.get("id")) for cliente in clientes_encontrados]
-    ids_str = "', '".join(str(cid) for cid in cliente_ids)
-    filtro_cliente = f"Customer/Id in ('{ids_str}')"
-    
-    items = []
-    try:
-        relatorios = client.relatorios.listar_relatorios(
-            accounting_firm_id=accounting_firm_id,
-            odata_filter=filtro_cliente,
-            odata_orderby="filedDate desc"
-        )
-        items = relatorios.get("items", [])
-    except Exception:
-        try:
-            relatorios = client.relatorios.listar_relatorios(
-                accounting_firm_id=accounting_firm_id,
-                odata_filter=filtro_cliente
-            )
-            items = relatorios.get("items", [])
-        except Exception:
-            relatorios = client.relatorios.listar_relatorios(
-                accounting_firm_id=accounting_firm_id
-            )
-            items = relatorios.get("items", [])
-            
-            items_cliente = []
-            cliente_ids_str = [str(cid) for cid in cliente_ids]
-            for item in items:
-                customer = item.get("customer")
-                if customer and isinstance(customer, dict):
-                    customer_id_item = customer.get("id")
-                    if customer_id_item and str(customer_id_item) in cliente_ids_str:
-                        items_cliente.append(item)
-            items = items_cliente
-    
-    items_filtrados = []
-    for item in items:
-        duedate_str = item.get("dueDate")
-        duedate_obj = parse_date(duedate_str)
-        
-        if duedate_obj and data_inicio <= duedate_obj <= data_fim:
-            items_filtrados.append(item)
+    # Clientes e período vão como filtros OData; só o que o servidor recusar é filtrado aqui
+    ids_clientes = [cliente.get("id") for cliente in clientes_encontrados]
+    items_filtrados = (
+        client.relatorios.consultar_obrigacoes(accounting_firm_id)
+        .clientes(ids_clientes)
+        .vencimento(data_inicio, data_fim)
+        .ordenar("filedDate desc")
+        .listar()
+    )
+    # Total dos clientes em qualquer período (mesmo filtro de clientes, sem o de vencimento)
+    total_cliente = sum(
+        1 for _ in client.relatorios.consultar_obrigacoes(accounting_firm_id).clientes(ids_clientes)
+    )
     
     return {
         "items": items_filtrados,
-        "total_cliente": len(items),
+        "total_cliente": total_cliente,
         "total_periodo": len(items_filtrados),
         "clientes_info": clientes_encontrados,
         "total_clientes": len(clientes_encontrados),
@@ -203,14 +106,7 @@ def listar_obrigacoes_cliente(
 
 def listar_departamentos(accounting_firm_id: Optional[UUID] = None) -> Dict[str, Any]:
     """Lista departamentos de um escritório contábil"""
-    config = NiboSettings()
-    client = NiboObrigacoesClient(config)
-    
-    if accounting_firm_id is None:
-        escritorios = client.escritorios.listar()
-        if not escritorios.get("items"):
-            raise ValueError("Nenhum escritório encontrado")
-        accounting_firm_id = UUID(escritorios["items"][0]["id"])
+    client = pool_padrao().obrigacoes()
     
     return client.departamentos.listar(accounting_firm_id=accounting_firm_id)
 
@@ -222,14 +118,7 @@ def listar_tarefas(
     incluir_completas: bool = False
 ) -> Dict[str, Any]:
     """Lista tarefas de um escritório contábil"""
-    config = NiboSettings()
-    client = NiboObrigacoesClient(config)
-    
-    if accounting_firm_id is None:
-        escritorios = client.escritorios.listar()
-        if not escritorios.get("items"):
-            raise ValueError("Nenhum escritório encontrado")
-        accounting_firm_id = UUID(escritorios["items"][0]["id"])
+    client = pool_padrao().obrigacoes()
     
     filtros = []
     
@@ -262,14 +151,7 @@ def criar_tarefa(
     arquivo_ids: Optional[List[str]] = None
 ) -> Dict[str, Any]:
     """Cria uma nova tarefa"""
-    config = NiboSettings()
-    client = NiboObrigacoesClient(config)
-    
-    if accounting_firm_id is None:
-        escritorios = client.escritorios.listar()
-        if not escritorios.get("items"):
-            raise ValueError("Nenhum escritório encontrado")
-        accounting_firm_id = UUID(escritorios["items"][0]["id"])
+    client = pool_padrao().obrigacoes()
     
     return client.tarefas.criar(
         accounting_firm_id=accounting_firm_id,
@@ -286,42 +168,21 @@ def criar_tarefa(
 
 def listar_cnaes(accounting_firm_id: Optional[UUID] = None) -> Dict[str, Any]:
     """Lista CNAEs de um escritório contábil"""
-    config = NiboSettings()
-    client = NiboObrigacoesClient(config)
-    
-    if accounting_firm_id is None:
-        escritorios = client.escritorios.listar()
-        if not escritorios.get("items"):
-            raise ValueError("Nenhum escritório encontrado")
-        accounting_firm_id = UUID(escritorios["items"][0]["id"])
+    client = pool_padrao().obrigacoes()
     
     return client.cnaes.listar(accounting_firm_id=accounting_firm_id)
 
 
 def listar_grupos_clientes(accounting_firm_id: Optional[UUID] = None) -> Dict[str, Any]:
     """Lista grupos de clientes (tags) de um escritório contábil"""
-    config = NiboSettings()
-    client = NiboObrigacoesClient(config)
-    
-    if accounting_firm_id is None:
-        escritorios = client.escritorios.listar()
-        if not escritorios.get("items"):
-            raise ValueError("Nenhum escritório encontrado")
-        accounting_firm_id = UUID(escritorios["items"][0]["id"])
+    client = pool_padrao().obrigacoes()
     
     return client.grupos_clientes.listar(accounting_firm_id=accounting_firm_id)
 
 
 def listar_usuarios(accounting_firm_id: Optional[UUID] = None, nome_usuario: Optional[str] = None) -> Dict[str, Any]:
     """Lista membros da equipe de um escritório contábil"""
-    config = NiboSettings()
-    client = NiboObrigacoesClient(config)
-    
-    if accounting_firm_id is None:
-        escritorios = client.escritorios.listar()
-        if not escritorios.get("items"):
-            raise ValueError("Nenhum escritório encontrado")
-        accounting_firm_id = UUID(escritorios["items"][0]["id"])
+    client = pool_padrao().obrigacoes()
     
     odata_filter = None
     if nome_usuario:
@@ -340,8 +201,7 @@ def criar_arquivo(
     nome_arquivo: Optional[str] = None
 ) -> Dict[str, Any]:
     """Cria um arquivo na API para upload"""
-    config = NiboSettings()
-    client = NiboObrigacoesClient(config)
+    client = pool_padrao().obrigacoes()
     
     arquivo_path = Path(caminho_arquivo)
     if not arquivo_path.exists():
@@ -350,12 +210,6 @@ def criar_arquivo(
     if nome_arquivo is None:
         nome_arquivo = arquivo_path.name
     
-    if accounting_firm_id is None:
-        escritorios = client.escritorios.listar()
-        if not escritorios.get("items"):
-            raise ValueError("Nenhum escritório encontrado")
-        accounting_firm_id = UUID(escritorios["items"][0]["id"])
-    
     resultado = client.arquivos.criar_arquivo_upload(
         accounting_firm_id=accounting_firm_id,
         name=nome_arquivo
@@ -371,8 +225,7 @@ def fazer_upload_arquivo(
     accounting_firm_id: Optional[UUID] = None
 ) -> Dict[str, Any]:
     """Faz upload de um arquivo usando sharedAccessSignature e envia para conferência"""
-    config = NiboSettings()
-    client = NiboObrigacoesClient(config)
+    client = pool_padrao().obrigacoes()
     
     arquivo_path = Path(caminho_arquivo)
     if not arquivo_path.exists():
@@ -394,12 +247,6 @@ def fazer_upload_arquivo(
             "Recomenda-se usar --shared-access-signature diretamente."
         )
     
-    if accounting_firm_id is None:
-        escritorios = client.escritorios.listar()
-        if not escritorios.get("items"):
-            raise ValueError("Nenhum escritório encontrado")
-        accounting_firm_id = UUID(escritorios["items"][0]["id"])
-    
     content_type, _ = mimetypes.guess_type(str(arquivo_path))
     if not content_type:
         content_type = "application/octet-stream"
@@ -490,6 +337,10 @@ Exemplos de uso:
 
   # Usar formato JSON
   python manage.py obrigacoes clientes --json
+
+  # Ignorar ou renovar o cache local de consultas
+  python manage.py obrigacoes clientes --no-cache
+  python manage.py obrigacoes clientes --refresh
         """
     )
     
@@ -507,12 +358,13 @@ Exemplos de uso:
         action="store_true",
         help="Exibe resultado em formato JSON"
     )
+    adicionar_opcoes_cache(shared_args)
     
     parser_escritorios = subparsers.add_parser("escritorios", help="Lista todos os escritórios contábeis", parents=[shared_args])
     parser_clientes = subparsers.add_parser("clientes", help="Lista clientes de um escritório", parents=[shared_args])
     parser_clientes.add_argument("--nome", type=str, help="Nome do cliente para filtrar")
     parser_obrigacoes = subparsers.add_parser("obrigacoes", help="Lista obrigações de um cliente", parents=[shared_args])
-    parser_obrigacoes.add_argument("--cliente", type=str, required=True, help="Nome do cliente ou UUID do cliente")
+    parser_obrigacoes.add_argument("--cliente", type=str, required=True, help="Nome, CPF/CNPJ ou UUID do cliente")
     parser_obrigacoes.add_argument("--inicio", type=str, help="Data de início (DD/MM/YYYY, padrão: hoje)")
     parser_obrigacoes.add_argument("--fim", type=str, help="Data de fim (DD/MM/YYYY, padrão: 31/12 do ano atual)")
     parser_obrigacoes.add_argument("--simples", action="store_true", help="Exibe apenas informações básicas")
@@ -555,6 +407,8 @@ Exemplos de uso:
         parser.print_help()
         return 0
     
+    configurar_cache_cli(sem_cache=args.no_cache, atualizar=args.refresh)
+    
     accounting_firm_id = None
     if hasattr(args, 'escritorio') and args.escritorio:
         try:
@@ -564,6 +418,10 @@ Exemplos de uso:
             return 1
     
     try:
+        if args.refresh and accounting_firm_id is None and args.comando != "escritorios":
+            # --refresh também renova o escritório padrão guardado em cache_dir
+            pool_padrao().obrigacoes().escritorio_padrao(atualizar=True)
+        
         if args.comando == "escritorios":
             resultado = listar_escritorios()
             if args.json:
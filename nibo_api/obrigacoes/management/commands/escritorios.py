@@ -4,8 +4,7 @@ Comandos CLI para escritórios
 import argparse
 from typing import Dict, Any
 
-from nibo_api.settings import NiboSettings
-from nibo_api.obrigacoes.client import NiboObrigacoesClient
+from nibo_api.pool import pool_padrao
 from ..utils import exibir_resultado_json, exibir_lista_simples
 
 
@@ -16,8 +15,7 @@ def listar_escritorios() -> Dict[str, Any]:
     Returns:
         Dicionário com 'items' (lista de escritórios) e 'metadata'
     """
-    config = NiboSettings()
-    client = NiboObrigacoesClient(config)
+    client = pool_padrao().obrigacoes()
     return client.escritorios.listar()
 
 
@@ -2,25 +2,22 @@
 Funções utilitárias para comandos CLI de obrigações
 """
 import json
-from datetime import datetime, date
+from datetime import date
 from typing import Dict, Any
 
+from nibo_api.common.datas import para_date
+
 
 def parse_date(date_str):
-    """Parse uma data de string para objeto date"""
-    if not date_str or date_str == "N/A":
-        return None
+    """
+    Parse uma data de string para objeto date (ver nibo_api.common.datas.para_date)
+
+    Returns:
+        date, ou None se a data estiver vazia ou for inválida
+    """
     try:
-        date_str = str(date_str).strip()
-        # Tenta formato DD/MM/YYYY primeiro
-        if "/" in date_str:
-            parts = date_str.split("/")
-            if len(parts) == 3:
-                return date(int(parts[2]), int(parts[1]), int(parts[0]))
-        # Tenta formato ISO (YYYY-MM-DD ou YYYY-MM-DDTHH:MM:SS)
-        date_str = date_str.split("T")[0].replace("Z", "")
-        return datetime.fromisoformat(date_str).date()
-    except:
+        return para_date(date_str)
+    except ValueError:
         return None
 
 
@@ -165,3 +162,15 @@ def exibir_obrigacoes(obrigacoes: Dict[str, Any], detalhado: bool = True):
         print("Nenhuma obrigação encontrada no período especificado.")
 
 
+def adicionar_opcoes_cache(parser):
+    """Adiciona --no-cache e --refresh (cache persistente de consultas) a um parser"""
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Não usa o cache local de consultas"
+    )
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Ignora o cache local e grava as respostas novas"
+    )
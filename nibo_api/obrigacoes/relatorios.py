@@ -1,10 +1,240 @@
 """
 Interface para relatórios no Nibo Obrigações
 """
-from typing import Optional, Dict, Any
+from datetime import date
+from itertools import chain, product
+from typing import Optional, Dict, Any, Iterable, Iterator, List, Tuple, Union
 from uuid import UUID
 
 from nibo_api.common.client import BaseClient
+from nibo_api.common.datas import para_date
+from nibo_api.common.exceptions import NiboValidationError
+from nibo_api.common.odata import aplicar_odata, compilar_predicado
+from nibo_api.common.paginacao import TAMANHO_PAGINA_PADRAO
+
+
+# Forma de filtro aceita pelo servidor: (forma do filtro de clientes, período no
+# servidor, ordenação no servidor). Indexada pela URL base e pelas partes pedidas,
+# é aprendida na primeira consulta e reaproveitada por todos os clientes do processo.
+FormaConsulta = Tuple[Optional[str], bool, bool]
+_FORMAS_ACEITAS: Dict[Tuple[str, Tuple[bool, bool, bool]], FormaConsulta] = {}
+
+# Formas do filtro de clientes, da preferida para a menos preferida (None: filtra localmente)
+_FORMAS_CLIENTES = ("in", "ou", None)
+
+_FIM = object()
+
+
+class ConsultaObrigacoes:
+    """
+    Consulta ao relatório completo de obrigações com filtros enviados ao servidor
+
+    Monta os filtros OData de clientes e do período de vencimento e pagina o
+    resultado. Se o servidor recusar alguma forma de filtro (erro 400), a
+    consulta tenta formas mais simples e aplica localmente o que não pôde ser
+    enviado; a forma aceita fica guardada e as próximas consultas vão direto
+    a ela. Erros 5xx não são tomados como recusa: são lançados sem alterar
+    a forma guardada.
+
+    Exemplo:
+        consulta = (client.relatorios.consultar_obrigacoes(firm_id)
+                    .clientes(cliente_id)
+                    .vencimento("01/01/2025", "31/12/2025")
+                    .ordenar("filedDate desc"))
+        items = consulta.listar()
+
+    Pensada para o cliente síncrono.
+    """
+
+    def __init__(self, relatorios: "RelatoriosInterface", accounting_firm_id: UUID):
+        """
+        Inicializa a consulta
+
+        Args:
+            relatorios: Interface de relatórios usada nas requisições
+            accounting_firm_id: UUID do escritório contábil
+        """
+        self.relatorios = relatorios
+        self.accounting_firm_id = accounting_firm_id
+        self.page_size = TAMANHO_PAGINA_PADRAO
+        self.forma: Optional[FormaConsulta] = None
+        self._clientes: List[str] = []
+        self._inicio: Optional[date] = None
+        self._fim: Optional[date] = None
+        self._ordem: Optional[str] = None
+
+    def clientes(self, *ids: Union[UUID, str, Iterable[Union[UUID, str]]]) -> "ConsultaObrigacoes":
+        """
+        Restringe a consulta aos clientes informados
+
+        Args:
+            *ids: UUIDs dos clientes (avulsos ou em listas)
+
+        Returns:
+            A própria consulta
+        """
+        for valor in ids:
+            valores = [valor] if isinstance(valor, (str, UUID)) else valor
+            self._clientes.extend(str(UUID(str(v))) for v in valores)
+        return self
+
+    def vencimento(
+        self,
+        inicio: Optional[Union[date, str]] = None,
+        fim: Optional[Union[date, str]] = None
+    ) -> "ConsultaObrigacoes":
+        """
+        Restringe a consulta ao período de vencimento (dueDate), inclusive
+
+        Args:
+            inicio: Data inicial (date, DD/MM/YYYY ou YYYY-MM-DD)
+            fim: Data final
+
+        Returns:
+            A própria consulta
+
+        Raises:
+            ValueError: Se alguma data for inválida ou o início for maior que o fim
+        """
+        for valor in (inicio, fim):
+            if valor is not None and para_date(valor) is None:
+                raise ValueError(f"Data inválida: {valor}. Use DD/MM/YYYY ou YYYY-MM-DD.")
+        self._inicio = para_date(inicio)
+        self._fim = para_date(fim)
+        if self._inicio and self._fim and self._inicio > self._fim:
+            raise ValueError("Data inicial não pode ser maior que data final.")
+        return self
+
+    def ordenar(self, odata_orderby: str) -> "ConsultaObrigacoes":
+        """
+        Define a ordenação (ex: "filedDate desc")
+
+        Returns:
+            A própria consulta
+        """
+        self._ordem = odata_orderby
+        return self
+
+    def tamanho_pagina(self, page_size: int) -> "ConsultaObrigacoes":
+        """
+        Define quantos registros são pedidos por página
+
+        Returns:
+            A própria consulta
+        """
+        self.page_size = page_size
+        return self
+
+    def _filtro_clientes(self, forma: Optional[str]) -> Optional[str]:
+        if not self._clientes or forma is None:
+            return None
+        if forma == "in":
+            return "Customer/Id in ('" + "', '".join(self._clientes) + "')"
+        return "(" + " or ".join(f"Customer/Id eq '{cliente}'" for cliente in self._clientes) + ")"
+
+    def _filtro_periodo(self) -> Optional[str]:
+        partes = []
+        if self._inicio:
+            partes.append(f"dueDate ge {self._inicio.strftime('%Y-%m-%dT00:00:00Z')}")
+        if self._fim:
+            partes.append(f"dueDate le {self._fim.strftime('%Y-%m-%dT23:59:59Z')}")
+        return " and ".join(partes) or None
+
+    def _formas(self) -> List[FormaConsulta]:
+        """
+        Formas possíveis, da que envia mais ao servidor para a que envia menos
+
+        A forma do filtro de clientes é simplificada primeiro ('in' -> 'ou' ->
+        local); período e ordenação só deixam o servidor depois disso.
+        """
+        clientes = _FORMAS_CLIENTES if self._clientes else (None,)
+        periodo = (True, False) if (self._inicio or self._fim) else (False,)
+        ordem = (True, False) if self._ordem else (False,)
+        return [(forma, p, o) for p, o, forma in product(periodo, ordem, clientes)]
+
+    def filtro_servidor(self, forma: FormaConsulta) -> Optional[str]:
+        """
+        Filtro OData enviado ao servidor em uma forma de consulta
+
+        Args:
+            forma: (forma do filtro de clientes, período no servidor, ordenação no servidor)
+
+        Returns:
+            Filtro OData, ou None se nada for filtrado no servidor
+        """
+        partes = [self._filtro_clientes(forma[0]), self._filtro_periodo() if forma[1] else None]
+        return " and ".join(f"({parte})" for parte in partes if parte) or None
+
+    def _filtro_local(self, forma: FormaConsulta) -> Optional[str]:
+        """O que o servidor não filtrou, para avaliar localmente"""
+        partes = [
+            self._filtro_clientes("ou") if forma[0] is None else None,
+            self._filtro_periodo() if not forma[1] else None,
+        ]
+        return " and ".join(f"({parte})" for parte in partes if parte) or None
+
+    def iterar(self) -> Iterator[Dict[str, Any]]:
+        """
+        Itera sobre as obrigações, buscando página a página
+
+        Sem ordenação no servidor, os itens saem na ordem da API; use
+        listar() para obter a ordenação pedida em qualquer caso.
+
+        Returns:
+            Iterador sobre os itens
+
+        Raises:
+            NiboAPIError: Se nem a consulta sem filtros for aceita
+            NiboServerError: Em erros 5xx (a forma guardada não é alterada)
+        """
+        chave = (
+            self.relatorios.client.base_url,
+            (bool(self._clientes), bool(self._inicio or self._fim), bool(self._ordem))
+        )
+        formas = self._formas()
+        conhecida = _FORMAS_ACEITAS.get(chave)
+        if conhecida in formas:
+            formas = formas[formas.index(conhecida):]
+        for forma in formas:
+            itens = iter(self.relatorios.iter_listar_relatorios(
+                self.accounting_firm_id,
+                odata_filter=self.filtro_servidor(forma),
+                odata_orderby=self._ordem if forma[2] else None,
+                page_size=self.page_size
+            ))
+            try:
+                primeiro = next(itens, _FIM)
+            except NiboValidationError:
+                if forma == formas[-1]:
+                    raise
+                continue
+            _FORMAS_ACEITAS[chave] = forma
+            self.forma = forma
+            break
+        if primeiro is _FIM:
+            return
+        filtro_local = self._filtro_local(forma)
+        todos = chain((primeiro,), itens)
+        if filtro_local is None:
+            yield from todos
+            return
+        predicado = compilar_predicado(filtro_local)
+        yield from (item for item in todos if predicado(item))
+
+    def listar(self) -> List[Dict[str, Any]]:
+        """
+        Busca todas as obrigações da consulta, já filtradas e ordenadas
+
+        Returns:
+            Lista de itens do relatório
+        """
+        itens = list(self.iterar())
+        if self._ordem and self.forma is not None and not self.forma[2]:
+            itens = aplicar_odata(itens, odata_orderby=self._ordem)
+        return itens
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return self.iterar()
 
 
 class RelatoriosInterface:
@@ -21,7 +251,7 @@ class RelatoriosInterface:
     
     def listar_relatorios(
         self,
-        accounting_firm_id: UUID,
+        accounting_firm_id: Optional[UUID] = None,
         odata_filter: Optional[str] = None,
         odata_orderby: Optional[str] = None,
         odata_top: Optional[int] = None,
@@ -31,7 +261,7 @@ class RelatoriosInterface:
         Lista relatórios do Nibo Obrigações de um escritório
         
         Args:
-            accounting_firm_id: UUID do escritório contábil
+            accounting_firm_id: UUID do escritório contábil (None usa o escritório padrão)
             odata_filter: Filtro OData
             odata_orderby: Campo para ordenação
             odata_top: Limite de registros
@@ -40,6 +270,7 @@ class RelatoriosInterface:
         Returns:
             Dicionário com 'items' (lista de relatórios) e 'metadata'
         """
+        accounting_firm_id = self.client.resolver_escritorio(accounting_firm_id)
         return self.client.get(
             f"/accountingfirms/{accounting_firm_id}/reports/obligations/complete",
             odata_filter=odata_filter,
@@ -48,9 +279,55 @@ class RelatoriosInterface:
             odata_skip=odata_skip
         )
     
+    def iter_listar_relatorios(
+        self,
+        accounting_firm_id: Optional[UUID] = None,
+        odata_filter: Optional[str] = None,
+        odata_orderby: Optional[str] = None,
+        page_size: int = TAMANHO_PAGINA_PADRAO,
+        **opcoes
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Itera sobre todos os registros de listar_relatorios(), buscando página a página
+        
+        Args:
+            accounting_firm_id: UUID do escritório contábil (None usa o escritório padrão)
+            odata_filter: Filtro OData
+            odata_orderby: Campo para ordenação
+            page_size: Registros por página ($top)
+            **opcoes: Opções de paginação repassadas a BaseClient.paginar
+            
+        Returns:
+            Iterador sobre os itens de todas as páginas
+        """
+        accounting_firm_id = self.client.resolver_escritorio(accounting_firm_id)
+        return self.client.paginar(
+            f"/accountingfirms/{accounting_firm_id}/reports/obligations/complete",
+            odata_filter=odata_filter,
+            odata_orderby=odata_orderby,
+            page_size=page_size,
+            **opcoes
+        )
+    
+    def consultar_obrigacoes(self, accounting_firm_id: Optional[UUID] = None) -> ConsultaObrigacoes:
+        """
+        Inicia uma consulta ao relatório completo de obrigações (ver ConsultaObrigacoes)
+
+        Os filtros de clientes e de vencimento vão para o servidor, evitando
+        baixar o relatório inteiro do escritório.
+
+        Args:
+            accounting_firm_id: UUID do escritório contábil (None usa o escritório padrão)
+
+        Returns:
+            ConsultaObrigacoes a ser refinada com clientes(), vencimento() e ordenar()
+        """
+        accounting_firm_id = self.client.resolver_escritorio(accounting_firm_id)
+        return ConsultaObrigacoes(self, accounting_firm_id)
+
     def listar_fields(
         self,
-        accounting_firm_id: UUID,
+        accounting_firm_id: Optional[UUID] = None,
         odata_filter: Optional[str] = None,
         odata_orderby: Optional[str] = None,
         odata_top: Optional[int] = None,
@@ -66,7 +343,7 @@ class RelatoriosInterface:
         - Obligation/Id in ('234687', '525873')
         
         Args:
-            accounting_firm_id: UUID do escritório contábil
+            accounting_firm_id: UUID do escritório contábil (None usa o escritório padrão)
             odata_filter: Filtro OData (ex: "Customer/Id in (id1, id2)")
             odata_orderby: Campo para ordenação
             odata_top: Limite de registros
@@ -75,6 +352,7 @@ class RelatoriosInterface:
         Returns:
             Dicionário com 'items' (lista de arquivos/obrigações) e 'metadata'
         """
+        accounting_firm_id = self.client.resolver_escritorio(accounting_firm_id)
         return self.client.get(
             f"/accountingfirms/{accounting_firm_id}/fields",
             odata_filter=odata_filter,
@@ -82,4 +360,34 @@ class RelatoriosInterface:
             odata_top=odata_top,
             odata_skip=odata_skip
         )
+    
+    def iter_listar_fields(
+        self,
+        accounting_firm_id: Optional[UUID] = None,
+        odata_filter: Optional[str] = None,
+        odata_orderby: Optional[str] = None,
+        page_size: int = TAMANHO_PAGINA_PADRAO,
+        **opcoes
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Itera sobre todos os registros de listar_fields(), buscando página a página
+        
+        Args:
+            accounting_firm_id: UUID do escritório contábil (None usa o escritório padrão)
+            odata_filter: Filtro OData (ex: "Customer/Id in (id1, id2)")
+            odata_orderby: Campo para ordenação
+            page_size: Registros por página ($top)
+            **opcoes: Opções de paginação repassadas a BaseClient.paginar
+            
+        Returns:
+            Iterador sobre os itens de todas as páginas
+        """
+        accounting_firm_id = self.client.resolver_escritorio(accounting_firm_id)
+        return self.client.paginar(
+            f"/accountingfirms/{accounting_firm_id}/fields",
+            odata_filter=odata_filter,
+            odata_orderby=odata_orderby,
+            page_size=page_size,
+            **opcoes
+        )
 
@@ -1,10 +1,11 @@
 """
 Interface para responsabilidades no Nibo Obrigações
 """
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterator
 from uuid import UUID
 
 from nibo_api.common.client import BaseClient
+from nibo_api.common.paginacao import TAMANHO_PAGINA_PADRAO
 
 
 class ResponsabilidadesInterface:
@@ -21,7 +22,7 @@ class ResponsabilidadesInterface:
     
     def listar_responsaveis_clientes(
         self,
-        accounting_firm_id: UUID,
+        accounting_firm_id: Optional[UUID] = None,
         odata_filter: Optional[str] = None,
         odata_orderby: Optional[str] = None,
         odata_top: Optional[int] = None,
@@ -31,7 +32,7 @@ class ResponsabilidadesInterface:
         Lista responsáveis pelos clientes de um escritório
         
         Args:
-            accounting_firm_id: UUID do escritório contábil
+            accounting_firm_id: UUID do escritório contábil (None usa o escritório padrão)
             odata_filter: Filtro OData
             odata_orderby: Campo para ordenação
             odata_top: Limite de registros
@@ -40,6 +41,7 @@ class ResponsabilidadesInterface:
         Returns:
             Dicionário com 'items' (lista de responsáveis) e 'metadata'
         """
+        accounting_firm_id = self.client.resolver_escritorio(accounting_firm_id)
         return self.client.get(
             f"/accountingfirms/{accounting_firm_id}/responsibilities",
             odata_filter=odata_filter,
@@ -48,9 +50,39 @@ class ResponsabilidadesInterface:
             odata_skip=odata_skip
         )
     
+    def iter_listar_responsaveis_clientes(
+        self,
+        accounting_firm_id: Optional[UUID] = None,
+        odata_filter: Optional[str] = None,
+        odata_orderby: Optional[str] = None,
+        page_size: int = TAMANHO_PAGINA_PADRAO,
+        **opcoes
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Itera sobre todos os registros de listar_responsaveis_clientes(), buscando página a página
+        
+        Args:
+            accounting_firm_id: UUID do escritório contábil (None usa o escritório padrão)
+            odata_filter: Filtro OData
+            odata_orderby: Campo para ordenação
+            page_size: Registros por página ($top)
+            **opcoes: Opções de paginação repassadas a BaseClient.paginar
+            
+        Returns:
+            Iterador sobre os itens de todas as páginas
+        """
+        accounting_firm_id = self.client.resolver_escritorio(accounting_firm_id)
+        return self.client.paginar(
+            f"/accountingfirms/{accounting_firm_id}/responsibilities",
+            odata_filter=odata_filter,
+            odata_orderby=odata_orderby,
+            page_size=page_size,
+            **opcoes
+        )
+    
     def transferir_responsavel(
         self,
-        accounting_firm_id: UUID,
+        accounting_firm_id: Optional[UUID],
         cliente_id: UUID,
         user_id: UUID,
         **kwargs
@@ -59,7 +91,7 @@ class ResponsabilidadesInterface:
         Transfere responsável pelo cliente
         
         Args:
-            accounting_firm_id: UUID do escritório contábil
+            accounting_firm_id: UUID do escritório contábil (None usa o escritório padrão)
             cliente_id: UUID do cliente
             user_id: UUID do usuário responsável
             **kwargs: Outros campos opcionais
@@ -67,6 +99,7 @@ class ResponsabilidadesInterface:
         Returns:
             Resposta da API
         """
+        accounting_firm_id = self.client.resolver_escritorio(accounting_firm_id)
         payload = {
             "userId": str(user_id)
         }
@@ -1,10 +1,11 @@
 """
 Interface para tarefas no Nibo Obrigações
 """
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Iterator
 from uuid import UUID
 
 from nibo_api.common.client import BaseClient
+from nibo_api.common.paginacao import TAMANHO_PAGINA_PADRAO
 
 
 # Constantes para Status
@@ -138,7 +139,7 @@ class TarefasInterface:
     
     def listar(
         self,
-        accounting_firm_id: UUID,
+        accounting_firm_id: Optional[UUID] = None,
         odata_filter: Optional[str] = None,
         odata_orderby: Optional[str] = None,
         odata_top: Optional[int] = None,
@@ -148,7 +149,7 @@ class TarefasInterface:
         Lista todas as tarefas de um escritório
         
         Args:
-            accounting_firm_id: UUID do escritório contábil
+            accounting_firm_id: UUID do escritório contábil (None usa o escritório padrão)
             odata_filter: Filtro OData
             odata_orderby: Campo para ordenação
             odata_top: Limite de registros
@@ -157,6 +158,7 @@ class TarefasInterface:
         Returns:
             Dicionário com 'items' (lista de tarefas) e 'metadata'
         """
+        accounting_firm_id = self.client.resolver_escritorio(accounting_firm_id)
         return self.client.get(
             f"/accountingfirms/{accounting_firm_id}/tasks",
             odata_filter=odata_filter,
@@ -165,9 +167,39 @@ class TarefasInterface:
             odata_skip=odata_skip
         )
     
+    def iter_listar(
+        self,
+        accounting_firm_id: Optional[UUID] = None,
+        odata_filter: Optional[str] = None,
+        odata_orderby: Optional[str] = None,
+        page_size: int = TAMANHO_PAGINA_PADRAO,
+        **opcoes
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Itera sobre todos os registros de listar(), buscando página a página
+        
+        Args:
+            accounting_firm_id: UUID do escritório contábil (None usa o escritório padrão)
+            odata_filter: Filtro OData
+            odata_orderby: Campo para ordenação
+            page_size: Registros por página ($top)
+            **opcoes: Opções de paginação repassadas a BaseClient.paginar
+            
+        Returns:
+            Iterador sobre os itens de todas as páginas
+        """
+        accounting_firm_id = self.client.resolver_escritorio(accounting_firm_id)
+        return self.client.paginar(
+            f"/accountingfirms/{accounting_firm_id}/tasks",
+            odata_filter=odata_filter,
+            odata_orderby=odata_orderby,
+            page_size=page_size,
+            **opcoes
+        )
+    
     def criar(
         self,
-        accounting_firm_id: UUID,
+        accounting_firm_id: Optional[UUID],
         name: str,
         task_template_id: Optional[str] = None,
         deadline: Optional[str] = None,
@@ -186,7 +218,7 @@ class TarefasInterface:
         Cria uma nova tarefa
         
         Args:
-            accounting_firm_id: UUID do escritório contábil
+            accounting_firm_id: UUID do escritório contábil (None usa o escritório padrão)
             name: Nome da tarefa (obrigatório, exceto quando usar template)
             task_template_id: ID do template para criar tarefa a partir de template (opcional)
             deadline: Data e hora limite para conclusão (formato: YYYY-MM-DDTHH:MM:SS)
@@ -209,6 +241,7 @@ class TarefasInterface:
             - O campo 'name' não pode ser modificado quando usar template
             - A API retorna status 202 (Accepted) indicando criação assíncrona
         """
+        accounting_firm_id = self.client.resolver_escritorio(accounting_firm_id)
         payload = {}
         
         # Se não usar template, name é obrigatório
@@ -0,0 +1,192 @@
+"""
+Pool de clientes Nibo com transporte HTTP compartilhado
+"""
+import threading
+from typing import Optional, Dict, Tuple
+
+from nibo_api.settings import NiboSettings
+from nibo_api.common.transporte import Transporte
+from nibo_api.common.cache import cache_persistente
+from nibo_api.common.coalescencia import Coalescedor
+from nibo_api.empresa.client import NiboEmpresaClient
+from nibo_api.obrigacoes.client import NiboObrigacoesClient
+
+
+class NiboClientPool:
+    """
+    Fábrica de clientes que reaproveita conexões entre organizações
+
+    Todos os clientes criados pelo pool compartilham o mesmo Transporte
+    (sessão, pool de conexões e contexto TLS); apenas o header de
+    autenticação varia por organização. Os clientes ficam em cache por
+    organização, então chamadas repetidas devolvem o mesmo cliente já
+    "aquecido". É seguro usar o pool a partir de várias threads.
+
+    Exemplo:
+        with NiboClientPool(config, rate_limiter=limitador) as pool:
+            for codigo in ("empresa_a", "empresa_b"):
+                client = pool.empresa(organizacao_codigo=codigo)
+                client.clientes.listar()
+    """
+
+    def __init__(
+        self,
+        config: Optional[NiboSettings] = None,
+        transporte: Optional[Transporte] = None,
+        cache_escritorios: Optional[bool] = None,
+        **opcoes
+    ):
+        """
+        Inicializa o pool
+
+        Args:
+            config: Instância de NiboSettings. Se None, usa NiboSettings.compartilhado().
+            transporte: Transporte a compartilhar. Se None, cria um novo.
+            cache_escritorios: Repassado ao cliente Nibo Obrigações (escritório
+                               padrão em cache_dir; None segue a configuração)
+            **opcoes: Opções repassadas a todos os clientes (ex: retry_policy, rate_limiter).
+                      Por padrão os clientes compartilham um Coalescedor.
+        """
+        self.config = config or NiboSettings.compartilhado()
+        self.transporte = transporte or Transporte(self.config)
+        opcoes.setdefault("coalescedor", Coalescedor())
+        self.opcoes = opcoes
+        self.cache_escritorios = cache_escritorios
+        self._lock = threading.Lock()
+        self._empresas: Dict[Tuple[Optional[str], Optional[str]], NiboEmpresaClient] = {}
+        self._obrigacoes: Optional[NiboObrigacoesClient] = None
+
+    def empresa(
+        self,
+        organizacao_id: Optional[str] = None,
+        organizacao_codigo: Optional[str] = None
+    ) -> NiboEmpresaClient:
+        """
+        Retorna o cliente Nibo Empresa de uma organização (criando se necessário)
+
+        Args:
+            organizacao_id: ID da organização (ex: "org_123")
+            organizacao_codigo: Código simplificado da organização (ex: "empresa_principal")
+
+        Returns:
+            Cliente em cache para a organização
+
+        Raises:
+            ValueError: Se nenhum identificador de organização for fornecido
+        """
+        chave = (organizacao_id, organizacao_codigo)
+        with self._lock:
+            client = self._empresas.get(chave)
+            if client is None:
+                client = NiboEmpresaClient(
+                    self.config,
+                    organizacao_id=organizacao_id,
+                    organizacao_codigo=organizacao_codigo,
+                    transporte=self.transporte,
+                    **self.opcoes
+                )
+                self._empresas[chave] = client
+            return client
+
+    def obrigacoes(self) -> NiboObrigacoesClient:
+        """
+        Retorna o cliente Nibo Obrigações (criando se necessário)
+
+        Returns:
+            Cliente em cache
+        """
+        with self._lock:
+            if self._obrigacoes is None:
+                self._obrigacoes = NiboObrigacoesClient(
+                    self.config,
+                    cache_escritorios=self.cache_escritorios,
+                    transporte=self.transporte,
+                    **self.opcoes
+                )
+            return self._obrigacoes
+
+    def limpar(self):
+        """Descarta os clientes em cache (as conexões do transporte são mantidas)"""
+        with self._lock:
+            self._empresas.clear()
+            self._obrigacoes = None
+
+    def close(self):
+        """Descarta os clientes e fecha as conexões do transporte"""
+        self.limpar()
+        self.transporte.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+_pool_padrao: Optional[NiboClientPool] = None
+_pool_padrao_lock = threading.Lock()
+
+
+def pool_padrao() -> NiboClientPool:
+    """
+    Retorna o pool de clientes do processo (criado na primeira chamada)
+
+    Usado pelos comandos da CLI para que chamadas sucessivas reaproveitem
+    configuração, clientes e conexões.
+
+    Returns:
+        NiboClientPool compartilhado pelo processo
+    """
+    global _pool_padrao
+    with _pool_padrao_lock:
+        if _pool_padrao is None:
+            _pool_padrao = NiboClientPool()
+        return _pool_padrao
+
+
+def configurar_pool_padrao(config: Optional[NiboSettings] = None, **opcoes) -> NiboClientPool:
+    """
+    Substitui o pool do processo por um novo com as opções informadas
+
+    Args:
+        config: Instância de NiboSettings (padrão: NiboSettings.compartilhado())
+        **opcoes: Opções repassadas a NiboClientPool (ex: response_cache, retry_policy)
+
+    Returns:
+        Novo NiboClientPool compartilhado pelo processo
+    """
+    global _pool_padrao
+    with _pool_padrao_lock:
+        if _pool_padrao is not None:
+            _pool_padrao.close()
+        _pool_padrao = NiboClientPool(config, **opcoes)
+        return _pool_padrao
+
+
+def configurar_cache_cli(sem_cache: bool = False, atualizar: bool = False) -> NiboClientPool:
+    """
+    Configura o pool da CLI com o cache persistente de respostas
+
+    Comandos executados em sequência (ex: num script) passam a reaproveitar
+    organizações, categorias, escritórios e demais dados de referência já
+    consultados, até o TTL de cada endpoint expirar.
+
+    Args:
+        sem_cache: Se True (--no-cache), não lê nem grava o cache (inclusive
+                   o do escritório padrão do Nibo Obrigações)
+        atualizar: Se True (--refresh), ignora entradas válidas e regrava o cache
+
+    Returns:
+        NiboClientPool compartilhado pelo processo
+    """
+    config = NiboSettings.compartilhado()
+    if sem_cache:
+        return configurar_pool_padrao(config, cache_escritorios=False)
+    if not config.cache_habilitado:
+        return configurar_pool_padrao(config)
+    try:
+        cache = cache_persistente(config, forcar_atualizacao=atualizar)
+    except OSError:
+        # Diretório de cache inacessível: segue sem cache
+        return configurar_pool_padrao(config)
+    return configurar_pool_padrao(config, response_cache=cache)
@@ -4,7 +4,7 @@ Sistema de configuração para a API Nibo
 import os
 import warnings
 from pathlib import Path
-from typing import Optional, Dict, Union
+from typing import Optional, Dict, Tuple, Union
 
 try:
     from cryptography.fernet import Fernet
@@ -16,71 +16,291 @@ try:
 except ImportError:
     CRYPTOGRAPHY_AVAILABLE = False
 
+import copy
+import hashlib
 import json
+import threading
+import time
+
+
+# Parâmetros da derivação de chave (PBKDF2) usada nos tokens criptografados
+_PBKDF2_SALT = b'nibo_api_salt'  # Salt fixo (em produção, usar salt único por token)
+_PBKDF2_ITERACOES = 100000
+
+# Cache do processo: chave Fernet derivada por chave de criptografia e
+# tokens já descriptografados por (chave, texto cifrado). As chaves do
+# cache usam um hash da chave de criptografia, nunca o valor original.
+_cache_cripto_lock = threading.Lock()
+_cache_fernet: Dict[str, "Fernet"] = {}
+_cache_tokens: Dict[Tuple[str, str], str] = {}
+
+
+def _impressao_chave(encryption_key: str) -> str:
+    """Hash usado para identificar uma chave de criptografia no cache"""
+    return hashlib.sha256(encryption_key.encode()).hexdigest()
+
+
+def _obter_fernet(encryption_key: str) -> "Fernet":
+    """
+    Deriva (uma única vez por processo) a chave Fernet a partir da chave de criptografia
+
+    Args:
+        encryption_key: Valor de NIBO_ENCRYPTION_KEY
+
+    Returns:
+        Instância de Fernet pronta para uso
+    """
+    impressao = _impressao_chave(encryption_key)
+    with _cache_cripto_lock:
+        fernet = _cache_fernet.get(impressao)
+    if fernet is not None:
+        return fernet
+
+    # Deriva chave da senha usando PBKDF2 (custo proposital: 100 mil iterações)
+    kdf = PBKDF2HMAC(
+        algorithm=hashes.SHA256(),
+        length=32,
+        salt=_PBKDF2_SALT,
+        iterations=_PBKDF2_ITERACOES,
+        backend=default_backend()
+    )
+    key = base64.urlsafe_b64encode(kdf.derive(encryption_key.encode()))
+    fernet = Fernet(key)
+
+    with _cache_cripto_lock:
+        return _cache_fernet.setdefault(impressao, fernet)
+
+
+def criptografar_token(token: str, encryption_key: Optional[str] = None) -> str:
+    """
+    Criptografa um token no formato aceito pelo settings.json ("encrypted:...")
+
+    Args:
+        token: Token em texto plano
+        encryption_key: Chave de criptografia (padrão: NIBO_ENCRYPTION_KEY)
+
+    Returns:
+        Token criptografado com prefixo "encrypted:"
+
+    Raises:
+        ValueError: Se criptografia não estiver disponível ou chave não fornecida
+    """
+    if not CRYPTOGRAPHY_AVAILABLE:
+        raise ValueError(
+            "Biblioteca cryptography não está instalada. "
+            "Instale com: pip install cryptography"
+        )
+    encryption_key = encryption_key or os.getenv("NIBO_ENCRYPTION_KEY")
+    if not encryption_key:
+        raise ValueError("Informe encryption_key ou defina NIBO_ENCRYPTION_KEY.")
+    return "encrypted:" + _obter_fernet(encryption_key).encrypt(token.encode()).decode()
+
+
+def limpar_cache_criptografia():
+    """
+    Descarta as chaves derivadas e os tokens descriptografados em cache
+
+    Use após trocar NIBO_ENCRYPTION_KEY ou para remover tokens da memória.
+    """
+    with _cache_cripto_lock:
+        _cache_fernet.clear()
+        _cache_tokens.clear()
+
+
+# Cache do processo para arquivos JSON de configuração: caminho ->
+# (assinatura (mtime_ns, tamanho), conteúdo). O arquivo só é relido quando
+# a assinatura muda.
+_cache_json_lock = threading.Lock()
+_cache_json: Dict[str, Tuple[Tuple[int, int], dict]] = {}
+
+# Instâncias compartilhadas de NiboSettings por (settings.json, tokens_path)
+_instancias_lock = threading.Lock()
+_instancias: Dict[Tuple[str, Optional[str]], "NiboSettings"] = {}
+
+
+def _assinatura_arquivo(caminho: Optional[Path]) -> Optional[Tuple[int, int]]:
+    """Retorna (mtime_ns, tamanho) do arquivo, ou None se não existir"""
+    if caminho is None:
+        return None
+    try:
+        info = caminho.stat()
+    except OSError:
+        return None
+    return (info.st_mtime_ns, info.st_size)
+
+
+def _ler_json_cacheado(caminho: Path) -> Tuple[dict, bool]:
+    """
+    Lê um arquivo JSON usando o cache do processo
+
+    Args:
+        caminho: Caminho do arquivo
+
+    Returns:
+        Tupla (conteúdo, relido), onde relido indica se o arquivo foi
+        efetivamente lido e interpretado nesta chamada. O conteúdo é uma
+        cópia: alterá-lo não afeta o cache nem as outras instâncias
+
+    Raises:
+        json.JSONDecodeError, IOError: Se o arquivo não puder ser lido
+    """
+    chave = str(caminho)
+    assinatura = _assinatura_arquivo(caminho)
+    with _cache_json_lock:
+        entrada = _cache_json.get(chave)
+        if entrada is not None and assinatura is not None and entrada[0] == assinatura:
+            return copy.deepcopy(entrada[1]), False
+
+    with open(caminho, 'r', encoding='utf-8') as f:
+        dados = json.load(f)
+
+    with _cache_json_lock:
+        if assinatura is not None:
+            _cache_json[chave] = (assinatura, copy.deepcopy(dados))
+    return dados, True
+
+
+def limpar_cache_settings():
+    """Descarta os arquivos de configuração em cache e as instâncias compartilhadas"""
+    with _cache_json_lock:
+        _cache_json.clear()
+    with _instancias_lock:
+        _instancias.clear()
 
 
 class NiboSettings:
     """Gerencia as configurações da API Nibo usando settings.json"""
     
-    def __init__(self, tokens_path: Optional[str] = None):
+    def __init__(self, tokens_path: Optional[str] = None, intervalo_verificacao: float = 2.0):
         """
         Inicializa a configuração
         
         Args:
             tokens_path: Caminho para o arquivo tokens.json (opcional). Se None, tenta
                         usar NIBO_TOKENS_FILE ou tokens_path do settings.json.
+            intervalo_verificacao: Intervalo mínimo, em segundos, entre verificações
+                                   de alteração dos arquivos (ver verificar_alteracoes)
+        """
+        self._tokens_path_informado = tokens_path
+        self.intervalo_verificacao = intervalo_verificacao
+        self.versao = 0
+        self._lock = threading.RLock()
+        self._ultima_verificacao = time.monotonic()
+        self._carregar()
+    
+    @classmethod
+    def compartilhado(cls, tokens_path: Optional[str] = None) -> "NiboSettings":
+        """
+        Retorna a instância de configuração compartilhada pelo processo
+        
+        Há uma instância por par (settings.json, tokens_path). Os arquivos só
+        são relidos quando mudam (ver verificar_alteracoes).
+        
+        Args:
+            tokens_path: Caminho para o arquivo tokens.json (opcional)
+            
+        Returns:
+            Instância de NiboSettings
         """
+        chave = (str(cls._caminho_settings()), str(tokens_path) if tokens_path else None)
+        with _instancias_lock:
+            instancia = _instancias.get(chave)
+            if instancia is None:
+                instancia = cls(tokens_path=tokens_path)
+                _instancias[chave] = instancia
+            return instancia
+    
+    def _carregar(self):
+        """Carrega settings.json e o arquivo de tokens (usando o cache do processo)"""
         # Carrega configurações do settings.json
-        self._settings_data = self._load_settings_json()
+        self._settings_data, settings_relido = self._load_settings_json()
         
         # Carrega tokens de arquivo separado se especificado
+        tokens_path = self._tokens_path_informado
         if tokens_path is None:
             tokens_path = self._get_tokens_path()
         
+        tokens_relido = False
         if tokens_path:
             self.tokens_path = Path(tokens_path)
-            self._tokens_config = self._load_tokens_config()
+            self._tokens_config, tokens_relido = self._load_tokens_config()
         else:
             self.tokens_path = None
             self._tokens_config = {}
         
         # Valida permissões de arquivo de tokens se existir
-        if self.tokens_path:
+        if self.tokens_path and tokens_relido:
             self._validate_file_permissions()
         
         # Emite warning se tokens estiverem em texto plano
-        self._warn_plaintext_tokens()
+        # (apenas quando o conteúdo foi relido, não a cada instância)
+        if settings_relido or tokens_relido:
+            self._warn_plaintext_tokens()
+        
+        self._assinatura = self._assinatura_arquivos()
+    
+    def _assinatura_arquivos(self) -> tuple:
+        """Assinatura (mtime_ns, tamanho) de settings.json e do arquivo de tokens"""
+        return (
+            _assinatura_arquivo(self._caminho_settings()),
+            _assinatura_arquivo(self.tokens_path)
+        )
     
-    def _load_settings_json(self) -> dict:
+    def verificar_alteracoes(self, forcar: bool = False) -> int:
+        """
+        Recarrega a configuração se settings.json ou o arquivo de tokens mudaram
+        
+        A verificação (um stat por arquivo) é feita no máximo uma vez a cada
+        intervalo_verificacao segundos. Processos longos usam a versão
+        retornada para saber quando reaplicar tokens rotacionados.
+        
+        Args:
+            forcar: Se True, verifica mesmo antes do intervalo
+            
+        Returns:
+            Versão atual da configuração (incrementada a cada recarga)
+        """
+        with self._lock:
+            agora = time.monotonic()
+            if not forcar and agora - self._ultima_verificacao < self.intervalo_verificacao:
+                return self.versao
+            self._ultima_verificacao = agora
+            if self._assinatura_arquivos() != self._assinatura:
+                self._carregar()
+                self.versao += 1
+            return self.versao
+    
+    @staticmethod
+    def _caminho_settings() -> Path:
+        """Caminho do settings.json na raiz do projeto"""
+        return Path(__file__).parent.parent / "settings.json"
+    
+    def _load_settings_json(self) -> Tuple[dict, bool]:
         """Carrega configurações do settings.json na raiz do projeto"""
-        root_dir = Path(__file__).parent.parent
-        settings_file = root_dir / "settings.json"
+        settings_file = self._caminho_settings()
         
         if not settings_file.exists():
             raise FileNotFoundError(
-                f"Arquivo settings.json não encontrado em {root_dir}. "
+                f"Arquivo settings.json não encontrado em {settings_file.parent}. "
                 "Certifique-se de que o arquivo settings.json existe na raiz do projeto."
             )
         
         try:
-            with open(settings_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return _ler_json_cacheado(settings_file)
         except json.JSONDecodeError as e:
             raise ValueError(f"Erro ao ler settings.json: {e}")
         except IOError as e:
             raise IOError(f"Erro ao abrir settings.json: {e}")
     
-    def _load_tokens_config(self) -> dict:
+    def _load_tokens_config(self) -> Tuple[dict, bool]:
         """Carrega configuração de tokens de arquivo separado"""
         if self.tokens_path and self.tokens_path.exists():
             try:
-                import json
-                with open(self.tokens_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                return _ler_json_cacheado(self.tokens_path)
             except (json.JSONDecodeError, IOError) as e:
                 warnings.warn(f"Erro ao carregar tokens.json: {e}")
-                return {}
-        return {}
+                return {}, False
+        return {}, False
     
     def _validate_file_permissions(self):
         """Valida permissões de arquivo e emite warning se necessário"""
@@ -171,6 +391,9 @@ class NiboSettings:
         """
         Descriptografa um token criptografado
         
+        A chave derivada (PBKDF2) e o token descriptografado ficam no cache do
+        processo; use limpar_cache_criptografia() para descartá-los.
+        
         Args:
             encrypted_token: Token com prefixo "encrypted:"
             
@@ -196,26 +419,26 @@ class NiboSettings:
                 "Configure a variável de ambiente NIBO_ENCRYPTION_KEY com a chave de criptografia."
             )
         
+        # Remove prefixo "encrypted:"
+        encrypted_data = encrypted_token[10:]
+        chave_cache = (_impressao_chave(encryption_key), encrypted_data)
+        with _cache_cripto_lock:
+            decrypted = _cache_tokens.get(chave_cache)
+        if decrypted is not None:
+            return decrypted
+        
         try:
-            # Remove prefixo "encrypted:"
-            encrypted_data = encrypted_token[10:]
-            
-            # Deriva chave da senha usando PBKDF2
-            kdf = PBKDF2HMAC(
-                algorithm=hashes.SHA256(),
-                length=32,
-                salt=b'nibo_api_salt',  # Salt fixo (em produção, usar salt único por token)
-                iterations=100000,
-                backend=default_backend()
-            )
-            key = base64.urlsafe_b64encode(kdf.derive(encryption_key.encode()))
-            fernet = Fernet(key)
+            # A derivação PBKDF2 é feita uma vez por chave e reaproveitada
+            fernet = _obter_fernet(encryption_key)
             
             # Descriptografa
-            decrypted = fernet.decrypt(encrypted_data.encode())
-            return decrypted.decode()
+            decrypted = fernet.decrypt(encrypted_data.encode()).decode()
         except Exception as e:
             raise ValueError(f"Erro ao descriptografar token: {e}")
+        
+        with _cache_cripto_lock:
+            _cache_tokens[chave_cache] = decrypted
+        return decrypted
     
     def _mask_token(self, token: str) -> str:
         """
@@ -376,6 +599,22 @@ class NiboSettings:
             or self._settings_data.get("obrigacoes_user_id")
         )
 
+    @property
+    def obrigacoes_accounting_firm_id(self) -> Optional[str]:
+        """
+        Escritório contábil padrão da API Nibo Obrigações (opcional)
+        
+        Usado quando uma operação não informa accounting_firm_id. Se não
+        configurado, o cliente usa o primeiro escritório retornado pela API.
+        
+        Returns:
+            UUID do escritório (prioridade: variável de ambiente > settings.json)
+        """
+        return (
+            os.getenv("NIBO_OBRIGACOES_ACCOUNTING_FIRM_ID")
+            or self._settings_data.get("obrigacoes_accounting_firm_id")
+        )
+
     @property
     def ca_bundle_path(self) -> Optional[str]:
         """
@@ -412,3 +651,113 @@ class NiboSettings:
 
         # Valor do settings.json; fallback seguro em True
         return self._settings_data.get("ssl_verify", True)
+
+    def _get_numero(self, env_var: str, chave: str, padrao, tipo=float):
+        """
+        Lê uma opção numérica (prioridade: variável de ambiente > settings.json > padrão)
+
+        Valores vazios, "none" ou null no settings.json resultam em None.
+        """
+        valor = os.getenv(env_var)
+        if valor is None:
+            valor = self._settings_data.get(chave, padrao)
+        if valor is None or (isinstance(valor, str) and valor.strip().lower() in ("", "none", "null")):
+            return None
+        try:
+            return tipo(valor)
+        except (TypeError, ValueError):
+            raise ValueError(f"Valor inválido para {chave}: {valor!r}")
+
+    @property
+    def pool_connections(self) -> int:
+        """
+        Quantidade de pools de conexão (hosts) mantidos pela sessão HTTP
+
+        Returns:
+            Valor de NIBO_POOL_CONNECTIONS ou pool_connections (padrão: 10)
+        """
+        return self._get_numero("NIBO_POOL_CONNECTIONS", "pool_connections", 10, int) or 10
+
+    @property
+    def pool_maxsize(self) -> int:
+        """
+        Máximo de conexões reaproveitadas por host
+
+        Deve ser pelo menos o número de threads que usam o mesmo cliente,
+        caso contrário conexões excedentes são descartadas.
+
+        Returns:
+            Valor de NIBO_POOL_MAXSIZE ou pool_maxsize (padrão: 32)
+        """
+        return self._get_numero("NIBO_POOL_MAXSIZE", "pool_maxsize", 32, int) or 32
+
+    @property
+    def connect_timeout(self) -> Optional[float]:
+        """
+        Timeout de conexão em segundos
+
+        Returns:
+            Valor de NIBO_CONNECT_TIMEOUT ou connect_timeout (padrão: 10; None = sem timeout)
+        """
+        return self._get_numero("NIBO_CONNECT_TIMEOUT", "connect_timeout", 10.0)
+
+    @property
+    def read_timeout(self) -> Optional[float]:
+        """
+        Timeout de leitura em segundos (tempo máximo sem receber dados)
+
+        Returns:
+            Valor de NIBO_READ_TIMEOUT ou read_timeout (padrão: 60; None = sem timeout)
+        """
+        return self._get_numero("NIBO_READ_TIMEOUT", "read_timeout", 60.0)
+
+    @property
+    def tcp_keepalive(self) -> bool:
+        """
+        Habilita TCP keep-alive nas conexões (detecta conexões mortas em pools ociosos)
+
+        Returns:
+            Valor de NIBO_TCP_KEEPALIVE ou tcp_keepalive (padrão: True)
+        """
+        env_valor = os.getenv("NIBO_TCP_KEEPALIVE")
+        if env_valor is not None:
+            return env_valor.strip().lower() in ("1", "true", "yes", "on")
+        return bool(self._settings_data.get("tcp_keepalive", True))
+
+    @property
+    def tcp_keepalive_idle(self) -> int:
+        """
+        Segundos de inatividade antes do primeiro pacote de keep-alive
+
+        Returns:
+            Valor de NIBO_TCP_KEEPALIVE_IDLE ou tcp_keepalive_idle (padrão: 60)
+        """
+        return self._get_numero("NIBO_TCP_KEEPALIVE_IDLE", "tcp_keepalive_idle", 60, int) or 60
+
+    @property
+    def cache_dir(self) -> str:
+        """
+        Diretório do cache persistente de respostas (usado pela CLI)
+
+        Returns:
+            Valor de NIBO_CACHE_DIR ou cache_dir (padrão: $XDG_CACHE_HOME/nibo-api,
+            ou ~/.cache/nibo-api)
+        """
+        diretorio = os.getenv("NIBO_CACHE_DIR") or self._settings_data.get("cache_dir")
+        if not diretorio:
+            base = os.getenv("XDG_CACHE_HOME") or os.path.join("~", ".cache")
+            diretorio = os.path.join(base, "nibo-api")
+        return os.path.expanduser(diretorio)
+
+    @property
+    def cache_habilitado(self) -> bool:
+        """
+        Habilita o cache persistente nos comandos da CLI
+
+        Returns:
+            Valor de NIBO_CACHE ou cache (padrão: True)
+        """
+        env_valor = os.getenv("NIBO_CACHE")
+        if env_valor is not None:
+            return env_valor.strip().lower() in ("1", "true", "yes", "on")
+        return bool(self._settings_data.get("cache", True))
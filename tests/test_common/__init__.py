@@ -0,0 +1,4 @@
+"""
+Testes dos componentes comuns (sem acesso à API)
+"""
+
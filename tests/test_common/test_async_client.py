@@ -0,0 +1,216 @@
+"""
+Testes para os clientes assíncronos usando um servidor aiohttp local
+"""
+import asyncio
+import functools
+import unittest
+
+from nibo_api.settings import NiboSettings
+from nibo_api.common.async_client import AIOHTTP_AVAILABLE, AsyncBaseClient
+from nibo_api.common.exceptions import NiboNotFoundError
+from nibo_api.common.rate_limit import RateLimiter
+from nibo_api.common.retry import RetryPolicy
+from nibo_api.common.cache import ResponseCache
+from nibo_api.common.modelos_compactos import CategoriaCompacta
+
+if AIOHTTP_AVAILABLE:
+    from aiohttp import web
+    from aiohttp.test_utils import TestServer
+    from nibo_api.empresa.client import AsyncNiboEmpresaClient
+
+TOTAL_ITENS = 250
+
+
+def _no_laco(teste):
+    """Executa um teste assíncrono no laço de eventos do caso de teste"""
+    @functools.wraps(teste)
+    def executar(self):
+        self.loop.run_until_complete(teste(self))
+    return executar
+
+
+@unittest.skipUnless(AIOHTTP_AVAILABLE, "aiohttp não instalado")
+class TestAsyncClient(unittest.TestCase):
+    """
+    Testes para AsyncBaseClient e AsyncNiboEmpresaClient contra um stub local
+
+    Usa um laço de eventos por teste com run_until_complete, em vez de
+    IsolatedAsyncioTestCase, que só existe a partir do Python 3.8.
+    """
+
+    def setUp(self):
+        """Cria o laço de eventos do teste e sobe o servidor stub"""
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_until_complete(self.asyncSetUp())
+
+    def tearDown(self):
+        """Derruba o servidor stub e fecha o laço de eventos"""
+        try:
+            self.loop.run_until_complete(self.asyncTearDown())
+        finally:
+            self.loop.close()
+            asyncio.set_event_loop(None)
+
+    async def asyncSetUp(self):
+        """Sobe o servidor stub e cria o cliente"""
+        self.requisicoes = []
+        self.em_andamento = 0
+        self.pico = 0
+        self.falhas_restantes = 0
+
+        app = web.Application()
+        app.router.add_get("/itens", self._itens)
+        app.router.add_get("/schedules/categories", self._itens)
+        app.router.add_get("/instavel", self._instavel)
+        app.router.add_get("/inexistente", self._inexistente)
+        self.servidor = TestServer(app)
+        await self.servidor.start_server()
+        self.base_url = str(self.servidor.make_url("")).rstrip("/")
+
+    async def asyncTearDown(self):
+        """Derruba o servidor stub"""
+        await self.servidor.close()
+
+    async def _itens(self, request):
+        self.requisicoes.append(request)
+        self.em_andamento += 1
+        self.pico = max(self.pico, self.em_andamento)
+        try:
+            await asyncio.sleep(0.01)
+            top = int(request.query.get("$top", TOTAL_ITENS))
+            skip = int(request.query.get("$skip", 0))
+            items = [{"id": i} for i in range(skip, min(skip + top, TOTAL_ITENS))]
+            return web.json_response({"items": items, "count": TOTAL_ITENS})
+        finally:
+            self.em_andamento -= 1
+
+    async def _instavel(self, request):
+        self.requisicoes.append(request)
+        if self.falhas_restantes > 0:
+            self.falhas_restantes -= 1
+            return web.Response(status=503, text="indisponível")
+        return web.json_response({"ok": True})
+
+    async def _inexistente(self, request):
+        return web.Response(status=404, text="não existe")
+
+    def _client(self, **opcoes) -> AsyncBaseClient:
+        return AsyncBaseClient(NiboSettings(), base_url=self.base_url, **opcoes)
+
+    @_no_laco
+    async def test_get_com_odata(self):
+        """Testa GET assíncrono com parâmetros OData"""
+        async with self._client() as client:
+            resultado = await client.get("/itens", odata_top=3, odata_skip=5)
+        self.assertEqual([item["id"] for item in resultado["items"]], [5, 6, 7])
+        self.assertEqual(self.requisicoes[0].query["$top"], "3")
+
+    @_no_laco
+    async def test_erros_http(self):
+        """Testa que status de erro geram as mesmas exceções do cliente síncrono"""
+        async with self._client() as client:
+            with self.assertRaises(NiboNotFoundError):
+                await client.get("/inexistente")
+
+    @_no_laco
+    async def test_paginacao_sequencial(self):
+        """Testa o iterador assíncrono de páginas"""
+        async with self._client() as client:
+            ids = [item["id"] async for item in client.paginar("/itens", page_size=100)]
+        self.assertEqual(ids, list(range(TOTAL_ITENS)))
+        self.assertEqual(len(self.requisicoes), 3)
+
+    @_no_laco
+    async def test_paginacao_paralela(self):
+        """Testa paginação concorrente mantendo a ordem"""
+        async with self._client() as client:
+            ids = [
+                item["id"]
+                async for item in client.paginar("/itens", page_size=10, max_workers=8)
+            ]
+        self.assertEqual(ids, list(range(TOTAL_ITENS)))
+        self.assertGreater(self.pico, 1)
+        self.assertLessEqual(self.pico, 8)
+
+    @_no_laco
+    async def test_semaforo_limita_concorrencia(self):
+        """Testa que max_concorrencia limita requisições simultâneas"""
+        async with self._client(max_concorrencia=4) as client:
+            await asyncio.gather(*[client.get("/itens", odata_top=1, odata_skip=i) for i in range(40)])
+        self.assertEqual(len(self.requisicoes), 40)
+        self.assertLessEqual(self.pico, 4)
+
+    @_no_laco
+    async def test_retry_e_rate_limit(self):
+        """Testa que retry_policy e rate_limiter também valem no modo assíncrono"""
+        self.falhas_restantes = 2
+        politica = RetryPolicy(max_tentativas=3, backoff_base=0.001, jitter=False)
+        limitador = RateLimiter(requisicoes_por_segundo=1000, rajada=10)
+        async with self._client(retry_policy=politica, rate_limiter=limitador) as client:
+            resultado = await client.get("/instavel")
+        self.assertEqual(resultado, {"ok": True})
+        self.assertEqual(politica.metricas()["repeticoes"], 2)
+
+    @_no_laco
+    async def test_cache_de_respostas(self):
+        """Testa que o cache de respostas também vale no modo assíncrono"""
+        cache = ResponseCache()
+        async with self._client(response_cache=cache) as client:
+            primeiro = await client.get("/schedules/categories")
+            segundo = await client.get("/schedules/categories")
+        self.assertEqual(primeiro, segundo)
+        self.assertEqual(len(self.requisicoes), 1)
+        self.assertEqual(cache.metricas()["acertos"], 1)
+
+    @_no_laco
+    async def test_gets_identicos_coalescidos(self):
+        """Testa que GETs idênticos simultâneos compartilham uma requisição"""
+        async with self._client() as client:
+            resultados = await asyncio.gather(*[client.get("/itens", odata_top=1) for _ in range(20)])
+        self.assertEqual(len(self.requisicoes), 1)
+        self.assertTrue(all(r == resultados[0] for r in resultados))
+        self.assertIsNot(resultados[0], resultados[1])
+
+    @_no_laco
+    async def test_paginacao_stream(self):
+        """Testa get/paginar com stream=True no modo assíncrono"""
+        async with self._client() as client:
+            resposta = await client.get("/itens", odata_top=5, stream=True)
+            primeiros = [item["id"] async for item in resposta]
+            ids = [item["id"] async for item in client.paginar("/itens", page_size=100, stream=True)]
+            with self.assertRaises(NiboNotFoundError):
+                await client.get("/inexistente", stream=True)
+        self.assertEqual(primeiros, [0, 1, 2, 3, 4])
+        self.assertEqual(resposta.metadados["count"], TOTAL_ITENS)
+        self.assertEqual(ids, list(range(TOTAL_ITENS)))
+
+    @_no_laco
+    async def test_interfaces_compartilhadas(self):
+        """Testa que as interfaces do cliente síncrono funcionam no assíncrono"""
+        client = AsyncNiboEmpresaClient(NiboSettings(), organizacao_codigo="NC")
+        client.base_url = self.base_url
+        async with client:
+            resultado = await client.categorias.listar(odata_top=2)
+            ids = [item["id"] async for item in client.categorias.iter_listar(page_size=100)]
+        self.assertEqual(len(resultado["items"]), 2)
+        self.assertEqual(ids, list(range(TOTAL_ITENS)))
+        self.assertIn("ApiToken", self.requisicoes[0].headers)
+
+    @_no_laco
+    async def test_modo_tipado(self):
+        """Testa typed=True no cliente assíncrono, inclusive em stream"""
+        client = AsyncNiboEmpresaClient(NiboSettings(), organizacao_codigo="NC", typed=True)
+        client.base_url = self.base_url
+        async with client:
+            pagina = await client.categorias.listar(odata_top=2)
+            ids = [
+                item.dados["id"]
+                async for item in client.categorias.iter_listar(page_size=100, stream=True)
+            ]
+        self.assertIsInstance(pagina["items"][0], CategoriaCompacta)
+        self.assertEqual(ids, list(range(TOTAL_ITENS)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,202 @@
+"""
+Testes para o cache de respostas GET (TTL, revalidação condicional e LRU)
+"""
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from nibo_api.common.client import BaseClient
+from nibo_api.common.cache import (
+    ResponseCache,
+    BackendMemoria,
+    BackendDisco,
+    BackendSQLite,
+    EntradaCache,
+    cache_persistente
+)
+from nibo_api import pool as modulo_pool
+from nibo_api.settings import NiboSettings
+from tests.test_common.util import resposta
+
+
+class TestResponseCache(unittest.TestCase):
+    """Testes para ResponseCache integrado ao BaseClient"""
+
+    def _cliente(self, cache: ResponseCache, token: str = "TOKEN-A") -> BaseClient:
+        client = BaseClient(base_url="https://api.teste", response_cache=cache)
+        client.headers["ApiToken"] = token
+        client.session = mock.Mock()
+        client.session.request = mock.Mock(return_value=resposta(
+            200, b'{"items": [1, 2]}', {"ETag": '"v1"'}
+        ))
+        return client
+
+    def test_acerto_dentro_do_ttl(self):
+        """Testa que uma segunda leitura dentro do TTL não chega à API"""
+        cache = ResponseCache()
+        client = self._cliente(cache)
+
+        self.assertEqual(client.get("/banks"), {"items": [1, 2]})
+        self.assertEqual(client.get("/banks"), {"items": [1, 2]})
+
+        self.assertEqual(client.session.request.call_count, 1)
+        self.assertEqual(cache.metricas(), {"acertos": 1, "revalidacoes": 0, "faltas": 1})
+
+    def test_revalidacao_com_etag(self):
+        """Testa que uma entrada expirada é revalidada e um 304 reaproveita o corpo"""
+        cache = ResponseCache(ttls={"/costcenters": 0.01})
+        client = self._cliente(cache)
+        client.get("/costcenters")
+        time.sleep(0.02)
+
+        client.session.request.return_value = resposta(304, b"")
+        self.assertEqual(client.get("/costcenters"), {"items": [1, 2]})
+
+        headers = client.session.request.call_args.kwargs["headers"]
+        self.assertEqual(headers["If-None-Match"], '"v1"')
+        self.assertEqual(cache.metricas()["revalidacoes"], 1)
+
+    def test_endpoint_sem_ttl_nao_e_armazenado(self):
+        """Testa que endpoints fora da tabela de TTLs sempre vão à API"""
+        cache = ResponseCache()
+        client = self._cliente(cache)
+        client.get("/schedules/credit")
+        client.get("/schedules/credit")
+        self.assertEqual(client.session.request.call_count, 2)
+        self.assertEqual(len(cache.backend), 0)
+
+    def test_glob_de_endpoint(self):
+        """Testa padrões glob na tabela de TTLs"""
+        cache = ResponseCache()
+        self.assertEqual(cache.ttl_para("/accountingfirms/123/cnaes"), 86400)
+        self.assertIsNone(cache.ttl_para("/accountingfirms/123/customers"))
+        self.assertEqual(ResponseCache(ttl_padrao=5).ttl_para("/qualquer"), 5)
+
+    def test_tokens_nao_compartilham_entradas(self):
+        """Testa que organizações diferentes não leem o cache uma da outra"""
+        cache = ResponseCache()
+        self._cliente(cache, "TOKEN-A").get("/banks")
+        client_b = self._cliente(cache, "TOKEN-B")
+        client_b.get("/banks")
+        self.assertEqual(client_b.session.request.call_count, 1)
+        self.assertEqual(len(cache.backend), 2)
+
+    def test_forcar_atualizacao(self):
+        """Testa que forcar_atualizacao ignora entradas ainda válidas"""
+        cache = ResponseCache()
+        client = self._cliente(cache)
+        client.get("/banks")
+        cache.forcar_atualizacao = True
+        client.get("/banks")
+        self.assertEqual(client.session.request.call_count, 2)
+
+    def test_erros_nao_sao_armazenados(self):
+        """Testa que respostas de erro não entram no cache"""
+        cache = ResponseCache()
+        client = self._cliente(cache)
+        client.session.request.return_value = resposta(404, b"nao encontrado")
+        with self.assertRaises(Exception):
+            client.get("/banks")
+        self.assertEqual(len(cache.backend), 0)
+
+
+class TestBackends(unittest.TestCase):
+    """Testes para BackendMemoria e BackendDisco"""
+
+    def test_lru_limitado_por_bytes(self):
+        """Testa o despejo das entradas menos usadas ao passar do limite"""
+        backend = BackendMemoria(max_bytes=10)
+        backend.gravar("a", EntradaCache(texto="aaaa"))
+        backend.gravar("b", EntradaCache(texto="bbbb"))
+        backend.obter("a")
+        backend.gravar("c", EntradaCache(texto="cccc"))
+
+        self.assertIsNotNone(backend.obter("a"))
+        self.assertIsNone(backend.obter("b"))
+        self.assertIsNotNone(backend.obter("c"))
+
+    def test_disco_compartilhado_entre_instancias(self):
+        """Testa que dois caches sobre o mesmo diretório compartilham entradas"""
+        with tempfile.TemporaryDirectory() as diretorio:
+            primeiro = ResponseCache(backend=BackendDisco(diretorio))
+            consulta = primeiro.consultar("/banks", "https://api.teste/banks", "T")
+            consulta.armazenar(200, {"ETag": '"x"'}, '{"ok": true}')
+
+            segundo = ResponseCache(backend=BackendDisco(diretorio))
+            consulta = segundo.consultar("/banks", "https://api.teste/banks", "T")
+            self.assertTrue(consulta.fresca)
+            self.assertEqual(consulta.dados(), {"ok": True})
+            self.assertEqual(len(os.listdir(diretorio)), 1)
+
+
+class TestCachePersistente(unittest.TestCase):
+    """Testes para BackendSQLite e o cache persistente da CLI"""
+
+    def setUp(self):
+        """Cria um diretório de cache temporário"""
+        diretorio = tempfile.TemporaryDirectory()
+        self.addCleanup(diretorio.cleanup)
+        self.diretorio = diretorio.name
+        self.caminho = os.path.join(self.diretorio, "respostas.sqlite3")
+
+    def _backend(self, **opcoes) -> BackendSQLite:
+        backend = BackendSQLite(self.caminho, **opcoes)
+        self.addCleanup(backend.close)
+        return backend
+
+    def test_entradas_sobrevivem_ao_processo(self):
+        """Testa que uma nova instância (novo comando da CLI) lê o que a anterior gravou"""
+        primeiro = ResponseCache(backend=self._backend())
+        client = BaseClient(base_url="https://api.teste", response_cache=primeiro)
+        client.session = mock.Mock()
+        client.session.request = mock.Mock(return_value=resposta(200, b'{"items": ["a"]}'))
+        client.get("/schedules/categories")
+
+        segundo = ResponseCache(backend=self._backend())
+        client.response_cache = segundo
+        self.assertEqual(client.get("/schedules/categories"), {"items": ["a"]})
+        self.assertEqual(client.session.request.call_count, 1)
+
+    def test_lru_limitado_por_bytes(self):
+        """Testa o despejo das entradas acessadas há mais tempo"""
+        backend = self._backend(max_bytes=10)
+        backend.gravar("a", EntradaCache(texto="aaaa", expira_em=0))
+        time.sleep(0.01)
+        backend.gravar("b", EntradaCache(texto="bbbb", expira_em=0))
+        time.sleep(0.01)
+        backend.obter("a")
+        backend.gravar("c", EntradaCache(texto="cccc", expira_em=0))
+
+        self.assertIsNotNone(backend.obter("a"))
+        self.assertIsNone(backend.obter("b"))
+        self.assertEqual(len(backend), 2)
+
+    def test_cache_persistente_usa_diretorio_configurado(self):
+        """Testa NIBO_CACHE_DIR e a tabela de TTLs da CLI"""
+        with mock.patch.dict(os.environ, {"NIBO_CACHE_DIR": self.diretorio}):
+            cache = cache_persistente(NiboSettings())
+        self.addCleanup(cache.backend.close)
+        self.assertTrue(os.path.exists(self.caminho))
+        self.assertEqual(cache.ttl_para("/accountingfirms"), 3600)
+        self.assertEqual(cache.ttl_para("/organizations"), 3600)
+
+    def test_opcoes_da_cli(self):
+        """Testa --no-cache e --refresh no pool da CLI"""
+        self.addCleanup(setattr, modulo_pool, "_pool_padrao", None)
+        with mock.patch.dict(os.environ, {"NIBO_CACHE_DIR": self.diretorio}):
+            pool = modulo_pool.configurar_cache_cli()
+            self.assertIsInstance(pool.opcoes["response_cache"], ResponseCache)
+            self.assertFalse(pool.opcoes["response_cache"].forcar_atualizacao)
+
+            pool = modulo_pool.configurar_cache_cli(atualizar=True)
+            self.assertTrue(pool.opcoes["response_cache"].forcar_atualizacao)
+
+            pool = modulo_pool.configurar_cache_cli(sem_cache=True)
+            self.assertNotIn("response_cache", pool.opcoes)
+            self.assertIs(modulo_pool.pool_padrao(), pool)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+"""
+Testes para a coalescência de GETs idênticos em andamento
+"""
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import requests
+
+from nibo_api.common.client import BaseClient
+from nibo_api.common.coalescencia import Coalescedor, chave_requisicao
+from nibo_api.common.exceptions import NiboServerError
+
+
+class TestCoalescedor(unittest.TestCase):
+    """Testes para Coalescedor"""
+
+    def test_chamadas_simultaneas_compartilham_execucao(self):
+        """Testa que threads com a mesma chave recebem o resultado de uma única execução"""
+        coalescedor = Coalescedor()
+        chamadas = []
+        liberar = threading.Event()
+
+        def funcao():
+            chamadas.append(1)
+            liberar.wait(1)
+            return "resultado"
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            futuros = [executor.submit(coalescedor.executar, "chave", funcao) for _ in range(8)]
+            time.sleep(0.05)
+            liberar.set()
+            resultados = [f.result() for f in futuros]
+
+        self.assertEqual(resultados, ["resultado"] * 8)
+        self.assertEqual(len(chamadas), 1)
+        self.assertEqual(coalescedor.metricas(), {"executadas": 1, "coalescidas": 7})
+
+    def test_excecao_propagada_e_chave_liberada(self):
+        """Testa que o erro chega a todos e que a chave é liberada depois"""
+        coalescedor = Coalescedor()
+        with self.assertRaises(RuntimeError):
+            coalescedor.executar("chave", lambda: (_ for _ in ()).throw(RuntimeError("falha")))
+        self.assertEqual(coalescedor.executar("chave", lambda: 42), 42)
+
+    def test_chave_separa_tokens_e_headers(self):
+        """Testa que token e headers adicionais fazem parte da chave"""
+        url = "https://api.teste/a"
+        self.assertEqual(chave_requisicao(url, "T1"), chave_requisicao(url, "T1", {}))
+        self.assertNotEqual(chave_requisicao(url, "T1"), chave_requisicao(url, "T2"))
+        self.assertNotEqual(
+            chave_requisicao(url, "T1"), chave_requisicao(url, "T1", {"If-None-Match": '"x"'})
+        )
+
+
+class TestClienteCoalescencia(unittest.TestCase):
+    """Testes da coalescência no BaseClient"""
+
+    def setUp(self):
+        """Cria um cliente com requisições simuladas lentas"""
+        self.client = BaseClient(base_url="https://api.teste")
+        self.client.headers["ApiToken"] = "TOKEN"
+        self.client.session = mock.Mock()
+        self.client.session.request = mock.Mock(side_effect=self._responder)
+        self.status = 200
+
+    def _responder(self, metodo, url, **kwargs):
+        time.sleep(0.05)
+        response = requests.Response()
+        response.status_code = self.status
+        response._content = b'{"id": "abc"}' if self.status == 200 else b"falha"
+        return response
+
+    def _em_paralelo(self, funcao, quantidade=10):
+        with ThreadPoolExecutor(max_workers=quantidade) as executor:
+            futuros = [executor.submit(funcao) for _ in range(quantidade)]
+        return futuros
+
+    def test_gets_identicos_uma_requisicao(self):
+        """Testa que buscas simultâneas pelo mesmo recurso geram um único envio"""
+        futuros = self._em_paralelo(lambda: self.client.get("/schedules/categories/abc"))
+        resultados = [f.result() for f in futuros]
+
+        self.assertEqual(self.client.session.request.call_count, 1)
+        self.assertEqual(resultados, [{"id": "abc"}] * 10)
+        # Cada chamador recebe seu próprio objeto
+        self.assertIsNot(resultados[0], resultados[1])
+
+    def test_erro_entregue_a_todos(self):
+        """Testa que o erro da requisição compartilhada chega a todos os chamadores"""
+        self.status = 500
+        futuros = self._em_paralelo(lambda: self.client.get("/schedules/categories/abc"))
+        for futuro in futuros:
+            self.assertIsInstance(futuro.exception(), NiboServerError)
+        self.assertEqual(self.client.session.request.call_count, 1)
+
+    def test_urls_diferentes_nao_coalescem(self):
+        """Testa que recursos diferentes continuam em requisições separadas"""
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(lambda i: self.client.get(f"/customers/{i}"), range(4)))
+        self.assertEqual(self.client.session.request.call_count, 4)
+
+    def test_post_nao_coalesce(self):
+        """Testa que apenas GETs são coalescidos"""
+        self._em_paralelo(lambda: self.client.post("/customers", json_data={}), 3)
+        self.assertEqual(self.client.session.request.call_count, 3)
+
+    def test_desativado(self):
+        """Testa coalescedor=False"""
+        client = BaseClient(base_url="https://api.teste", coalescedor=False)
+        client.session = mock.Mock()
+        client.session.request = mock.Mock(side_effect=self._responder)
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            for _ in range(3):
+                executor.submit(client.get, "/a")
+        self.assertEqual(client.session.request.call_count, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
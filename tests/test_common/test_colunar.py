@@ -0,0 +1,113 @@
+"""
+Testes para os resultados em colunas (NumPy)
+"""
+import unittest
+from decimal import Decimal
+
+from nibo_api.common.colunar import NUMPY_AVAILABLE, ResultadoColunar
+from nibo_api.common.tipagem import MODELOS_EMPRESA, tipar_resposta
+
+CLIENTES = [("c1", "Cliente 1"), ("c2", "Cliente 2"), ("c3", "Cliente 3")]
+CATEGORIAS = [("k1", "Vendas"), ("k2", "Serviços")]
+
+
+def _pagamentos(quantidade: int = 12) -> dict:
+    items = []
+    for i in range(quantidade):
+        cliente = CLIENTES[i % 3]
+        categoria = CATEGORIAS[i % 2]
+        items.append({
+            "entryId": f"e{i}",
+            "value": 10.1 * (i + 1),
+            "date": f"2025-{i % 4 + 1:02d}-15T00:00:00",
+            "stakeholder": {"id": cliente[0], "name": cliente[1]},
+            "category": {"id": categoria[0], "name": categoria[1]},
+        })
+    return {"items": items, "count": quantidade}
+
+
+@unittest.skipUnless(NUMPY_AVAILABLE, "numpy não instalado")
+class TestResultadoColunar(unittest.TestCase):
+    """Testes para ResultadoColunar"""
+
+    def setUp(self):
+        """Monta o resultado a partir de uma página sintética"""
+        self.pagina = _pagamentos()
+        self.resultado = ResultadoColunar.de_itens(self.pagina)
+
+    def test_colunas(self):
+        """Testa os tipos das colunas e a codificação por dicionário"""
+        self.assertEqual(len(self.resultado), 12)
+        self.assertEqual(self.resultado.valor.dtype.name, "float64")
+        self.assertEqual(str(self.resultado.data.dtype), "datetime64[D]")
+        self.assertEqual(self.resultado.stakeholder.dtype.name, "int32")
+        self.assertEqual(len(self.resultado.stakeholders), 4)  # 3 + código 0 (sem stakeholder)
+
+    def test_total_igual_a_soma_dos_dicionarios(self):
+        """Testa o total contra a soma feita item a item"""
+        esperado = sum(float(item["value"]) for item in self.pagina["items"])
+        self.assertAlmostEqual(self.resultado.total(), esperado)
+        self.assertEqual(self.resultado.total(exato=True), Decimal("787.80"))
+
+    def test_filtros(self):
+        """Testa filtros por período, stakeholder, categoria e valor"""
+        primeiro_trimestre = self.resultado.filtrar(inicio="01/01/2025", fim="2025-03-31")
+        self.assertEqual(len(primeiro_trimestre), 9)
+
+        do_cliente = self.resultado.filtrar(stakeholder="c1", categoria=["k1", "k2"])
+        self.assertEqual([item["entryId"] for item in do_cliente.itens()], ["e0", "e3", "e6", "e9"])
+
+        combinado = self.resultado.filtrar(
+            mascara=self.resultado.valor > 50, stakeholder="c2", valor_maximo=100
+        )
+        self.assertEqual([item["entryId"] for item in combinado.itens()], ["e4", "e7"])
+        self.assertEqual(len(self.resultado.filtrar(stakeholder="inexistente")), 0)
+
+    def test_agrupamentos(self):
+        """Testa group-by por stakeholder, categoria e mês"""
+        por_cliente = self.resultado.agrupar("stakeholder")
+        self.assertEqual(por_cliente["c1"]["quantidade"], 4)
+        self.assertEqual(por_cliente["c1"]["nome"], "Cliente 1")
+        self.assertAlmostEqual(por_cliente["c3"]["total"], 10.1 * (3 + 6 + 9 + 12))
+        self.assertEqual(list(por_cliente), ["c3", "c2", "c1"])  # total decrescente
+
+        por_mes = self.resultado.agrupar("mes")
+        self.assertEqual(list(por_mes), ["2025-01", "2025-02", "2025-03", "2025-04"])
+        self.assertEqual(por_mes["2025-01"]["quantidade"], 3)
+
+        por_categoria = self.resultado.agrupar("categoria")
+        self.assertEqual(sum(g["quantidade"] for g in por_categoria.values()), 12)
+        with self.assertRaises(ValueError):
+            self.resultado.agrupar("dia")
+
+    def test_agendamentos_e_itens_incompletos(self):
+        """Testa dueDate, 'categories' e itens sem stakeholder/data"""
+        resultado = ResultadoColunar.de_itens([
+            {"value": 5, "dueDate": "2025-05-01T00:00:00",
+             "categories": [{"categoryId": "k9", "categoryName": "Outros"}]},
+            {"value": None, "dueDate": None},
+        ])
+        self.assertEqual(resultado.agrupar("categoria")["k9"]["nome"], "Outros")
+        self.assertEqual(resultado.agrupar("stakeholder")[None]["quantidade"], 2)
+        self.assertEqual(resultado.resumo(), {
+            "quantidade": 2, "total": 5.0, "inicio": "2025-05-01", "fim": "2025-05-01"
+        })
+
+    def test_itens_tipados(self):
+        """Testa itens de um cliente com typed=True (modelos compactos)"""
+        tipada = tipar_resposta(MODELOS_EMPRESA.modelo_para("/payments"), _pagamentos())
+        resultado = ResultadoColunar.de_itens(iter(tipada["items"]))
+        self.assertEqual(resultado.total(), self.resultado.total())
+        self.assertEqual(resultado.agrupar("stakeholder"), self.resultado.agrupar("stakeholder"))
+        self.assertEqual(resultado.itens(), self.pagina["items"])
+
+    def test_sem_itens_originais(self):
+        """Testa manter_itens=False"""
+        resultado = ResultadoColunar.de_itens(iter(self.pagina["items"]), manter_itens=False)
+        self.assertEqual(len(resultado), 12)
+        with self.assertRaises(ValueError):
+            resultado.itens()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+"""
+Testes para o cache de chaves derivadas e tokens descriptografados
+"""
+import os
+import unittest
+from unittest import mock
+
+from nibo_api import settings
+from nibo_api.settings import NiboSettings, criptografar_token, limpar_cache_criptografia
+
+
+@unittest.skipUnless(settings.CRYPTOGRAPHY_AVAILABLE, "cryptography não instalada")
+class TestCriptografia(unittest.TestCase):
+    """Testes para _decrypt_token e o cache de criptografia do processo"""
+
+    def setUp(self):
+        """Configuração inicial dos testes"""
+        limpar_cache_criptografia()
+        self.addCleanup(limpar_cache_criptografia)
+        patcher = mock.patch.dict(os.environ, {"NIBO_ENCRYPTION_KEY": "chave-teste"})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.config = NiboSettings()
+
+    def _contar_derivacoes(self):
+        """Envolve PBKDF2HMAC para contar as derivações de chave"""
+        patcher = mock.patch.object(settings, "PBKDF2HMAC", wraps=settings.PBKDF2HMAC)
+        kdf = patcher.start()
+        self.addCleanup(patcher.stop)
+        return kdf
+
+    def test_ida_e_volta(self):
+        """Testa que um token criptografado é descriptografado corretamente"""
+        cifrado = criptografar_token("token-secreto")
+        self.assertTrue(cifrado.startswith("encrypted:"))
+        self.assertEqual(self.config._decrypt_token(cifrado), "token-secreto")
+
+    def test_deriva_chave_uma_vez(self):
+        """Testa que a derivação PBKDF2 acontece uma única vez por chave"""
+        kdf = self._contar_derivacoes()
+        cifrados = [criptografar_token(f"token-{i}") for i in range(5)]
+        for cifrado in cifrados:
+            self.config._decrypt_token(cifrado)
+        NiboSettings()._decrypt_token(cifrados[0])
+        self.assertEqual(kdf.call_count, 1)
+
+    def test_invalidacao(self):
+        """Testa que limpar_cache_criptografia força nova derivação"""
+        cifrado = criptografar_token("token")
+        kdf = self._contar_derivacoes()
+        limpar_cache_criptografia()
+        self.config._decrypt_token(cifrado)
+        self.assertEqual(kdf.call_count, 1)
+
+    def test_troca_de_chave(self):
+        """Testa que o cache é separado por chave de criptografia"""
+        cifrado = criptografar_token("token")
+        self.config._decrypt_token(cifrado)
+        with mock.patch.dict(os.environ, {"NIBO_ENCRYPTION_KEY": "outra-chave"}):
+            with self.assertRaises(ValueError):
+                self.config._decrypt_token(cifrado)
+
+    def test_texto_plano(self):
+        """Testa que tokens sem prefixo são devolvidos como estão"""
+        self.assertEqual(self.config._decrypt_token("plano"), "plano")
+
+
+if __name__ == "__main__":
+    unittest.main()
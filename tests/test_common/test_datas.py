@@ -0,0 +1,125 @@
+"""
+Testes para a conversão de datas com memoização
+"""
+import unittest
+from datetime import date, datetime, timedelta, timezone
+
+from nibo_api.common import datas
+from nibo_api.common.datas import converter_coluna, para_date, para_datetime
+from nibo_api.common.models import AgendamentoRecebimento
+from nibo_api.empresa.management.utils import parse_date
+from nibo_api.obrigacoes.management.utils import parse_date as parse_date_obrigacoes
+
+
+class TestParaDatetime(unittest.TestCase):
+    """Testes para para_datetime"""
+
+    def test_formatos_da_api(self):
+        """Testa 'Z', offset, sem fuso e frações de segundo"""
+        self.assertEqual(para_datetime("2025-01-20T10:30:00Z"), datetime(2025, 1, 20, 10, 30, tzinfo=timezone.utc))
+        self.assertEqual(
+            para_datetime("2025-01-20T10:30:00-03:00"),
+            datetime(2025, 1, 20, 10, 30, tzinfo=timezone(timedelta(hours=-3)))
+        )
+        self.assertEqual(para_datetime("2025-01-20T00:00:00"), datetime(2025, 1, 20))
+        self.assertEqual(
+            para_datetime("2025-01-20T10:30:00.1234567Z"),
+            datetime(2025, 1, 20, 10, 30, 0, 123456, tzinfo=timezone.utc)
+        )
+
+    def test_memoizacao(self):
+        """Testa que o mesmo texto devolve o mesmo objeto e datetimes passam direto"""
+        primeiro = para_datetime("2025-02-01T00:00:00Z")
+        self.assertIs(para_datetime("2025-02-01T00:00:00Z"), primeiro)
+        self.assertIs(para_datetime(primeiro), primeiro)
+
+    def test_invalida(self):
+        """Testa que textos inválidos geram ValueError"""
+        with self.assertRaises(ValueError):
+            para_datetime("ontem")
+
+
+class TestParaDate(unittest.TestCase):
+    """Testes para para_date e para os usos na CLI"""
+
+    def test_formatos(self):
+        """Testa ISO, DD/MM/YYYY, date e datetime"""
+        self.assertEqual(para_date("2025-01-20T10:30:00Z"), date(2025, 1, 20))
+        self.assertEqual(para_date(" 20/01/2025 "), date(2025, 1, 20))
+        self.assertEqual(para_date("5/1/2025"), date(2025, 1, 5))
+        self.assertEqual(para_date(datetime(2025, 1, 20, 8)), date(2025, 1, 20))
+        self.assertEqual(para_date(date(2025, 1, 20)), date(2025, 1, 20))
+
+    def test_vazias(self):
+        """Testa que valores vazios resultam em None"""
+        for valor in (None, "", "N/A"):
+            self.assertIsNone(para_date(valor), valor)
+
+    def test_invalidas(self):
+        """Testa que datas inexistentes ou com texto sobrando geram ValueError"""
+        for valor in ("31/02/2025", "2025-13-01", "texto", "2025-01-01garbage",
+                      "2025-01-01T10:00:00lixo", "1/2/25", "001/2/2025", "20/01/2025 10:00"):
+            with self.assertRaises(ValueError, msg=valor):
+                para_date(valor)
+
+    def test_parse_date_da_cli(self):
+        """Testa que o parse_date da CLI usa a conversão compartilhada"""
+        self.assertEqual(parse_date("2025-03-05T00:00:00"), date(2025, 3, 5))
+        self.assertIsNone(parse_date("N/A"))
+        self.assertEqual(parse_date("5/1/2025"), date(2025, 1, 5))
+        self.assertEqual(parse_date_obrigacoes("5/1/2025"), date(2025, 1, 5))
+        self.assertIsNone(parse_date_obrigacoes("5/1/2025x"))
+        self.assertIsNone(parse_date("2025-01-01garbage"))
+
+
+class TestColunas(unittest.TestCase):
+    """Testes para conversão de colunas inteiras"""
+
+    def test_converter_coluna(self):
+        """Testa ordem, valores ausentes e reaproveitamento de objetos"""
+        valores = ["2025-01-20T00:00:00", None, "2025-01-20T00:00:00", "05/02/2025", "N/A"]
+        convertidas = converter_coluna(valores)
+        self.assertEqual(convertidas, [date(2025, 1, 20), None, date(2025, 1, 20), date(2025, 2, 5), None])
+        self.assertIs(convertidas[0], convertidas[2])
+        with self.assertRaises(ValueError):
+            converter_coluna(["2025-01-20", "x"])
+
+    def test_conversor_personalizado(self):
+        """Testa converter_coluna com para_datetime"""
+        convertidas = converter_coluna(["2025-01-20T00:00:00Z"] * 3, para_datetime)
+        self.assertEqual(len({id(d) for d in convertidas}), 1)
+
+    @unittest.skipUnless(datas.NUMPY_AVAILABLE, "numpy não instalado")
+    def test_coluna_datetime64(self):
+        """Testa a conversão vetorizada, inclusive com formatos mistos"""
+        import numpy as np
+        coluna = datas.coluna_datetime64(["2025-01-20T00:00:00Z", None, "N/A", date(2025, 2, 1)])
+        self.assertEqual(coluna.dtype, np.dtype("datetime64[D]"))
+        self.assertEqual(str(coluna[0]), "2025-01-20")
+        self.assertTrue(np.isnat(coluna[1]) and np.isnat(coluna[2]))
+        self.assertEqual(str(coluna[3]), "2025-02-01")
+        misturada = datas.coluna_datetime64(["2025-01-20", "05/02/2025", "2025-01-01garbage"])
+        self.assertEqual([str(d) for d in misturada], ["2025-01-20", "2025-02-05", "NaT"])
+
+
+class TestModelos(unittest.TestCase):
+    """Testes do uso nos modelos"""
+
+    def test_agendamento_compartilha_datas(self):
+        """Testa que datas iguais entre itens viram o mesmo datetime"""
+        base = {
+            "scheduleId": "00000000-0000-0000-0000-000000000001", "type": "Credit",
+            "dueDate": "2025-04-10T00:00:00Z", "accrualDate": "2025-04-10T00:00:00Z",
+            "scheduleDate": "2025-04-10T00:00:00Z", "createDate": "2025-04-01T00:00:00Z",
+            "createUser": "u", "updateDate": "2025-04-01T00:00:00Z", "updateUser": "u",
+            "value": 10, "stakeholder": {"id": "00000000-0000-0000-0000-000000000002", "name": "A", "type": "Customer"},
+            "category": {"id": "00000000-0000-0000-0000-000000000003", "name": "C", "type": "in"},
+        }
+        primeiro = AgendamentoRecebimento.from_dict(base)
+        segundo = AgendamentoRecebimento.from_dict(dict(base))
+        self.assertEqual(primeiro.due_date, datetime(2025, 4, 10, tzinfo=timezone.utc))
+        self.assertIs(primeiro.due_date, segundo.due_date)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,211 @@
+"""
+Testes para o diário de escritas e a reconciliação de POSTs
+"""
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+from urllib.parse import parse_qs, urlparse
+
+from nibo_api.settings import NiboSettings
+from nibo_api.common.client import BaseClient
+from nibo_api.common.async_client import AIOHTTP_AVAILABLE, AsyncBaseClient
+from nibo_api.common.diario import DiarioEscritas, EXISTENTE, Reconciliador, chave_idempotencia, verificar_agendamento
+from nibo_api.common.exceptions import NiboEscritaIncertaError, NiboServerError, NiboValidationError
+from nibo_api.common.modelos_compactos import AgendamentoCompacto
+from nibo_api.common.retry import IDEMPOTENCY_HEADER
+from tests.test_common.util import resposta
+
+CONTATO = "aaaaaaaa-0000-0000-0000-000000000001"
+
+
+class ServidorFalso:
+    """Simula /schedules/credit: cria agendamentos e filtra pela referência"""
+
+    def __init__(self):
+        self.agendamentos = []
+        self.posts = []
+        self.gets = 0
+        self.falhas = []  # status das próximas respostas de POST
+        self.aplicar_antes_de_falhar = False
+
+    def __call__(self, metodo, url, headers=None, json=None, **kwargs):
+        if metodo == "GET":
+            self.gets += 1
+            filtro = parse_qs(urlparse(url).query)["$filter"][0]
+            referencia = filtro.split("'", 1)[1][:-1].replace("''", "'")
+            return resposta(200, {"items": [a for a in self.agendamentos if a["reference"] == referencia]})
+        self.posts.append((json, headers.get(IDEMPOTENCY_HEADER)))
+        status = self.falhas.pop(0) if self.falhas else 200
+        if status == 200 or (status >= 500 and self.aplicar_antes_de_falhar):
+            schedule_id = f"id-{len(self.agendamentos) + 1}"
+            self.agendamentos.append({
+                "scheduleId": schedule_id, "reference": json.get("reference"),
+                "stakeholder": {"id": json.get("stakeholderId", "").upper()},
+            })
+            if status == 200:
+                return resposta(200, schedule_id)
+        return resposta(status, {"message": "falha"})
+
+
+class TestDiarioEscritas(unittest.TestCase):
+    """Testes para BaseClient com DiarioEscritas e Reconciliador"""
+
+    def setUp(self):
+        """Cria um diário temporário e um cliente ligado ao servidor falso"""
+        diretorio = tempfile.TemporaryDirectory()
+        self.addCleanup(diretorio.cleanup)
+        self.caminho = os.path.join(diretorio.name, "escritas.jsonl")
+        self.servidor = ServidorFalso()
+        self.client = self._cliente()
+
+    def _cliente(self):
+        diario = DiarioEscritas(self.caminho, sincronizar=False)
+        self.addCleanup(diario.close)
+        client = BaseClient(NiboSettings(), base_url="https://api.teste", diario=diario)
+        client.session = mock.Mock()
+        client.session.request = mock.Mock(side_effect=self.servidor)
+        return client
+
+    def _payload(self, referencia="NF 10"):
+        return {"stakeholderId": CONTATO, "value": 10, "reference": referencia}
+
+    def test_post_repetido_nao_duplica(self):
+        """Testa que o mesmo POST devolve a resposta gravada sem novo envio"""
+        self.assertEqual(self.client.post("/schedules/credit", json_data=self._payload()), "id-1")
+        self.assertEqual(self.client.post("/schedules/credit", json_data=self._payload()), "id-1")
+        self.assertEqual(self._cliente().post("/schedules/credit", json_data=self._payload()), "id-1")
+        self.assertEqual(len(self.servidor.posts), 1)
+        chave = chave_idempotencia("/schedules/credit", self._payload(), "https://api.teste|")
+        self.assertEqual(self.servidor.posts[0][1], chave)
+
+    def test_erro_definitivo_pode_ser_reenviado(self):
+        """Testa que um POST recusado (400) é reenviado na próxima chamada"""
+        self.servidor.falhas = [400]
+        with self.assertRaises(NiboValidationError):
+            self.client.post("/schedules/credit", json_data=self._payload())
+        self.assertEqual(self.client.post("/schedules/credit", json_data=self._payload()), "id-1")
+        self.assertEqual(len(self.servidor.posts), 2)
+
+    def test_erro_ambiguo_reconcilia_antes_de_reenviar(self):
+        """Testa que, após um 503 aplicado no servidor, o novo envio encontra o agendamento"""
+        self.servidor.falhas = [503]
+        self.servidor.aplicar_antes_de_falhar = True
+        with self.assertRaises(NiboServerError):
+            self.client.post("/schedules/credit", json_data=self._payload())
+        self.assertEqual(self.client.diario.pendentes()[0]["payload"], self._payload())
+
+        # Novo processo: o diário relido ainda tem a escrita pendente
+        client = self._cliente()
+        self.assertEqual(client.post("/schedules/credit", json_data=self._payload()), "id-1")
+        self.assertEqual((len(self.servidor.posts), self.servidor.gets), (1, 1))
+        self.assertEqual(len(self.servidor.agendamentos), 1)
+        self.assertEqual(client.diario.pendentes(), [])
+
+    def test_erro_ambiguo_nao_aplicado_e_reenviado(self):
+        """Testa que a escrita ausente no servidor é reenviada com a mesma chave"""
+        self.servidor.falhas = [503]
+        with self.assertRaises(NiboServerError):
+            self.client.post("/schedules/credit", json_data=self._payload())
+        self.assertEqual(self.client.post("/schedules/credit", json_data=self._payload()), "id-1")
+        self.assertEqual(self.servidor.posts[0][1], self.servidor.posts[1][1])
+
+    def test_pendente_sem_verificador(self):
+        """Testa que endpoints sem verificador não são reenviados às cegas"""
+        self.servidor.falhas = [503]
+        with self.assertRaises(NiboServerError):
+            self.client.post("/nfse/emit", json_data={"value": 1})
+        with self.assertRaises(NiboEscritaIncertaError):
+            self.client.post("/nfse/emit", json_data={"value": 1})
+        self.assertEqual(len(self.servidor.posts), 1)
+
+    def test_reconciliar_pendentes(self):
+        """Testa a reconciliação em massa com reenvio das escritas ausentes"""
+        self.servidor.falhas = [503, 503, 503]
+        self.servidor.aplicar_antes_de_falhar = True
+        with self.assertRaises(NiboServerError):
+            self.client.post("/schedules/credit", json_data=self._payload("A"))
+        self.servidor.aplicar_antes_de_falhar = False
+        for referencia in ("B", None):
+            with self.assertRaises(NiboServerError):
+                self.client.post("/schedules/credit", json_data=self._payload(referencia))
+
+        resultados = Reconciliador(self._cliente()).reconciliar(reenviar=True)
+        self.assertEqual([r.situacao for r in resultados], ["existente", "reenviado", "indeterminado"])
+        self.assertEqual([r.id for r in resultados], ["id-1", "id-2", None])
+        self.assertEqual(sorted(a["reference"] for a in self.servidor.agendamentos), ["A", "B"])
+
+    def test_linha_truncada_e_compactacao(self):
+        """Testa a leitura após uma queda durante a gravação e a compactação do arquivo"""
+        self.client.post("/schedules/credit", json_data=self._payload("A"))
+        self.client.post("/schedules/credit", json_data=self._payload("B"))
+        self.client.diario.close()
+        with open(self.caminho, "a", encoding="utf-8") as f:
+            f.write('{"chave": "x", "esta')
+        diario = DiarioEscritas(self.caminho, sincronizar=False)
+        self.addCleanup(diario.close)
+        diario.compactar()
+        with open(self.caminho, encoding="utf-8") as f:
+            linhas = [json.loads(linha) for linha in f]
+        self.assertEqual([(r["estado"], r["id"]) for r in linhas], [("confirmado", "id-1"), ("confirmado", "id-2")])
+        self.assertEqual(linhas[0]["payload"], self._payload("A"))
+
+    def test_verificador_com_itens_tipados(self):
+        """Testa a verificação quando o cliente devolve modelos compactos (typed=True)"""
+        self.client.post("/schedules/credit", json_data=self._payload())
+        client = mock.Mock()
+        client.get.return_value = {"items": [AgendamentoCompacto(a) for a in self.servidor.agendamentos]}
+        registro = {"endpoint": "/schedules/credit", "payload": self._payload()}
+        self.assertEqual(verificar_agendamento(client, registro), (EXISTENTE, "id-1"))
+
+    def test_endpoints_fora_do_filtro(self):
+        """Testa que POSTs fora dos padrões configurados não passam pelo diário"""
+        self.client.diario.endpoints = ["/schedules/*"]
+        self.client.post("/payments", json_data={"value": 1})
+        self.client.post("/payments", json_data={"value": 1})
+        self.assertEqual(len(self.servidor.posts), 2)
+        self.assertEqual(self.servidor.posts[0][1], None)
+
+
+@unittest.skipUnless(AIOHTTP_AVAILABLE, "aiohttp não instalado")
+class TestDiarioAssincrono(unittest.TestCase):
+    """Testes para o diário de escritas em AsyncClientMixin.post"""
+
+    def test_post_assincrono(self):
+        """Testa resposta gravada, escrita pendente sem reenvio e POST fora do diário"""
+        diretorio = tempfile.TemporaryDirectory()
+        self.addCleanup(diretorio.cleanup)
+        diario = DiarioEscritas(os.path.join(diretorio.name, "escritas.jsonl"), endpoints=["/schedules/*"])
+        self.addCleanup(diario.close)
+        client = AsyncBaseClient(NiboSettings(), base_url="https://api.teste", diario=diario)
+        enviados = []
+        falhas = [None, NiboServerError("503")]
+
+        async def requisitar(metodo, url, headers=None, **kwargs):
+            enviados.append((url, (headers or {}).get(IDEMPOTENCY_HEADER)))
+            erro = falhas.pop(0) if falhas else None
+            if erro is not None:
+                raise erro
+            return f"id-{len(enviados)}"
+
+        client._request = requisitar
+
+        async def cenario():
+            self.assertEqual(await client.post("/schedules/credit", json_data={"reference": "A"}), "id-1")
+            self.assertEqual(await client.post("/schedules/credit", json_data={"reference": "A"}), "id-1")
+            with self.assertRaises(NiboServerError):
+                await client.post("/schedules/credit", json_data={"reference": "B"})
+            with self.assertRaises(NiboEscritaIncertaError):
+                await client.post("/schedules/credit", json_data={"reference": "B"})
+            self.assertEqual(await client.post("/payments", json_data={"value": 1}), "id-3")
+
+        asyncio.run(cenario())
+        self.assertEqual(len(enviados), 3)
+        self.assertIsNotNone(enviados[0][1])
+        self.assertIsNone(enviados[2][1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+"""
+Testes para os modelos compactos com decodificação preguiçosa
+"""
+import copy
+import unittest
+from datetime import datetime, timezone
+from uuid import UUID
+
+from nibo_api.common.models import AgendamentoRecebimento
+from nibo_api.common.modelos_compactos import (
+    AgendamentoCompacto,
+    Internador,
+    StakeholderCompacto,
+    UUID_ZERO,
+    agendamentos_compactos
+)
+
+STAKEHOLDER = {"id": "11111111-1111-1111-1111-111111111111", "name": "Cliente", "type": "Customer"}
+CATEGORIA = {"id": "22222222-2222-2222-2222-222222222222", "name": "Vendas", "type": "in"}
+
+
+def _agendamento(indice: int) -> dict:
+    return {
+        "scheduleId": f"00000000-0000-0000-0000-{indice:012d}",
+        "type": "Credit",
+        "dueDate": "2025-01-10T00:00:00Z",
+        "accrualDate": "2025-01-10T00:00:00Z",
+        "scheduleDate": "2025-01-01T00:00:00Z",
+        "createDate": "2025-01-01T10:00:00Z",
+        "createUser": "financeiro@empresa.com",
+        "updateDate": "2025-01-02T10:00:00Z",
+        "updateUser": "financeiro@empresa.com",
+        "value": 150.5,
+        "stakeholderId": STAKEHOLDER["id"],
+        "stakeholder": dict(STAKEHOLDER),
+        "category": dict(CATEGORIA),
+        "categories": [{
+            "id": "33333333-3333-3333-3333-333333333333",
+            "categoryId": CATEGORIA["id"],
+            "categoryName": "Vendas",
+            "value": 150.5,
+            "type": "in"
+        }],
+        "campoNovoDaApi": {"x": 1},
+    }
+
+
+class TestModelosCompactos(unittest.TestCase):
+    """Testes para AgendamentoCompacto e agendamentos_compactos"""
+
+    def test_mesmos_valores_que_o_dataclass(self):
+        """Testa que os campos equivalem aos de AgendamentoRecebimento.from_dict"""
+        dados = _agendamento(1)
+        esperado = AgendamentoRecebimento.from_dict(copy.deepcopy(dados))
+        compacto = AgendamentoCompacto(dados)
+
+        for nome in ("schedule_id", "type", "due_date", "create_user", "value", "paid_value",
+                     "stakeholder_id", "description", "has_recurrence", "cost_centers",
+                     "custom_attributes", "is_payment_scheduled"):
+            self.assertEqual(getattr(compacto, nome), getattr(esperado, nome), nome)
+        self.assertEqual(compacto.stakeholder.id, esperado.stakeholder.id)
+        self.assertEqual(compacto.categories[0].category_id, esperado.categories[0].category_id)
+        self.assertEqual(compacto.categories[0].parent_id, UUID_ZERO)
+        self.assertIsNone(compacto.recurrence)
+
+    def test_decodificacao_preguicosa(self):
+        """Testa que nada é convertido até o primeiro acesso e que o valor é reaproveitado"""
+        compacto = AgendamentoCompacto(_agendamento(1))
+        self.assertIsNone(compacto._cache)
+
+        data = compacto.due_date
+        self.assertEqual(data, datetime(2025, 1, 10, tzinfo=timezone.utc))
+        self.assertIs(compacto.due_date, data)
+        self.assertEqual(len(compacto._cache), 1)
+        self.assertIsInstance(compacto.schedule_id, UUID)
+
+    def test_slots_sem_dict(self):
+        """Testa que as instâncias não têm __dict__"""
+        compacto = AgendamentoCompacto(_agendamento(1))
+        self.assertFalse(hasattr(compacto, "__dict__"))
+        with self.assertRaises(AttributeError):
+            compacto.atributo_qualquer = 1
+
+    def test_repetidos_compartilhados_na_pagina(self):
+        """Testa que stakeholders, categorias e textos repetidos viram um só objeto"""
+        agendamentos = agendamentos_compactos({"items": [_agendamento(i) for i in range(5)]})
+
+        self.assertIs(agendamentos[0].stakeholder, agendamentos[4].stakeholder)
+        self.assertIs(agendamentos[0].category, agendamentos[3].category)
+        self.assertIsInstance(agendamentos[0].stakeholder, StakeholderCompacto)
+        self.assertIs(agendamentos[0]._valores[1], agendamentos[2]._valores[1])
+        self.assertNotEqual(agendamentos[0].schedule_id, agendamentos[1].schedule_id)
+
+    def test_internador_entre_paginas(self):
+        """Testa o compartilhamento entre páginas com o mesmo Internador"""
+        internador = Internador()
+        primeira = agendamentos_compactos([_agendamento(1)], internador)
+        segunda = agendamentos_compactos([_agendamento(2)], internador)
+        self.assertIs(primeira[0].stakeholder, segunda[0].stakeholder)
+
+    def test_dados_brutos_preservados(self):
+        """Testa que o dicionário original (inclusive campos desconhecidos) é recuperável"""
+        dados = _agendamento(7)
+        compacto = AgendamentoCompacto(copy.deepcopy(dados))
+        self.assertEqual(compacto.dados, dados)
+        self.assertEqual(compacto, AgendamentoCompacto(copy.deepcopy(dados)))
+        self.assertEqual(compacto.para_dict()["value"], 150.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,152 @@
+"""
+Testes para a avaliação local de expressões OData
+"""
+import json
+import sqlite3
+import unittest
+
+from nibo_api.common.odata import (
+    CompiladorSQL,
+    ErroOData,
+    analisar_ordenacao,
+    aplicar_odata,
+    compilar_predicado,
+    registrar_funcoes,
+    texto_instante,
+)
+
+ITENS = [
+    {"id": "1", "dueDate": "2025-01-10T00:00:00", "value": 100, "isPaid": False,
+     "stakeholder": {"id": "AAAA0000-0000-0000-0000-000000000001", "name": "João da Silva"},
+     "description": "Mensalidade", "updateDate": "2025-01-05T12:00:00Z"},
+    {"id": "2", "dueDate": "2025-02-10T00:00:00", "value": 250.5, "isPaid": True,
+     "stakeholder": {"id": "aaaa0000-0000-0000-0000-000000000002", "name": "Maria Souza"},
+     "description": None, "updateDate": "2025-02-01T09:00:00-03:00"},
+    {"id": "3", "dueDate": "2025-03-10T00:00:00", "value": 80, "isPaid": False,
+     "stakeholder": {"id": "aaaa0000-0000-0000-0000-000000000003", "name": "JOÃO PEREIRA"},
+     "updateDate": "2025-03-01T00:00:00Z"},
+    {"id": "4", "dueDate": None, "value": 10, "isPaid": False, "stakeholder": None},
+]
+
+FILTROS = [
+    "contains(stakeholder/name, 'joão')",
+    "startswith(stakeholder/name, 'maria') or endswith(stakeholder/name, 'PEREIRA')",
+    "dueDate ge 2025-02-01T00:00:00Z and dueDate le 2025-03-10T00:00:00Z",
+    "dueDate gt 2025-02-10",
+    "updateDate lt 2025-02-01T12:00:00Z",
+    "value gt 90 and not isPaid",
+    "isPaid eq true",
+    "isPaid",
+    "description eq null",
+    "description ne null",
+    "description ne 'mensalidade'",
+    "stakeholder/id eq aaaa0000-0000-0000-0000-000000000001",
+    "stakeholder/id eq guid'AAAA0000-0000-0000-0000-000000000002'",
+    "stakeholder/name eq 'maria souza'",
+    "year(dueDate) eq 2025 and month(dueDate) ge 2",
+    "length(tolower(stakeholder/name)) gt 12",
+    "substringof('silva', stakeholder/name)",
+    "not (dueDate lt 2025-02-01T00:00:00Z)",
+    "trim(stakeholder/name) eq 'JOÃO PEREIRA'",
+    "id in ('1', '3') and value in (100, 250.5)",
+]
+
+
+def _ids(itens):
+    return [item["id"] for item in itens]
+
+
+class TestPredicados(unittest.TestCase):
+    """Testes para a avaliação em memória"""
+
+    def test_filtros(self):
+        """Testa os filtros usados pela CLI e pelas interfaces"""
+        casos = {
+            "contains(stakeholder/name, 'joão')": ["1", "3"],
+            "dueDate ge 2025-02-01T00:00:00Z and dueDate le 2025-03-10T00:00:00Z": ["2", "3"],
+            "value gt 90 and not isPaid": ["1"],
+            "isPaid": ["2"],
+            "description eq null": ["2", "3", "4"],
+            "description ne 'mensalidade'": ["2", "3", "4"],
+            "stakeholder/id eq aaaa0000-0000-0000-0000-000000000001": ["1"],
+            "updateDate lt 2025-02-01T12:00:00Z": ["1"],
+            "stakeholder/id in ('aaaa0000-0000-0000-0000-000000000002', 'x') or id in ('4')": ["2", "4"],
+            "not (dueDate lt 2025-02-01T00:00:00Z)": ["2", "3", "4"],
+        }
+        for filtro, esperado in casos.items():
+            predicado = compilar_predicado(filtro)
+            self.assertEqual(_ids(item for item in ITENS if predicado(item)), esperado, filtro)
+
+    def test_campos_sem_diferenciar_maiusculas(self):
+        """Testa nomes de campos como 'inChargeUser/Id' usados na CLI de obrigações"""
+        predicado = compilar_predicado("inChargeUser/Id eq 'u1' and contains(inChargeUser/Name, 'ana')")
+        self.assertTrue(predicado({"inChargeUser": {"id": "U1", "name": "Ana Lima"}}))
+
+    def test_ordenacao_e_paginacao(self):
+        """Testa $orderby com várias chaves, $skip e $top"""
+        self.assertEqual(_ids(aplicar_odata(ITENS, odata_orderby="dueDate desc")), ["3", "2", "1", "4"])
+        self.assertEqual(_ids(aplicar_odata(ITENS, odata_orderby="isPaid, value desc", odata_top=2)), ["1", "3"])
+        self.assertEqual(_ids(aplicar_odata(ITENS, "not isPaid", odata_skip=1, odata_top=1)), ["3"])
+        self.assertEqual(analisar_ordenacao("dueDate desc, value"), [("dueDate", True), ("value", False)])
+
+    def test_expressoes_invalidas(self):
+        """Testa que expressões inválidas ou não suportadas geram ErroOData (ValueError)"""
+        for filtro in ("value gt", "value eq 1)", "any(categories, c: c eq 1)", "contains(name)",
+                       "dueDate ge 2025-13-45", "name eq 'aberto", "value % 2"):
+            with self.assertRaises(ErroOData, msg=filtro):
+                compilar_predicado(filtro)
+        with self.assertRaises(ValueError):
+            analisar_ordenacao("value para cima")
+
+
+class TestCompiladorSQL(unittest.TestCase):
+    """Testes para a compilação em SQL"""
+
+    def setUp(self):
+        """Cria uma tabela em memória com colunas indexadas e o JSON dos itens"""
+        self.conexao = sqlite3.connect(":memory:")
+        self.addCleanup(self.conexao.close)
+        registrar_funcoes(self.conexao)
+        self.conexao.execute(
+            "CREATE TABLE itens (id TEXT, vencimento TEXT, stakeholder_id TEXT, nome TEXT, valor REAL, dados TEXT)"
+        )
+        self.conexao.executemany("INSERT INTO itens VALUES (?, ?, ?, ?, ?, ?)", [
+            (item["id"], texto_instante(item["dueDate"]),
+             (item["stakeholder"] or {}).get("id", "").casefold() or None,
+             (item["stakeholder"] or {}).get("name"), item["value"], json.dumps(item))
+            for item in ITENS
+        ])
+        self.compilador = CompiladorSQL({
+            "dueDate": ("vencimento", "datahora"),
+            "stakeholder/id": ("stakeholder_id", "id"),
+            "stakeholder/name": ("nome", "texto"),
+            "value": ("valor", "numero"),
+        })
+
+    def _consultar(self, filtro=None, ordenacao=None):
+        onde, parametros = self.compilador.filtro(filtro) if filtro else ("1", [])
+        ordem, parametros_ordem = self.compilador.ordem(ordenacao)
+        sql = f"SELECT id FROM itens WHERE {onde} ORDER BY {ordem + ', ' if ordem else ''}id"
+        return [linha[0] for linha in self.conexao.execute(sql, parametros + parametros_ordem)]
+
+    def test_mesmo_resultado_que_em_memoria(self):
+        """Testa que SQL e predicado em memória selecionam os mesmos itens"""
+        for filtro in FILTROS:
+            predicado = compilar_predicado(filtro)
+            self.assertEqual(self._consultar(filtro), _ids(i for i in ITENS if predicado(i)), filtro)
+
+    def test_ordenacao(self):
+        """Testa ORDER BY em colunas próprias e no JSON"""
+        self.assertEqual(self._consultar(ordenacao="dueDate desc"), ["3", "2", "1", "4"])
+        self.assertEqual(self._consultar(ordenacao="isPaid desc, value"), ["2", "4", "3", "1"])
+
+    def test_usa_coluna_indexada(self):
+        """Testa que comparações de data e id usam as colunas próprias"""
+        sql, parametros = self.compilador.filtro("dueDate ge 2025-02-01T00:00:00Z")
+        self.assertEqual((sql, parametros), ("(COALESCE(vencimento >= ?, 0))", ["2025-02-01T00:00:00.000000"]))
+        sql, _ = self.compilador.filtro("stakeholder/id eq AAAA0000-0000-0000-0000-000000000001")
+        self.assertEqual(sql, "(stakeholder_id IS ?)")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,169 @@
+"""
+Testes para a paginação OData do BaseClient
+"""
+import random
+import threading
+import time
+import unittest
+from unittest import mock
+
+from nibo_api.settings import NiboSettings
+from nibo_api.common.client import BaseClient
+from nibo_api.common.paginacao import extrair_items, extrair_total
+from nibo_api.empresa.agendamentos.receber import AgendamentosReceberInterface
+
+
+def _paginas_fake(total: int, chave_total: str = "count"):
+    """Cria um substituto de BaseClient.get que simula um endpoint com `total` registros"""
+    chamadas = []
+
+    def get(endpoint, params=None, odata_filter=None, odata_orderby=None, odata_top=None, odata_skip=None):
+        chamadas.append((odata_top, odata_skip))
+        inicio = odata_skip or 0
+        fim = min(total, inicio + odata_top)
+        items = [{"id": i} for i in range(inicio, fim)]
+        if chave_total == "count":
+            return {"items": items, "count": total}
+        if chave_total == "metadata":
+            return {"items": items, "metadata": {"totalCount": total}}
+        return {"items": items}
+
+    return get, chamadas
+
+
+class TestPaginacao(unittest.TestCase):
+    """Testes para BaseClient.paginar e iteradores iter_*"""
+    
+    def setUp(self):
+        """Configuração inicial dos testes"""
+        self.client = BaseClient(NiboSettings(), base_url="https://api.teste")
+    
+    def test_itera_todas_as_paginas(self):
+        """Testa que todos os itens são entregues em ordem"""
+        get, chamadas = _paginas_fake(250)
+        with mock.patch.object(self.client, "get", side_effect=get):
+            ids = [item["id"] for item in self.client.paginar("/x", page_size=100)]
+        
+        self.assertEqual(ids, list(range(250)))
+        self.assertEqual(chamadas, [(100, 0), (100, 100), (100, 200)])
+    
+    def test_para_no_count_sem_pagina_extra(self):
+        """Testa que a paginação para ao atingir o 'count' informado"""
+        get, chamadas = _paginas_fake(200)
+        with mock.patch.object(self.client, "get", side_effect=get):
+            ids = list(self.client.paginar("/x", page_size=100))
+        
+        self.assertEqual(len(ids), 200)
+        self.assertEqual(len(chamadas), 2)
+    
+    def test_para_no_total_de_metadata(self):
+        """Testa o total informado em 'metadata' (API de Obrigações)"""
+        get, chamadas = _paginas_fake(100, chave_total="metadata")
+        with mock.patch.object(self.client, "get", side_effect=get):
+            ids = list(self.client.paginar("/x", page_size=50))
+        
+        self.assertEqual(len(ids), 100)
+        self.assertEqual(len(chamadas), 2)
+    
+    def test_sem_total_para_em_pagina_vazia(self):
+        """Testa endpoint sem total: para na primeira página vazia"""
+        get, chamadas = _paginas_fake(100, chave_total=None)
+        with mock.patch.object(self.client, "get", side_effect=get):
+            ids = list(self.client.paginar("/x", page_size=50))
+        
+        self.assertEqual(len(ids), 100)
+        self.assertEqual(chamadas[-1], (50, 100))
+    
+    def test_limite(self):
+        """Testa limite de itens entregues"""
+        get, chamadas = _paginas_fake(1000)
+        with mock.patch.object(self.client, "get", side_effect=get):
+            ids = [item["id"] for item in self.client.paginar("/x", page_size=100, limite=150, odata_skip=10)]
+        
+        self.assertEqual(ids, list(range(10, 160)))
+        self.assertEqual(chamadas, [(100, 10), (50, 110)])
+    
+    def test_iteracao_preguicosa(self):
+        """Testa que nenhuma requisição é feita antes de consumir o iterador"""
+        get, chamadas = _paginas_fake(500)
+        with mock.patch.object(self.client, "get", side_effect=get):
+            iterador = self.client.paginar("/x", page_size=100)
+            self.assertEqual(chamadas, [])
+            next(iterador)
+            self.assertEqual(len(chamadas), 1)
+    
+    def test_page_size_invalido(self):
+        """Testa validação do tamanho de página"""
+        with self.assertRaises(ValueError):
+            list(self.client.paginar("/x", page_size=0))
+        with self.assertRaises(ValueError):
+            list(self.client.paginar("/x", max_workers=0))
+    
+    def test_iter_listar_todos(self):
+        """Testa o iterador de agendamentos de recebimento"""
+        interface = AgendamentosReceberInterface(self.client)
+        with mock.patch.object(self.client, "get", return_value={"items": [{"id": 1}], "count": 1}) as get:
+            itens = list(interface.iter_listar_todos(odata_filter="value gt 10", page_size=10))
+        
+        self.assertEqual(itens, [{"id": 1}])
+        args, kwargs = get.call_args
+        self.assertEqual(args[0], "/schedules/credit")
+        self.assertEqual(kwargs["odata_filter"], "value gt 10")
+        self.assertEqual(kwargs["odata_top"], 10)
+    
+    def test_paralelo_preserva_ordem(self):
+        """Testa que páginas buscadas em paralelo são entregues na ordem do servidor"""
+        get, chamadas = _paginas_fake(1050)
+        threads = set()
+        
+        def get_lento(*args, **kwargs):
+            threads.add(threading.get_ident())
+            time.sleep(random.uniform(0, 0.01))
+            return get(*args, **kwargs)
+        
+        with mock.patch.object(self.client, "get", side_effect=get_lento):
+            ids = [item["id"] for item in self.client.paginar("/x", page_size=100, max_workers=4)]
+        
+        self.assertEqual(ids, list(range(1050)))
+        self.assertEqual(sorted(chamadas), sorted([(100, s) for s in range(0, 1000, 100)] + [(50, 1000)]))
+        self.assertGreater(len(threads), 1)
+    
+    def test_paralelo_com_limite(self):
+        """Testa limite de itens na paginação paralela"""
+        get, chamadas = _paginas_fake(1000)
+        with mock.patch.object(self.client, "get", side_effect=get):
+            ids = [item["id"] for item in self.client.paginar("/x", page_size=100, limite=250, max_workers=3)]
+        
+        self.assertEqual(ids, list(range(250)))
+        self.assertEqual(sorted(chamadas), [(50, 200), (100, 0), (100, 100)])
+    
+    def test_paralelo_sem_total_segue_sequencial(self):
+        """Testa que, sem total informado, a paginação paralela recai na sequencial"""
+        get, chamadas = _paginas_fake(250, chave_total=None)
+        with mock.patch.object(self.client, "get", side_effect=get):
+            ids = [item["id"] for item in self.client.paginar("/x", page_size=100, max_workers=4)]
+        
+        self.assertEqual(ids, list(range(250)))
+        self.assertEqual(chamadas, [(100, 0), (100, 100), (100, 200)])
+    
+    def test_paralelo_via_interface(self):
+        """Testa que max_workers é repassado pelos iteradores iter_*"""
+        interface = AgendamentosReceberInterface(self.client)
+        get, chamadas = _paginas_fake(300)
+        with mock.patch.object(self.client, "get", side_effect=get):
+            itens = list(interface.iter_listar_abertos(page_size=100, max_workers=2))
+        
+        self.assertEqual(len(itens), 300)
+        self.assertEqual(len(chamadas), 3)
+    
+    def test_extracao_de_items_e_total(self):
+        """Testa formatos de resposta suportados"""
+        self.assertEqual(extrair_items([1, 2]), [1, 2])
+        self.assertEqual(extrair_items({"items": None}), [])
+        self.assertIsNone(extrair_total([1, 2]))
+        self.assertIsNone(extrair_total({"items": [], "metadata": None}))
+        self.assertEqual(extrair_total({"items": [], "count": 7}), 7)
+
+
+if __name__ == "__main__":
+    unittest.main()
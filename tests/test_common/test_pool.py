@@ -0,0 +1,91 @@
+"""
+Testes para o transporte compartilhado e o NiboClientPool
+"""
+import threading
+import unittest
+from unittest import mock
+
+from nibo_api.settings import NiboSettings
+from nibo_api.common.client import BaseClient
+from nibo_api.common.transporte import Transporte
+from nibo_api.pool import NiboClientPool
+from tests.test_common.util import resposta
+
+
+class TestPool(unittest.TestCase):
+    """Testes para Transporte e NiboClientPool"""
+
+    def setUp(self):
+        """Configuração inicial dos testes"""
+        self.config = NiboSettings()
+        self.pool = NiboClientPool(self.config)
+        self.addCleanup(self.pool.close)
+        self.pool.transporte.session.request = mock.Mock(return_value=resposta(corpo=b'{"items": []}'))
+
+    def test_clientes_compartilham_sessao(self):
+        """Testa que clientes de organizações diferentes usam a mesma sessão"""
+        client_a = BaseClient(self.config, base_url="https://api.teste", transporte=self.pool.transporte)
+        client_b = BaseClient(self.config, base_url="https://api.teste", transporte=self.pool.transporte)
+        client_a.headers["ApiToken"] = "token-a"
+        client_b.headers["ApiToken"] = "token-b"
+
+        client_a.get("/a")
+        client_b.get("/b")
+
+        chamadas = self.pool.transporte.session.request.call_args_list
+        self.assertIs(client_a.session, client_b.session)
+        self.assertEqual(chamadas[0].kwargs["headers"]["ApiToken"], "token-a")
+        self.assertEqual(chamadas[1].kwargs["headers"]["ApiToken"], "token-b")
+        self.assertNotIn("ApiToken", self.pool.transporte.session.headers)
+
+    def test_headers_da_requisicao_prevalecem(self):
+        """Testa a combinação de headers do cliente com os da requisição"""
+        client = BaseClient(self.config, base_url="https://api.teste", transporte=self.pool.transporte)
+        client.post("/a", json_data={}, idempotency_key="chave-1")
+        headers = self.pool.transporte.session.request.call_args.kwargs["headers"]
+        self.assertEqual(headers["Idempotency-Key"], "chave-1")
+        self.assertEqual(headers["accept"], "application/json")
+
+    def test_cache_de_clientes_empresa(self):
+        """Testa que o pool devolve o mesmo cliente para a mesma organização"""
+        client = self.pool.empresa(organizacao_codigo="NC")
+        self.assertIs(client, self.pool.empresa(organizacao_codigo="NC"))
+        self.assertIs(client.transporte, self.pool.transporte)
+        self.assertIn("ApiToken", client.headers)
+
+    def test_cliente_obrigacoes(self):
+        """Testa o cliente de Obrigações do pool"""
+        client = self.pool.obrigacoes()
+        self.assertIs(client, self.pool.obrigacoes())
+        self.assertIs(client.session, self.pool.transporte.session)
+        self.assertIn("X-API-Key", client.headers)
+        self.assertNotIn("ApiToken", client.headers)
+
+    def test_opcoes_repassadas(self):
+        """Testa que opções do pool são repassadas aos clientes"""
+        pool = NiboClientPool(self.config, transporte=self.pool.transporte, retry_policy="politica")
+        self.assertEqual(pool.obrigacoes().retry_policy, "politica")
+
+    def test_acesso_concorrente(self):
+        """Testa que threads concorrentes recebem o mesmo cliente"""
+        clientes = []
+
+        def obter():
+            clientes.append(self.pool.empresa(organizacao_codigo="NC"))
+
+        threads = [threading.Thread(target=obter) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len({id(client) for client in clientes}), 1)
+
+    def test_organizacao_obrigatoria(self):
+        """Testa erro quando a organização não é informada"""
+        with self.assertRaises(ValueError):
+            self.pool.empresa()
+
+
+if __name__ == "__main__":
+    unittest.main()
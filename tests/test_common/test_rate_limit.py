@@ -0,0 +1,159 @@
+"""
+Testes para o limitador de taxa (token bucket) do BaseClient
+"""
+import threading
+import unittest
+from unittest import mock
+
+from nibo_api.settings import NiboSettings
+from nibo_api.common.client import BaseClient
+from nibo_api.common.rate_limit import TokenBucket, RateLimiter
+from tests.test_common.util import resposta
+
+
+class _Relogio:
+    """Relógio controlado para substituir time.monotonic/time.sleep"""
+
+    def __init__(self):
+        self.agora = 1000.0
+        self.esperas = []
+
+    def monotonic(self):
+        return self.agora
+
+    def sleep(self, segundos):
+        self.esperas.append(segundos)
+        self.agora += segundos
+
+
+class TestRateLimit(unittest.TestCase):
+    """Testes para TokenBucket, RateLimiter e integração com BaseClient"""
+
+    def setUp(self):
+        """Configuração inicial dos testes"""
+        self.relogio = _Relogio()
+        for nome in ("monotonic", "sleep"):
+            patcher = mock.patch(f"nibo_api.common.rate_limit.time.{nome}", getattr(self.relogio, nome))
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_rajada_sem_espera(self):
+        """Testa que a rajada configurada é liberada sem espera"""
+        balde = TokenBucket(taxa=2, capacidade=3)
+        esperas = [balde.adquirir() for _ in range(3)]
+        self.assertEqual(esperas, [0.0, 0.0, 0.0])
+
+    def test_espera_apos_rajada(self):
+        """Testa que, esgotada a rajada, as requisições seguem a taxa configurada"""
+        balde = TokenBucket(taxa=2, capacidade=1)
+        balde.adquirir()
+        self.assertAlmostEqual(balde.adquirir(), 0.5)
+        self.assertAlmostEqual(balde.adquirir(), 0.5)
+        self.assertEqual(len(self.relogio.esperas), 2)
+
+    def test_reposicao_limitada_a_capacidade(self):
+        """Testa que fichas ociosas não passam da capacidade"""
+        balde = TokenBucket(taxa=10, capacidade=2)
+        self.relogio.agora += 60
+        esperas = [balde.adquirir() for _ in range(3)]
+        self.assertEqual(esperas[:2], [0.0, 0.0])
+        self.assertAlmostEqual(esperas[2], 0.1)
+
+    def test_retry_after_pausa_balde(self):
+        """Testa que um 429 com Retry-After pausa o balde"""
+        balde = TokenBucket(taxa=100, capacidade=10)
+        balde.registrar_resposta(429, "3")
+        self.assertAlmostEqual(balde.adquirir(), 3.0)
+
+    def test_modo_adaptativo(self):
+        """Testa redução da taxa em 429 e recuperação gradual em sucessos"""
+        balde = TokenBucket(taxa=10, capacidade=5, adaptativo=True, incremento=1)
+        balde.registrar_resposta(429)
+        self.assertEqual(balde.taxa, 5)
+        balde.registrar_resposta(429)
+        self.assertEqual(balde.taxa, 2.5)
+        balde.registrar_resposta(200)
+        self.assertEqual(balde.taxa, 3.5)
+        for _ in range(20):
+            balde.registrar_resposta(200)
+        self.assertEqual(balde.taxa, 10)
+
+    def test_modo_adaptativo_respeita_taxa_minima(self):
+        """Testa que a taxa adaptativa não cai abaixo do mínimo"""
+        balde = TokenBucket(taxa=10, capacidade=1, adaptativo=True, taxa_minima=4)
+        for _ in range(5):
+            balde.registrar_resposta(429)
+        self.assertEqual(balde.taxa, 4)
+
+    def test_baldes_por_token(self):
+        """Testa que tokens diferentes usam baldes diferentes"""
+        limitador = RateLimiter(requisicoes_por_segundo=1, rajada=1)
+        self.assertIs(limitador.balde("token-a"), limitador.balde("token-a"))
+        self.assertIsNot(limitador.balde("token-a"), limitador.balde("token-b"))
+        self.assertEqual(limitador.adquirir("token-a"), 0.0)
+        self.assertEqual(limitador.adquirir("token-b"), 0.0)
+        self.assertAlmostEqual(limitador.adquirir("token-a"), 1.0)
+
+    def test_reserva_concorrente(self):
+        """Testa que threads concorrentes recebem esperas escalonadas"""
+        balde = TokenBucket(taxa=10, capacidade=1)
+        esperas = []
+        lock = threading.Lock()
+
+        def reservar():
+            espera = balde.reservar()
+            with lock:
+                esperas.append(espera)
+
+        threads = [threading.Thread(target=reservar) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        esperadas = [0.0, 0.1, 0.2, 0.3, 0.4]
+        for espera, esperada in zip(sorted(esperas), esperadas):
+            self.assertAlmostEqual(espera, esperada)
+
+    def test_clientes_compartilham_balde(self):
+        """Testa que clientes com o mesmo token compartilham o limitador"""
+        limitador = RateLimiter(requisicoes_por_segundo=4, rajada=1)
+        clientes = []
+        for _ in range(2):
+            client = BaseClient(NiboSettings(), base_url="https://api.teste", rate_limiter=limitador)
+            client.headers["ApiToken"] = "mesmo-token"
+            client.session.request = mock.Mock(return_value=resposta(200))
+            clientes.append(client)
+
+        clientes[0].get("/a")
+        clientes[1].get("/b")
+        clientes[0].get("/c")
+
+        self.assertEqual(len(self.relogio.esperas), 2)
+        for espera in self.relogio.esperas:
+            self.assertAlmostEqual(espera, 0.25)
+
+    def test_client_registra_429(self):
+        """Testa que o BaseClient informa 429 e Retry-After ao limitador"""
+        limitador = RateLimiter(requisicoes_por_segundo=100, rajada=10, adaptativo=True)
+        client = BaseClient(NiboSettings(), base_url="https://api.teste", rate_limiter=limitador)
+        client.headers["X-API-Key"] = "chave"
+        client.session.request = mock.Mock(return_value=resposta(429, headers={"Retry-After": "2"}))
+
+        with self.assertRaises(Exception):
+            client.get("/a")
+
+        balde = limitador.balde("chave")
+        self.assertEqual(balde.taxa, 50)
+        self.assertGreaterEqual(balde.reservar(), 2.0)
+
+    def test_valida_parametros(self):
+        """Testa validação dos parâmetros do limitador"""
+        with self.assertRaises(ValueError):
+            RateLimiter(requisicoes_por_segundo=0)
+        with self.assertRaises(ValueError):
+            TokenBucket(taxa=1, capacidade=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
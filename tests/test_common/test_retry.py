@@ -0,0 +1,130 @@
+"""
+Testes para a política de novas tentativas do BaseClient
+"""
+import unittest
+from unittest import mock
+
+import requests
+
+from nibo_api.settings import NiboSettings
+from nibo_api.common.client import BaseClient
+from nibo_api.common.retry import RetryPolicy, parse_retry_after
+from nibo_api.common.exceptions import NiboRateLimitError, NiboServerError
+from tests.test_common.util import resposta
+
+
+class TestRetry(unittest.TestCase):
+    """Testes para RetryPolicy e sua integração com BaseClient"""
+    
+    def setUp(self):
+        """Configuração inicial dos testes"""
+        self.eventos = []
+        self.politica = RetryPolicy(
+            max_tentativas=3,
+            backoff_base=0.1,
+            jitter=False,
+            on_retry=self.eventos.append
+        )
+        self.client = BaseClient(NiboSettings(), base_url="https://api.teste", retry_policy=self.politica)
+        patcher = mock.patch("nibo_api.common.client.time.sleep")
+        self.sleep = patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    def test_repete_get_em_erro_5xx(self):
+        """Testa que GET é repetido após 503 e retorna o sucesso"""
+        respostas = [resposta(503), resposta(200)]
+        with mock.patch.object(self.client.session, "request", side_effect=respostas) as request:
+            resultado = self.client.get("/x")
+        
+        self.assertEqual(resultado, {"ok": True})
+        self.assertEqual(request.call_count, 2)
+        self.sleep.assert_called_once_with(0.1)
+        self.assertEqual(self.politica.metricas(), {"repeticoes": 1, "desistencias": 0})
+        self.assertEqual(self.eventos[0]["status"], 503)
+    
+    def test_fecha_resposta_descartada(self):
+        """Testa que a resposta repetida é fechada (stream=True devolve a conexão ao pool)"""
+        respostas = [resposta(503), resposta(200, b'{"items": []}')]
+        respostas[0].close = mock.Mock()
+        with mock.patch.object(self.client.session, "request", side_effect=respostas):
+            list(self.client.get("/x", stream=True))
+        
+        respostas[0].close.assert_called_once_with()
+    
+    def test_respeita_retry_after(self):
+        """Testa que o header Retry-After define a espera"""
+        respostas = [resposta(429, headers={"Retry-After": "7"}), resposta(200)]
+        with mock.patch.object(self.client.session, "request", side_effect=respostas):
+            self.client.get("/x")
+        
+        self.sleep.assert_called_once_with(7.0)
+    
+    def test_desiste_apos_max_tentativas(self):
+        """Testa que a exceção original é lançada ao esgotar as tentativas"""
+        with mock.patch.object(self.client.session, "request", side_effect=[resposta(429)] * 3) as request:
+            with self.assertRaises(NiboRateLimitError):
+                self.client.get("/x")
+        
+        self.assertEqual(request.call_count, 3)
+        self.assertEqual(self.politica.metricas(), {"repeticoes": 2, "desistencias": 1})
+    
+    def test_respeita_prazo_total(self):
+        """Testa que a espera não ultrapassa o prazo total"""
+        self.politica.prazo_total = 5
+        respostas = [resposta(503, headers={"Retry-After": "60"})]
+        with mock.patch.object(self.client.session, "request", side_effect=respostas):
+            with self.assertRaises(NiboServerError):
+                self.client.get("/x")
+        
+        self.sleep.assert_not_called()
+    
+    def test_post_sem_chave_nao_repete(self):
+        """Testa que POST sem Idempotency-Key não é repetido"""
+        with mock.patch.object(self.client.session, "request", side_effect=[resposta(503)]) as request:
+            with self.assertRaises(NiboServerError):
+                self.client.post("/x", json_data={"a": 1})
+        
+        self.assertEqual(request.call_count, 1)
+    
+    def test_post_com_chave_repete(self):
+        """Testa que POST com Idempotency-Key é repetido com o mesmo header"""
+        respostas = [resposta(502), resposta(201)]
+        with mock.patch.object(self.client.session, "request", side_effect=respostas) as request:
+            self.client.post("/x", json_data={"a": 1}, idempotency_key="chave-1")
+        
+        self.assertEqual(request.call_count, 2)
+        for chamada in request.call_args_list:
+            self.assertEqual(chamada.kwargs["headers"]["Idempotency-Key"], "chave-1")
+    
+    def test_repete_erro_de_conexao(self):
+        """Testa que erros de conexão em métodos idempotentes são repetidos"""
+        respostas = [requests.ConnectionError("falhou"), resposta(200)]
+        with mock.patch.object(self.client.session, "request", side_effect=respostas):
+            self.assertEqual(self.client.delete("/x"), {"ok": True})
+    
+    def test_sem_politica_lanca_na_hora(self):
+        """Testa o comportamento padrão sem política de retry"""
+        client = BaseClient(NiboSettings(), base_url="https://api.teste")
+        with mock.patch.object(client.session, "request", side_effect=[resposta(503)]) as request:
+            with self.assertRaises(NiboServerError):
+                client.get("/x")
+        self.assertEqual(request.call_count, 1)
+    
+    def test_backoff_exponencial_com_limite(self):
+        """Testa o cálculo do backoff"""
+        politica = RetryPolicy(backoff_base=1, backoff_max=5, jitter=False)
+        self.assertEqual([politica.calcular_espera(t) for t in range(1, 6)], [1, 2, 4, 5, 5])
+        politica.jitter = True
+        for t in range(1, 6):
+            self.assertLessEqual(politica.calcular_espera(t), 5)
+    
+    def test_parse_retry_after(self):
+        """Testa formatos do header Retry-After"""
+        self.assertEqual(parse_retry_after("3"), 3.0)
+        self.assertEqual(parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT"), 0.0)
+        self.assertIsNone(parse_retry_after("invalido"))
+        self.assertIsNone(parse_retry_after(None))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+"""
+Testes para o cache de configuração e a recarga de tokens alterados em disco
+"""
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import requests
+
+from nibo_api import settings
+from nibo_api.settings import NiboSettings, limpar_cache_settings
+from nibo_api.common.client import BaseClient
+
+
+class TestSettingsCache(unittest.TestCase):
+    """Testes para NiboSettings.compartilhado e verificar_alteracoes"""
+
+    def setUp(self):
+        """Cria um arquivo de tokens temporário"""
+        limpar_cache_settings()
+        self.addCleanup(limpar_cache_settings)
+        diretorio = tempfile.TemporaryDirectory()
+        self.addCleanup(diretorio.cleanup)
+        self.tokens_path = os.path.join(diretorio.name, "tokens.json")
+        self._gravar_tokens("TOKEN-ANTIGO")
+
+    def _gravar_tokens(self, token: str):
+        with open(self.tokens_path, "w", encoding="utf-8") as f:
+            json.dump({"api_tokens": {"org_teste": token}}, f)
+        os.chmod(self.tokens_path, 0o600)
+        # Garante mtime diferente mesmo em sistemas de arquivos com baixa resolução
+        info = os.stat(self.tokens_path)
+        os.utime(self.tokens_path, ns=(info.st_atime_ns, info.st_mtime_ns + 1_000_000_000))
+
+    def test_json_interpretado_uma_vez(self):
+        """Testa que novas instâncias não reinterpretam arquivos inalterados"""
+        with mock.patch.object(settings.json, "load", wraps=json.load) as load:
+            NiboSettings(tokens_path=self.tokens_path)
+            NiboSettings(tokens_path=self.tokens_path)
+            NiboSettings(tokens_path=self.tokens_path)
+        self.assertEqual(load.call_count, 2)  # settings.json + tokens.json
+
+    def test_alteracao_nao_afeta_cache(self):
+        """Testa que alterar os tokens de uma instância não altera as próximas"""
+        primeira = NiboSettings(tokens_path=self.tokens_path)
+        primeira._get_api_tokens_dict()["org_teste"] = "ALTERADO"
+        primeira._get_api_tokens_dict()["org_nova"] = "NOVO"
+        tokens = NiboSettings(tokens_path=self.tokens_path)._get_api_tokens_dict()
+        self.assertEqual(tokens, {"org_teste": "TOKEN-ANTIGO"})
+
+    def test_instancia_compartilhada(self):
+        """Testa o singleton por caminho de tokens"""
+        config = NiboSettings.compartilhado(self.tokens_path)
+        self.assertIs(config, NiboSettings.compartilhado(self.tokens_path))
+        self.assertIsNot(config, NiboSettings.compartilhado())
+
+    def test_recarrega_token_rotacionado(self):
+        """Testa que tokens alterados em disco são recarregados"""
+        config = NiboSettings(tokens_path=self.tokens_path)
+        self.assertEqual(config.get_api_token(organizacao_id="org_teste"), "TOKEN-ANTIGO")
+
+        self._gravar_tokens("TOKEN-NOVO-ROTACIONADO")
+        self.assertEqual(config.verificar_alteracoes(forcar=True), 1)
+        self.assertEqual(config.get_api_token(organizacao_id="org_teste"), "TOKEN-NOVO-ROTACIONADO")
+
+    def test_sem_alteracao_mantem_versao(self):
+        """Testa que a versão não muda sem alteração nos arquivos"""
+        config = NiboSettings(tokens_path=self.tokens_path)
+        self.assertEqual(config.verificar_alteracoes(forcar=True), 0)
+
+    def test_intervalo_de_verificacao(self):
+        """Testa que a verificação respeita o intervalo configurado"""
+        config = NiboSettings(tokens_path=self.tokens_path, intervalo_verificacao=3600)
+        self._gravar_tokens("TOKEN-NOVO")
+        self.assertEqual(config.verificar_alteracoes(), 0)
+        self.assertEqual(config.verificar_alteracoes(forcar=True), 1)
+
+    def test_cliente_usa_token_rotacionado(self):
+        """Testa que um cliente em execução passa a enviar o token novo"""
+        config = NiboSettings(tokens_path=self.tokens_path, intervalo_verificacao=0)
+        client = BaseClient(config, base_url="https://api.teste", organizacao_id="org_teste")
+        response = requests.Response()
+        response.status_code = 200
+        response._content = b"{}"
+        client.session.request = mock.Mock(return_value=response)
+
+        client.get("/a")
+        self._gravar_tokens("TOKEN-NOVO")
+        client.get("/b")
+
+        chamadas = client.session.request.call_args_list
+        self.assertEqual(chamadas[0].kwargs["headers"]["ApiToken"], "TOKEN-ANTIGO")
+        self.assertEqual(chamadas[1].kwargs["headers"]["ApiToken"], "TOKEN-NOVO")
+
+
+if __name__ == "__main__":
+    unittest.main()
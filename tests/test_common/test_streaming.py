@@ -0,0 +1,142 @@
+"""
+Testes para a decodificação incremental de respostas JSON
+"""
+import io
+import json
+import unittest
+from unittest import mock
+
+import requests
+
+from nibo_api.common.client import BaseClient
+from nibo_api.common.exceptions import NiboNotFoundError
+from nibo_api.common.streaming import DecodificadorItens, iter_itens_json
+
+
+def _em_blocos(texto, tamanho):
+    dados = texto.encode("utf-8")
+    return [dados[i:i + tamanho] for i in range(0, len(dados), tamanho)]
+
+
+class TestDecodificadorItens(unittest.TestCase):
+    """Testes para DecodificadorItens e iter_itens_json"""
+
+    def setUp(self):
+        """Resposta de exemplo com tipos variados e caracteres fora do ASCII"""
+        self.items = [
+            {"id": i, "nome": f"Açaí {i}", "valor": i * 10.5, "ativo": i % 2 == 0,
+             "tags": ["a", {"b": [1, 2]}], "obs": None}
+            for i in range(20)
+        ]
+        self.texto = json.dumps(
+            {"metadata": {"totalCount": 20}, "items": self.items, "count": 20},
+            ensure_ascii=False
+        )
+
+    def test_qualquer_tamanho_de_bloco(self):
+        """Testa que o resultado independe de onde os blocos são cortados"""
+        for tamanho in (1, 2, 3, 7, 64, len(self.texto) * 2):
+            decodificador = DecodificadorItens()
+            itens = []
+            for bloco in _em_blocos(self.texto, tamanho):
+                itens.extend(decodificador.alimentar(bloco))
+            itens.extend(decodificador.finalizar())
+            self.assertEqual(itens, self.items, tamanho)
+            self.assertEqual(decodificador.metadados, {"metadata": {"totalCount": 20}, "count": 20})
+
+    def test_itens_entregues_antes_do_fim(self):
+        """Testa que os itens saem à medida que os blocos chegam"""
+        decodificador = DecodificadorItens()
+        blocos = _em_blocos(self.texto, 50)
+        metade = len(blocos) // 2
+        parciais = []
+        for bloco in blocos[:metade]:
+            parciais.extend(decodificador.alimentar(bloco))
+        self.assertGreater(len(parciais), 0)
+        self.assertLess(len(parciais), len(self.items))
+
+    def test_numero_no_fim_do_bloco(self):
+        """Testa que um número cortado no fim do bloco não é entregue pela metade"""
+        blocos = ['{"items": [12', '34, 5', "6]}"]
+        self.assertEqual(list(iter_itens_json(blocos)), [1234, 56])
+
+    def test_lista_no_topo(self):
+        """Testa respostas que são a própria lista (ex: CNAEs)"""
+        self.assertEqual(list(iter_itens_json(_em_blocos('[{"a": 1}, 2, "x"]', 3))), [{"a": 1}, 2, "x"])
+
+    def test_sem_itens(self):
+        """Testa lista vazia e resposta sem o campo items"""
+        self.assertEqual(list(iter_itens_json(['{"items": [], "count": 0}'])), [])
+        decodificador = DecodificadorItens()
+        self.assertEqual(list(decodificador.alimentar('{"ok": true}')), [])
+        self.assertEqual(list(decodificador.finalizar()), [])
+        self.assertEqual(decodificador.metadados, {"ok": True})
+
+    def test_json_invalido(self):
+        """Testa que corpo truncado ou inválido gera ValueError"""
+        with self.assertRaises(ValueError):
+            list(iter_itens_json(['{"items": [1, 2']))
+        with self.assertRaises(ValueError):
+            list(iter_itens_json(['{"items": [1, }']))
+        with self.assertRaises(ValueError):
+            list(iter_itens_json(['"texto"']))
+
+
+class TestClienteStream(unittest.TestCase):
+    """Testes do modo stream no BaseClient"""
+
+    def setUp(self):
+        """Cria um cliente com respostas simuladas lidas em blocos"""
+        self.client = BaseClient(base_url="https://api.teste")
+        self.client.session = mock.Mock()
+        self.client.session.request = mock.Mock(side_effect=self._responder)
+        self.status = 200
+        self.total = 250
+
+    def _responder(self, metodo, url, **kwargs):
+        response = requests.Response()
+        response.status_code = self.status
+        if self.status != 200:
+            response._content = b"falha"
+            return response
+        query = dict(p.split("=") for p in url.split("?")[1].split("&")) if "?" in url else {}
+        skip = int(query.get("%24skip", 0))
+        top = int(query.get("%24top", self.total))
+        items = [{"id": i} for i in range(skip, min(skip + top, self.total))]
+        response.raw = io.BytesIO(json.dumps({"items": items, "count": self.total}).encode())
+        return response
+
+    def test_get_stream(self):
+        """Testa get(stream=True) sem cache nem coalescência"""
+        resposta = self.client.get("/schedules/credit/opened", stream=True)
+        ids = [item["id"] for item in resposta]
+        self.assertEqual(ids, list(range(250)))
+        self.assertEqual(resposta.metadados["count"], 250)
+        _, kwargs = self.client.session.request.call_args
+        self.assertTrue(kwargs["stream"])
+
+    def test_erro_http(self):
+        """Testa que status de erro geram as exceções habituais"""
+        self.status = 404
+        with self.assertRaises(NiboNotFoundError):
+            self.client.get("/inexistente", stream=True)
+
+    def test_paginacao_stream(self):
+        """Testa paginar(stream=True) parando no total informado"""
+        ids = [item["id"] for item in self.client.paginar("/x", page_size=100, stream=True)]
+        self.assertEqual(ids, list(range(250)))
+        self.assertEqual(self.client.session.request.call_count, 3)
+
+    def test_paginacao_stream_com_limite(self):
+        """Testa limite no modo stream"""
+        ids = list(self.client.paginar("/x", page_size=100, limite=150, stream=True))
+        self.assertEqual(len(ids), 150)
+
+    def test_stream_exige_sequencial(self):
+        """Testa que stream não combina com páginas em paralelo"""
+        with self.assertRaises(ValueError):
+            self.client.paginar("/x", stream=True, max_workers=4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,148 @@
+"""
+Testes para o modo tipado dos clientes (typed=True)
+"""
+import json
+import unittest
+from datetime import datetime, timezone
+from unittest import mock
+from uuid import UUID
+
+import requests
+
+from nibo_api.settings import NiboSettings
+from nibo_api.common.modelos_compactos import (
+    AgendamentoCompacto,
+    ContaCompacta,
+    ContatoCompacto,
+    ItemRelatorioObrigacoesCompacto,
+    LancamentoCompacto,
+    TarefaCompacta,
+)
+from nibo_api.common.tipagem import MODELOS_EMPRESA, MODELOS_OBRIGACOES, tipar_resposta
+from nibo_api.empresa.client import NiboEmpresaClient
+from nibo_api.obrigacoes.client import NiboObrigacoesClient
+
+ID_CLIENTE = "0b3f5c2e-8a8e-4d57-9a39-8f6b8f0f1a11"
+ID_CONTA = "7d1c4a8b-1111-4c2d-9e3f-000000000001"
+
+
+def _pagamento(i):
+    return {
+        "entryId": f"00000000-0000-0000-0000-{i:012d}",
+        "date": "2025-03-10T00:00:00Z",
+        "value": 10.5 * i,
+        "description": f"Pagamento {i}",
+        "stakeholder": {"id": ID_CLIENTE, "name": "Cliente A", "type": "Customer"},
+        "account": {"id": ID_CONTA, "name": "Conta principal"},
+        "campoNovo": i,
+    }
+
+
+class TestTabelaModelos(unittest.TestCase):
+    """Testes para a associação entre endpoints e modelos"""
+
+    def test_endpoints_empresa(self):
+        """Testa listagens e recursos únicos da API Empresa"""
+        casos = {
+            "/payments": LancamentoCompacto,
+            "/receipts/abc": LancamentoCompacto,
+            "/accounts": ContaCompacta,
+            "/accounts/abc/statement": LancamentoCompacto,
+            "/schedules/credit/opened": AgendamentoCompacto,
+            "/schedules/debit/abc": AgendamentoCompacto,
+            "/suppliers/abc/schedules": AgendamentoCompacto,
+            "/customers/abc": ContatoCompacto,
+        }
+        for endpoint, modelo in casos.items():
+            self.assertIs(MODELOS_EMPRESA.modelo_para(endpoint), modelo, endpoint)
+
+    def test_endpoints_sem_modelo(self):
+        """Testa que endpoints sem modelo continuam sem conversão"""
+        self.assertIsNone(MODELOS_EMPRESA.modelo_para("/schedules/categories/hierarchy"))
+        self.assertIsNone(MODELOS_EMPRESA.modelo_para("/accounts/abc/balance"))
+        self.assertIsNone(MODELOS_OBRIGACOES.modelo_para("/accountingfirms/x/users"))
+
+    def test_endpoints_obrigacoes(self):
+        """Testa tarefas e relatório de obrigações"""
+        self.assertIs(MODELOS_OBRIGACOES.modelo_para("/accountingfirms/x/tasks"), TarefaCompacta)
+        self.assertIs(
+            MODELOS_OBRIGACOES.modelo_para("/accountingfirms/x/reports/obligations/complete"),
+            ItemRelatorioObrigacoesCompacto
+        )
+
+
+class TestTiparResposta(unittest.TestCase):
+    """Testes para tipar_resposta"""
+
+    def test_pagina(self):
+        """Testa que 'items' vira modelos e os demais campos são mantidos"""
+        pagina = {"items": [_pagamento(i) for i in range(3)], "count": 3}
+        tipada = tipar_resposta(LancamentoCompacto, pagina)
+
+        self.assertEqual(tipada["count"], 3)
+        self.assertIsInstance(pagina["items"][0], dict)
+        primeiro = tipada["items"][1]
+        self.assertIsInstance(primeiro, LancamentoCompacto)
+        self.assertEqual(primeiro.value, 10.5)
+        self.assertEqual(primeiro.date, datetime(2025, 3, 10, tzinfo=timezone.utc))
+        self.assertEqual(primeiro.account.name, "Conta principal")
+        self.assertEqual(primeiro.dados, _pagamento(1))
+        # Stakeholder repetido é um único objeto
+        self.assertIs(tipada["items"][0].stakeholder, tipada["items"][2].stakeholder)
+
+    def test_recurso_unico_e_lista(self):
+        """Testa recurso único e lista devolvida diretamente"""
+        conta = tipar_resposta(ContaCompacta, {"id": ID_CONTA, "name": "Caixa"})
+        self.assertEqual(conta.id, UUID(ID_CONTA))
+        contas = tipar_resposta(ContaCompacta, [{"id": ID_CONTA}, "texto"])
+        self.assertIsInstance(contas[0], ContaCompacta)
+        self.assertEqual(contas[1], "texto")
+        self.assertEqual(tipar_resposta(ContaCompacta, ""), "")
+
+
+class TestClienteTipado(unittest.TestCase):
+    """Testes do parâmetro typed nos clientes"""
+
+    def _cliente(self, classe, **opcoes):
+        client = classe(NiboSettings(), **opcoes)
+        client.session = mock.Mock()
+        client.session.request = mock.Mock(side_effect=self._responder)
+        return client
+
+    def _responder(self, metodo, url, **kwargs):
+        response = requests.Response()
+        response.status_code = 200
+        if "/tasks" in url:
+            corpo = {"items": [{"id": ID_CLIENTE, "name": "DCTF", "inChargeUser": {"id": ID_CONTA, "name": "Ana"}}]}
+        elif "/balance" in url:
+            corpo = {"balance": 10}
+        else:
+            corpo = {"items": [_pagamento(i) for i in range(5)], "count": 5}
+        response._content = json.dumps(corpo).encode()
+        return response
+
+    def test_empresa_tipado(self):
+        """Testa interfaces e paginação retornando modelos"""
+        client = self._cliente(NiboEmpresaClient, organizacao_codigo="NC", typed=True)
+        pagina = client.pagamentos.listar(odata_top=5)
+        self.assertTrue(all(isinstance(item, LancamentoCompacto) for item in pagina["items"]))
+        itens = list(client.pagamentos.iter_listar(page_size=5, limite=5))
+        self.assertEqual([item.value for item in itens], [10.5 * i for i in range(5)])
+        # Endpoints sem modelo continuam retornando dicionários
+        self.assertEqual(client.contas_extratos.consultar_saldo(ID_CONTA), {"balance": 10})
+
+    def test_padrao_sem_tipos(self):
+        """Testa que o modo tipado é opcional"""
+        client = self._cliente(NiboEmpresaClient, organizacao_codigo="NC")
+        self.assertIsInstance(client.pagamentos.listar()["items"][0], dict)
+
+    def test_obrigacoes_tipado(self):
+        """Testa tarefas do Nibo Obrigações"""
+        client = self._cliente(NiboObrigacoesClient, typed=True)
+        tarefa = client.tarefas.listar(UUID(ID_CONTA))["items"][0]
+        self.assertIsInstance(tarefa, TarefaCompacta)
+        self.assertEqual(tarefa.in_charge_user.name, "Ana")
+
+
+if __name__ == "__main__":
+    unittest.main()
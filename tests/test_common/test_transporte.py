@@ -0,0 +1,85 @@
+"""
+Testes para a configuração de pool de conexões, timeouts e keep-alive
+"""
+import os
+import socket
+import unittest
+from unittest import mock
+
+import requests
+
+from nibo_api.settings import NiboSettings
+from nibo_api.common.client import BaseClient
+from nibo_api.common.transporte import KeepAliveHTTPAdapter, criar_sessao, opcoes_keepalive
+
+
+class TestTransporte(unittest.TestCase):
+    """Testes para criar_sessao e opções de rede do NiboSettings"""
+
+    def test_padroes(self):
+        """Testa os valores padrão das opções de rede"""
+        with mock.patch.dict(os.environ, {}, clear=False):
+            for var in ("NIBO_POOL_MAXSIZE", "NIBO_CONNECT_TIMEOUT", "NIBO_READ_TIMEOUT", "NIBO_TCP_KEEPALIVE"):
+                os.environ.pop(var, None)
+            config = NiboSettings()
+            self.assertEqual(config.pool_maxsize, 32)
+            self.assertEqual(config.connect_timeout, 10.0)
+            self.assertEqual(config.read_timeout, 60.0)
+            self.assertTrue(config.tcp_keepalive)
+
+    def test_variaveis_de_ambiente(self):
+        """Testa que variáveis de ambiente sobrescrevem o settings.json"""
+        ambiente = {
+            "NIBO_POOL_CONNECTIONS": "4",
+            "NIBO_POOL_MAXSIZE": "64",
+            "NIBO_CONNECT_TIMEOUT": "3.5",
+            "NIBO_READ_TIMEOUT": "none",
+            "NIBO_TCP_KEEPALIVE": "false",
+        }
+        with mock.patch.dict(os.environ, ambiente):
+            config = NiboSettings()
+            self.assertEqual(config.pool_connections, 4)
+            self.assertEqual(config.pool_maxsize, 64)
+            self.assertEqual(config.connect_timeout, 3.5)
+            self.assertIsNone(config.read_timeout)
+            self.assertFalse(config.tcp_keepalive)
+
+    def test_valor_invalido(self):
+        """Testa erro para valores não numéricos"""
+        with mock.patch.dict(os.environ, {"NIBO_POOL_MAXSIZE": "muitos"}):
+            with self.assertRaises(ValueError):
+                NiboSettings().pool_maxsize
+
+    def test_sessao_configurada(self):
+        """Testa que a sessão monta adapters com o pool e keep-alive configurados"""
+        with mock.patch.dict(os.environ, {"NIBO_POOL_MAXSIZE": "48", "NIBO_TCP_KEEPALIVE": "true"}):
+            session = criar_sessao(NiboSettings())
+        adapter = session.get_adapter("https://api.nibo.com.br")
+        self.assertIsInstance(adapter, KeepAliveHTTPAdapter)
+        self.assertEqual(adapter._pool_maxsize, 48)
+        self.assertIn((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1), adapter.socket_options)
+        self.assertEqual(adapter.poolmanager.connection_pool_kw["socket_options"], adapter.socket_options)
+
+    def test_opcoes_keepalive(self):
+        """Testa a montagem das opções de keep-alive"""
+        opcoes = opcoes_keepalive(30)
+        self.assertEqual(opcoes[0], (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+        if hasattr(socket, "TCP_KEEPIDLE"):
+            self.assertIn((socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, 30), opcoes)
+
+    def test_timeout_nas_requisicoes(self):
+        """Testa que o BaseClient envia o timeout (conexão, leitura) em toda requisição"""
+        with mock.patch.dict(os.environ, {"NIBO_CONNECT_TIMEOUT": "2", "NIBO_READ_TIMEOUT": "15"}):
+            client = BaseClient(NiboSettings(), base_url="https://api.teste")
+        response = requests.Response()
+        response.status_code = 200
+        response._content = b"{}"
+        client.session.request = mock.Mock(return_value=response)
+
+        client.get("/recurso")
+
+        self.assertEqual(client.session.request.call_args.kwargs["timeout"], (2.0, 15.0))
+
+
+if __name__ == "__main__":
+    unittest.main()
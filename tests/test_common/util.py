@@ -0,0 +1,34 @@
+"""
+Utilitários compartilhados pelos testes dos componentes comuns
+"""
+import io
+import json
+from typing import Any, Dict, Optional
+
+import requests
+
+
+def resposta(
+    status: int = 200,
+    corpo: Any = b'{"ok": true}',
+    headers: Optional[Dict[str, str]] = None
+) -> requests.Response:
+    """
+    Monta uma resposta HTTP sem acessar a rede
+
+    Args:
+        status: Código HTTP
+        corpo: Corpo em bytes ou objeto serializado como JSON
+        headers: Headers da resposta
+
+    Returns:
+        Resposta que também pode ser lida em fluxo (stream=True) e fechada
+    """
+    if not isinstance(corpo, bytes):
+        corpo = json.dumps(corpo).encode()
+    response = requests.Response()
+    response.status_code = status
+    response._content = corpo
+    response.raw = io.BytesIO(corpo)
+    response.headers.update(headers or {})
+    return response
@@ -0,0 +1,251 @@
+"""
+Testes para o espelho local em SQLite do Nibo Empresa
+"""
+import json
+import os
+import tempfile
+import unittest
+from datetime import date, timedelta
+from types import SimpleNamespace
+from unittest import mock
+
+from nibo_api.settings import NiboSettings
+from nibo_api.empresa import espelho as modulo_espelho
+from nibo_api.empresa.client import NiboEmpresaClient
+from nibo_api.empresa.espelho import EspelhoLocal, caminho_padrao
+from nibo_api.common.datas import para_datetime
+from nibo_api.common.modelos_compactos import AgendamentoCompacto
+
+
+def _agendamento(i, atualizado=None, **campos):
+    item = {
+        "scheduleId": f"00000000-0000-0000-0000-{i:012d}",
+        "dueDate": f"2025-03-{i % 28 + 1:02d}T00:00:00",
+        "value": 100.0 + i,
+        "isPaid": False,
+        "isDued": i % 2 == 0,
+        "stakeholder": {"id": f"cliente-{i % 3}", "name": f"Cliente {i % 3}"},
+        "categories": [{"categoryId": f"categoria-{i % 2}", "categoryName": "Vendas"}],
+        "updateDate": atualizado or f"2025-01-01T10:00:{i % 60:02d}Z",
+    }
+    item.update(campos)
+    return item
+
+
+class _ApiFalsa:
+    """Simula os métodos iter_* das interfaces, aplicando o filtro por updateDate"""
+
+    def __init__(self, chave_id):
+        self.chave_id = chave_id
+        self.itens = {}
+        self.filtros = []
+
+    def iter_listar_todos(self, odata_filter=None, odata_orderby=None, page_size=None):
+        self.filtros.append(odata_filter)
+        minimo = None
+        if odata_filter:
+            campo, operador, valor = odata_filter.split(" ")
+            assert (campo, operador) == ("updateDate", "ge")
+            minimo = para_datetime(valor)
+        itens = sorted(self.itens.values(), key=lambda item: para_datetime(item["updateDate"]))
+        return iter([dict(item) for item in itens
+                     if minimo is None or para_datetime(item["updateDate"]) >= minimo])
+
+    iter_listar = iter_listar_todos
+
+    def gravar(self, item):
+        self.itens[item[self.chave_id]] = item
+
+
+class TestEspelhoLocal(unittest.TestCase):
+    """Testes para EspelhoLocal"""
+
+    def setUp(self):
+        """Cria um cliente falso e um espelho em diretório temporário"""
+        diretorio = tempfile.TemporaryDirectory()
+        self.addCleanup(diretorio.cleanup)
+        self.receber = _ApiFalsa("scheduleId")
+        self.pagamentos = _ApiFalsa("entryId")
+        self.client = SimpleNamespace(
+            agendamentos_receber=self.receber,
+            agendamentos_pagar=_ApiFalsa("scheduleId"),
+            recebimentos=_ApiFalsa("entryId"),
+            pagamentos=self.pagamentos,
+            organizacao_codigo="empresa/principal",
+            organizacao_id=None,
+            config=NiboSettings(),
+        )
+        for i in range(10):
+            self.receber.gravar(_agendamento(i))
+        self.caminho = os.path.join(diretorio.name, "espelho.sqlite3")
+        self.espelho = EspelhoLocal(self.client, self.caminho)
+        self.addCleanup(self.espelho.close)
+
+    def test_carga_completa_e_consultas(self):
+        """Testa a primeira carga e as consultas por índice"""
+        resultados = self.espelho.sincronizar(["agendamentos_receber"])
+        self.assertTrue(resultados[0].completa)
+        self.assertEqual(resultados[0].gravados, 10)
+        self.assertEqual(self.receber.filtros, [None])
+
+        vencidos = self.espelho.consultar("agendamentos_receber", status="vencido")
+        self.assertEqual(len(vencidos), 5)
+        self.assertEqual(vencidos[0], _agendamento(0))
+        do_cliente = self.espelho.consultar("agendamentos_receber", stakeholder_id="cliente-1")
+        self.assertEqual({item["stakeholder"]["id"] for item in do_cliente}, {"cliente-1"})
+        periodo = self.espelho.consultar(
+            "agendamentos_receber", vencimento_inicio="03/03/2025", vencimento_fim="2025-03-05"
+        )
+        self.assertEqual([item["dueDate"][:10] for item in periodo], ["2025-03-03", "2025-03-04", "2025-03-05"])
+        self.assertEqual(len(self.espelho.consultar("agendamentos_receber", categoria_id="categoria-0")), 5)
+        self.assertEqual(len(self.espelho.consultar("agendamentos_receber", limite=2)), 2)
+
+    def test_sincronizacao_incremental(self):
+        """Testa que apenas os itens alterados são pedidos após a primeira carga"""
+        self.espelho.sincronizar(["agendamentos_receber"])
+        self.receber.gravar(_agendamento(3, atualizado="2025-02-01T08:00:00Z", isPaid=True))
+        self.receber.gravar(_agendamento(42, atualizado="2025-02-01T09:30:00Z"))
+
+        resultado = self.espelho.sincronizar(["agendamentos_receber"])[0]
+        self.assertFalse(resultado.completa)
+        self.assertEqual(self.receber.filtros[-1], "updateDate ge 2025-01-01T10:00:09Z")
+        # 'ge' também traz de novo o item da marca anterior (gravação idempotente)
+        self.assertEqual(resultado.gravados, 3)
+        self.assertTrue(self.espelho.obter("agendamentos_receber", _agendamento(3)["scheduleId"])["isPaid"])
+        self.assertEqual(self.espelho.contar("agendamentos_receber"), 11)
+        self.assertEqual(
+            self.espelho.estado()["agendamentos_receber"]["marca_atualizacao"], "2025-02-01T09:30:00Z"
+        )
+
+    def test_exclusoes(self):
+        """Testa que a carga completa remove itens excluídos na API"""
+        self.espelho.sincronizar(["agendamentos_receber"])
+        del self.receber.itens[_agendamento(5)["scheduleId"]]
+
+        self.assertEqual(self.espelho.sincronizar(["agendamentos_receber"])[0].removidos, 0)
+        self.assertEqual(self.espelho.contar("agendamentos_receber"), 10)
+
+        resultado = self.espelho.sincronizar(["agendamentos_receber"], completa=True)[0]
+        self.assertEqual(resultado.removidos, 1)
+        self.assertIsNone(self.espelho.obter("agendamentos_receber", _agendamento(5)["scheduleId"]))
+        self.assertTrue(self.espelho.remover("agendamentos_receber", _agendamento(6)["scheduleId"]))
+        self.assertEqual(self.espelho.contar("agendamentos_receber"), 8)
+
+    def test_intervalo_completa(self):
+        """Testa que intervalo_completa=0 faz toda sincronização ser completa"""
+        espelho = EspelhoLocal(self.client, self.caminho, intervalo_completa=0)
+        self.addCleanup(espelho.close)
+        espelho.sincronizar(["agendamentos_receber"])
+        self.assertTrue(espelho.sincronizar(["agendamentos_receber"])[0].completa)
+
+    def test_persistencia_e_lancamentos(self):
+        """Testa lançamentos, reabertura do arquivo e recursos inválidos"""
+        self.pagamentos.gravar({
+            "entryId": "p1", "date": "2025-04-01T00:00:00Z", "value": 50, "isReconciled": True,
+            "category": {"id": "categoria-9"}, "updateDate": "2025-04-01T12:00:00Z",
+        })
+        self.espelho.sincronizar()
+        self.espelho.close()
+
+        reaberto = EspelhoLocal(self.client, self.caminho)
+        self.addCleanup(reaberto.close)
+        self.assertEqual(reaberto.consultar("pagamentos", status="conciliado", categoria_id="categoria-9")[0]["entryId"], "p1")
+        self.assertEqual(set(reaberto.estado()), {"agendamentos_receber", "agendamentos_pagar", "recebimentos", "pagamentos"})
+        with self.assertRaises(ValueError):
+            reaberto.consultar("boletos")
+        with self.assertRaises(ValueError):
+            reaberto.consultar("pagamentos", vencimento_inicio="31/02/2025")
+
+    def test_caminho_padrao(self):
+        """Testa que o arquivo padrão fica no cache_dir, um por organização"""
+        caminho = caminho_padrao(self.client)
+        self.assertEqual(os.path.dirname(caminho), self.client.config.cache_dir)
+        self.assertTrue(caminho.endswith("espelho-empresa_principal.sqlite3"))
+
+
+class TestConsultaLocal(unittest.TestCase):
+    """Testes para consultas OData no espelho e source="local" nas interfaces"""
+
+    def setUp(self):
+        """Sincroniza um espelho com dados falsos e o associa a um cliente real sem rede"""
+        diretorio = tempfile.TemporaryDirectory()
+        self.addCleanup(diretorio.cleanup)
+        self.caminho = os.path.join(diretorio.name, "espelho.sqlite3")
+        receber = _ApiFalsa("scheduleId")
+        for i in range(10):
+            receber.gravar(_agendamento(i, isPaid=i == 4))
+        ontem = (date.today() - timedelta(days=1)).isoformat()
+        amanha = (date.today() + timedelta(days=1)).isoformat()
+        receber.gravar(_agendamento(50, dueDate=f"{ontem}T00:00:00"))
+        receber.gravar(_agendamento(51, dueDate=f"{amanha}T00:00:00"))
+        pagamentos = _ApiFalsa("entryId")
+        for dia in (1, 15, 30):
+            pagamentos.gravar({"entryId": f"p{dia}", "date": f"2025-04-{dia:02d}T00:00:00Z", "value": dia,
+                               "updateDate": "2025-05-01T00:00:00Z"})
+        falso = SimpleNamespace(agendamentos_receber=receber, agendamentos_pagar=_ApiFalsa("scheduleId"),
+                                recebimentos=_ApiFalsa("entryId"), pagamentos=pagamentos)
+        with EspelhoLocal(falso, self.caminho) as espelho:
+            espelho.sincronizar()
+
+        self.client = NiboEmpresaClient(NiboSettings(), organizacao_codigo="NC")
+        self.client.session = mock.Mock()
+        self.client.session.request = mock.Mock(side_effect=AssertionError("sem rede"))
+        self.client.espelho = EspelhoLocal(self.client, self.caminho)
+        self.addCleanup(self.client.espelho.close)
+
+    def test_listar_com_odata(self):
+        """Testa filtro, ordenação, $top/$skip e 'count' como na API"""
+        pagina = self.client.espelho.listar(
+            "agendamentos_receber",
+            odata_filter="contains(stakeholder/name, 'CLIENTE 1') and value lt 150",
+            odata_orderby="value desc", odata_top=2, odata_skip=1
+        )
+        self.assertEqual(pagina["count"], 3)
+        self.assertEqual([item["value"] for item in pagina["items"]], [104.0, 101.0])
+
+    def test_iterar_em_lotes(self):
+        """Testa que iterar lê o cursor aos poucos e entrega o mesmo que listar"""
+        espelho = self.client.espelho
+        esperado = espelho.listar("agendamentos_receber", odata_orderby="value desc")["items"]
+        with mock.patch.object(modulo_espelho, "TAMANHO_LOTE", 2), \
+                mock.patch.object(modulo_espelho.json, "loads", side_effect=json.loads) as loads:
+            itens = espelho.iterar("agendamentos_receber", odata_orderby="value desc")
+            primeiro = next(itens)
+            self.assertEqual(loads.call_count, 2)
+            self.assertEqual([primeiro] + list(itens), esperado)
+
+    def test_interfaces_com_source_local(self):
+        """Testa que as interfaces respondem pelo espelho sem acessar a API"""
+        receber = self.client.agendamentos_receber
+        abertos = receber.listar_abertos(odata_filter="stakeholder/name eq 'cliente 0'", source="local")
+        self.assertNotIn(_agendamento(4)["scheduleId"], [item["scheduleId"] for item in abertos["items"]])
+        self.assertTrue(all(item["stakeholder"]["name"] == "Cliente 0" for item in abertos["items"]))
+        vencidos = receber.listar_vencidos(source="local")
+        ids_vencidos = {item["scheduleId"] for item in vencidos["items"]}
+        self.assertIn(_agendamento(50)["scheduleId"], ids_vencidos)
+        self.assertNotIn(_agendamento(51)["scheduleId"], ids_vencidos)
+        self.assertEqual(len(list(receber.iter_listar_todos(source="local", limite=3, page_size=1))), 3)
+
+        periodo = self.client.pagamentos.listar_por_periodo("02/04/2025", "30/04/2025", source="local")
+        self.assertEqual([item["entryId"] for item in periodo["items"]], ["p30", "p15"])
+        self.client.session.request.assert_not_called()
+
+    def test_fonte_invalida_e_sem_espelho(self):
+        """Testa validação de source e cliente sem espelho"""
+        with self.assertRaises(ValueError):
+            self.client.pagamentos.listar(source="cache")
+        client = NiboEmpresaClient(NiboSettings(), organizacao_codigo="NC")
+        with self.assertRaises(ValueError):
+            client.pagamentos.listar(source="local")
+
+    def test_modo_tipado(self):
+        """Testa que clientes com typed=True recebem modelos também da fonte local"""
+        client = NiboEmpresaClient(NiboSettings(), organizacao_codigo="NC", typed=True)
+        client.espelho = EspelhoLocal(client, self.caminho)
+        self.addCleanup(client.espelho.close)
+        item = client.agendamentos_receber.listar_todos(odata_top=1, source="local")["items"][0]
+        self.assertIsInstance(item, AgendamentoCompacto)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+"""
+Testes para a execução em várias organizações (fan-out) do Nibo Empresa
+"""
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+import requests
+
+from nibo_api.settings import NiboSettings
+from nibo_api.pool import NiboClientPool
+from nibo_api.empresa.client import NiboEmpresaClient
+from nibo_api.empresa.fanout import executar_em_organizacoes, organizacoes_configuradas
+from nibo_api.common.exceptions import NiboServerError
+
+ORGANIZACOES = {f"org_{i}": f"TOKEN-{i}" for i in range(6)}
+
+
+class TestFanOut(unittest.TestCase):
+    """Testes para executar_em_organizacoes"""
+
+    def setUp(self):
+        """Cria tokens de teste e um pool com requisições simuladas"""
+        diretorio = tempfile.TemporaryDirectory()
+        self.addCleanup(diretorio.cleanup)
+        tokens_path = os.path.join(diretorio.name, "tokens.json")
+        with open(tokens_path, "w", encoding="utf-8") as f:
+            json.dump({"api_tokens": ORGANIZACOES}, f)
+        os.chmod(tokens_path, 0o600)
+
+        self.pool = NiboClientPool(NiboSettings(tokens_path=tokens_path))
+        self.addCleanup(self.pool.close)
+        self.lock = threading.Lock()
+        self.em_andamento = 0
+        self.pico = 0
+        self.pool.transporte.session.request = mock.Mock(side_effect=self._responder)
+
+    def _responder(self, metodo, url, headers=None, **kwargs):
+        token = headers["ApiToken"]
+        with self.lock:
+            self.em_andamento += 1
+            self.pico = max(self.pico, self.em_andamento)
+        time.sleep(0.02)
+        with self.lock:
+            self.em_andamento -= 1
+
+        response = requests.Response()
+        if token == "TOKEN-3":
+            response.status_code = 500
+            response._content = b"falha"
+        else:
+            response.status_code = 200
+            response._content = json.dumps({"items": [{"token": token}], "count": 1}).encode()
+        return response
+
+    def test_resultados_por_organizacao(self):
+        """Testa resultados marcados por organização e erros isolados"""
+        resultados = executar_em_organizacoes(
+            list(ORGANIZACOES), "agendamentos_receber.listar_abertos",
+            max_workers=3, pool=self.pool
+        )
+
+        self.assertEqual([r.organizacao for r in resultados], list(ORGANIZACOES))
+        self.assertEqual(list(resultados.erros()), ["org_3"])
+        self.assertIsInstance(resultados.erros()["org_3"], NiboServerError)
+        self.assertEqual(len(resultados.sucessos()), 5)
+        for organizacao, item in resultados.itens():
+            self.assertEqual(item["token"], ORGANIZACOES[organizacao])
+
+    def test_paralelismo_limitado(self):
+        """Testa que no máximo max_workers organizações rodam ao mesmo tempo"""
+        executar_em_organizacoes(
+            list(ORGANIZACOES), lambda client: client.categorias.listar(),
+            max_workers=2, pool=self.pool
+        )
+        self.assertEqual(self.pico, 2)
+
+    def test_organizacao_sem_token(self):
+        """Testa que organização desconhecida gera erro apenas para ela"""
+        resultados = executar_em_organizacoes(
+            ["org_0", "org_inexistente"], "categorias.listar", pool=self.pool
+        )
+        self.assertTrue(resultados[0].sucesso)
+        self.assertIsInstance(resultados.erros()["org_inexistente"], ValueError)
+
+    def test_iteradores_sao_materializados(self):
+        """Testa que métodos iter_* são consumidos dentro da thread da organização"""
+        resultados = executar_em_organizacoes(
+            ["org_0", "org_1"], "categorias.iter_listar", pool=self.pool
+        )
+        self.assertEqual(resultados.por_organizacao()["org_1"], [{"token": "TOKEN-1"}])
+
+    def test_todas_as_organizacoes_configuradas(self):
+        """Testa o uso de todas as organizações de api_tokens"""
+        self.assertEqual(organizacoes_configuradas(self.pool), list(ORGANIZACOES))
+        resultados = NiboEmpresaClient.executar_em_organizacoes(
+            None, "categorias.listar", pool=self.pool
+        )
+        self.assertEqual(len(resultados), len(ORGANIZACOES))
+
+    def test_operacao_invalida(self):
+        """Testa validação dos parâmetros"""
+        with self.assertRaises(ValueError):
+            executar_em_organizacoes(["org_0"], 42, pool=self.pool)
+        with self.assertRaises(ValueError):
+            executar_em_organizacoes(["org_0"], "categorias.listar", max_workers=0, pool=self.pool)
+
+
+if __name__ == "__main__":
+    unittest.main()
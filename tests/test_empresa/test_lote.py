@@ -0,0 +1,147 @@
+"""
+Testes para a criação de agendamentos em lote do Nibo Empresa
+"""
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from nibo_api.common.exceptions import NiboServerError, NiboValidationError
+from nibo_api.empresa.agendamentos.receber import AgendamentosReceberInterface
+from nibo_api.empresa.lote import CheckpointLote, chave_padrao, executar_lote
+from nibo_api.empresa.management.commands.agendamentos import _ler_csv_agendamentos, payload_linha_agendamento
+
+CONTATO = "aaaaaaaa-0000-0000-0000-000000000001"
+CATEGORIA = "bbbbbbbb-0000-0000-0000-000000000002"
+
+
+class TestExecutarLote(unittest.TestCase):
+    """Testes para executar_lote e CheckpointLote"""
+
+    def setUp(self):
+        """Cria um diretório para checkpoints e um 'enviar' simulado"""
+        diretorio = tempfile.TemporaryDirectory()
+        self.addCleanup(diretorio.cleanup)
+        self.checkpoint = os.path.join(diretorio.name, "lote.checkpoint.jsonl")
+        self.lock = threading.Lock()
+        self.em_andamento = 0
+        self.pico = 0
+        self.enviados = []
+        self.falhas = {}
+
+    def _enviar(self, payload):
+        with self.lock:
+            self.em_andamento += 1
+            self.pico = max(self.pico, self.em_andamento)
+            self.enviados.append(payload["n"])
+        time.sleep(0.005 * (payload["n"] % 3))
+        with self.lock:
+            self.em_andamento -= 1
+        if payload["n"] in self.falhas:
+            raise self.falhas[payload["n"]]
+        return {"id": f"id-{payload['n']}"}
+
+    def test_ordem_concorrencia_e_ids(self):
+        """Testa resultados na ordem de entrada com envios simultâneos limitados"""
+        lidos = []
+
+        def itens():
+            for n in range(40):
+                lidos.append(n)
+                yield {"n": n}
+
+        resultados = executar_lote(self._enviar, itens(), max_workers=4)
+        primeiro = next(resultados)
+        self.assertLessEqual(len(lidos), 2 * 4 + 1)  # entrada lida sob demanda
+        resultados = [primeiro] + list(resultados)
+        self.assertEqual([r.indice for r in resultados], list(range(40)))
+        self.assertEqual([r.id for r in resultados], [f"id-{n}" for n in range(40)])
+        self.assertTrue(all(r.sucesso for r in resultados))
+        self.assertLessEqual(self.pico, 4)
+        self.assertGreater(self.pico, 1)
+
+    def test_erros_por_item(self):
+        """Testa erro definitivo, erro ambíguo e falha de conversão sem interromper o lote"""
+        self.falhas = {1: NiboValidationError("inválido"), 2: NiboServerError("503")}
+
+        def converter(item):
+            if item == "ruim":
+                raise ValueError("linha inválida")
+            return item
+
+        itens = [{"n": 0}, {"n": 1}, {"n": 2}, "ruim", {"n": 4}]
+        situacoes = [r.situacao for r in executar_lote(self._enviar, itens, max_workers=2, converter=converter)]
+        self.assertEqual(situacoes, ["criado", "erro", "incerto", "erro", "criado"])
+
+    def test_retomada_sem_duplicar(self):
+        """Testa que a retomada pula criados e incertos e reenvia apenas os recusados"""
+        self.falhas = {3: NiboValidationError("inválido"), 5: NiboServerError("timeout")}
+        itens = [{"n": n} for n in range(8)]
+        list(executar_lote(self._enviar, itens[:6], max_workers=3, checkpoint=self.checkpoint))
+        # Simula uma queda durante o envio do item 6: só o registro 'enviando' foi gravado
+        with CheckpointLote(self.checkpoint) as checkpoint:
+            checkpoint.registrar(chave_padrao(6, itens[6]), "enviando")
+
+        self.enviados.clear()
+        self.falhas = {}
+        resultados = list(executar_lote(self._enviar, itens, max_workers=3, checkpoint=self.checkpoint))
+        self.assertEqual(sorted(self.enviados), [3, 7])
+        self.assertEqual(
+            [r.situacao for r in resultados],
+            ["retomado"] * 3 + ["criado", "retomado", "incerto", "incerto", "criado"]
+        )
+        self.assertEqual(resultados[0].id, "id-0")
+
+        self.enviados.clear()
+        list(executar_lote(self._enviar, itens, max_workers=3, checkpoint=self.checkpoint, reenviar_incertos=True))
+        self.assertEqual(sorted(self.enviados), [5, 6])
+
+    def test_checkpoint_tolera_linha_truncada(self):
+        """Testa a leitura de um checkpoint cuja última linha foi cortada por uma queda"""
+        with open(self.checkpoint, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"chave": "a", "situacao": "criado", "id": "1"}) + "\n")
+            f.write('{"chave": "b", "situ')
+        with CheckpointLote(self.checkpoint) as checkpoint:
+            self.assertEqual(checkpoint.situacao("a")["id"], "1")
+            self.assertIsNone(checkpoint.situacao("b"))
+
+    def test_agendar_lote_da_interface(self):
+        """Testa agendar_lote enviando cada payload para /schedules/credit"""
+        client = mock.Mock()
+        client.post.side_effect = lambda endpoint, json_data: f'"{json_data["description"]}-id"'
+        interface = AgendamentosReceberInterface(client)
+        resultados = list(interface.agendar_lote([{"description": "a"}, {"description": "b"}], max_workers=2))
+        self.assertEqual([r.id for r in resultados], ["a-id", "b-id"])
+        self.assertEqual({c.args[0] for c in client.post.call_args_list}, {"/schedules/credit"})
+
+
+class TestImportacaoCSV(unittest.TestCase):
+    """Testes para a leitura e conversão do CSV de importar-agendamentos"""
+
+    def test_linhas_e_payload(self):
+        """Testa separador ';', valor com vírgula e datas em dois formatos"""
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False, encoding="utf-8") as f:
+            f.write("Contato;Categoria;Valor;Data_Agendamento;Data_Vencimento;Descricao;Referencia\n")
+            f.write(f"{CONTATO};{CATEGORIA};1.234,56;01/02/2025;2025-02-28;Mensalidade;NF 10\n")
+            f.write(f"{CONTATO};;10;01/02/2025;31/02/2025;Sem categoria;\n")
+        self.addCleanup(os.unlink, f.name)
+
+        linhas = list(_ler_csv_agendamentos(f.name))
+        payload = payload_linha_agendamento(linhas[0])
+        self.assertEqual(payload, {
+            "categories": [{"categoryId": CATEGORIA, "value": 1234.56, "description": "Mensalidade"}],
+            "stakeholderId": CONTATO,
+            "scheduleDate": "01/02/2025",
+            "dueDate": "28/02/2025",
+            "description": "Mensalidade",
+            "reference": "NF 10",
+        })
+        with self.assertRaises(ValueError):
+            payload_linha_agendamento(linhas[1])
+
+
+if __name__ == "__main__":
+    unittest.main()
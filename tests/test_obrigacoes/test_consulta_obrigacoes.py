@@ -0,0 +1,174 @@
+"""
+Testes para a consulta ao relatório de obrigações com filtros no servidor
+"""
+import json
+import unittest
+from datetime import date
+from unittest import mock
+from urllib.parse import parse_qs, urlparse
+from uuid import UUID
+
+import requests
+
+from nibo_api.settings import NiboSettings
+from nibo_api.common.exceptions import NiboServerError
+from nibo_api.common.odata import aplicar_odata
+from nibo_api.obrigacoes import relatorios
+from nibo_api.obrigacoes.client import NiboObrigacoesClient
+from nibo_api.obrigacoes.management import cli
+
+ESCRITORIO = UUID("11111111-1111-1111-1111-111111111111")
+CLIENTE_A = "aaaaaaaa-0000-0000-0000-000000000001"
+CLIENTE_B = "bbbbbbbb-0000-0000-0000-000000000002"
+
+OBRIGACOES = [
+    {"id": str(i), "dueDate": f"2025-{i % 12 + 1:02d}-20T00:00:00", "filedDate": f"2025-01-{i % 28 + 1:02d}T00:00:00",
+     "customer": {"id": (CLIENTE_A, CLIENTE_B, "cccccccc-0000-0000-0000-000000000003")[i % 3], "name": "Cliente"}}
+    for i in range(60)
+]
+
+
+class TestConsultaObrigacoes(unittest.TestCase):
+    """Testes para RelatoriosInterface.consultar_obrigacoes"""
+
+    def setUp(self):
+        """Cria um cliente com um servidor simulado que recusa 'in' e $orderby"""
+        relatorios._FORMAS_ACEITAS.clear()
+        self.addCleanup(relatorios._FORMAS_ACEITAS.clear)
+        self.client = NiboObrigacoesClient(NiboSettings())
+        self.client.session = mock.Mock()
+        self.client.session.request = mock.Mock(side_effect=self._responder)
+        self.recusar = {"in", "orderby"}
+        self.filtros = []
+        self.recusados = 0
+        self.falhas_503 = 0
+
+    def _responder(self, metodo, url, **kwargs):
+        consulta = {chave: valores[0] for chave, valores in parse_qs(urlparse(url).query).items()}
+        filtro = consulta.get("$filter")
+        self.filtros.append(filtro)
+        response = requests.Response()
+        if self.falhas_503:
+            self.falhas_503 -= 1
+            response.status_code = 503
+            response._content = b'{"message": "indisponivel"}'
+            return response
+        recusado = (("filtro" in self.recusar and filtro)
+                    or ("in" in self.recusar and filtro and " in (" in filtro)
+                    or ("orderby" in self.recusar and "$orderby" in consulta))
+        if recusado:
+            self.recusados += 1
+            response.status_code = 400
+            response._content = b'{"message": "filtro nao suportado"}'
+            return response
+        itens = aplicar_odata(
+            OBRIGACOES, odata_filter=filtro, odata_orderby=consulta.get("$orderby"),
+            odata_top=int(consulta.get("$top", 100)), odata_skip=int(consulta.get("$skip", 0))
+        )
+        response.status_code = 200
+        response._content = json.dumps({"items": itens}).encode()
+        return response
+
+    def _consulta(self):
+        return (self.client.relatorios.consultar_obrigacoes(ESCRITORIO)
+                .clientes([CLIENTE_A, UUID(CLIENTE_B)])
+                .vencimento("01/03/2025", date(2025, 6, 30))
+                .ordenar("filedDate desc")
+                .tamanho_pagina(5))
+
+    def _esperado(self):
+        return [
+            item for item in OBRIGACOES
+            if item["customer"]["id"] in (CLIENTE_A, CLIENTE_B) and "2025-03" <= item["dueDate"][:7] <= "2025-06"
+        ]
+
+    def test_filtros_enviados_ao_servidor(self):
+        """Testa que clientes e período vão como OData e as páginas são percorridas"""
+        self.recusar = set()
+        consulta = self._consulta()
+        itens = consulta.listar()
+
+        self.assertEqual(consulta.forma, ("in", True, True))
+        self.assertIn("Customer/Id in (", self.filtros[0])
+        self.assertIn("dueDate ge 2025-03-01T00:00:00Z and dueDate le 2025-06-30T23:59:59Z", self.filtros[0])
+        esperado = self._esperado()
+        self.assertEqual(sorted(item["id"] for item in itens), sorted(item["id"] for item in esperado))
+        self.assertEqual([item["filedDate"] for item in itens],
+                         sorted((item["filedDate"] for item in esperado), reverse=True))
+        self.assertGreater(len(self.filtros), 2)  # várias páginas de 5
+
+    def test_formas_recusadas_e_memorizadas(self):
+        """Testa a troca para formas aceitas e que a forma aceita é reaproveitada"""
+        consulta = self._consulta()
+        itens = consulta.listar()
+
+        self.assertEqual(consulta.forma, ("ou", True, False))
+        self.assertEqual(self.recusados, 4)
+        self.assertEqual(len(itens), len(self._esperado()))
+        self.assertEqual(itens[0]["filedDate"], max(item["filedDate"] for item in itens))
+
+        self.filtros.clear()
+        self._consulta().listar()
+        self.assertEqual(self.recusados, 4)
+        self.assertTrue(all(" or " in filtro for filtro in self.filtros))
+
+    def test_ordem_das_formas(self):
+        """Testa que o filtro de clientes é simplificado antes de período e ordenação"""
+        self.assertEqual(self._consulta()._formas()[:4], [
+            ("in", True, True), ("ou", True, True), (None, True, True), ("in", True, False)
+        ])
+
+    def test_erro_5xx_nao_altera_forma(self):
+        """Testa que um 503 na primeira página é lançado sem rebaixar a forma guardada"""
+        self.recusar = set()
+        self.falhas_503 = 1
+        with self.assertRaises(NiboServerError):
+            self._consulta().listar()
+        self.assertEqual(relatorios._FORMAS_ACEITAS, {})
+        self.assertEqual(len(self.filtros), 1)
+
+        consulta = self._consulta()
+        consulta.listar()
+        self.assertEqual(consulta.forma, ("in", True, True))
+
+        self.falhas_503 = 1
+        with self.assertRaises(NiboServerError):
+            self._consulta().listar()
+        self.assertEqual(list(relatorios._FORMAS_ACEITAS.values()), [("in", True, True)])
+
+    def test_filtro_local_quando_servidor_recusa_tudo(self):
+        """Testa que, sem filtros aceitos, o resultado é filtrado localmente"""
+        self.recusar = {"filtro", "orderby"}
+        consulta = self._consulta()
+        itens = consulta.listar()
+        self.assertEqual(consulta.forma, (None, False, False))
+        self.assertEqual(sorted(item["id"] for item in itens), sorted(item["id"] for item in self._esperado()))
+        self.assertEqual(itens[0]["filedDate"], max(item["filedDate"] for item in itens))
+
+    def test_listar_obrigacoes_cliente(self):
+        """Testa os totais do comando da CLI (cliente em qualquer período e no período)"""
+        self.recusar = set()
+        pool = mock.Mock()
+        pool.obrigacoes.return_value = self.client
+        diretorio = mock.Mock()
+        diretorio.resolver.return_value = [{"id": CLIENTE_A}, {"id": CLIENTE_B}]
+        with mock.patch.object(cli, "pool_padrao", return_value=pool), \
+                mock.patch.object(self.client.clientes, "diretorio", return_value=diretorio):
+            resultado = cli.listar_obrigacoes_cliente("cliente", date(2025, 3, 1), date(2025, 6, 30), ESCRITORIO)
+        self.assertEqual(resultado["total_periodo"], len(self._esperado()))
+        self.assertEqual(resultado["total_cliente"], 40)
+        self.assertEqual(resultado["total_clientes"], 2)
+
+    def test_validacao(self):
+        """Testa datas inválidas e período invertido"""
+        consulta = self.client.relatorios.consultar_obrigacoes(ESCRITORIO)
+        with self.assertRaises(ValueError):
+            consulta.vencimento("31/02/2025")
+        with self.assertRaises(ValueError):
+            consulta.vencimento("2025-12-01", "2025-01-01")
+        with self.assertRaises(ValueError):
+            consulta.clientes("nao-e-uuid")
+
+
+if __name__ == "__main__":
+    unittest.main()
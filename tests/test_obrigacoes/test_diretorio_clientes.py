@@ -0,0 +1,143 @@
+"""
+Testes para o diretório em memória de clientes do Nibo Obrigações
+"""
+import asyncio
+import json
+import unittest
+from unittest import mock
+from uuid import UUID
+
+import requests
+
+from nibo_api.settings import NiboSettings
+from nibo_api.common.async_client import AIOHTTP_AVAILABLE
+from nibo_api.common.modelos_compactos import ClienteObrigacoesCompacto
+from nibo_api.obrigacoes import clientes as modulo_clientes
+from nibo_api.obrigacoes.client import AsyncNiboObrigacoesClient, NiboObrigacoesClient
+
+ESCRITORIO = UUID("11111111-1111-1111-1111-111111111111")
+
+
+def _cliente(i, nome=None, documento=None):
+    return {
+        "id": f"00000000-0000-0000-0000-{i:012d}",
+        "name": nome or f"Cliente {i}",
+        "documentNumber": documento or f"{i:014d}",
+    }
+
+
+class TestDiretorioClientes(unittest.TestCase):
+    """Testes para ClientesInterface.diretorio"""
+
+    def setUp(self):
+        """Cria um cliente cuja listagem paginada devolve self.clientes"""
+        self.client = NiboObrigacoesClient(NiboSettings())
+        self.clientes = [_cliente(i) for i in range(1, 1251)]
+        self.clientes[0] = _cliente(1, "Bragglon & Vilaça LTDA", "12.345.678/0001-90")
+        self.clientes[1] = _cliente(2, "BRAGGLON  & VILACA ltda")
+        self.client.paginar = mock.Mock(side_effect=lambda *args, **kwargs: iter(list(self.clientes)))
+        self.agora = 1000.0
+        relogio = mock.patch.object(modulo_clientes.time, "monotonic", side_effect=lambda: self.agora)
+        relogio.start()
+        self.addCleanup(relogio.stop)
+        self.diretorio = self.client.clientes.diretorio(ESCRITORIO)
+
+    def test_buscas_com_uma_unica_carga(self):
+        """Testa buscas por id, nome e documento além de 1000 clientes sem novas requisições"""
+        self.assertEqual(self.diretorio.obter(UUID(_cliente(1200)["id"]))["name"], "Cliente 1200")
+        self.assertEqual(self.diretorio.obter(_cliente(5)["id"].upper())["name"], "Cliente 5")
+        self.assertEqual(len(self.diretorio.por_nome("bragglon & vilaca ltda")), 2)
+        self.assertEqual(self.diretorio.por_documento("12345678000190")[0]["id"], _cliente(1)["id"])
+        self.assertEqual(len(self.diretorio), 1250)
+        self.assertEqual(self.client.paginar.call_count, 1)
+        self.assertIs(self.client.clientes.diretorio(str(ESCRITORIO).upper()), self.diretorio)
+
+    def test_resolver(self):
+        """Testa a identificação por UUID, CNPJ, nome exato e trecho do nome"""
+        self.assertEqual([c["id"] for c in self.diretorio.resolver(_cliente(7)["id"])], [_cliente(7)["id"]])
+        self.assertEqual([c["id"] for c in self.diretorio.resolver("12.345.678/0001-90")], [_cliente(1)["id"]])
+        self.assertEqual(len(self.diretorio.resolver("Bragglon & Vilaça LTDA")), 2)
+        self.assertEqual([c["name"] for c in self.diretorio.resolver("cliente 124")], ["Cliente 124"])
+        self.assertEqual([c["name"] for c in self.diretorio.resolver("ENTE 124")],
+                         ["Cliente 124"] + [f"Cliente {i}" for i in range(1240, 1250)])
+
+    def test_atualizacao_por_ttl(self):
+        """Testa que a lista é relida após o TTL e os índices refletem as mudanças"""
+        self.diretorio.obter(_cliente(3)["id"])
+        removido = self.clientes.pop(2)
+        self.clientes[0] = dict(self.clientes[0], name="Novo Nome", documentNumber="98765432000110")
+        self.clientes.append(_cliente(2000))
+
+        self.agora += modulo_clientes.INTERVALO_RECARGA_MINIMO - 1
+        self.assertIsNotNone(self.diretorio.obter(removido["id"]))
+        self.assertIsNone(self.diretorio.obter(_cliente(2000)["id"]))
+        self.assertEqual(self.client.paginar.call_count, 1)
+
+        self.agora += modulo_clientes.TTL_DIRETORIO_PADRAO
+        self.assertIsNone(self.diretorio.obter(removido["id"]))
+        self.assertEqual(self.client.paginar.call_count, 2)
+        self.assertIsNotNone(self.diretorio.obter(_cliente(2000)["id"]))
+        self.assertEqual(self.diretorio.por_nome("bragglon & vilaca ltda"), [self.clientes[1]])
+        self.assertEqual(self.diretorio.por_documento("98765432000110"), [self.clientes[0]])
+        self.assertEqual(self.diretorio.por_documento("12345678000190"), [])
+
+    def test_busca_sem_resultado_recarrega(self):
+        """Testa que um id desconhecido dispara uma releitura, limitada pelo intervalo mínimo"""
+        self.diretorio.obter(_cliente(1)["id"])
+        self.clientes.append(_cliente(3000))
+        self.agora += modulo_clientes.INTERVALO_RECARGA_MINIMO
+        self.assertIsNotNone(self.diretorio.obter(_cliente(3000)["id"]))
+        self.assertIsNone(self.diretorio.obter(_cliente(4000)["id"]))
+        self.assertEqual(self.client.paginar.call_count, 2)
+
+    def test_criar_registra_no_diretorio(self):
+        """Testa que clientes criados entram nos índices sem nova listagem"""
+        self.diretorio.obter(_cliente(1)["id"])
+        novo = _cliente(5000, "Cliente Recém Criado")
+        self.client.post = mock.Mock(return_value=novo)
+        self.client.clientes.criar(ESCRITORIO, name=novo["name"])
+        self.assertEqual(self.diretorio.por_nome("cliente recem criado"), [novo])
+        self.assertEqual(self.client.paginar.call_count, 1)
+
+
+class TestDiretorioOutrosClientes(unittest.TestCase):
+    """Testes do diretório em clientes com typed=True e assíncronos"""
+
+    def test_cliente_tipado(self):
+        """Testa que os modelos compactos da listagem entram nos índices como dicionários"""
+        clientes = [_cliente(1, "Bragglon & Vilaça LTDA", "12.345.678/0001-90"), _cliente(2)]
+
+        def responder(metodo, url, **kwargs):
+            response = requests.Response()
+            response.status_code = 200
+            response._content = json.dumps({"items": clientes, "count": len(clientes)}).encode()
+            return response
+
+        client = NiboObrigacoesClient(NiboSettings(), typed=True)
+        client.session = mock.Mock()
+        client.session.request = mock.Mock(side_effect=responder)
+        self.assertIsInstance(client.clientes.listar(ESCRITORIO)["items"][0], ClienteObrigacoesCompacto)
+        self.assertEqual(client.clientes.listar(ESCRITORIO)["items"][0].document_number, "12.345.678/0001-90")
+
+        diretorio = client.clientes.diretorio(ESCRITORIO)
+        self.assertEqual(len(diretorio), 2)
+        self.assertEqual(diretorio.obter(_cliente(2)["id"]), clientes[1])
+        self.assertEqual(diretorio.por_documento("12345678000190"), [clientes[0]])
+
+    @unittest.skipUnless(AIOHTTP_AVAILABLE, "aiohttp não instalado")
+    def test_cliente_assincrono(self):
+        """Testa que o diretório é recusado no cliente assíncrono e criar() devolve o resultado aguardado"""
+        client = AsyncNiboObrigacoesClient(NiboSettings())
+        novo = _cliente(5000)
+
+        async def requisitar(metodo, url, headers=None, **kwargs):
+            return novo
+
+        client._request = requisitar
+        with self.assertRaises(TypeError):
+            client.clientes.diretorio(ESCRITORIO)
+        self.assertEqual(asyncio.run(client.clientes.criar(ESCRITORIO, name=novo["name"])), novo)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+"""
+Testes para a resolução do escritório padrão do Nibo Obrigações
+"""
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+from urllib.parse import urlparse
+from uuid import UUID
+
+import requests
+
+from nibo_api.settings import NiboSettings
+from nibo_api.pool import configurar_cache_cli, configurar_pool_padrao
+from nibo_api.common.async_client import AIOHTTP_AVAILABLE
+from nibo_api.obrigacoes import client as modulo_client
+from nibo_api.obrigacoes.client import AsyncNiboObrigacoesClient, NiboObrigacoesClient
+
+ESCRITORIO = "11111111-1111-1111-1111-111111111111"
+CONFIGURADO = "22222222-2222-2222-2222-222222222222"
+
+
+class TestEscritorioPadrao(unittest.TestCase):
+    """Testes para NiboObrigacoesClient.escritorio_padrao"""
+
+    def setUp(self):
+        """Usa um cache_dir temporário e limpa o cache do processo"""
+        diretorio = tempfile.TemporaryDirectory()
+        self.addCleanup(diretorio.cleanup)
+        ambiente = mock.patch.dict(os.environ, {"NIBO_CACHE_DIR": diretorio.name, "NIBO_CACHE": "1"})
+        ambiente.start()
+        self.addCleanup(ambiente.stop)
+        os.environ.pop("NIBO_OBRIGACOES_ACCOUNTING_FIRM_ID", None)
+        modulo_client.limpar_cache_escritorios()
+        self.addCleanup(modulo_client.limpar_cache_escritorios)
+        self.config = NiboSettings()
+        self.config._settings_data.pop("obrigacoes_accounting_firm_id", None)
+        self.caminhos = []
+
+    def _cliente(self, **opcoes):
+        client = NiboObrigacoesClient(self.config, **opcoes)
+        client.session = mock.Mock()
+        client.session.request = mock.Mock(side_effect=self._responder)
+        return client
+
+    def _responder(self, metodo, url, **kwargs):
+        self.caminhos.append(urlparse(url).path)
+        response = requests.Response()
+        response.status_code = 200
+        if urlparse(url).path.endswith("/accountingfirms"):
+            response._content = json.dumps({"items": [{"id": ESCRITORIO, "name": "Escritório"}]}).encode()
+        else:
+            response._content = b'{"items": [], "metadata": {}}'
+        return response
+
+    def test_consulta_a_api_uma_vez(self):
+        """Testa que o primeiro escritório da API é memorizado no processo"""
+        client = self._cliente()
+        self.assertEqual(client.escritorio_padrao(), UUID(ESCRITORIO))
+        self.assertEqual(client.escritorio_padrao(), UUID(ESCRITORIO))
+        self.assertEqual(self._cliente().escritorio_padrao(), UUID(ESCRITORIO))
+        self.assertEqual(sum(caminho.endswith("/accountingfirms") for caminho in self.caminhos), 1)
+
+    def test_cache_entre_processos(self):
+        """Testa que outro processo reaproveita o escritório gravado em cache_dir"""
+        self._cliente().escritorio_padrao()
+        modulo_client.limpar_cache_escritorios()  # simula um novo processo
+        self.caminhos.clear()
+        self.assertEqual(self._cliente().escritorio_padrao(), UUID(ESCRITORIO))
+        self.assertEqual(self.caminhos, [])
+        with open(os.path.join(self.config.cache_dir, modulo_client.ARQUIVO_ESCRITORIOS_PADRAO)) as f:
+            self.assertNotIn(self.config.obrigacoes_api_token or "sem-token", f.read())
+
+    def test_sem_cache_em_disco(self):
+        """Testa que cache_escritorios=False (CLI com --no-cache) não lê nem grava o arquivo"""
+        self._cliente().escritorio_padrao()
+        modulo_client.limpar_cache_escritorios()
+        self.caminhos.clear()
+        self._cliente(cache_escritorios=False).escritorio_padrao()
+        self.assertEqual(len(self.caminhos), 1)
+
+        os.unlink(os.path.join(self.config.cache_dir, modulo_client.ARQUIVO_ESCRITORIOS_PADRAO))
+        modulo_client.limpar_cache_escritorios()
+        self._cliente(cache_escritorios=False).escritorio_padrao()
+        self.assertFalse(os.path.exists(os.path.join(self.config.cache_dir, modulo_client.ARQUIVO_ESCRITORIOS_PADRAO)))
+
+        pool = configurar_cache_cli(sem_cache=True)
+        self.addCleanup(configurar_pool_padrao)
+        self.assertFalse(pool.obrigacoes().cache_escritorios)
+
+    @unittest.skipUnless(AIOHTTP_AVAILABLE, "aiohttp não instalado")
+    def test_cliente_assincrono(self):
+        """Testa que o cliente assíncrono resolve o escritório sem a sessão síncrona"""
+        client = AsyncNiboObrigacoesClient(self.config)
+        client.session.request = mock.Mock(side_effect=AssertionError("chamada síncrona"))
+        urls = []
+
+        async def requisitar(metodo, url, headers=None, **kwargs):
+            urls.append(url)
+            return {"items": [{"id": ESCRITORIO}]}
+
+        client._request = requisitar
+        with self.assertRaises(ValueError):
+            client.resolver_escritorio()
+        self.assertEqual(asyncio.run(client.escritorio_padrao()), UUID(ESCRITORIO))
+        self.assertEqual(client.resolver_escritorio(), UUID(ESCRITORIO))
+        self.assertEqual(client.resolver_escritorio(UUID(CONFIGURADO)), UUID(CONFIGURADO))
+        self.assertEqual(len(urls), 1)
+        self.assertTrue(urlparse(urls[0]).path.endswith("/accountingfirms"))
+
+    def test_configurado_em_settings(self):
+        """Testa que obrigacoes_accounting_firm_id dispensa a consulta"""
+        with mock.patch.dict(os.environ, {"NIBO_OBRIGACOES_ACCOUNTING_FIRM_ID": CONFIGURADO}):
+            self.assertEqual(self._cliente().escritorio_padrao(), UUID(CONFIGURADO))
+        self.assertEqual(self.caminhos, [])
+
+    def test_interfaces_usam_escritorio_padrao(self):
+        """Testa que as interfaces aceitam accounting_firm_id omitido"""
+        client = self._cliente()
+        client.departamentos.listar()
+        client.clientes.listar()
+        client.contatos.buscar_por_id(None, UUID(CONFIGURADO))
+        client.departamentos.listar(UUID(CONFIGURADO))
+        self.assertEqual(self.caminhos[1:], [
+            f"/accountant/api/v1/accountingfirms/{ESCRITORIO}/departments",
+            f"/accountant/api/v1/accountingfirms/{ESCRITORIO}/customers",
+            f"/accountant/api/v1/accountingfirms/{ESCRITORIO}/contacts/{CONFIGURADO}",
+            f"/accountant/api/v1/accountingfirms/{CONFIGURADO}/departments",
+        ])
+
+    def test_sem_escritorios(self):
+        """Testa o erro quando a credencial não tem escritórios"""
+        client = self._cliente()
+        response = requests.Response()
+        response.status_code = 200
+        response._content = b'{"items": []}'
+        client.session.request = mock.Mock(return_value=response)
+        with self.assertRaises(ValueError):
+            client.escritorio_padrao()
+
+
+if __name__ == "__main__":
+    unittest.main()